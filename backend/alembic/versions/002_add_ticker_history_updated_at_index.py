@@ -0,0 +1,26 @@
+"""Add index on ticker_history.updated_at
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # max(updated_at) over all tickers backs the ETag/Last-Modified validator of the ticker list
+    op.create_index(op.f('ix_ticker_history_updated_at'), 'ticker_history', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ticker_history_updated_at'), table_name='ticker_history')
@@ -0,0 +1,46 @@
+"""Add ticker_bars table
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cache of completed weekly/monthly bars resampled from ticker_history
+    op.create_table(
+        'ticker_bars',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('interval', sa.String(length=8), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('open', sa.Numeric(precision=20, scale=6), nullable=False),
+        sa.Column('high', sa.Numeric(precision=20, scale=6), nullable=False),
+        sa.Column('low', sa.Numeric(precision=20, scale=6), nullable=False),
+        sa.Column('close', sa.Numeric(precision=20, scale=6), nullable=False),
+        sa.Column('volume', sa.BigInteger(), nullable=False),
+        sa.Column('trading_days', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ticker_bars_id'), 'ticker_bars', ['id'], unique=False)
+    op.create_index('idx_ticker_bar_period', 'ticker_bars', ['ticker', 'interval', 'period_start'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ticker_bar_period', table_name='ticker_bars')
+    op.drop_index(op.f('ix_ticker_bars_id'), table_name='ticker_bars')
+    op.drop_table('ticker_bars')
@@ -0,0 +1,96 @@
+"""Add price_adjustments table and adjusted ticker bars
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 00:00:00.000000
+
+From this revision ticker_history stores raw prices. Earlier rows were
+stored split- and dividend-adjusted and cannot be converted back, so they are
+kept and flagged ``provider_adjusted``: adjusted reads leave them as they are,
+and each ticker holding them is recorded in ``pending_raw_backfills`` so its
+next refresh downloads its whole period raw (see README, Database Migrations).
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored prices were adjusted by the provider: flag them rather than delete
+    # them. A constant default is a catalog-only change, so existing rows read
+    # as flagged without rewriting the table; new rows default to raw
+    op.add_column(
+        'ticker_history',
+        sa.Column('provider_adjusted', sa.Boolean(), server_default=sa.true(), nullable=False),
+    )
+    op.alter_column('ticker_history', 'provider_adjusted', server_default=sa.false())
+
+    # Incremental refreshes only fetch missing sessions and would never rewrite
+    # the flagged rows: these tickers get one full download on their next refresh
+    op.create_table(
+        'pending_raw_backfills',
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('ticker')
+    )
+    tickers = [
+        row[0] for row in op.get_bind().execute(
+            sa.text(
+                'INSERT INTO pending_raw_backfills (ticker) '
+                'SELECT DISTINCT ticker FROM ticker_history RETURNING ticker'
+            )
+        )
+    ]
+    if tickers:
+        logger.warning(
+            'Flagged provider-adjusted price history of %d ticker(s); their next refresh '
+            'downloads it raw: %s',
+            len(tickers), ' '.join(sorted(tickers)),
+        )
+
+    # Cumulative split/dividend factors, one row per corporate action
+    op.create_table(
+        'price_adjustments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('ex_date', sa.Date(), nullable=False),
+        sa.Column('dividend', sa.Numeric(precision=20, scale=6), nullable=False),
+        sa.Column('split_ratio', sa.Numeric(precision=20, scale=6), nullable=False),
+        sa.Column('price_factor', sa.Numeric(precision=30, scale=15), nullable=False),
+        sa.Column('volume_factor', sa.Numeric(precision=30, scale=15), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_price_adjustments_id'), 'price_adjustments', ['id'], unique=False)
+    op.create_index('idx_price_adjustment_ex_date', 'price_adjustments', ['ticker', 'ex_date'], unique=True)
+
+    # Cached bars are kept separately for raw and adjusted prices
+    op.add_column('ticker_bars', sa.Column('adjusted', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.drop_index('idx_ticker_bar_period', table_name='ticker_bars')
+    op.create_index('idx_ticker_bar_period', 'ticker_bars', ['ticker', 'interval', 'adjusted', 'period_start'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ticker_bar_period', table_name='ticker_bars')
+    op.execute("DELETE FROM ticker_bars WHERE adjusted")
+    op.create_index('idx_ticker_bar_period', 'ticker_bars', ['ticker', 'interval', 'period_start'], unique=True)
+    op.drop_column('ticker_bars', 'adjusted')
+
+    op.drop_index('idx_price_adjustment_ex_date', table_name='price_adjustments')
+    op.drop_index(op.f('ix_price_adjustments_id'), table_name='price_adjustments')
+    op.drop_table('price_adjustments')
+
+    op.drop_table('pending_raw_backfills')
+    op.drop_column('ticker_history', 'provider_adjusted')
@@ -0,0 +1,44 @@
+"""Add intraday_bars table and widen ticker_history.volume
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Intraday tier: natural key, double precision prices, 64-bit volume
+    op.create_table(
+        'intraday_bars',
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('interval', sa.String(length=4), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.Float(), nullable=False),
+        sa.Column('high', sa.Float(), nullable=False),
+        sa.Column('low', sa.Float(), nullable=False),
+        sa.Column('close', sa.Float(), nullable=False),
+        sa.Column('volume', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('ticker', 'interval', 'timestamp')
+    )
+    op.create_index('idx_intraday_bars_timestamp', 'intraday_bars', ['timestamp'], unique=False, postgresql_using='brin')
+
+    # Daily volumes of large caps exceed 2^31 - 1
+    op.alter_column('ticker_history', 'volume', type_=sa.BigInteger(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('ticker_history', 'volume', type_=sa.Integer(), existing_nullable=False)
+    op.drop_index('idx_intraday_bars_timestamp', table_name='intraday_bars', postgresql_using='brin')
+    op.drop_table('intraday_bars')
@@ -0,0 +1,41 @@
+"""Add quarantined_bars table
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Daily bars rejected by data-quality validation, with the failed checks
+    op.create_table(
+        'quarantined_bars',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('reasons', postgresql.ARRAY(sa.String(length=32)), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('quarantined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quarantined_bars_id'), 'quarantined_bars', ['id'], unique=False)
+    op.create_index('idx_quarantined_bar_ticker_date', 'quarantined_bars', ['ticker', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_quarantined_bar_ticker_date', table_name='quarantined_bars')
+    op.drop_index(op.f('ix_quarantined_bars_id'), table_name='quarantined_bars')
+    op.drop_table('quarantined_bars')
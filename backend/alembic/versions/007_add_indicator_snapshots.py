@@ -0,0 +1,58 @@
+"""Add indicator_snapshots table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Latest indicator values per ticker, queried by the screener
+    op.create_table(
+        'indicator_snapshots',
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('as_of', sa.Date(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=True),
+        sa.Column('sector', sa.String(length=50), nullable=True),
+        sa.Column('region', sa.String(length=50), nullable=True),
+        sa.Column('market_cap', sa.Float(), nullable=True),
+        sa.Column('close', sa.Float(), nullable=False),
+        sa.Column('volume', sa.BigInteger(), nullable=False),
+        sa.Column('change_1d', sa.Float(), nullable=True),
+        sa.Column('ma5', sa.Float(), nullable=True),
+        sa.Column('ma20', sa.Float(), nullable=True),
+        sa.Column('ma60', sa.Float(), nullable=True),
+        sa.Column('rsi14', sa.Float(), nullable=True),
+        sa.Column('macd', sa.Float(), nullable=True),
+        sa.Column('macd_signal', sa.Float(), nullable=True),
+        sa.Column('macd_hist', sa.Float(), nullable=True),
+        sa.Column('bb_upper', sa.Float(), nullable=True),
+        sa.Column('bb_lower', sa.Float(), nullable=True),
+        sa.Column('volatility', sa.Float(), nullable=True),
+        sa.Column('high_52w', sa.Float(), nullable=True),
+        sa.Column('low_52w', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('ticker')
+    )
+    op.create_index('idx_indicator_snapshot_sector', 'indicator_snapshots', ['sector'], unique=False)
+    op.create_index('idx_indicator_snapshot_region', 'indicator_snapshots', ['region'], unique=False)
+    op.create_index('idx_indicator_snapshot_rsi14', 'indicator_snapshots', ['rsi14'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_indicator_snapshot_rsi14', table_name='indicator_snapshots')
+    op.drop_index('idx_indicator_snapshot_region', table_name='indicator_snapshots')
+    op.drop_index('idx_indicator_snapshot_sector', table_name='indicator_snapshots')
+    op.drop_table('indicator_snapshots')
@@ -0,0 +1,60 @@
+"""Add news_articles and news_sentiment_daily tables
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every ingested article; near-duplicates point at the first copy of the story
+    op.create_table(
+        'news_articles',
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('article_id', sa.String(length=64), nullable=False),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('title', sa.Text(), nullable=False),
+        sa.Column('publisher', sa.String(length=100), nullable=True),
+        sa.Column('url', sa.Text(), nullable=True),
+        sa.Column('signature', postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column('duplicate_of', sa.String(length=64), nullable=True),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('model', sa.String(length=50), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('ticker', 'article_id')
+    )
+    op.create_index('idx_news_article_ticker_published', 'news_articles', ['ticker', 'published_at'], unique=False)
+
+    # Daily aggregates read by the research workflow's sentiment stage
+    op.create_table(
+        'news_sentiment_daily',
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('articles', sa.Integer(), nullable=False),
+        sa.Column('unique_articles', sa.Integer(), nullable=False),
+        sa.Column('score_sum', sa.Float(), nullable=False),
+        sa.Column('sentiment', sa.Float(), nullable=False),
+        sa.Column('positive', sa.Integer(), nullable=False),
+        sa.Column('negative', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('ticker', 'date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('news_sentiment_daily')
+    op.drop_index('idx_news_article_ticker_published', table_name='news_articles')
+    op.drop_table('news_articles')
@@ -0,0 +1,40 @@
+"""Add weekly_report_snapshots table
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Weekly report documents per ticker / portfolio, served by the reports API
+    op.create_table(
+        'weekly_report_snapshots',
+        sa.Column('kind', sa.String(length=10), nullable=False),
+        sa.Column('subject', sa.String(length=50), nullable=False),
+        sa.Column('week', sa.String(length=8), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.String(length=100), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('document', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('kind', 'subject', 'week')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('weekly_report_snapshots')
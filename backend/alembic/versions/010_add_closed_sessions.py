@@ -0,0 +1,33 @@
+"""Add closed_sessions table
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sessions the provider has no bar for (unlisted holidays, halts), not re-requested
+    op.create_table(
+        'closed_sessions',
+        sa.Column('ticker', sa.String(length=20), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('ticker', 'date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('closed_sessions')
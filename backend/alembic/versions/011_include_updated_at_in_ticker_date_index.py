@@ -0,0 +1,39 @@
+"""Include updated_at in the unique (ticker, date) index of ticker_history
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # max(updated_at)/count() over one ticker's date range (the history validator)
+    # runs as an index-only scan instead of reading every heap row in the range.
+    # The unique index is rebuilt rather than duplicated, so bar writes still
+    # maintain a single (ticker, date) B-tree; it stays the upserts' arbiter.
+    op.create_index(
+        'idx_ticker_date_covering',
+        'ticker_history',
+        ['ticker', 'date'],
+        unique=True,
+        postgresql_include=['updated_at'],
+    )
+    op.drop_index('idx_ticker_date', table_name='ticker_history')
+    op.execute('ALTER INDEX idx_ticker_date_covering RENAME TO idx_ticker_date')
+
+
+def downgrade() -> None:
+    op.create_index('idx_ticker_date_plain', 'ticker_history', ['ticker', 'date'], unique=True)
+    op.drop_index('idx_ticker_date', table_name='ticker_history')
+    op.execute('ALTER INDEX idx_ticker_date_plain RENAME TO idx_ticker_date')
@@ -1,12 +1,30 @@
 """
 CrewAI Agent Definitions for Quant Research War Room
+
+Agent classes are imported on first access so that importing this package
+does not load the LLM stack.
 """
 
-from app.agents.market_intelligence import MarketIntelligenceAgent
-from app.agents.quant_strategist import QuantStrategistAgent
-from app.agents.sentiment_analyst import SentimentAnalystAgent
-from app.agents.risk_officer import RiskOfficerAgent
-from app.agents.cio import ChiefInvestmentOfficerAgent
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from app.agents.cio import ChiefInvestmentOfficerAgent
+    from app.agents.market_intelligence import MarketIntelligenceAgent
+    from app.agents.quant_strategist import QuantStrategistAgent
+    from app.agents.risk_officer import RiskOfficerAgent
+    from app.agents.sentiment_analyst import SentimentAnalystAgent
+
+_EXPORTS = {
+    "MarketIntelligenceAgent": "app.agents.market_intelligence",
+    "QuantStrategistAgent": "app.agents.quant_strategist",
+    "SentimentAnalystAgent": "app.agents.sentiment_analyst",
+    "RiskOfficerAgent": "app.agents.risk_officer",
+    "ChiefInvestmentOfficerAgent": "app.agents.cio",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "MarketIntelligenceAgent",
@@ -1,10 +1,23 @@
+import secrets
 from typing import AsyncGenerator
 
+from fastapi import Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.core.database import async_session_maker
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         yield session
+
+
+async def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    """Guard of /admin endpoints: the X-Admin-Token header must match ADMIN_TOKEN."""
+    if not settings.ADMIN_TOKEN:
+        if settings.DEBUG:
+            return
+        raise HTTPException(status_code=403, detail="Admin endpoints need ADMIN_TOKEN to be set")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
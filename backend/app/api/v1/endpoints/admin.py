@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.api import deps
+from app.core.query_monitor import SlowQueryMonitor, get_query_monitor
+from app.schemas.admin import SlowQueriesResponse, SlowQuery
+
+router = APIRouter(dependencies=[Depends(deps.require_admin)])
+
+ORDER_PATTERN = "^(" + "|".join(SlowQueryMonitor.ORDERINGS) + ")$"
+
+
+@router.get("/slow-queries", response_model=SlowQueriesResponse)
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=500, description="Number of fingerprints"),
+    order_by: str = Query(
+        "total_ms", pattern=ORDER_PATTERN, description="total_ms, max_ms, mean_ms or count"
+    ),
+) -> SlowQueriesResponse:
+    """
+    Top slow statement fingerprints of the API worker serving the request.
+
+    Statements slower than `SLOW_QUERY_THRESHOLD_MS` are grouped by
+    fingerprint (literals and parameters replaced by `?`) with the SQL and
+    parameters of their latest slow run; **plan** is the latest sampled
+    `EXPLAIN (ANALYZE, BUFFERS)` of the fingerprint, if any.
+    """
+    monitor = get_query_monitor()
+    return SlowQueriesResponse(
+        threshold_ms=monitor.threshold_ms,
+        explain_sample_rate=monitor.explain_sample_rate,
+        fingerprints=len(monitor.stats),
+        explains=monitor.explains,
+        queries=[SlowQuery(**stats.as_dict()) for stats in monitor.top(limit, order_by)],
+    )
+
+
+@router.delete("/slow-queries", status_code=204)
+async def reset_slow_queries() -> Response:
+    """Forget the recorded slow queries of the API worker serving the request."""
+    get_query_monitor().reset()
+    return Response(status_code=204)
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.schemas.chart import ChartResponse
+from app.services.chart_service import (
+    SUPPORTED_PANELS,
+    ChartSpec,
+    get_chart_service,
+    load_chart_bars,
+)
+
+router = APIRouter()
+
+# Chart files are content-addressed: a given URL never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/files/{filename}", response_class=FileResponse)
+async def get_chart_file(
+    filename: str = Path(..., pattern=r"^[0-9a-f]{32}\.svg$"),
+) -> FileResponse:
+    """
+    Serve a rendered chart by its content key, with long-lived cache headers.
+    """
+    path = get_chart_service().output_dir / filename
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Chart not found")
+
+    return FileResponse(
+        path,
+        media_type="image/svg+xml",
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{path.stem}"'},
+    )
+
+
+@router.get("/{ticker}", response_model=ChartResponse)
+async def get_chart(
+    request: Request,
+    ticker: str,
+    lookback: int = Query(90, ge=5, le=2500, description="Visible trading days"),
+    panels: str = Query(",".join(SUPPORTED_PANELS), description="Comma-separated panels"),
+    db: AsyncSession = Depends(deps.get_db),
+) -> ChartResponse:
+    """
+    Get (rendering if needed) the chart for a ticker.
+
+    - **lookback**: Number of trading days shown
+    - **panels**: Any of `price`, `rsi`, `macd`
+
+    Returns the chart's content key and the URL of the cacheable image.
+    """
+    requested = tuple(panel.strip() for panel in panels.split(",") if panel.strip())
+    unknown = set(requested) - set(SUPPORTED_PANELS)
+    if unknown or not requested:
+        raise HTTPException(status_code=422, detail=f"Unsupported panels: {', '.join(unknown)}")
+
+    spec = ChartSpec(ticker=ticker, lookback=lookback, panels=requested)
+    bars = await load_chart_bars(db, ticker, spec)
+    if not bars:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No historical data found for ticker {ticker}",
+        )
+
+    key, _ = await get_chart_service().render(spec, bars)
+
+    return ChartResponse(
+        ticker=ticker,
+        key=key,
+        url=str(request.url_for("get_chart_file", filename=f"{key}.svg").path),
+        lookback=lookback,
+        panels=list(requested),
+    )
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import re
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+
+from app.services.quote_service import QuoteHub, QuoteSubscriber, get_quote_hub
+
+router = APIRouter()
+
+MAX_SUBSCRIPTIONS = 50
+
+# Yahoo-style symbols, e.g. NVDA, 2330.TW, BRK-B, ^GSPC, EURUSD=X (ticker columns are 20 wide)
+SYMBOL_PATTERN = re.compile(r"[A-Z0-9^][A-Z0-9.=^-]{0,19}")
+
+
+async def _send_quotes(websocket: WebSocket, subscriber: QuoteSubscriber) -> None:
+    while True:
+        quotes = await subscriber.get()
+        await websocket.send_json({"type": "quotes", "quotes": quotes})
+
+
+def _parse_message(text: str) -> tuple[str, list[str]]:
+    """Validate a client message; raises ValueError with the reason."""
+    try:
+        message = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError("Message must be JSON") from e
+    if not isinstance(message, dict) or message.get("action") not in ("subscribe", "unsubscribe"):
+        raise ValueError("action must be 'subscribe' or 'unsubscribe'")
+    tickers = message.get("tickers")
+    if not isinstance(tickers, list) or not all(isinstance(t, str) for t in tickers):
+        raise ValueError("tickers must be a list of symbols")
+    # Normalized so that "nvda" and "NVDA" share one poller
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    invalid = [symbol for symbol in symbols if not SYMBOL_PATTERN.fullmatch(symbol)]
+    if invalid:
+        raise ValueError(f"Invalid ticker symbol(s): {', '.join(invalid)}")
+    return message["action"], symbols
+
+
+@router.websocket("/ws")
+async def stream_quotes(websocket: WebSocket, hub: QuoteHub = Depends(get_quote_hub)) -> None:
+    """
+    Stream live quotes for the symbols a client subscribes to.
+
+    Client messages: `{"action": "subscribe" | "unsubscribe", "tickers": [...]}`;
+    symbols are upper-cased, and a message with an invalid one is rejected.
+
+    Server messages:
+    - `{"type": "quotes", "quotes": [...]}`: latest quote per updated symbol
+      (ticker, price, previous_close, volume, timestamp); a slow client only
+      gets the most recent quote of each symbol
+    - `{"type": "subscribed", "tickers": [...]}`: current subscriptions
+    - `{"type": "error", "detail": ...}`: invalid message (the connection stays open)
+    """
+    await websocket.accept()
+    subscriber = QuoteSubscriber()
+    subscribed: set[str] = set()
+    sender = asyncio.create_task(_send_quotes(websocket, subscriber))
+    try:
+        while True:
+            try:
+                action, tickers = _parse_message(await websocket.receive_text())
+                if action == "subscribe":
+                    if len(subscribed | set(tickers)) > MAX_SUBSCRIPTIONS:
+                        raise ValueError(f"At most {MAX_SUBSCRIPTIONS} tickers per connection")
+                    hub.subscribe(subscriber, tickers)
+                    subscribed.update(tickers)
+                else:
+                    hub.unsubscribe(subscriber, tickers)
+                    subscribed.difference_update(tickers)
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            await websocket.send_json({"type": "subscribed", "tickers": sorted(subscribed)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(subscriber)
+        sender.cancel()
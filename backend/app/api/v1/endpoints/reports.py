@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.http_cache import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.schemas.report import ReportDiffResponse, ReportSnapshot, ReportWeeksResponse
+from app.services.report_snapshot_service import (
+    KINDS,
+    WEEK_PATTERN,
+    diff_snapshots,
+    get_snapshot,
+    list_snapshot_weeks,
+)
+
+router = APIRouter()
+
+KIND_PATTERN = "^(" + "|".join(KINDS) + ")$"
+
+
+@router.get("/{kind}/{subject}/weeks", response_model=ReportWeeksResponse)
+async def list_report_weeks(
+    kind: str = Path(..., pattern=KIND_PATTERN, description="ticker or portfolio"),
+    subject: str = Path(..., max_length=50, description="Ticker or portfolio name"),
+    limit: int = Query(52, ge=1, le=520, description="Maximum number of weeks"),
+    before: str | None = Query(
+        None, pattern=WEEK_PATTERN, description="Only weeks before this one (e.g. 2026-W42)"
+    ),
+    db: AsyncSession = Depends(deps.get_db),
+) -> ReportWeeksResponse:
+    """
+    List the weeks with a report snapshot of a ticker or portfolio, newest first.
+
+    Reads the snapshot index only, never the documents. Page with **before**
+    set to the oldest week returned.
+    """
+    weeks = await list_snapshot_weeks(db, kind, subject, limit=limit, before=before)
+    return ReportWeeksResponse(kind=kind, subject=subject, weeks=weeks)
+
+
+@router.get("/{kind}/{subject}/diff", response_model=ReportDiffResponse)
+async def diff_report_weeks(
+    kind: str = Path(..., pattern=KIND_PATTERN, description="ticker or portfolio"),
+    subject: str = Path(..., max_length=50, description="Ticker or portfolio name"),
+    base: str = Query(..., pattern=WEEK_PATTERN, description="Week diffed from"),
+    week: str = Query(..., pattern=WEEK_PATTERN, description="Week diffed to"),
+    db: AsyncSession = Depends(deps.get_db),
+) -> ReportDiffResponse:
+    """
+    Diff the report snapshots of two weeks.
+
+    Each change has the dotted **path** of the field, its **base** and
+    **other** values, **change** (`added`, `removed` or `changed`) and, for
+    numbers, **delta**.
+    """
+    diff = await diff_snapshots(db, kind, subject, base, week)
+    if diff is None:
+        raise HTTPException(
+            status_code=404, detail=f"No {kind} report of {subject} for {base} and {week}"
+        )
+    return ReportDiffResponse(**diff)
+
+
+@router.get("/{kind}/{subject}/{week}", response_model=ReportSnapshot)
+async def get_report(
+    request: Request,
+    response: Response,
+    kind: str = Path(..., pattern=KIND_PATTERN, description="ticker or portfolio"),
+    subject: str = Path(..., max_length=50, description="Ticker or portfolio name"),
+    week: str = Path(..., pattern=WEEK_PATTERN, description="ISO week, e.g. 2026-W42"),
+    db: AsyncSession = Depends(deps.get_db),
+) -> ReportSnapshot | Response:
+    """
+    Get the weekly report of a ticker or portfolio.
+
+    Served from the snapshot written by the weekly workflow with a single
+    key lookup. Supports conditional requests (`If-None-Match` /
+    `If-Modified-Since`); the ETag follows the document's fingerprint.
+
+    - **kind**: `ticker` or `portfolio` (e.g. `watchlist`)
+    - **document**: Versioned report document (**version**)
+    """
+    snapshot = await get_snapshot(db, kind, subject, week)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"No {kind} report of {subject} for {week}")
+
+    etag = make_etag(kind, subject, week, snapshot["fingerprint"])
+    if is_not_modified(request, etag, snapshot["updated_at"]):
+        return not_modified_response(etag, snapshot["updated_at"])
+    response.headers.update(validator_headers(etag, snapshot["updated_at"]))
+    return ReportSnapshot(**snapshot)
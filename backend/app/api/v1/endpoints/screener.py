@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.process_cache import get_process_cache
+from app.schemas.screener import ScreenerResponse
+from app.services.screener_service import MAX_LIMIT, ScreenerSyntaxError, run_screen
+
+router = APIRouter()
+
+
+@router.get("/", response_model=ScreenerResponse)
+async def screen_stocks(
+    filter: str | None = Query(
+        None,
+        max_length=1000,
+        description="Filter expression, e.g. `rsi14 < 30 and sector = 'Semiconductors'`",
+    ),
+    sort: str | None = Query(
+        None, max_length=200, description="Sort fields, `-` for descending, e.g. `-rsi14,ticker`"
+    ),
+    limit: int = Query(100, ge=1, le=MAX_LIMIT, description="Maximum number of rows"),
+    db: AsyncSession = Depends(deps.get_db),
+) -> ScreenerResponse:
+    """
+    Screen tickers on their latest indicator values.
+
+    Runs one query over the indicator snapshot (refreshed on each ingestion),
+    never over the full price history. Results are cached per worker until
+    the next ingestion change.
+
+    - **filter**: Comparisons (`< <= > >= = !=`), `in (...)`, `is [not] null`,
+      arithmetic (`+ - * /`), combined with `and`, `or`, `not` and parentheses
+    - **fields**: ticker, name, sector, region, market_cap, close, volume,
+      change_1d, ma5, ma20, ma60, rsi14, macd, macd_signal, macd_hist,
+      bb_upper, bb_lower, volatility, high_52w, low_52w
+    """
+    try:
+        result = await get_process_cache().get_or_load(
+            ("screen", filter, sort, limit),
+            lambda: run_screen(db, filter=filter, sort=sort, limit=limit),
+        )
+    except ScreenerSyntaxError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    return ScreenerResponse(**result)
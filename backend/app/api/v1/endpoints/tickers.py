@@ -1,36 +1,71 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.config import settings
+from app.core.http_cache import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    validator_headers,
+)
+from app.core.process_cache import get_process_cache
+from app.core.serialization import rows_response
+from app.schemas.bar import TickerBarsResponse
 from app.schemas.ticker_history import (
     AvailableTickersResponse,
+    IntradayBar,
     TickerDataFetchRequest,
     TickerDataFetchResponse,
     TickerHistory,
 )
+from app.services.adjustment_service import get_adjustments_validator
+from app.services.bar_service import get_bars, get_bars_batch
+from app.services.fetch_coordinator import get_fetch_coordinator
+from app.services.ingest_writer import get_ingest_writer
+from app.services.intraday_service import INTRADAY_COLUMNS, get_intraday_rows
 from app.services.ticker_service import (
-    fetch_and_store_ticker_data,
+    HISTORY_COLUMNS,
     get_available_tickers,
-    get_ticker_history,
+    get_history_validator,
+    get_ticker_history_rows,
+    get_tickers_validator,
 )
 
 router = APIRouter()
 
+INTERVAL_PATTERN = r"^(1w|1mo)$"
+HISTORY_INTERVAL_PATTERN = r"^(1d|1h|5m|1m)$"
+MAX_BATCH_TICKERS = 50
+
 
 @router.get("/", response_model=AvailableTickersResponse)
 async def get_available_ticker_list(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
-) -> AvailableTickersResponse:
+) -> AvailableTickersResponse | Response:
     """
     Get list of available tickers.
 
+    Supports conditional requests (`If-None-Match` / `If-Modified-Since`).
+
     Returns:
     - **configured_tickers**: Tickers configured in .env file
     - **tickers_in_database**: Tickers with data in database, including record counts and date ranges
     """
-    result = await get_available_tickers(db)
+    cache = get_process_cache()
+    last_modified = await cache.get_or_load(
+        ("tickers_validator",), lambda: get_tickers_validator(db)
+    )
+    etag = make_etag("tickers", settings.TICKERS, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    response.headers.update(validator_headers(etag, last_modified))
+
+    result = await cache.get_or_load(("tickers",), lambda: get_available_tickers(db))
 
     return AvailableTickersResponse(
         configured_tickers=result["configured_tickers"],
@@ -39,20 +74,32 @@ async def get_available_ticker_list(
 
 
 @router.post("/fetch", response_model=TickerDataFetchResponse)
-async def fetch_ticker_data(
-    request: TickerDataFetchRequest,
-    db: AsyncSession = Depends(deps.get_db),
-) -> TickerDataFetchResponse:
+async def fetch_ticker_data(request: TickerDataFetchRequest) -> TickerDataFetchResponse:
     """
     Fetch historical data for tickers from yfinance and store in database.
 
     - **tickers**: List of ticker symbols (optional, defaults to configured tickers)
     - **period**: Data period (1d,5d,1mo,3mo,6mo,1y,2y,5y,10y,ytd,max)
+    - **full_refresh**: Download the whole period even for tickers with stored bars
+
+    Tickers with stored bars only fetch the sessions of the period they are
+    missing, per their exchange's trading calendar; **tickers_up_to_date**
+    counts those skipped because their market has had no session since.
+
+    Bars failing data-quality checks are quarantined rather than stored;
+    **quality** reports the per-ticker checks of this run.
+
+    Concurrent fetches share one group-committed write of their bars
+    (`INGEST_GROUP_COMMIT`). A ticker already being fetched with the same
+    period, by this or another request, is not fetched again: the request
+    waits for that fetch and shares its result (**tickers_shared**). Other
+    API workers and the CLI wait for it too (`FETCH_ADVISORY_LOCKS`).
     """
-    result = await fetch_and_store_ticker_data(
-        db=db,
+    result = await get_fetch_coordinator().fetch(
         tickers=request.tickers,
         period=request.period,
+        full_refresh=request.full_refresh,
+        writer=get_ingest_writer() if settings.INGEST_GROUP_COMMIT else None,
     )
 
     return TickerDataFetchResponse(
@@ -60,37 +107,204 @@ async def fetch_ticker_data(
         message=result["message"],
         records_created=result["records_created"],
         records_updated=result["records_updated"],
+        records_quarantined=result["records_quarantined"],
+        tickers_up_to_date=result["tickers_up_to_date"],
+        sessions_missing=result["sessions_missing"],
+        sessions_unfilled=result["sessions_unfilled"],
+        tickers_shared=result["tickers_shared"],
+        quality=result["quality"],
     )
 
 
-@router.get("/{ticker}/history", response_model=list[TickerHistory])
+@router.get("/{ticker}/history", response_model=list[TickerHistory] | list[IntradayBar])
 async def get_ticker_data(
+    request: Request,
     ticker: str,
     start_date: datetime | None = Query(None, description="Start date for filtering"),
     end_date: datetime | None = Query(None, description="End date for filtering"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records"),
+    adjusted: bool = Query(False, description="Apply split/dividend adjustments"),
+    interval: str = Query(
+        "1d", pattern=HISTORY_INTERVAL_PATTERN, description="Bar interval: 1d, 1h, 5m or 1m"
+    ),
     db: AsyncSession = Depends(deps.get_db),
-) -> list[TickerHistory]:
+) -> Response:
     """
     Get historical data for a specific ticker from the database.
 
+    Supports conditional requests (`If-None-Match` / `If-Modified-Since`); the
+    validators are derived from the latest `updated_at` in the requested range.
+    Validators and rows are cached per worker until ingestion changes the range.
+
     - **ticker**: Ticker symbol (e.g., "NVDA", "2330.TW")
     - **start_date**: Optional start date filter
     - **end_date**: Optional end date filter
     - **limit**: Maximum number of records to return (default: 100, max: 1000)
+    - **adjusted**: Return split/dividend-adjusted prices and volume; `dividends`
+      and `stock_splits` stay as recorded on their ex-date
+    - **interval**: `1d` (default) reads daily history; `1h`, `5m` and `1m` read
+      the intraday tier and return `IntradayBar` rows (older periods are only
+      kept at coarser intervals, see `intraday_config`)
     """
-    history = await get_ticker_history(
-        db=db,
+    if interval != "1d":
+        return await _get_intraday_data(ticker, interval, start_date, end_date, limit, adjusted, db)
+
+    # Cached until ingestion notifies a change of this ticker within the range
+    cache = get_process_cache()
+    start, end = _day(start_date), _day(end_date)
+
+    headers: dict[str, str] = {}
+    last_modified, count = await cache.get_or_load(
+        ("history_validator", ticker, start_date, end_date),
+        lambda: get_history_validator(db, ticker, start_date, end_date),
+        ticker=ticker,
+        start=start,
+        end=end,
+    )
+    if count:
+        factors_modified = (
+            await cache.get_or_load(
+                ("adjustments_validator", ticker),
+                lambda: get_adjustments_validator(db, ticker),
+                ticker=ticker,
+                adjusted=True,
+            )
+            if adjusted
+            else None
+        )
+        if factors_modified is not None:
+            last_modified = max(last_modified or factors_modified, factors_modified)
+        etag = make_etag(ticker, start_date, end_date, limit, adjusted, count, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        headers = validator_headers(etag, last_modified)
+
+    # Rows are encoded directly; response_model only documents the schema
+    rows = await cache.get_or_load(
+        ("history", ticker, start_date, end_date, limit, adjusted),
+        lambda: get_ticker_history_rows(
+            db=db,
+            ticker=ticker,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            adjusted=adjusted,
+        ),
         ticker=ticker,
-        start_date=start_date,
-        end_date=end_date,
-        limit=limit,
+        start=start,
+        end=end,
+        adjusted=adjusted,
+    )
+
+    if not rows:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No historical data found for ticker {ticker}",
+        )
+
+    return rows_response(HISTORY_COLUMNS, rows, headers=headers)
+
+
+def _day(moment: datetime | None) -> date | None:
+    return moment.date() if moment is not None else None
+
+
+async def _get_intraday_data(
+    ticker: str,
+    interval: str,
+    start_date: datetime | None,
+    end_date: datetime | None,
+    limit: int,
+    adjusted: bool,
+    db: AsyncSession,
+) -> Response:
+    if adjusted:
+        raise HTTPException(
+            status_code=422, detail="adjusted is only supported for daily (1d) history"
+        )
+
+    rows = await get_intraday_rows(db, ticker, interval, start_date, end_date, limit)
+
+    if not rows:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No {interval} data found for ticker {ticker}",
+        )
+
+    return rows_response(INTRADAY_COLUMNS, rows)
+
+
+@router.get("/bars", response_model=list[TickerBarsResponse])
+async def get_ticker_bars_batch(
+    tickers: str | None = Query(
+        None, description="Comma-separated ticker symbols (defaults to configured tickers)"
+    ),
+    interval: str = Query("1w", pattern=INTERVAL_PATTERN, description="Bar interval: 1w or 1mo"),
+    start_date: datetime | None = Query(None, description="Start date for filtering"),
+    end_date: datetime | None = Query(None, description="End date for filtering"),
+    limit: int = Query(52, ge=1, le=1000, description="Maximum number of bars per ticker"),
+    adjusted: bool = Query(False, description="Resample split/dividend-adjusted prices"),
+    db: AsyncSession = Depends(deps.get_db),
+) -> list[TickerBarsResponse]:
+    """
+    Get weekly or monthly bars for several tickers.
+
+    - **tickers**: Comma-separated symbols, e.g. `NVDA,2330.TW` (max 50)
+    - **interval**: `1w` (exchange-local trading weeks) or `1mo`
+    - **start_date** / **end_date**: Optional period filters
+    - **limit**: Maximum number of bars per ticker (default: 52)
+    - **adjusted**: Resample split/dividend-adjusted daily prices
+
+    Tickers without data are returned with an empty `bars` list.
+    """
+    symbols = (
+        [symbol.strip() for symbol in tickers.split(",") if symbol.strip()]
+        if tickers
+        else settings.ticker_list
     )
+    if len(symbols) > MAX_BATCH_TICKERS:
+        raise HTTPException(
+            status_code=422, detail=f"At most {MAX_BATCH_TICKERS} tickers per request"
+        )
+
+    result = await get_bars_batch(db, symbols, interval, start_date, end_date, limit, adjusted)
+
+    return [
+        TickerBarsResponse(ticker=ticker, interval=interval, bars=bars)
+        for ticker, bars in result.items()
+    ]
+
+
+@router.get("/{ticker}/bars", response_model=TickerBarsResponse)
+async def get_ticker_bars(
+    ticker: str,
+    interval: str = Query("1w", pattern=INTERVAL_PATTERN, description="Bar interval: 1w or 1mo"),
+    start_date: datetime | None = Query(None, description="Start date for filtering"),
+    end_date: datetime | None = Query(None, description="End date for filtering"),
+    limit: int = Query(52, ge=1, le=1000, description="Maximum number of bars"),
+    adjusted: bool = Query(False, description="Resample split/dividend-adjusted prices"),
+    db: AsyncSession = Depends(deps.get_db),
+) -> TickerBarsResponse:
+    """
+    Get weekly or monthly OHLCV bars resampled from daily data.
+
+    Each bar has the first open, highest high, lowest low, last close and
+    total volume of its period. Weeks follow the exchange's trading week
+    (Monday-Friday, or Sunday-Thursday for e.g. `.SR` listings). The latest
+    bar has `complete=false` while its period is still open.
+
+    - **ticker**: Ticker symbol (e.g., "NVDA", "2330.TW")
+    - **interval**: `1w` or `1mo`
+    - **start_date** / **end_date**: Optional period filters
+    - **limit**: Maximum number of bars to return (default: 52, max: 1000)
+    - **adjusted**: Resample split/dividend-adjusted daily prices
+    """
+    bars = await get_bars(db, ticker, interval, start_date, end_date, limit, adjusted)
 
-    if not history:
+    if not bars:
         raise HTTPException(
             status_code=404,
             detail=f"No historical data found for ticker {ticker}",
         )
 
-    return history
+    return TickerBarsResponse(ticker=ticker, interval=interval, bars=bars)
@@ -0,0 +1,64 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.config import config_loader
+from app.core.process_cache import get_process_cache
+from app.schemas.watchlist import (
+    WatchlistAggregatesResponse,
+    WatchlistResponse,
+    WatchlistStockInfo,
+)
+from app.services.watchlist_service import get_watchlist_aggregates
+
+router = APIRouter()
+
+
+@router.get("/", response_model=WatchlistResponse)
+async def get_watchlist() -> WatchlistResponse:
+    """
+    Get the configured watchlist with symbol metadata and sector/region membership.
+    """
+    index = config_loader.watchlist_index
+
+    return WatchlistResponse(
+        stocks=[
+            WatchlistStockInfo(
+                symbol=stock.symbol,
+                name=stock.name,
+                sector=stock.sector,
+                region=stock.region,
+                market_cap=stock.market_cap,
+            )
+            for stock in index.stocks.values()
+        ],
+        sectors={name: list(members) for name, members in index.sectors.items()},
+        regions={name: list(members) for name, members in index.regions.items()},
+    )
+
+
+@router.get("/aggregates", response_model=WatchlistAggregatesResponse)
+async def get_aggregates(
+    lookback_days: int | None = Query(
+        None, ge=1, le=3650, description="Return window in days (defaults to analysis_config)"
+    ),
+    adjusted: bool = Query(False, description="Use split/dividend-adjusted closes"),
+    db: AsyncSession = Depends(deps.get_db),
+) -> WatchlistAggregatesResponse:
+    """
+    Get sector- and region-level aggregates over the lookback window.
+
+    - **equal_weighted_return**: Mean close-to-close return of members with data
+    - **cap_weighted_return**: Return weighted by the configured `market_cap`
+    - **breadth**: Fraction of members with data that advanced
+    - **adjusted**: Compute returns from split/dividend-adjusted closes
+
+    Cached per worker until the next ingestion change (or the next day).
+    """
+    result = await get_process_cache().get_or_load(
+        ("watchlist_aggregates", lookback_days, adjusted, date.today()),
+        lambda: get_watchlist_aggregates(db, lookback_days=lookback_days, adjusted=adjusted),
+    )
+    return WatchlistAggregatesResponse(**result)
@@ -1,8 +1,24 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import health, items, tickers
+from app.api.v1.endpoints import (
+    admin,
+    charts,
+    health,
+    items,
+    quotes,
+    reports,
+    screener,
+    tickers,
+    watchlist,
+)
 
 api_router = APIRouter()
 api_router.include_router(health.router, tags=["health"])
 api_router.include_router(items.router, prefix="/items", tags=["items"])
 api_router.include_router(tickers.router, prefix="/tickers", tags=["tickers"])
+api_router.include_router(watchlist.router, prefix="/watchlist", tags=["watchlist"])
+api_router.include_router(charts.router, prefix="/charts", tags=["charts"])
+api_router.include_router(quotes.router, prefix="/quotes", tags=["quotes"])
+api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
+api_router.include_router(screener.router, prefix="/screener", tags=["screener"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
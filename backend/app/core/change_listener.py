@@ -0,0 +1,189 @@
+"""
+Cross-process change notifications over Postgres LISTEN/NOTIFY.
+
+Ingestion publishes a ``TickerChange`` per ticker on ``CHANNEL`` inside the
+transaction that finishes the ticker's write: Postgres delivers it when
+(and only if) that transaction commits, so a listener never hears of data
+it cannot read yet. Every API worker holds one listener connection, outside
+the engine's pool, and invalidates the affected entries of its
+``ProcessCache``.
+
+While the listener is disconnected notifications are lost, so the cache is
+disabled until it reconnects, and cleared when it does.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.process_cache import ProcessCache, TickerChange, get_process_cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "ticker_changes"
+
+
+async def notify_ticker_change(
+    db: AsyncSession,
+    ticker: str,
+    start: date,
+    end: date,
+    adjusted_before: date | None = None,
+) -> None:
+    """
+    Publish a change of ``ticker``'s bars, delivered when ``db`` commits (caller commits).
+
+    Args:
+        db: Session of the transaction writing the change
+        ticker: Ticker symbol
+        start: First changed date
+        end: Last changed date
+        adjusted_before: Ex-date before which adjusted prices changed, if any
+    """
+    change = TickerChange(ticker, start, end, adjusted_before)
+    await db.execute(select(func.pg_notify(CHANNEL, change.payload())))
+
+
+def listener_dsn(database_url: str) -> str:
+    """Plain asyncpg DSN of a SQLAlchemy ``postgresql+asyncpg://`` URL."""
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def asyncpg_connect(dsn: str) -> Any:
+    import asyncpg
+
+    return await asyncpg.connect(dsn)
+
+
+@dataclass
+class ListenerStats:
+    connects: int = 0
+    disconnects: int = 0
+    notifications: int = 0
+    malformed: int = 0
+
+
+class ChangeListener:
+    """
+    Keeps one LISTEN connection open and applies notifications to ``cache``.
+
+    Reconnects with exponential backoff; a connection is checked every
+    ``keepalive_seconds`` so a silently dropped one is noticed too.
+
+    Usage:
+        listener = ChangeListener(listener_dsn(settings.DATABASE_URL), get_process_cache())
+        listener.start()
+        ...
+        await listener.aclose()
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        cache: ProcessCache,
+        channel: str = CHANNEL,
+        connect: Callable[[str], Awaitable[Any]] = asyncpg_connect,
+        retry_seconds: float = 1.0,
+        max_retry_seconds: float = 30.0,
+        keepalive_seconds: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.cache = cache
+        self.channel = channel
+        self.stats = ListenerStats()
+        self.connected = asyncio.Event()
+        self._connect = connect
+        self._retry_seconds = retry_seconds
+        self._max_retry_seconds = max_retry_seconds
+        self._keepalive_seconds = keepalive_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """asyncpg notification callback: invalidate what the change affects."""
+        self.stats.notifications += 1
+        try:
+            change = TickerChange.from_payload(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            # Unknown scope: nothing cached can be trusted
+            self.stats.malformed += 1
+            logger.warning("Malformed %s notification %r: %s", channel, payload, e)
+            self.cache.clear()
+            return
+        self.cache.invalidate(change)
+
+    async def _run(self) -> None:
+        delay = self._retry_seconds
+        while True:
+            connection = None
+            try:
+                connection = await self._connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _, lost=lost: lost.set())
+                await connection.add_listener(self.channel, self.on_notification)
+
+                # Changes committed while not listening were missed
+                self.cache.clear()
+                self.cache.enabled = True
+                self.connected.set()
+                self.stats.connects += 1
+                delay = self._retry_seconds
+
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), self._keepalive_seconds)
+                    except TimeoutError:
+                        await asyncio.wait_for(
+                            connection.execute("SELECT 1"), self._keepalive_seconds
+                        )
+                logger.warning("Change listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Change listener failed (%s), retry in %.0fs", e, delay)
+            finally:
+                if self.connected.is_set():
+                    self.stats.disconnects += 1
+                self.cache.enabled = False
+                self.connected.clear()
+                if connection is not None and not connection.is_closed():
+                    try:
+                        await connection.close(timeout=5)
+                    except Exception:
+                        connection.terminate()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_retry_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_change_listener() -> ChangeListener:
+    """This process's listener, feeding ``get_process_cache()``."""
+    return ChangeListener(listener_dsn(settings.DATABASE_URL), get_process_cache())
+
+
+async def close_change_listener() -> None:
+    if get_change_listener.cache_info().currsize:
+        await get_change_listener().aclose()
+        get_change_listener.cache_clear()
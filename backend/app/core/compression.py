@@ -0,0 +1,109 @@
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional: install the "brotli" extra to enable br encoding
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "image/svg+xml", "application/xml")
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick ``br`` or ``gzip`` from an Accept-Encoding header (q=0 means refused)."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    def accepted_quality(encoding: str) -> float:
+        return accepted.get(encoding, accepted.get("*", 0.0))
+
+    br, gzip_quality = accepted_quality("br"), accepted_quality("gzip")
+    if brotli is not None and br > 0 and br >= gzip_quality:
+        return "br"
+    if gzip_quality > 0:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress large responses with brotli (if installed) or gzip.
+
+    Like Starlette's GZipMiddleware, but negotiates brotli as well. Responses
+    below ``minimum_size``, already-encoded responses, partial (range)
+    responses and non-text content types are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        body_parts: list[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or message["status"] in (204, 206, 304)
+                    or "content-range" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.minimum_size:
+                if encoding == "br":
+                    body = brotli.compress(body)
+                else:
+                    body = gzip.compress(body, compresslevel=self.gzip_level)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
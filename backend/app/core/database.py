@@ -2,6 +2,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
+from app.core.query_monitor import get_query_monitor
 
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -9,6 +10,9 @@ engine = create_async_engine(
     future=True,
 )
 
+if settings.SLOW_QUERY_LOG:
+    get_query_monitor().install(engine)
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
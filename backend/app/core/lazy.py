@@ -0,0 +1,36 @@
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build module-level ``__getattr__``/``__dir__`` hooks (PEP 562) for a package.
+
+    Each exported name is imported from its module on first access and then
+    cached in the package namespace, so importing the package itself stays cheap.
+
+    Args:
+        package: ``__name__`` of the package installing the hooks
+        exports: Mapping of exported name to the module that defines it
+
+    Returns:
+        Tuple of ``(__getattr__, __dir__)`` to assign in the package
+    """
+    namespace = import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module_path = exports.get(name)
+        if module_path is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(import_module(module_path), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
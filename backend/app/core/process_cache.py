@@ -0,0 +1,210 @@
+"""
+Per-process cache of ticker reads, invalidated by ingestion notifications.
+
+Entries are tagged with the ticker and the date range they were read from
+(or no ticker, for reads spanning every ticker such as the ticker list or
+a screen). A ``TickerChange`` published by ingestion (see
+``change_listener``) drops exactly the entries it can affect: the ticker's
+entries overlapping the changed dates, its adjusted entries before a
+changed ex-date, and every cross-ticker entry. Entries otherwise live for
+``PROCESS_CACHE_TTL_SECONDS``.
+
+The cache only serves entries while ``enabled``, i.e. while this process's
+listener is connected: notifications sent while it is not are lost, so the
+cache is cleared on every (re)connect.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, TypeVar, cast
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class TickerChange:
+    """Daily bars of ``ticker`` changed from ``start`` to ``end`` (inclusive)."""
+
+    ticker: str
+    start: date
+    end: date
+    # Adjustment factors changed: adjusted prices before this ex-date changed too
+    adjusted_before: date | None = None
+
+    def affects(self, start: date | None, end: date | None, adjusted: bool = False) -> bool:
+        """Whether a read of ``start``..``end`` (None: unbounded) may have changed."""
+        if (start is None or start <= self.end) and (end is None or end >= self.start):
+            return True
+        return (
+            adjusted
+            and self.adjusted_before is not None
+            and (start is None or start < self.adjusted_before)
+        )
+
+    def payload(self) -> str:
+        return json.dumps(
+            {
+                "ticker": self.ticker,
+                "start": self.start.isoformat(),
+                "end": self.end.isoformat(),
+                "adjusted_before": self.adjusted_before and self.adjusted_before.isoformat(),
+            }
+        )
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "TickerChange":
+        data = json.loads(payload)
+        return cls(
+            ticker=data["ticker"],
+            start=date.fromisoformat(data["start"]),
+            end=date.fromisoformat(data["end"]),
+            adjusted_before=(
+                date.fromisoformat(data["adjusted_before"]) if data.get("adjusted_before") else None
+            ),
+        )
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    ticker: str | None
+    start: date | None
+    end: date | None
+    adjusted: bool
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    invalidated: int = 0  # Entries dropped by notifications
+    evicted: int = 0  # Entries dropped to stay under max_entries
+    changes: int = 0  # Notifications received
+    clears: int = 0
+
+
+class ProcessCache:
+    """
+    TTL cache of read results, invalidated per ticker and date range.
+
+    A load racing with a change is not stored: every change bumps the
+    version of its ticker (and of the cross-ticker entries), and a result
+    is only kept if that version did not move while it was being read.
+
+    Usage:
+        cache = get_process_cache()
+        rows = await cache.get_or_load(
+            ("history", ticker, start, end), load_rows, ticker=ticker, start=start, end=end
+        )
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = False
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._keys_by_ticker: dict[str | None, set[Hashable]] = {}
+        self._versions: dict[str | None, int] = {}
+        self._epoch = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _token(self, ticker: str | None) -> tuple[int, int]:
+        return self._epoch, self._versions.get(ticker, 0)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[T]],
+        ticker: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        adjusted: bool = False,
+    ) -> T:
+        """
+        Cached result of ``load``, loading (and caching) it on a miss.
+
+        Args:
+            key: Cache key (must identify the read, arguments included)
+            load: Reads the value
+            ticker: Ticker the value was read from (None: every ticker)
+            start: First date read (None: unbounded)
+            end: Last date read (None: unbounded)
+            adjusted: Whether the value includes adjusted prices
+        """
+        if not self.enabled:
+            return await load()
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > self._clock():
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return cast(T, entry.value)
+
+        self.stats.misses += 1
+        token = self._token(ticker)
+        value = await load()
+        if self.enabled and self._token(ticker) == token:
+            self._drop(key)
+            self._entries[key] = _Entry(
+                value, self._clock() + self.ttl_seconds, ticker, start, end, adjusted
+            )
+            self._keys_by_ticker.setdefault(ticker, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.stats.evicted += 1
+        return value
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_ticker[entry.ticker]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_ticker[entry.ticker]
+
+    def invalidate(self, change: TickerChange) -> int:
+        """Drop the entries ``change`` can affect; returns how many were dropped."""
+        self.stats.changes += 1
+        for ticker in (change.ticker, None):
+            self._versions[ticker] = self._versions.get(ticker, 0) + 1
+        stale = list(self._keys_by_ticker.get(None, ()))
+        for key in self._keys_by_ticker.get(change.ticker, ()):
+            entry = self._entries[key]
+            if change.affects(entry.start, entry.end, entry.adjusted):
+                stale.append(key)
+        for key in stale:
+            self._drop(key)
+        self.stats.invalidated += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_ticker.clear()
+        self._epoch += 1
+        self.stats.clears += 1
+
+
+@lru_cache(maxsize=1)
+def get_process_cache() -> ProcessCache:
+    """This process's cache of ticker reads (enabled by its change listener)."""
+    return ProcessCache(
+        ttl_seconds=settings.PROCESS_CACHE_TTL_SECONDS,
+        max_entries=settings.PROCESS_CACHE_MAX_ENTRIES,
+    )
@@ -0,0 +1,282 @@
+"""
+Slow-query capture for the database engine.
+
+Cursor execution events time every statement. A statement slower than
+``SLOW_QUERY_THRESHOLD_MS`` is recorded under its fingerprint (the SQL with
+literals and bind parameters replaced by ``?``), with the parameters of its
+latest slow run. For a sample (``SLOW_QUERY_EXPLAIN_SAMPLE_RATE``) of slow
+SELECTs, ``EXPLAIN (ANALYZE, BUFFERS)`` is run in the background on a
+separate connection, inside a transaction that is rolled back, and the plan
+kept with the fingerprint. Rolling back does not undo everything: reads that
+call functions with effects outside the transaction (advisory locks,
+``pg_notify``, sequences, ...) or lock rows are only planned, with a plain
+``EXPLAIN``.
+
+Stats are per process: each uvicorn worker reports the statements it ran.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Longest parameter text kept per statement (multi-row inserts can be huge)
+MAX_PARAMETERS_CHARS = 1000
+
+_PLACEHOLDERS = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):[A-Za-z_]\w*|\?")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+_EXPLAINABLE = ("SELECT", "WITH")
+
+# Not undone by rolling back, or not worth running again: planned without ANALYZE
+_SIDE_EFFECTS = re.compile(
+    r"\b(?:pg_(?:try_)?advisory_\w+|pg_notify|nextval|setval|pg_sleep\w*|set_config"
+    r"|pg_cancel_backend|pg_terminate_backend|pg_logical_emit_message|dblink\w*|lo_\w+)\s*\("
+    r"|\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b",
+    re.IGNORECASE,
+)
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalized form of a statement, the same for every run of the same query.
+
+    Literals and bind parameters become ``?``, lists of them (``IN`` lists,
+    ``VALUES`` rows) ``(...)``, and whitespace is collapsed.
+    """
+    text = _PLACEHOLDERS.sub("?", statement)
+    text = _LITERALS.sub("?", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    text = _LISTS.sub("(...)", text)
+    return _ROWS.sub("(...)", text)
+
+
+def analyzable(statement: str) -> bool:
+    """
+    Whether ``EXPLAIN ANALYZE`` may run ``statement`` again.
+
+    Not when it calls functions whose effects outlive a rollback (advisory
+    locks, notifications, sequences, ...) or locks rows (``FOR UPDATE``).
+    """
+    return _SIDE_EFFECTS.search(statement) is None
+
+
+def _parameters_text(parameters: Any) -> str:
+    text = repr(parameters)
+    if len(text) > MAX_PARAMETERS_CHARS:
+        text = text[:MAX_PARAMETERS_CHARS] + "..."
+    return text
+
+
+@dataclass
+class QueryStats:
+    """Slow runs of one statement fingerprint."""
+
+    fingerprint: str
+    query_id: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    last_seen: datetime | None = None
+    statement: str = ""  # SQL of the latest slow run
+    parameters: str = ""  # Its parameters (truncated repr)
+    plan: Any = None  # Latest sampled EXPLAIN (ANALYZE, BUFFERS) plan, as JSON
+    plan_analyzed: bool = False  # False: planned only, the statement was not run
+    plan_captured_at: datetime | None = None
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "query_id": self.query_id,
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "mean_ms": self.mean_ms,
+            "max_ms": self.max_ms,
+            "last_ms": self.last_ms,
+            "last_seen": self.last_seen,
+            "statement": self.statement,
+            "parameters": self.parameters,
+            "plan": self.plan,
+            "plan_analyzed": self.plan_analyzed,
+            "plan_captured_at": self.plan_captured_at,
+        }
+
+
+class SlowQueryMonitor:
+    """
+    Records statements over ``threshold_ms`` per fingerprint, sampling plans.
+
+    Usage:
+        monitor = SlowQueryMonitor(threshold_ms=200, explain_sample_rate=0.1)
+        monitor.install(engine)
+        ...
+        monitor.top(10)
+    """
+
+    ORDERINGS = ("total_ms", "max_ms", "mean_ms", "count")
+
+    def __init__(
+        self,
+        threshold_ms: float = 200.0,
+        explain_sample_rate: float = 0.1,
+        max_fingerprints: int = 500,
+        clock: Callable[[], float] = time.perf_counter,
+        sample: Callable[[], float] = random.random,
+    ):
+        if threshold_ms < 0 or not 0 <= explain_sample_rate <= 1 or max_fingerprints < 1:
+            raise ValueError(
+                f"Invalid slow query settings: {threshold_ms=}, {explain_sample_rate=}, "
+                f"{max_fingerprints=}"
+            )
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.max_fingerprints = max_fingerprints
+        self.stats: dict[str, QueryStats] = {}
+        self.explains = 0
+        self._clock = clock
+        self._sample = sample
+        self._engine: Any = None
+        self._explaining = False
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def install(self, engine: Any) -> None:
+        """Time the statements of ``engine`` (an ``AsyncEngine`` or a sync ``Engine``)."""
+        self._engine = engine
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_monitor_started", []).append(self._clock())
+
+    def _after_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        started = conn.info["query_monitor_started"].pop()
+        elapsed_ms = (self._clock() - started) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+        # The monitor's own EXPLAINs are not recorded
+        if context is not None and not context.execution_options.get("query_monitor", True):
+            return
+        stats = self.record(statement, parameters, elapsed_ms)
+        if not executemany and self._should_explain(statement):
+            self._schedule_explain(stats, statement, parameters)
+
+    def record(self, statement: str, parameters: Any, elapsed_ms: float) -> QueryStats:
+        """Add a slow run of ``statement`` to its fingerprint's stats."""
+        key = fingerprint(statement)
+        stats = self.stats.get(key)
+        if stats is None:
+            if len(self.stats) >= self.max_fingerprints:
+                # Make room by forgetting the fingerprint that cost the least
+                del self.stats[min(self.stats.values(), key=lambda s: s.total_ms).fingerprint]
+            query_id = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+            stats = self.stats[key] = QueryStats(fingerprint=key, query_id=query_id)
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.last_ms = elapsed_ms
+        stats.last_seen = datetime.now(timezone.utc)
+        stats.statement = statement
+        stats.parameters = _parameters_text(parameters)
+        return stats
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> list[QueryStats]:
+        """The ``limit`` worst fingerprints by ``order_by`` (one of ``ORDERINGS``)."""
+        if order_by not in self.ORDERINGS:
+            raise ValueError(f"order_by must be one of {', '.join(self.ORDERINGS)}")
+        ranked = sorted(self.stats.values(), key=lambda s: getattr(s, order_by), reverse=True)
+        return ranked[:limit]
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+    def _should_explain(self, statement: str) -> bool:
+        # ANALYZE executes the statement: only reads are explained, one at a time
+        # (see ``analyzable`` for those only planned)
+        return (
+            not self._explaining
+            and hasattr(self._engine, "sync_engine")
+            and statement.lstrip().upper().startswith(_EXPLAINABLE)
+            and self._sample() < self.explain_sample_rate
+        )
+
+    def _schedule_explain(self, stats: QueryStats, statement: str, parameters: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._explaining = True
+        task = loop.create_task(self.explain(stats, statement, parameters))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def explain(self, stats: QueryStats, statement: str, parameters: Any) -> None:
+        """Capture the plan of ``statement`` on a separate connection into ``stats``."""
+        analyze = analyzable(statement)
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        try:
+            async with self._engine.connect() as conn:
+                conn = await conn.execution_options(query_monitor=False)
+                result = await conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters)
+                plan = result.scalar()
+                # EXPLAIN ANALYZE ran the statement: leave nothing behind
+                await conn.rollback()
+        except Exception as e:
+            logger.warning("EXPLAIN of slow query %s failed: %s", stats.query_id, e)
+            return
+        finally:
+            self._explaining = False
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        stats.plan = plan[0] if isinstance(plan, list) and plan else plan
+        stats.plan_analyzed = analyze
+        stats.plan_captured_at = datetime.now(timezone.utc)
+        self.explains += 1
+
+
+@lru_cache(maxsize=1)
+def get_query_monitor() -> SlowQueryMonitor:
+    """Process-wide monitor of the application's engine."""
+    return SlowQueryMonitor(
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    )
@@ -0,0 +1,44 @@
+"""
+Fast JSON encoding for read-heavy endpoints.
+
+Large reads skip the ``response_model`` round trip (ORM object -> Pydantic
+validation -> JSON-compatible dict -> ``json.dumps``) and encode plain row
+tuples with orjson instead. Endpoints keep their ``response_model`` so the
+OpenAPI schema is unchanged; the encoded body matches what Pydantic would
+produce for the same rows.
+"""
+
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+# Pydantic renders UTC datetimes with a "Z" suffix; keep the output identical
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def encode_rows(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> bytes:
+    """
+    Encode row tuples as a JSON array of objects keyed by ``columns``.
+
+    Values must already be JSON-native (str, int, float, bool, None) or
+    date/datetime; cast ``Numeric`` columns to float in SQL rather than
+    converting ``Decimal`` values per row in Python.
+    """
+    return orjson.dumps(
+        [dict(zip(columns, row, strict=True)) for row in rows], option=_ORJSON_OPTIONS
+    )
+
+
+def rows_response(
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """JSON response for ``rows`` (see ``encode_rows``)."""
+    return Response(
+        content=encode_rows(columns, rows),
+        media_type="application/json",
+        headers=dict(headers) if headers else None,
+    )
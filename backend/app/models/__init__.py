@@ -1,4 +1,27 @@
+from app.models.closed_session import ClosedSession
+from app.models.indicator_snapshot import IndicatorSnapshot
+from app.models.intraday_bar import IntradayBar
 from app.models.item import Item
+from app.models.news_article import NewsArticle
+from app.models.news_sentiment import NewsSentimentDaily
+from app.models.pending_raw_backfill import PendingRawBackfill
+from app.models.price_adjustment import PriceAdjustment
+from app.models.quarantined_bar import QuarantinedBar
+from app.models.ticker_bar import TickerBar
 from app.models.ticker_history import TickerHistory
+from app.models.weekly_report_snapshot import WeeklyReportSnapshot
 
-__all__ = ["Item", "TickerHistory"]
+__all__ = [
+    "ClosedSession",
+    "IndicatorSnapshot",
+    "IntradayBar",
+    "Item",
+    "NewsArticle",
+    "NewsSentimentDaily",
+    "PendingRawBackfill",
+    "PriceAdjustment",
+    "QuarantinedBar",
+    "TickerBar",
+    "TickerHistory",
+    "WeeklyReportSnapshot",
+]
@@ -0,0 +1,26 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class ClosedSession(Base):
+    """
+    Calendar session a ticker has no bar for at the provider.
+
+    An exchange holiday missing from ``trading_calendars``, or a trading
+    halt. Recorded when an incremental refresh requested the session and
+    got nothing back, so later refreshes count it as present instead of
+    requesting it again (see ``ticker_service._missing_sessions``).
+    """
+
+    __tablename__ = "closed_sessions"
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    recorded_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
@@ -0,0 +1,53 @@
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Float, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class IndicatorSnapshot(Base):
+    """
+    Latest indicator values per ticker, the screener's only data source.
+
+    Refreshed from (adjusted) ticker_history whenever a ticker's daily bars
+    change; sector/region/name come from ``stock_watchlist.yaml``.
+    """
+
+    __tablename__ = "indicator_snapshots"
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    as_of: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # Watchlist metadata (NULL for symbols outside the watchlist)
+    name: Mapped[str | None] = mapped_column(String(100))
+    sector: Mapped[str | None] = mapped_column(String(50))
+    region: Mapped[str | None] = mapped_column(String(50))
+    market_cap: Mapped[float | None] = mapped_column(Float)
+
+    close: Mapped[float] = mapped_column(Float, nullable=False)
+    volume: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    change_1d: Mapped[float | None] = mapped_column(Float)
+    ma5: Mapped[float | None] = mapped_column(Float)
+    ma20: Mapped[float | None] = mapped_column(Float)
+    ma60: Mapped[float | None] = mapped_column(Float)
+    rsi14: Mapped[float | None] = mapped_column(Float)
+    macd: Mapped[float | None] = mapped_column(Float)
+    macd_signal: Mapped[float | None] = mapped_column(Float)
+    macd_hist: Mapped[float | None] = mapped_column(Float)
+    bb_upper: Mapped[float | None] = mapped_column(Float)
+    bb_lower: Mapped[float | None] = mapped_column(Float)
+    volatility: Mapped[float | None] = mapped_column(Float)
+    high_52w: Mapped[float | None] = mapped_column(Float)
+    low_52w: Mapped[float | None] = mapped_column(Float)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        Index("idx_indicator_snapshot_sector", "sector"),
+        Index("idx_indicator_snapshot_region", "region"),
+        Index("idx_indicator_snapshot_rsi14", "rsi14"),
+    )
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class IntradayBar(Base):
+    """
+    Intraday OHLCV bar (1m, 5m or 1h), stored apart from daily ticker_history.
+
+    Kept lean for row volume: natural primary key instead of a surrogate id,
+    double precision prices and no audit columns. Every period is stored in
+    exactly one interval tier; retention rolls old bars into coarser tiers.
+    """
+
+    __tablename__ = "intraday_bars"
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    interval: Mapped[str] = mapped_column(String(4), primary_key=True)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+
+    open: Mapped[float] = mapped_column(Float, nullable=False)
+    high: Mapped[float] = mapped_column(Float, nullable=False)
+    low: Mapped[float] = mapped_column(Float, nullable=False)
+    close: Mapped[float] = mapped_column(Float, nullable=False)
+    volume: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        # Retention scans by time across tickers; BRIN stays tiny on append-only data
+        Index("idx_intraday_bars_timestamp", "timestamp", postgresql_using="brin"),
+    )
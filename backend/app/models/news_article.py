@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, Index, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class NewsArticle(Base):
+    """
+    News article ingested for a ticker by the sentiment pipeline.
+
+    Every article is kept (to skip it on later runs and to count syndication),
+    but only the first copy of a story is scored: a near-duplicate of an
+    earlier article (see ``sentiment_service``) points at it through
+    ``duplicate_of`` and carries its score.
+    """
+
+    __tablename__ = "news_articles"
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    article_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    published_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    title: Mapped[str] = mapped_column(Text, nullable=False)
+    publisher: Mapped[str | None] = mapped_column(String(100))
+    url: Mapped[str | None] = mapped_column(Text)
+
+    # MinHash of the word shingles of the title and summary
+    signature: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), nullable=False)
+    duplicate_of: Mapped[str | None] = mapped_column(String(64))
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    model: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("idx_news_article_ticker_published", "ticker", "published_at"),)
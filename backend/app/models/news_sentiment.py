@@ -0,0 +1,32 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class NewsSentimentDaily(Base):
+    """
+    News sentiment per ticker and (UTC) publication day.
+
+    Aggregated from ``news_articles``: ``articles`` counts every copy of a
+    story, the score columns only the unique ones. Days touched by an ingest
+    run are recomputed by it (see ``sentiment_service.refresh_daily_sentiment``).
+    """
+
+    __tablename__ = "news_sentiment_daily"
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    articles: Mapped[int] = mapped_column(Integer, nullable=False)
+    unique_articles: Mapped[int] = mapped_column(Integer, nullable=False)
+    score_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    sentiment: Mapped[float] = mapped_column(Float, nullable=False)  # Mean of unique articles
+    positive: Mapped[int] = mapped_column(Integer, nullable=False)
+    negative: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class PendingRawBackfill(Base):
+    """
+    Ticker whose stored history predates raw prices (revision 004).
+
+    Its rows were stored split- and dividend-adjusted by the provider and are
+    flagged ``provider_adjusted``. The next refresh of the ticker downloads
+    its whole period, which rewrites those rows raw, and then drops the
+    marker (see ``ticker_service.fetch_and_store_ticker_data``).
+    """
+
+    __tablename__ = "pending_raw_backfills"
+
+    ticker: Mapped[str] = mapped_column(String(20), primary_key=True)
+    recorded_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
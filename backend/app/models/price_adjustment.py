@@ -0,0 +1,37 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class PriceAdjustment(Base):
+    """
+    Cumulative split/dividend adjustment factors, one row per corporate action.
+
+    A row's factors apply to every ticker_history day before its ``ex_date``
+    and on or after the previous action's ``ex_date``; days on or after the
+    latest action are unadjusted (factor 1).
+    """
+
+    __tablename__ = "price_adjustments"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    ticker: Mapped[str] = mapped_column(String(20), nullable=False)
+    ex_date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # The action itself, as stored in ticker_history on ex_date
+    dividend: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
+    split_ratio: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
+
+    # Product over this and every later action
+    price_factor: Mapped[float] = mapped_column(Numeric(precision=30, scale=15), nullable=False)
+    volume_factor: Mapped[float] = mapped_column(Numeric(precision=30, scale=15), nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (Index("idx_price_adjustment_ex_date", "ticker", "ex_date", unique=True),)
@@ -0,0 +1,34 @@
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Date, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class QuarantinedBar(Base):
+    """
+    Downloaded daily bar rejected by data-quality validation.
+
+    Keeps the provider's values and the failed checks for inspection; the bar
+    is not written to ticker_history. A later download of the same date that
+    validates replaces the row (see ``data_quality.quarantine_bars``).
+    """
+
+    __tablename__ = "quarantined_bars"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    ticker: Mapped[str] = mapped_column(String(20), nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+    reasons: Mapped[list[str]] = mapped_column(ARRAY(String(32)), nullable=False)
+    # Provider values as downloaded (non-finite numbers as null)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    quarantined_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (Index("idx_quarantined_bar_ticker_date", "ticker", "date"),)
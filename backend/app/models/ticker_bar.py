@@ -0,0 +1,43 @@
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Index, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class TickerBar(Base):
+    """
+    Weekly/monthly bar of a completed period, resampled from ticker_history.
+
+    Only completed periods are stored; the still-open bar is always computed
+    from daily rows. Rows are deleted when daily bars in their period change,
+    adjusted rows also when a later corporate action changes their factors.
+    """
+
+    __tablename__ = "ticker_bars"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    ticker: Mapped[str] = mapped_column(String(20), nullable=False)
+    interval: Mapped[str] = mapped_column(String(8), nullable=False)
+    # Resampled from split/dividend-adjusted daily prices
+    adjusted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    period_end: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # OHLCV aggregated over the period's trading days
+    open: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
+    high: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
+    low: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
+    close: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
+    volume: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    trading_days: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "idx_ticker_bar_period", "ticker", "interval", "adjusted", "period_start", unique=True
+        ),
+    )
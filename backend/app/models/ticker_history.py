@@ -1,6 +1,17 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Float, Index, Integer, Numeric, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    false,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -19,7 +30,7 @@ class TickerHistory(Base):
     high: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
     low: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
     close: Mapped[float] = mapped_column(Numeric(precision=20, scale=6), nullable=False)
-    volume: Mapped[int] = mapped_column(Integer, nullable=False)
+    volume: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     # Optional fields
     dividends: Mapped[float | None] = mapped_column(
@@ -29,14 +40,20 @@ class TickerHistory(Base):
         Numeric(precision=20, scale=6), nullable=True, default=0
     )
 
+    # Stored split/dividend-adjusted by the provider (before revision 004); adjusted
+    # reads leave these rows as they are, and the next full download rewrites them raw
+    provider_adjusted: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=false())
+
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Indexed: max(updated_at) over all tickers validates the ticker list
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True
     )
 
     __table_args__ = (
-        Index("idx_ticker_date", "ticker", "date", unique=True),
+        # Includes updated_at: the per-ticker history validator is an index-only scan
+        Index("idx_ticker_date", "ticker", "date", unique=True, postgresql_include=["updated_at"]),
     )
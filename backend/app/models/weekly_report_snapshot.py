@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class WeeklyReportSnapshot(Base):
+    """
+    Weekly report document per ticker or portfolio and ISO week.
+
+    Written once per week by the research workflow (see
+    ``report_snapshot_service.save_snapshots``) so the report API serves a
+    report with a single primary key lookup. The primary key order also
+    serves listing a subject's weeks, newest first.
+    """
+
+    __tablename__ = "weekly_report_snapshots"
+
+    kind: Mapped[str] = mapped_column(String(10), primary_key=True)  # "ticker" or "portfolio"
+    subject: Mapped[str] = mapped_column(String(50), primary_key=True)  # Ticker or portfolio name
+    week: Mapped[str] = mapped_column(String(8), primary_key=True)  # ISO week, e.g. "2026-W42"
+
+    # Document schema version (SNAPSHOT_VERSION when written)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    run_id: Mapped[str] = mapped_column(String(100), nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    document: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
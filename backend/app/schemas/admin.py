@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class SlowQuery(BaseModel):
+    query_id: str
+    fingerprint: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    last_ms: float
+    last_seen: datetime | None = None
+    statement: str
+    parameters: str
+    plan: Any = None
+    plan_analyzed: bool = False
+    plan_captured_at: datetime | None = None
+
+
+class SlowQueriesResponse(BaseModel):
+    threshold_ms: float
+    explain_sample_rate: float
+    fingerprints: int
+    explains: int
+    queries: list[SlowQuery]
@@ -0,0 +1,21 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class Bar(BaseModel):
+    period_start: date
+    period_end: date
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    trading_days: int
+    complete: bool
+
+
+class TickerBarsResponse(BaseModel):
+    ticker: str
+    interval: str
+    bars: list[Bar]
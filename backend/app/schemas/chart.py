@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class ChartResponse(BaseModel):
+    ticker: str
+    key: str
+    url: str
+    lookback: int
+    panels: list[str]
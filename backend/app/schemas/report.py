@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class ReportSnapshot(BaseModel):
+    kind: str
+    subject: str
+    week: str
+    version: int
+    run_id: str
+    fingerprint: str
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    document: dict[str, Any]
+
+
+class ReportWeek(BaseModel):
+    week: str
+    version: int
+    run_id: str
+    fingerprint: str
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+class ReportWeeksResponse(BaseModel):
+    kind: str
+    subject: str
+    weeks: list[ReportWeek]
+
+
+class ReportChange(BaseModel):
+    path: str
+    change: str
+    base: Any = None
+    other: Any = None
+    delta: float | None = None
+
+
+class ReportDiffResponse(BaseModel):
+    kind: str
+    subject: str
+    base_week: str
+    week: str
+    base_version: int
+    version: int
+    changes: list[ReportChange]
@@ -0,0 +1,35 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class ScreenerRow(BaseModel):
+    ticker: str
+    as_of: date
+    name: str | None = None
+    sector: str | None = None
+    region: str | None = None
+    market_cap: float | None = None
+    close: float
+    volume: int
+    change_1d: float | None = None
+    ma5: float | None = None
+    ma20: float | None = None
+    ma60: float | None = None
+    rsi14: float | None = None
+    macd: float | None = None
+    macd_signal: float | None = None
+    macd_hist: float | None = None
+    bb_upper: float | None = None
+    bb_lower: float | None = None
+    volatility: float | None = None
+    high_52w: float | None = None
+    low_52w: float | None = None
+
+
+class ScreenerResponse(BaseModel):
+    filter: str
+    sort: str
+    count: int
+    oldest_as_of: date | None = None
+    results: list[ScreenerRow]
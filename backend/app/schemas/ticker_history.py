@@ -27,9 +27,36 @@ class TickerHistory(TickerHistoryBase):
     updated_at: datetime
 
 
+class IntradayBar(BaseModel):
+    ticker: str
+    interval: str
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+
+
 class TickerDataFetchRequest(BaseModel):
     tickers: list[str] | None = None
     period: str = "1y"
+    full_refresh: bool = False
+
+
+class DataQualityGap(BaseModel):
+    after: date
+    before: date
+    missing_days: int
+
+
+class DataQualityReport(BaseModel):
+    ticker: str
+    rows: int
+    clean: int
+    quarantined: dict[str, int]
+    extreme_moves: list[date]
+    gaps: list[DataQualityGap]
 
 
 class TickerDataFetchResponse(BaseModel):
@@ -37,6 +64,12 @@ class TickerDataFetchResponse(BaseModel):
     message: str
     records_created: int
     records_updated: int
+    records_quarantined: int = 0
+    tickers_up_to_date: int = 0
+    sessions_missing: int = 0
+    sessions_unfilled: int = 0
+    tickers_shared: int = 0
+    quality: dict[str, DataQualityReport] = {}
 
 
 class TickerInfo(BaseModel):
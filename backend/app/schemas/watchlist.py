@@ -0,0 +1,35 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class WatchlistStockInfo(BaseModel):
+    symbol: str
+    name: str
+    sector: str
+    region: str
+    market_cap: float | None = None
+
+
+class WatchlistResponse(BaseModel):
+    stocks: list[WatchlistStockInfo]
+    sectors: dict[str, list[str]]
+    regions: dict[str, list[str]]
+
+
+class GroupAggregate(BaseModel):
+    group: str
+    members: int
+    members_with_data: int
+    equal_weighted_return: float | None = None
+    cap_weighted_return: float | None = None
+    advancers: int
+    decliners: int
+    breadth: float | None = None
+
+
+class WatchlistAggregatesResponse(BaseModel):
+    lookback_days: int
+    start_date: date
+    sectors: list[GroupAggregate]
+    regions: list[GroupAggregate]
@@ -0,0 +1,188 @@
+"""
+Split/dividend adjustment factors for raw daily prices.
+
+``ticker_history`` stores raw prices plus each day's dividend and split.
+``price_adjustments`` holds one row per corporate action with the cumulative
+factors (product over that and every later action) for the days before its
+ex-date. Ingestion refreshes the rows from the latest changed action
+backwards; reads join the factors and multiply in SQL (``adjusted_column``).
+
+Factors follow the usual convention: a split of ratio ``r`` scales earlier
+prices by ``1/r`` and volumes by ``r``; a dividend ``d`` scales earlier prices
+by ``1 - d / previous_close``. Rows still stored adjusted by the provider
+(``provider_adjusted``, from before raw storage) are read as they are.
+"""
+
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, Float, and_, case, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.price_adjustment import PriceAdjustment
+from app.models.ticker_history import TickerHistory
+
+
+def split_multipliers(splits: list[float]) -> list[float]:
+    """
+    Per-row factors that undo split adjustment of a provider series (oldest first).
+
+    Yahoo Finance delivers prices split-adjusted as of the download, i.e.
+    divided by every split after the row's date. Multiplying prices (and
+    dividends) by the returned factor, and dividing volumes by it, restores
+    the raw values, which stay stable across re-downloads.
+    """
+    multipliers = [1.0] * len(splits)
+    running = 1.0
+    for i in range(len(splits) - 1, -1, -1):
+        multipliers[i] = running
+        if splits[i]:
+            running *= splits[i]
+    return multipliers
+
+
+def compute_adjustments(
+    actions: list[tuple[date, float, float, float | None]],
+) -> list[dict[str, Any]]:
+    """
+    Cumulative factors for (ex_date, dividend, split_ratio, previous_close) actions.
+
+    Walks the actions from the newest backwards, so each row's factors are the
+    product over that action and every later one.
+    """
+    rows: list[dict[str, Any]] = []
+    price_factor = volume_factor = 1.0
+    for ex_date, dividend, split_ratio, previous_close in sorted(actions, reverse=True):
+        if split_ratio:
+            price_factor /= split_ratio
+            volume_factor *= split_ratio
+        if dividend and previous_close:
+            price_factor *= max(1.0 - dividend / previous_close, 0.0)
+        rows.append(
+            {
+                "ex_date": ex_date,
+                "dividend": dividend or 0.0,
+                "split_ratio": split_ratio or 0.0,
+                "price_factor": price_factor,
+                "volume_factor": volume_factor,
+            }
+        )
+    rows.reverse()
+    return rows
+
+
+async def refresh_adjustments(db: AsyncSession, ticker: str, first_changed: date) -> date | None:
+    """
+    Recompute adjustment factors after ticker_history changed from ``first_changed`` on.
+
+    Only actions on or after ``first_changed`` (new, corrected or removed, or
+    whose previous close changed) can alter factors, and only rows up to the
+    latest such action are rewritten. The caller commits.
+
+    Returns:
+        The latest affected ex-date, or None when no factors changed
+    """
+    has_action = or_(TickerHistory.dividends > 0, TickerHistory.stock_splits > 0)
+    stored_latest = await db.scalar(
+        select(func.max(PriceAdjustment.ex_date)).where(
+            PriceAdjustment.ticker == ticker, PriceAdjustment.ex_date >= first_changed
+        )
+    )
+    history_latest = await db.scalar(
+        select(func.max(TickerHistory.date)).where(
+            TickerHistory.ticker == ticker, TickerHistory.date >= first_changed, has_action
+        )
+    )
+    affected = [d for d in (stored_latest, history_latest) if d is not None]
+    if not affected:
+        return None
+    since = max(affected)
+
+    ranked = (
+        select(
+            TickerHistory.date,
+            TickerHistory.dividends,
+            TickerHistory.stock_splits,
+            func.lag(TickerHistory.close).over(order_by=TickerHistory.date).label("previous_close"),
+        )
+        .where(TickerHistory.ticker == ticker)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            ranked.c.date,
+            ranked.c.dividends.cast(Float),
+            ranked.c.stock_splits.cast(Float),
+            ranked.c.previous_close.cast(Float),
+        ).where(or_(ranked.c.dividends > 0, ranked.c.stock_splits > 0))
+    )
+    rows = [
+        row for row in compute_adjustments(list(result.tuples().all())) if row["ex_date"] <= since
+    ]
+
+    await db.execute(
+        delete(PriceAdjustment).where(
+            PriceAdjustment.ticker == ticker, PriceAdjustment.ex_date <= since
+        )
+    )
+    if rows:
+        await db.execute(
+            insert(PriceAdjustment).values([{"ticker": ticker, **row} for row in rows])
+        )
+    return since
+
+
+def adjustment_factors(tickers: list[str]) -> Any:
+    """
+    Factor ranges for ``tickers``: ``[start_date, end_date)`` with their factors.
+
+    ``start_date`` is NULL for a ticker's earliest action (open-ended).
+    """
+    return (
+        select(
+            PriceAdjustment.ticker,
+            func.lag(PriceAdjustment.ex_date)
+            .over(partition_by=PriceAdjustment.ticker, order_by=PriceAdjustment.ex_date)
+            .label("start_date"),
+            PriceAdjustment.ex_date.label("end_date"),
+            PriceAdjustment.price_factor,
+            PriceAdjustment.volume_factor,
+        )
+        .where(PriceAdjustment.ticker.in_(tickers))
+        .subquery()
+    )
+
+
+def join_adjustments(query: Any, factors: Any) -> Any:
+    """Outer-join the factor range covering each ticker_history row onto ``query``."""
+    return query.outerjoin(
+        factors,
+        and_(
+            factors.c.ticker == TickerHistory.ticker,
+            factors.c.end_date > TickerHistory.date,
+            or_(factors.c.start_date.is_(None), factors.c.start_date <= TickerHistory.date),
+        ),
+    )
+
+
+def adjusted_column(name: str, factors: Any) -> Any:
+    """
+    Adjusted ticker_history column (prices by the price factor, volume by the volume factor).
+
+    Rows flagged ``provider_adjusted`` are already adjusted and get factor 1.
+    """
+    column = getattr(TickerHistory, name)
+    factor = factors.c.volume_factor if name == "volume" else factors.c.price_factor
+    factor = case((TickerHistory.provider_adjusted, 1), else_=func.coalesce(factor, 1))
+    if name == "volume":
+        return func.round(column * factor).cast(BigInteger)
+    return (column * factor).cast(Float)
+
+
+async def get_adjustments_validator(db: AsyncSession, ticker: str) -> datetime | None:
+    """Latest ``updated_at`` of a ticker's adjustment factors (None if it has none)."""
+    last_modified: datetime | None = await db.scalar(
+        select(func.max(PriceAdjustment.updated_at)).where(PriceAdjustment.ticker == ticker)
+    )
+    return last_modified
@@ -0,0 +1,244 @@
+"""
+Weekly and monthly OHLCV bars resampled from daily ticker_history rows.
+
+Bars of completed periods are cached in ``ticker_bars``; a request only
+resamples the daily rows after the last cached period (normally just the
+still-open week or month). The cache always holds a contiguous prefix of a
+ticker's bars: ingestion deletes every cached bar from the first changed
+day onwards (see ``invalidate_bars``). Bars resampled from adjusted prices
+are cached separately and also dropped when a new corporate action changes
+the factors of earlier days.
+"""
+
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Float, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ticker_bar import TickerBar
+from app.models.ticker_history import TickerHistory
+from app.services.adjustment_service import adjusted_column, adjustment_factors, join_adjustments
+from app.services.market_calendar import MONDAY, exchange_for
+
+SUPPORTED_INTERVALS = ("1w", "1mo")
+
+_OHLC = ("open", "high", "low", "close")
+
+_INSERT_CHUNK = 1000
+
+
+def period_bounds(day: date, interval: str, week_start: int = MONDAY) -> tuple[date, date]:
+    """
+    First and last calendar day of the period containing ``day``.
+
+    Weeks start on ``week_start`` (``date.weekday()`` numbering), so a
+    Sunday-Thursday market gets Sunday-Saturday weeks.
+    """
+    if interval == "1w":
+        start = day - timedelta(days=(day.weekday() - week_start) % 7)
+        return start, start + timedelta(days=6)
+    if interval == "1mo":
+        last_day = calendar.monthrange(day.year, day.month)[1]
+        return day.replace(day=1), day.replace(day=last_day)
+    raise ValueError(f"Unsupported interval: {interval}")
+
+
+def resample_bars(
+    rows: list[tuple[date, float, float, float, float, int]],
+    interval: str,
+    week_start: int = MONDAY,
+) -> list[dict[str, Any]]:
+    """
+    Aggregate daily (date, open, high, low, close, volume) rows, oldest first.
+
+    Each bar takes the first open, highest high, lowest low, last close and
+    summed volume of its period in a single pass over the rows.
+    """
+    bars: list[dict[str, Any]] = []
+    current: dict[str, Any] | None = None
+    for day, open_, high, low, close, volume in rows:
+        if current is None or day > current["period_end"]:
+            start, end = period_bounds(day, interval, week_start)
+            current = {
+                "period_start": start,
+                "period_end": end,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+                "trading_days": 1,
+            }
+            bars.append(current)
+        else:
+            current["high"] = max(current["high"], high)
+            current["low"] = min(current["low"], low)
+            current["close"] = close
+            current["volume"] += volume
+            current["trading_days"] += 1
+    return bars
+
+
+async def invalidate_bars(
+    db: AsyncSession, ticker: str, since: date, adjusted_only: bool = False
+) -> None:
+    """
+    Drop cached bars whose prices may change (caller commits).
+
+    Args:
+        db: Database session
+        ticker: Ticker symbol
+        since: First changed day: drops bars of every period ending on or
+            after it; with ``adjusted_only``, an ex-date whose factors changed:
+            drops adjusted bars of every period starting before it
+        adjusted_only: Only drop bars resampled from adjusted prices
+    """
+    query = delete(TickerBar).where(TickerBar.ticker == ticker)
+    if adjusted_only:
+        query = query.where(TickerBar.adjusted.is_(True), TickerBar.period_start < since)
+    else:
+        query = query.where(TickerBar.period_end >= since)
+    await db.execute(query)
+
+
+async def _refresh_bars(
+    db: AsyncSession, ticker: str, interval: str, adjusted: bool, today: date | None
+) -> dict[str, Any] | None:
+    """
+    Resample daily rows after the last cached period and cache completed bars.
+
+    Returns:
+        The still-open bar, if any
+    """
+    exchange = exchange_for(ticker)
+    today = today or exchange.today()
+
+    last_end = await db.scalar(
+        select(func.max(TickerBar.period_end)).where(
+            TickerBar.ticker == ticker,
+            TickerBar.interval == interval,
+            TickerBar.adjusted.is_(adjusted),
+        )
+    )
+    if adjusted:
+        factors = adjustment_factors([ticker])
+        query = join_adjustments(
+            select(
+                TickerHistory.date,
+                *(adjusted_column(name, factors) for name in (*_OHLC, "volume")),
+            ).select_from(TickerHistory),
+            factors,
+        )
+    else:
+        query = select(
+            TickerHistory.date,
+            *(cast(getattr(TickerHistory, name), Float) for name in _OHLC),
+            TickerHistory.volume,
+        )
+    query = query.where(TickerHistory.ticker == ticker)
+    if last_end is not None:
+        query = query.where(TickerHistory.date > last_end)
+    result = await db.execute(query.order_by(TickerHistory.date))
+    bars = resample_bars(list(result.tuples().all()), interval, exchange.week_start)
+
+    open_bar = bars.pop() if bars and bars[-1]["period_end"] >= today else None
+    if bars:
+        # Chunked to stay under the driver's bind parameter limit on long histories
+        for i in range(0, len(bars), _INSERT_CHUNK):
+            stmt = insert(TickerBar).values(
+                [
+                    {"ticker": ticker, "interval": interval, "adjusted": adjusted, **bar}
+                    for bar in bars[i : i + _INSERT_CHUNK]
+                ]
+            )
+            await db.execute(stmt.on_conflict_do_nothing())
+        await db.commit()
+    return open_bar
+
+
+async def get_bars(
+    db: AsyncSession,
+    ticker: str,
+    interval: str,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    limit: int = 100,
+    adjusted: bool = False,
+    today: date | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Retrieve weekly or monthly bars for a ticker.
+
+    Args:
+        db: Database session
+        ticker: Ticker symbol
+        interval: ``1w`` or ``1mo``
+        start_date: Optional filter; bars ending before it are excluded
+        end_date: Optional filter; bars starting after it are excluded
+        limit: Maximum number of bars to return
+        adjusted: Resample split/dividend-adjusted daily prices
+        today: Exchange-local current date (defaults to now on the exchange)
+
+    Returns:
+        List of bar dictionaries, newest first; ``complete`` is False for
+        the still-open period
+    """
+    if interval not in SUPPORTED_INTERVALS:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    open_bar = await _refresh_bars(db, ticker, interval, adjusted, today)
+
+    def in_range(period_start: date, period_end: date) -> bool:
+        return (start_date is None or period_end >= start_date.date()) and (
+            end_date is None or period_start <= end_date.date()
+        )
+
+    bars: list[dict[str, Any]] = []
+    if open_bar is not None and in_range(open_bar["period_start"], open_bar["period_end"]):
+        bars.append({**open_bar, "complete": False})
+
+    query = select(
+        TickerBar.period_start,
+        TickerBar.period_end,
+        *(cast(getattr(TickerBar, name), Float) for name in _OHLC),
+        TickerBar.volume,
+        TickerBar.trading_days,
+    ).where(
+        TickerBar.ticker == ticker,
+        TickerBar.interval == interval,
+        TickerBar.adjusted.is_(adjusted),
+    )
+    if start_date:
+        query = query.where(TickerBar.period_end >= start_date.date())
+    if end_date:
+        query = query.where(TickerBar.period_start <= end_date.date())
+    query = query.order_by(TickerBar.period_start.desc()).limit(limit - len(bars))
+
+    result = await db.execute(query)
+    keys = ("period_start", "period_end", *_OHLC, "volume", "trading_days")
+    bars.extend({**dict(zip(keys, row, strict=True)), "complete": True} for row in result)
+    return bars
+
+
+async def get_bars_batch(
+    db: AsyncSession,
+    tickers: list[str],
+    interval: str,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    limit: int = 100,
+    adjusted: bool = False,
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Retrieve bars for several tickers (see ``get_bars``).
+
+    Returns:
+        Bars per ticker, in request order; tickers without data map to ``[]``
+    """
+    return {
+        ticker: await get_bars(db, ticker, interval, start_date, end_date, limit, adjusted)
+        for ticker in tickers
+    }
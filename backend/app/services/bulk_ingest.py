@@ -0,0 +1,297 @@
+"""
+Sharded bulk ingestion of daily history, for backfills of large universes.
+
+The symbols are split round-robin into one shard per worker process. Each
+worker runs its own event loop, database engine (connection pool) and
+provider governor holding its share of the upstream rate limit, and ingests
+its shard with ``fetch_and_store_ticker_data``, a few symbols at a time.
+
+Progress is checkpointed as JSON lines, one file per worker, under
+``<WORKFLOW_CHECKPOINT_DIR>/ingest/<run_id>/``: a line is appended and
+fsynced as each symbol finishes. A rerun with the same run id (by default
+derived from the universe and period) only ingests symbols that did not
+finish, so a killed run resumes where it stopped.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from functools import partial
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+
+# Checkpoint statuses that count as finished (not retried on resume)
+FINISHED = ("done", "no_data")
+
+_NO_DATA = "No data available"
+
+
+@dataclass
+class IngestSummary:
+    total: int
+    resumed: int = 0  # Finished by earlier runs
+    done: int = 0
+    no_data: int = 0
+    failed: int = 0
+    records: int = 0
+    quarantined: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def remaining(self) -> int:
+        return self.total - self.resumed - self.done - self.no_data
+
+    @property
+    def symbols_per_second(self) -> float:
+        finished = self.done + self.no_data + self.failed
+        return finished / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.records / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def eta_seconds(self) -> float | None:
+        if not self.symbols_per_second:
+            return None
+        return max(self.remaining - self.failed, 0) / self.symbols_per_second
+
+
+def default_run_id(symbols: list[str], period: str) -> str:
+    """Run id identifying a universe and period, so rerunning the same backfill resumes it."""
+    digest = hashlib.sha256("\n".join(sorted(set(symbols))).encode("utf-8")).hexdigest()
+    return f"{period}-{digest[:12]}"
+
+
+def shard(symbols: list[str], workers: int) -> list[list[str]]:
+    """Round-robin split into at most ``workers`` non-empty shards."""
+    return [part for part in (symbols[i::workers] for i in range(workers)) if part]
+
+
+class IngestCheckpoint:
+    """Append-only JSON-lines checkpoint of a run, one file per worker."""
+
+    def __init__(self, run_dir: Path | str):
+        self.run_dir = Path(run_dir)
+
+    def record(self, worker: int, entry: dict[str, Any]) -> None:
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.run_dir / f"worker-{worker}.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Latest entry per ticker (a line cut short by a killed worker is ignored)."""
+        latest: dict[str, dict[str, Any]] = {}
+        for path in sorted(self.run_dir.glob("worker-*.jsonl")):
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                previous = latest.get(entry["ticker"])
+                if previous is None or entry["finished_at"] >= previous["finished_at"]:
+                    latest[entry["ticker"]] = entry
+        return latest
+
+    def remaining(self, symbols: list[str]) -> list[str]:
+        entries = self.entries()
+        return [s for s in symbols if entries.get(s, {}).get("status") not in FINISHED]
+
+    def clear(self) -> None:
+        for path in self.run_dir.glob("worker-*.jsonl"):
+            path.unlink()
+
+    def summary(self, symbols: list[str], started_at: float) -> IngestSummary:
+        """Progress of the run that started at ``started_at`` (``time.time()``)."""
+        entries = self.entries()
+        summary = IngestSummary(total=len(symbols))
+        for symbol in symbols:
+            entry = entries.get(symbol)
+            if entry is None:
+                continue
+            if entry["finished_at"] < started_at:
+                summary.resumed += entry["status"] in FINISHED
+                continue
+            if entry["status"] == "done":
+                summary.done += 1
+            elif entry["status"] == "no_data":
+                summary.no_data += 1
+            else:
+                summary.failed += 1
+            summary.records += entry.get("records", 0)
+            summary.quarantined += entry.get("quarantined", 0)
+        summary.elapsed_seconds = time.time() - started_at
+        return summary
+
+
+async def ingest_shard(
+    checkpoint: IngestCheckpoint,
+    worker: int,
+    symbols: list[str],
+    period: str,
+    concurrency: int,
+    session_factory: Callable[[], Any],
+    ingest: Callable[..., Awaitable[dict[str, Any]]] | None = None,
+) -> None:
+    """
+    Ingest a shard, ``concurrency`` symbols at a time, checkpointing each one.
+
+    Args:
+        checkpoint: Run checkpoint
+        worker: Worker index (selects the checkpoint file)
+        symbols: Symbols of the shard
+        period: yfinance period to fetch
+        concurrency: Symbols in flight at once (one session each)
+        session_factory: Async session factory of the worker's engine
+        ingest: Ingestion function (defaults to ``fetch_and_store_ticker_data``)
+    """
+    if ingest is None:
+        from app.services.ticker_service import fetch_and_store_ticker_data
+
+        ingest = fetch_and_store_ticker_data
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def ingest_one(symbol: str) -> None:
+        async with semaphore:
+            entry: dict[str, Any] = {"ticker": symbol}
+            started = time.perf_counter()
+            try:
+                async with session_factory() as db:
+                    # A backfill downloads the whole period, not just missing sessions
+                    result = await ingest(db, tickers=[symbol], period=period, full_refresh=True)
+                if result["success"]:
+                    entry["status"] = "done"
+                elif all(error.endswith(_NO_DATA) for error in result["errors"]):
+                    entry["status"] = "no_data"
+                else:
+                    entry["status"] = "failed"
+                    entry["error"] = "; ".join(result["errors"])
+                entry["records"] = result["records_created"] + result["records_updated"]
+                entry["quarantined"] = result.get("records_quarantined", 0)
+            except Exception as e:
+                entry.update(status="failed", error=f"{type(e).__name__}: {e}")
+            entry["seconds"] = round(time.perf_counter() - started, 3)
+            entry["finished_at"] = time.time()
+            await asyncio.to_thread(checkpoint.record, worker, entry)
+
+    await asyncio.gather(*(ingest_one(symbol) for symbol in symbols))
+
+
+def run_shard(
+    run_dir: str, worker: int, symbols: list[str], period: str, concurrency: int, workers: int
+) -> None:
+    """Worker process entry point: own event loop, engine and governor share."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from app.services.ingest_writer import IngestWriter
+    from app.services.provider_governor import configure_governor, governor_policy
+    from app.services.ticker_service import fetch_and_store_ticker_data
+
+    # The workers together stay within the configured upstream rate
+    policy = governor_policy()
+    configure_governor(
+        "yahoo",
+        replace(
+            policy,
+            rate_per_second=policy.rate_per_second / workers,
+            burst=max(1, policy.burst // workers),
+        ),
+    )
+
+    async def main() -> None:
+        # One connection per symbol in flight, plus one for the writer
+        engine = create_async_engine(
+            settings.DATABASE_URL, pool_size=concurrency + 1, max_overflow=0
+        )
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        ingest = fetch_and_store_ticker_data
+        writer = None
+        if settings.INGEST_GROUP_COMMIT:
+            # The worker's symbols in flight share group-committed bar writes
+            writer = IngestWriter(
+                session_factory,
+                max_rows=settings.INGEST_WRITER_MAX_ROWS,
+                max_delay=settings.INGEST_WRITER_MAX_DELAY,
+            )
+            ingest = partial(fetch_and_store_ticker_data, writer=writer)
+        try:
+            await ingest_shard(
+                IngestCheckpoint(run_dir),
+                worker,
+                symbols,
+                period,
+                concurrency,
+                session_factory,
+                ingest,
+            )
+        finally:
+            if writer is not None:
+                await writer.aclose()
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def run_bulk_ingest(
+    symbols: list[str],
+    period: str,
+    workers: int,
+    concurrency: int = 2,
+    run_id: str | None = None,
+    restart: bool = False,
+    progress_interval: float = 10.0,
+    on_progress: Callable[[IngestSummary], None] | None = None,
+) -> tuple[str, IngestSummary]:
+    """
+    Ingest ``symbols`` across ``workers`` processes, resuming a previous run.
+
+    Args:
+        symbols: Symbol universe
+        period: yfinance period to fetch
+        workers: Worker processes
+        concurrency: Symbols in flight per worker
+        run_id: Checkpoint run id (defaults to ``default_run_id``)
+        restart: Discard the run's checkpoint and ingest everything again
+        progress_interval: Seconds between ``on_progress`` calls
+        on_progress: Called with the run's summary while it is running
+
+    Returns:
+        Tuple of (run id, final summary)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    run_id = run_id or default_run_id(symbols, period)
+    checkpoint = IngestCheckpoint(Path(settings.WORKFLOW_CHECKPOINT_DIR) / "ingest" / run_id)
+    if restart:
+        checkpoint.clear()
+
+    started_at = time.time()
+    shards = shard(checkpoint.remaining(symbols), workers)
+    if shards:
+        # Spawned, not forked: no event loop or pooled connection leaks into a worker
+        with ProcessPoolExecutor(len(shards), mp_context=get_context("spawn")) as pool:
+            futures = [
+                pool.submit(
+                    run_shard, str(checkpoint.run_dir), i, part, period, concurrency, len(shards)
+                )
+                for i, part in enumerate(shards)
+            ]
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=progress_interval)
+                if on_progress is not None:
+                    on_progress(checkpoint.summary(symbols, started_at))
+            for future in futures:
+                future.result()
+
+    return run_id, checkpoint.summary(symbols, started_at)
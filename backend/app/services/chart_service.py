@@ -0,0 +1,280 @@
+"""
+Chart rendering with a content-addressed cache.
+
+Charts are SVG documents (price with MA/Bollinger overlays, RSI and MACD
+panels) stored under ``CHART_OUTPUT_DIR/<key>.svg``, where the key hashes the
+input bars together with the chart spec. The same data and spec therefore
+always map to the same file, which the API, the report builder and browsers
+can all cache forever. Rendering is CPU-bound and runs in a process pool.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.ticker_history import TickerHistory
+from app.services.indicators import bollinger, macd, rsi, sma
+
+# Bump when the SVG output changes so cached charts are re-rendered
+RENDERER_VERSION = 1
+
+# Extra bars fed to the indicators ahead of the visible window (MA60 warm-up)
+WARMUP_BARS = 60
+
+SUPPORTED_PANELS = ("price", "rsi", "macd")
+
+_PALETTE = ["#2563eb", "#f59e0b", "#10b981", "#8b5cf6", "#ef4444"]
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    ticker: str
+    lookback: int = 90  # Visible bars
+    panels: tuple[str, ...] = SUPPORTED_PANELS
+    overlays: tuple[str, ...] = ("MA20", "MA60", "BOLLINGER")
+    width: int = 900
+    height: int = 600
+
+
+def chart_input(bars: list[dict[str, Any]], spec: ChartSpec) -> list[dict[str, Any]]:
+    """The slice of ``bars`` (oldest first) a chart for ``spec`` depends on."""
+    return bars[-(spec.lookback + WARMUP_BARS) :]
+
+
+def chart_key(bars: list[dict[str, Any]], spec: ChartSpec) -> str:
+    """Cache key of a chart: hash of its input bars, its spec and the renderer version."""
+    payload = json.dumps(
+        {
+            "renderer": RENDERER_VERSION,
+            "spec": asdict(spec),
+            "bars": [[bar["date"], bar["close"]] for bar in chart_input(bars, spec)],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _polyline(
+    values: list[float | None], x_of: Any, y_of: Any, color: str, width: float = 1.5
+) -> str:
+    segments: list[list[str]] = [[]]
+    for i, value in enumerate(values):
+        if value is None:
+            if segments[-1]:
+                segments.append([])
+            continue
+        segments[-1].append(f"{x_of(i):.1f},{y_of(value):.1f}")
+    return "".join(
+        f'<polyline fill="none" stroke="{color}" stroke-width="{width}" points="{" ".join(points)}"/>'
+        for points in segments
+        if len(points) > 1
+    )
+
+
+def render_chart_svg(spec: ChartSpec, bars: list[dict[str, Any]]) -> bytes:
+    """Render a chart for ``spec`` from bars (dicts with ``date`` and ``close``, oldest first)."""
+    bars = chart_input(bars, spec)
+    closes = [float(bar["close"]) for bar in bars]
+    visible = min(spec.lookback, len(closes))
+    start = len(closes) - visible
+
+    def window(series: list[float | None]) -> list[float | None]:
+        return series[start:]
+
+    panels = [panel for panel in spec.panels if panel in SUPPORTED_PANELS]
+    weights = {"price": 3, "rsi": 1, "macd": 1}
+    total_weight = sum(weights[panel] for panel in panels) or 1
+    margin_left, margin_right, gap = 60, 20, 24
+    plot_width = spec.width - margin_left - margin_right
+    usable_height = spec.height - 40 - gap * max(len(panels) - 1, 0)
+
+    def x_of(i: int) -> float:
+        return margin_left + (i / max(visible - 1, 1)) * plot_width
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{spec.width}" height="{spec.height}" '
+        f'viewBox="0 0 {spec.width} {spec.height}" font-family="sans-serif" font-size="11">',
+        f'<rect width="{spec.width}" height="{spec.height}" fill="#ffffff"/>',
+        f'<text x="{margin_left}" y="16" font-size="14" font-weight="bold">'
+        f"{escape(spec.ticker)}</text>",
+    ]
+    if bars:
+        parts.append(
+            f'<text x="{spec.width - margin_right}" y="16" text-anchor="end">'
+            f"{escape(str(bars[start]['date']))} – {escape(str(bars[-1]['date']))}</text>"
+        )
+
+    top = 28.0
+    for panel in panels:
+        height = usable_height * weights[panel] / total_weight
+        series: list[tuple[str, list[float | None], str]] = []
+        fixed_range: tuple[float, float] | None = None
+
+        if panel == "price":
+            series.append(("Close", window(list(closes)), "#111827"))
+            for n, overlay in enumerate(spec.overlays):
+                color = _PALETTE[n % len(_PALETTE)]
+                if overlay.startswith("MA") and overlay[2:].isdigit():
+                    series.append((overlay, window(sma(closes, int(overlay[2:]))), color))
+                elif overlay == "BOLLINGER":
+                    upper, _, lower = bollinger(closes)
+                    series.append(("BB upper", window(upper), color))
+                    series.append(("BB lower", window(lower), color))
+        elif panel == "rsi":
+            series.append(("RSI14", window(rsi(closes, 14)), "#8b5cf6"))
+            fixed_range = (0.0, 100.0)
+        elif panel == "macd":
+            line, signal_line, histogram = macd(closes)
+            series.append(("MACD", window(line), "#2563eb"))
+            series.append(("Signal", window(signal_line), "#f59e0b"))
+            series.append(("Hist", window(histogram), "#9ca3af"))
+
+        defined = [v for _, values, _ in series for v in values if v is not None]
+        low, high = fixed_range or ((min(defined), max(defined)) if defined else (0.0, 1.0))
+        if high == low:
+            high, low = high + 1, low - 1
+
+        def y_of(
+            value: float,
+            top: float = top,
+            height: float = height,
+            low: float = low,
+            high: float = high,
+        ) -> float:
+            return top + height - (value - low) / (high - low) * height
+
+        parts.append(
+            f'<rect x="{margin_left}" y="{top:.1f}" width="{plot_width}" height="{height:.1f}" '
+            f'fill="none" stroke="#e5e7eb"/>'
+        )
+        parts.append(
+            f'<text x="{margin_left - 6}" y="{top + 10:.1f}" text-anchor="end">{high:.2f}</text>'
+        )
+        parts.append(
+            f'<text x="{margin_left - 6}" y="{top + height:.1f}" text-anchor="end">{low:.2f}</text>'
+        )
+        if panel == "rsi":
+            for level in (30, 70):
+                parts.append(
+                    f'<line x1="{margin_left}" x2="{margin_left + plot_width}" y1="{y_of(level):.1f}" '
+                    f'y2="{y_of(level):.1f}" stroke="#d1d5db" stroke-dasharray="4 3"/>'
+                )
+        for n, (label, values, color) in enumerate(series):
+            parts.append(_polyline(values, x_of, y_of, color))
+            parts.append(
+                f'<text x="{margin_left + 6 + n * 70}" y="{top + 12:.1f}" fill="{color}">'
+                f"{escape(label)}</text>"
+            )
+        top += height + gap
+
+    parts.append("</svg>")
+    return "\n".join(parts).encode("utf-8")
+
+
+def render_chart_file(spec: ChartSpec, bars: list[dict[str, Any]], path: str) -> str:
+    """Render one chart to ``path`` atomically (runs in a worker process)."""
+    content = render_chart_svg(spec, bars)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ChartService:
+    """
+    Batched chart rendering into ``CHART_OUTPUT_DIR`` with a content-addressed cache.
+
+    Usage:
+        service = ChartService()
+        paths = service.render_batch([(ChartSpec("NVDA", lookback=90), bars)])
+    """
+
+    def __init__(self, output_dir: Path | str | None = None, executor: Executor | None = None):
+        self.output_dir = Path(output_dir or settings.CHART_OUTPUT_DIR)
+        self.executor = executor
+
+    def path_for(self, key: str) -> Path:
+        return self.output_dir / f"{key}.svg"
+
+    def render_batch(
+        self, jobs: list[tuple[ChartSpec, list[dict[str, Any]]]], max_workers: int | None = None
+    ) -> dict[str, Path]:
+        """
+        Render every chart not already cached, in parallel.
+
+        Args:
+            jobs: (spec, bars) pairs; bars are dicts with ``date`` and ``close``
+            max_workers: Process pool size when no executor was given
+
+        Returns:
+            Chart file path per chart key (cached and newly rendered)
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        paths: dict[str, Path] = {}
+        missing: dict[str, tuple[ChartSpec, list[dict[str, Any]]]] = {}
+        for spec, bars in jobs:
+            key = chart_key(bars, spec)
+            paths[key] = self.path_for(key)
+            if not paths[key].exists():
+                missing[key] = (spec, chart_input(bars, spec))
+
+        if missing:
+            executor = self.executor or ProcessPoolExecutor(max_workers=max_workers)
+            try:
+                futures = [
+                    executor.submit(render_chart_file, spec, bars, str(paths[key]))
+                    for key, (spec, bars) in missing.items()
+                ]
+                for future in futures:
+                    future.result()
+            finally:
+                if executor is not self.executor:
+                    executor.shutdown()
+
+        return paths
+
+    async def render(self, spec: ChartSpec, bars: list[dict[str, Any]]) -> tuple[str, Path]:
+        """Render (or reuse) a single chart without blocking the event loop."""
+        key = chart_key(bars, spec)
+        path = self.path_for(key)
+        if not path.exists():
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self.executor, render_chart_file, spec, chart_input(bars, spec), str(path)
+            )
+        return key, path
+
+
+@lru_cache(maxsize=1)
+def get_chart_service() -> ChartService:
+    """Shared chart service for the API, rendering in a process pool."""
+    return ChartService(executor=ProcessPoolExecutor(max_workers=settings.CHART_RENDER_WORKERS))
+
+
+async def load_chart_bars(db: AsyncSession, ticker: str, spec: ChartSpec) -> list[dict[str, Any]]:
+    """Load the bars a chart for ``spec`` needs (oldest first)."""
+    query = (
+        select(TickerHistory.date, TickerHistory.close)
+        .where(TickerHistory.ticker == ticker)
+        .order_by(TickerHistory.date.desc())
+        .limit(spec.lookback + WARMUP_BARS)
+    )
+    result = await db.execute(query)
+    return [
+        {"date": row.date.isoformat(), "close": float(row.close)} for row in reversed(result.all())
+    ]
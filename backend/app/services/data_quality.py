@@ -0,0 +1,229 @@
+"""
+Data-quality validation of downloaded daily bars.
+
+``validate_bars`` checks a whole provider DataFrame at once with array
+operations and splits it into clean rows, which are stored, and rejected
+rows, which go to ``quarantined_bars`` with their reasons. One bad bar
+therefore no longer fails (and rolls back) the whole ticker.
+
+Row checks (rejected): non-finite values, non-positive prices, high below
+low, open/close outside the high-low range, negative volume, duplicate dates
+(the last occurrence is kept) and one-day price spikes (a move beyond
+``max_daily_move`` that reverses the next day). Series checks (reported
+only): one-sided extreme moves, which are usually real, and calendar gaps of
+more than ``max_gap_days`` missing sessions (trading days that are not
+exchange holidays).
+"""
+
+import math
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config_loader
+from app.models.quarantined_bar import QuarantinedBar
+from app.services.market_calendar import MONDAY
+
+# Provider column -> stored payload key
+_PAYLOAD_COLUMNS = {
+    "Open": "open",
+    "High": "high",
+    "Low": "low",
+    "Close": "close",
+    "Volume": "volume",
+    "Dividends": "dividends",
+    "Stock Splits": "stock_splits",
+}
+
+
+@dataclass(frozen=True)
+class QualityPolicy:
+    max_daily_move: float = 0.5  # |close / previous close - 1| counted as an extreme move
+    max_gap_days: int = 4  # Missing trading days in a row before a gap is reported
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "QualityPolicy":
+        """Build the policy from the ``data_quality`` YAML section."""
+        policy = cls(
+            max_daily_move=float(config.get("max_daily_move", cls.max_daily_move)),
+            max_gap_days=int(config.get("max_gap_days", cls.max_gap_days)),
+        )
+        if policy.max_daily_move <= 0 or policy.max_gap_days < 0:
+            raise ValueError(f"Invalid data quality policy: {policy}")
+        return policy
+
+
+def quality_policy() -> QualityPolicy:
+    return QualityPolicy.from_config(config_loader.stock_watchlist.get("data_quality", {}))
+
+
+@dataclass
+class QualityReport:
+    """Per-ticker statistics of one validation run."""
+
+    ticker: str
+    rows: int = 0
+    clean: int = 0
+    quarantined: dict[str, int] = field(default_factory=dict)  # Rows per reason
+    extreme_moves: list[str] = field(default_factory=list)  # Kept rows, ISO dates
+    gaps: list[dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def extend(self, other: "QualityReport") -> None:
+        """Add the statistics of another validated frame of the same ticker."""
+        self.rows += other.rows
+        self.clean += other.clean
+        for reason, count in other.quarantined.items():
+            self.quarantined[reason] = self.quarantined.get(reason, 0) + count
+        self.extreme_moves.extend(other.extreme_moves)
+        self.gaps.extend(other.gaps)
+
+
+def _weekmask(week_start: int) -> str:
+    """numpy busday weekmask (Monday first) of a five-day week starting on ``week_start``."""
+    trading = {(week_start + i) % 7 for i in range(5)}
+    return "".join("1" if day in trading else "0" for day in range(7))
+
+
+def _spikes(close: np.ndarray, max_move: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split extreme close-to-close moves into one-day spikes and lasting moves.
+
+    Returns:
+        Tuple of boolean arrays over ``close``: spike rows, and rows reached by
+        an extreme move that is not part of a spike
+    """
+    n = len(close)
+    moves = close[1:] / close[:-1] - 1
+    extreme = np.abs(moves) > max_move
+    direction = np.sign(moves)
+
+    into = np.zeros(n, dtype=bool)
+    into[1:] = extreme
+    out = np.zeros(n, dtype=bool)
+    out[:-1] = extreme
+    sign_in = np.zeros(n)
+    sign_in[1:] = direction
+    sign_out = np.zeros(n)
+    sign_out[:-1] = direction
+
+    spike = into & out & (sign_in == -sign_out)
+    after_spike = np.zeros(n, dtype=bool)
+    after_spike[1:] = spike[:-1]
+    return spike, into & ~spike & ~after_spike
+
+
+def validate_bars(
+    ticker: str,
+    frame: pd.DataFrame,
+    policy: QualityPolicy | None = None,
+    week_start: int = MONDAY,
+    holidays: Sequence[date] = (),
+) -> tuple[np.ndarray, list[dict[str, Any]], QualityReport]:
+    """
+    Validate a provider DataFrame (Open/High/Low/Close/Volume, dated index, oldest first).
+
+    Args:
+        ticker: Ticker symbol (for the report)
+        frame: Bars as returned by yfinance ``Ticker.history``
+        policy: Thresholds (defaults to the ``data_quality`` config)
+        week_start: First trading day of the exchange's week, for gap detection
+        holidays: Exchange holidays, not counted as missing days
+
+    Returns:
+        Tuple of (clean row mask, rejected rows as dicts with date, reasons
+        and payload, QualityReport)
+    """
+    policy = policy or quality_policy()
+    prices = frame[["Open", "High", "Low", "Close"]].to_numpy(dtype=float)
+    volume = frame["Volume"].to_numpy(dtype=float)
+    open_, high, low, close = prices.T
+    days = np.asarray(frame.index.date)
+    report = QualityReport(ticker=ticker, rows=len(frame))
+
+    checks: dict[str, np.ndarray] = {
+        "non_finite": ~(np.isfinite(prices).all(axis=1) & np.isfinite(volume)),
+        "non_positive_price": (prices <= 0).any(axis=1),
+        "high_below_low": high < low,
+        "negative_volume": volume < 0,
+        "duplicate_date": pd.Index(days).duplicated(keep="last"),
+    }
+    tolerance = 1e-9 * np.abs(high)
+    checks["open_close_outside_range"] = ~checks["high_below_low"] & (
+        (np.maximum(open_, close) > high + tolerance) | (np.minimum(open_, close) < low - tolerance)
+    )
+
+    # Spikes and gaps are judged on the rows that passed the row checks
+    passed = ~np.logical_or.reduce(list(checks.values()))
+    positions = np.flatnonzero(passed)
+    spike, extreme = _spikes(close[positions], policy.max_daily_move)
+    checks["price_spike"] = np.zeros(len(frame), dtype=bool)
+    checks["price_spike"][positions[spike]] = True
+    clean = passed & ~checks["price_spike"]
+
+    report.extreme_moves = [day.isoformat() for day in days[positions[extreme]]]
+    clean_days = days[clean].astype("datetime64[D]")
+    if len(clean_days) > 1:
+        missing = np.busday_count(
+            clean_days[:-1] + np.timedelta64(1, "D"),
+            clean_days[1:],
+            weekmask=_weekmask(week_start),
+            holidays=np.array(holidays, dtype="datetime64[D]"),
+        )
+        report.gaps = [
+            {
+                "after": str(clean_days[i]),
+                "before": str(clean_days[i + 1]),
+                "missing_days": int(missing[i]),
+            }
+            for i in np.flatnonzero(missing > policy.max_gap_days)
+        ]
+
+    # Per-row reasons only for rejected rows (normally a handful)
+    names = list(checks)
+    matrix = np.column_stack([checks[name] for name in names])
+    payload_columns = [column for column in _PAYLOAD_COLUMNS if column in frame]
+    rejected: list[dict[str, Any]] = []
+    for i in np.flatnonzero(~clean):
+        reasons = [names[j] for j in np.flatnonzero(matrix[i])]
+        for reason in reasons:
+            report.quarantined[reason] = report.quarantined.get(reason, 0) + 1
+        payload = {}
+        for column in payload_columns:
+            value = float(frame[column].iloc[i])
+            # JSONB has no NaN/Infinity
+            payload[_PAYLOAD_COLUMNS[column]] = value if math.isfinite(value) else None
+        rejected.append({"date": days[i], "reasons": reasons, "payload": payload})
+
+    report.clean = int(clean.sum())
+    return clean, rejected, report
+
+
+async def quarantine_bars(
+    db: AsyncSession, ticker: str, rejected: list[dict[str, Any]], start: date, end: date
+) -> None:
+    """
+    Replace a ticker's quarantined rows between ``start`` and ``end`` (caller commits).
+
+    Rows quarantined by an earlier run that now validate are thereby released.
+    """
+    await db.execute(
+        delete(QuarantinedBar).where(
+            QuarantinedBar.ticker == ticker,
+            QuarantinedBar.date >= start,
+            QuarantinedBar.date <= end,
+        )
+    )
+    if rejected:
+        await db.execute(
+            insert(QuarantinedBar).values([{"ticker": ticker, **row} for row in rejected])
+        )
@@ -0,0 +1,333 @@
+"""
+Single-flight coordination of ticker fetches.
+
+Within a process, concurrent fetches of the same ticker and range share one
+provider download and upsert: the first caller runs it, later callers
+attach to the fetch in flight and get its result.
+
+Across processes (uvicorn workers, the CLI), each fetch holds a
+transaction-level Postgres advisory lock on its ticker. A caller finding the
+lock held waits for it, then only fetches the sessions still missing -
+usually none, as the holder has just stored them - instead of downloading
+and upserting the same bars again. Locks are taken on a small pool of their
+own (``FETCH_LOCK_POOL_SIZE`` connections), so holders and waiters never
+starve the requests and the group-commit writer of connections, and a wait -
+for a lock connection or for the lock itself - is bounded by
+``FETCH_LOCK_TIMEOUT``: past it the caller fetches without the lock.
+
+The whole-period downloads of the tickers a call starts flights for are
+made together before the flights run (see
+``ticker_service.prefetch_full_histories``), so a multi-ticker refresh over
+a multiplexing provider requests its symbols concurrently even though each
+ticker is ingested on its own.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# SQLSTATE of a lock wait cancelled by ``lock_timeout``
+LOCK_NOT_AVAILABLE = "55P03"
+
+_COUNTERS = (
+    "records_created",
+    "records_updated",
+    "records_quarantined",
+    "tickers_processed",
+    "tickers_up_to_date",
+    "sessions_missing",
+    "sessions_unfilled",
+)
+
+
+class SingleFlight(Generic[T]):
+    """
+    Runs one call per key at a time; callers of a key in flight share its outcome.
+
+    The call runs as its own task, so a caller that is cancelled does not
+    cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, asyncio.Task[T]] = {}
+
+    @property
+    def in_flight(self) -> set[Hashable]:
+        return set(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run ``fn`` for ``key``, or wait for the run already in flight.
+
+        Returns:
+            Tuple of (result, whether it was shared with an earlier caller)
+
+        Raises:
+            Exception: Whatever the (shared) call raised
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = asyncio.ensure_future(fn())
+            self._flights[key] = flight
+            flight.add_done_callback(partial(self._land, key))
+        return await asyncio.shield(flight), shared
+
+    def _land(self, key: Hashable, flight: asyncio.Task[T]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Retrieved here too, in case every caller was cancelled meanwhile
+            flight.exception()
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for ``name`` (same in every process)."""
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@asynccontextmanager
+async def advisory_xact_lock(
+    db: Any, key: int, timeout: float | None = None
+) -> AsyncIterator[bool]:
+    """
+    Hold a transaction-level advisory lock on ``key`` for the block.
+
+    The lock is released by ending ``db``'s transaction on exit, so ``db``
+    must be a session of its own.
+
+    Args:
+        db: Session to take the lock on
+        key: Advisory lock key (see ``advisory_lock_key``)
+        timeout: Seconds to wait for a lock held elsewhere, None for no limit;
+            past it the block runs without the lock
+
+    Yields:
+        Whether another session held the lock and had to be waited for
+
+    If ``db``'s pool has no connection free within its timeout, the block
+    runs without the lock too.
+    """
+    try:
+        acquired = await db.scalar(select(func.pg_try_advisory_xact_lock(key)))
+    except PoolTimeoutError:
+        logger.warning("No connection free for advisory lock %s, going on without it", key)
+        yield False
+        return
+    waited = not acquired
+    if waited:
+        if timeout is not None:
+            lock_timeout = f"{max(1, round(timeout * 1000))}ms"
+            await db.execute(select(func.set_config("lock_timeout", lock_timeout, True)))
+        try:
+            await db.execute(select(func.pg_advisory_xact_lock(key)))
+        except DBAPIError as exc:
+            if getattr(exc.orig, "sqlstate", None) != LOCK_NOT_AVAILABLE:
+                raise
+            logger.warning(
+                "Advisory lock %s still held after %ss, going on without it", key, timeout
+            )
+            await db.rollback()
+            waited = False
+    try:
+        yield waited
+    finally:
+        await db.rollback()
+
+
+@dataclass
+class CoordinatorStats:
+    fetches: int = 0  # Ticker fetches run by this process
+    shared: int = 0  # Callers attached to a fetch in flight
+    waited: int = 0  # Fetches that waited for another process's
+
+
+class FetchCoordinator:
+    """
+    Deduplicates concurrent ticker fetches in and across processes.
+
+    Advisory locks are held on sessions of ``lock_session_factory`` (default
+    ``session_factory``), and another process's lock is waited for at most
+    ``lock_timeout`` seconds (None: no limit). ``prefetch`` makes the
+    whole-period downloads of a call's tickers in one batch, passed on to
+    ``ingest`` as ``prefetched`` (default: ``prefetch_full_histories`` with
+    the default ``ingest``, none with another).
+
+    Usage:
+        result = await get_fetch_coordinator().fetch(["NVDA", "TSM"], period="1y")
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        ingest: Callable[..., Awaitable[dict[str, Any]]] | None = None,
+        advisory_locks: bool = True,
+        lock_session_factory: Callable[[], Any] | None = None,
+        lock_timeout: float | None = None,
+        prefetch: Callable[..., Awaitable[dict[str, Any]]] | None = None,
+    ):
+        if ingest is None:
+            from app.services.ticker_service import (
+                fetch_and_store_ticker_data,
+                prefetch_full_histories,
+            )
+
+            ingest = fetch_and_store_ticker_data
+            prefetch = prefetch or prefetch_full_histories
+
+        self.session_factory = session_factory
+        self.ingest: Callable[..., Awaitable[dict[str, Any]]] = ingest
+        self.advisory_locks = advisory_locks
+        self.lock_session_factory = lock_session_factory or session_factory
+        self.lock_timeout = lock_timeout
+        self.prefetch = prefetch
+        self.flights: SingleFlight[dict[str, Any]] = SingleFlight()
+        self.stats = CoordinatorStats()
+
+    async def fetch(
+        self,
+        tickers: list[str] | None = None,
+        period: str = "1y",
+        full_refresh: bool = False,
+        writer: Any = None,
+    ) -> dict[str, Any]:
+        """
+        Fetch and store tickers like ``fetch_and_store_ticker_data``, one flight per ticker.
+
+        The whole-period downloads of the tickers not already in flight are
+        prefetched together first, then each flight ingests its ticker.
+
+        Args:
+            tickers: List of ticker symbols (defaults to settings.TICKERS)
+            period: Data period (1d,5d,1mo,3mo,6mo,1y,2y,5y,10y,ytd,max)
+            full_refresh: Download the whole period even if bars are stored
+            writer: Group-commit writer for the bars (see ``ingest_writer``)
+
+        Returns:
+            The merged results of the tickers' fetches, as returned by
+            ``fetch_and_store_ticker_data``, plus ``tickers_shared``: tickers
+            whose result came from a fetch already in flight
+        """
+        if tickers is None:
+            tickers = settings.ticker_list
+        tickers = list(dict.fromkeys(tickers))
+
+        prefetched: dict[str, Any] = {}
+        if self.prefetch is not None:
+            in_flight = self.flights.in_flight
+            owned = [
+                ticker for ticker in tickers if (ticker, period, full_refresh) not in in_flight
+            ]
+            if len(owned) > 1:
+                async with self.session_factory() as db:
+                    prefetched = await self.prefetch(
+                        db, owned, period=period, full_refresh=full_refresh
+                    )
+
+        results = []
+        shared = 0
+        for ticker in tickers:
+            frame = prefetched.pop(ticker, None)
+            result, attached = await self.flights.do(
+                (ticker, period, full_refresh),
+                partial(self._fetch_ticker, ticker, period, full_refresh, writer, frame),
+            )
+            results.append(result)
+            shared += attached
+        self.stats.shared += shared
+        return merge_fetch_results(results, tickers_shared=shared)
+
+    async def _fetch_ticker(
+        self, ticker: str, period: str, full_refresh: bool, writer: Any, frame: Any = None
+    ) -> dict[str, Any]:
+        """Ingest one ticker, with its prefetched download ``frame`` if any."""
+        self.stats.fetches += 1
+        prefetched = {ticker: frame} if frame is not None else None
+        async with self.session_factory() as db:
+            if not self.advisory_locks:
+                return await self.ingest(
+                    db,
+                    tickers=[ticker],
+                    period=period,
+                    full_refresh=full_refresh,
+                    writer=writer,
+                    prefetched=prefetched,
+                )
+            key = advisory_lock_key(f"ticker_fetch:{ticker}")
+            async with (
+                self.lock_session_factory() as lock_db,
+                advisory_xact_lock(lock_db, key, self.lock_timeout) as waited,
+            ):
+                if waited:
+                    self.stats.waited += 1
+                return await self.ingest(
+                    db,
+                    tickers=[ticker],
+                    period=period,
+                    # Another process has just fetched the ticker: only what it left
+                    # missing, so the download made before the wait is dropped
+                    full_refresh=full_refresh and not waited,
+                    writer=writer,
+                    prefetched=None if waited else prefetched,
+                )
+
+
+def merge_fetch_results(results: list[dict[str, Any]], tickers_shared: int = 0) -> dict[str, Any]:
+    """Combine per-ticker ``fetch_and_store_ticker_data`` results into one."""
+    errors = [error for result in results for error in result["errors"]]
+    message = "Data fetched successfully"
+    if errors:
+        message = f"Completed with {len(errors)} error(s): {'; '.join(errors)}"
+
+    merged: dict[str, Any] = {"success": not errors, "message": message}
+    for counter in _COUNTERS:
+        merged[counter] = sum(result.get(counter, 0) for result in results)
+    merged["tickers_shared"] = tickers_shared
+    merged["errors"] = errors
+    merged["quality"] = {
+        ticker: report for result in results for ticker, report in result["quality"].items()
+    }
+    return merged
+
+
+@lru_cache(maxsize=1)
+def get_fetch_coordinator() -> FetchCoordinator:
+    """
+    Process-wide fetch coordinator over the application's engine.
+
+    Advisory locks are held on a bounded pool of their own engine, as a lock
+    lasts for the ticker's whole ingest; a fetch waits for a lock connection
+    at most ``FETCH_LOCK_TIMEOUT`` seconds.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.core.database import async_session_maker
+
+    lock_engine = create_async_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.FETCH_LOCK_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.FETCH_LOCK_TIMEOUT,
+    )
+    return FetchCoordinator(
+        async_session_maker,
+        advisory_locks=settings.FETCH_ADVISORY_LOCKS,
+        lock_session_factory=async_sessionmaker(lock_engine, expire_on_commit=False),
+        lock_timeout=settings.FETCH_LOCK_TIMEOUT,
+    )
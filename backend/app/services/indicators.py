@@ -0,0 +1,175 @@
+"""
+Technical indicators and risk metrics over plain price lists.
+
+Series functions return lists aligned with the input, with ``None`` where the
+indicator is not yet defined (warm-up period). They have no pandas/numpy
+dependency so that API workers can use them without the data stack.
+"""
+
+import math
+import re
+from collections.abc import Callable
+from typing import Any
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def sma(values: list[float], window: int) -> list[float | None]:
+    """Simple moving average."""
+    result: list[float | None] = [None] * len(values)
+    running = 0.0
+    for i, value in enumerate(values):
+        running += value
+        if i >= window:
+            running -= values[i - window]
+        if i >= window - 1:
+            result[i] = running / window
+    return result
+
+
+def ema(values: list[float], span: int) -> list[float | None]:
+    """Exponential moving average, seeded with the SMA of the first ``span`` values."""
+    result: list[float | None] = [None] * len(values)
+    if len(values) < span:
+        return result
+
+    alpha = 2 / (span + 1)
+    current = sum(values[:span]) / span
+    result[span - 1] = current
+    for i in range(span, len(values)):
+        current = alpha * values[i] + (1 - alpha) * current
+        result[i] = current
+    return result
+
+
+def rsi(values: list[float], period: int = 14) -> list[float | None]:
+    """Relative Strength Index with Wilder smoothing."""
+    result: list[float | None] = [None] * len(values)
+    if len(values) <= period:
+        return result
+
+    gains = losses = 0.0
+    for i in range(1, period + 1):
+        change = values[i] - values[i - 1]
+        gains += max(change, 0.0)
+        losses += max(-change, 0.0)
+    avg_gain, avg_loss = gains / period, losses / period
+
+    def to_rsi(gain: float, loss: float) -> float:
+        if loss == 0:
+            return 100.0 if gain > 0 else 50.0
+        return 100 - 100 / (1 + gain / loss)
+
+    result[period] = to_rsi(avg_gain, avg_loss)
+    for i in range(period + 1, len(values)):
+        change = values[i] - values[i - 1]
+        avg_gain = (avg_gain * (period - 1) + max(change, 0.0)) / period
+        avg_loss = (avg_loss * (period - 1) + max(-change, 0.0)) / period
+        result[i] = to_rsi(avg_gain, avg_loss)
+    return result
+
+
+def macd(
+    values: list[float], fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[list[float | None], list[float | None], list[float | None]]:
+    """MACD line, signal line and histogram."""
+    fast_ema, slow_ema = ema(values, fast), ema(values, slow)
+    line: list[float | None] = [
+        f - s if f is not None and s is not None else None
+        for f, s in zip(fast_ema, slow_ema, strict=True)
+    ]
+
+    defined = [value for value in line if value is not None]
+    offset = len(line) - len(defined)
+    padding: list[float | None] = [None] * offset
+    signal_line = padding + ema(defined, signal)
+    histogram: list[float | None] = [
+        m - s if m is not None and s is not None else None
+        for m, s in zip(line, signal_line, strict=True)
+    ]
+    return line, signal_line, histogram
+
+
+def bollinger(
+    values: list[float], window: int = 20, num_std: float = 2.0
+) -> tuple[list[float | None], list[float | None], list[float | None]]:
+    """Bollinger Bands (upper, middle, lower) using the population standard deviation."""
+    middle = sma(values, window)
+    upper: list[float | None] = [None] * len(values)
+    lower: list[float | None] = [None] * len(values)
+    for i, mean in enumerate(middle):
+        if mean is None:
+            continue
+        window_values = values[i - window + 1 : i + 1]
+        std = math.sqrt(sum((v - mean) ** 2 for v in window_values) / window)
+        upper[i] = mean + num_std * std
+        lower[i] = mean - num_std * std
+    return upper, middle, lower
+
+
+PERIOD_INDICATORS: dict[str, Callable[[list[float], int], list[float | None]]] = {
+    "MA": sma,
+    "EMA": ema,
+    "RSI": rsi,
+}
+
+
+def latest_indicators(closes: list[float], indicators: list[str]) -> dict[str, Any]:
+    """
+    Latest value of each configured indicator (names as in ``agent_config.yaml``).
+
+    Supports ``MA<n>``, ``EMA<n>``, ``RSI<n>``, ``MACD`` and ``BOLLINGER``;
+    unknown names are ignored.
+    """
+    result: dict[str, Any] = {}
+    for name in indicators:
+        if match := re.fullmatch(r"(MA|EMA|RSI)(\d+)", name):
+            kind, period = match.group(1), int(match.group(2))
+            series = PERIOD_INDICATORS[kind](closes, period)
+            result[name] = series[-1] if series else None
+        elif name == "MACD":
+            line, signal_line, histogram = macd(closes)
+            result[name] = {
+                "macd": line[-1] if line else None,
+                "signal": signal_line[-1] if signal_line else None,
+                "histogram": histogram[-1] if histogram else None,
+            }
+        elif name == "BOLLINGER":
+            upper, middle, lower = bollinger(closes)
+            result[name] = {
+                "upper": upper[-1] if upper else None,
+                "middle": middle[-1] if middle else None,
+                "lower": lower[-1] if lower else None,
+            }
+    return result
+
+
+def risk_metrics(closes: list[float]) -> dict[str, float | None]:
+    """
+    Basic risk statistics from a close series.
+
+    Returns annualized volatility, maximum drawdown (as a negative fraction)
+    and 1-day historical VaR at 95% (as a negative return).
+    """
+    returns = [b / a - 1 for a, b in zip(closes, closes[1:], strict=False) if a]
+    if len(returns) < 2:
+        return {"volatility": None, "max_drawdown": None, "var_95": None}
+
+    mean = sum(returns) / len(returns)
+    variance = sum((r - mean) ** 2 for r in returns) / (len(returns) - 1)
+
+    peak = closes[0]
+    max_drawdown = 0.0
+    for close in closes:
+        peak = max(peak, close)
+        if peak:
+            max_drawdown = min(max_drawdown, close / peak - 1)
+
+    ordered = sorted(returns)
+    var_95 = ordered[max(0, math.ceil(0.05 * len(ordered)) - 1)]
+
+    return {
+        "volatility": math.sqrt(variance) * math.sqrt(TRADING_DAYS_PER_YEAR),
+        "max_drawdown": max_drawdown,
+        "var_95": var_95,
+    }
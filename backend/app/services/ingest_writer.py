@@ -0,0 +1,299 @@
+"""
+Group-commit writer for daily bars.
+
+Concurrent producers (API fetches, the scheduler, ingestion workers) hand
+their bars to one in-process writer instead of upserting them in their own
+transactions. The writer merges the batches in a buffer keyed by
+``(ticker, date)`` - a later write of a bar replaces a buffered earlier one -
+and flushes the buffer as a few multi-row upserts in a single transaction
+once it holds ``max_rows`` bars or its oldest bar has waited ``max_delay``
+seconds. One commit (one WAL flush) then covers many producers' batches, and
+rows are written in key order, so concurrent flushes never deadlock on the
+``(ticker, date)`` unique index.
+
+Each batch gets a future that resolves with its ``WriteResult`` once the
+flush containing it has committed (or fails with the flush's error). The
+flush transaction also publishes each changed ticker's date range to the API
+workers' caches (see ``change_listener``), so a producer that fails after
+its bars were written cannot leave them stale.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import false, literal_column, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import settings
+from app.core.change_listener import notify_ticker_change
+from app.models.ticker_history import TickerHistory
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume", "dividends", "stock_splits")
+
+# Rows per INSERT statement: 10 parameters each, well within asyncpg's 32767
+CHUNK_ROWS = 2000
+
+
+def bar_upsert(rows: dict[str, Any] | list[dict[str, Any]]) -> Any:
+    """
+    Upsert of one row, or a list of rows, into ``ticker_history`` on ``(ticker, date)``.
+
+    Unchanged bars (and their ``updated_at``) are left alone so that HTTP
+    validators only change when the data does. A row stored adjusted by the
+    provider is always rewritten, and clears its ``provider_adjusted`` flag.
+    """
+    stmt = insert(TickerHistory).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["ticker", "date"],
+        set_={
+            **{column: getattr(stmt.excluded, column) for column in BAR_COLUMNS},
+            "provider_adjusted": false(),
+            "updated_at": stmt.excluded.updated_at,
+        },
+        where=or_(
+            TickerHistory.provider_adjusted,
+            tuple_(*(getattr(TickerHistory, c) for c in BAR_COLUMNS)).is_distinct_from(
+                tuple_(*(getattr(stmt.excluded, c) for c in BAR_COLUMNS))
+            ),
+        ),
+    )
+
+
+@dataclass
+class WriteResult:
+    """Outcome of one submitted batch."""
+
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    superseded: int = 0  # Replaced by a later batch's bar before the flush
+    # Earliest inserted or changed date per ticker (invalidates cached bars)
+    first_changed: dict[str, date] = field(default_factory=dict)
+
+
+@dataclass
+class WriterStats:
+    batches: int = 0
+    flushes: int = 0
+    rows_written: int = 0
+    rows_superseded: int = 0
+    largest_flush: int = 0
+    failed_flushes: int = 0
+
+
+@dataclass
+class _Batch:
+    future: asyncio.Future[WriteResult]
+    result: WriteResult
+
+
+class IngestWriter:
+    """
+    Buffers bar batches from many producers and commits them together.
+
+    Usage:
+        writer = get_ingest_writer()
+        result = await writer.write(rows)  # rows: ticker_history column dicts
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        max_rows: int = 5000,
+        max_delay: float = 0.05,
+    ):
+        if max_rows < 1 or max_delay < 0:
+            raise ValueError(f"Invalid ingest writer limits: {max_rows=}, {max_delay=}")
+        self.session_factory = session_factory
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.stats = WriterStats()
+        self._buffer: dict[tuple[str, date], tuple[dict[str, Any], _Batch]] = {}
+        self._batches: list[_Batch] = []
+        self._has_rows = asyncio.Event()
+        self._full = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def pending_rows(self) -> int:
+        return len(self._buffer)
+
+    def submit(self, rows: list[dict[str, Any]]) -> asyncio.Future[WriteResult]:
+        """
+        Add a batch to the buffer.
+
+        Args:
+            rows: ``ticker_history`` rows (column dicts, all with the same keys)
+
+        Returns:
+            Future resolving with the batch's ``WriteResult`` once it is committed
+        """
+        batch = _Batch(asyncio.get_running_loop().create_future(), WriteResult(rows=len(rows)))
+        self.stats.batches += 1
+        for row in rows:
+            key = (row["ticker"], row["date"])
+            previous = self._buffer.get(key)
+            if previous is not None:
+                previous[1].result.superseded += 1
+                self.stats.rows_superseded += 1
+            self._buffer[key] = (row, batch)
+        self._batches.append(batch)
+
+        self._has_rows.set()
+        if len(self._buffer) >= self.max_rows:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return batch.future
+
+    async def write(self, rows: list[dict[str, Any]]) -> WriteResult:
+        """
+        Submit a batch and wait until it is committed.
+
+        While the buffer is more than twice ``max_rows`` over (flushes falling
+        behind), producers wait for it to drain first.
+        """
+        while len(self._buffer) >= 2 * self.max_rows:
+            self._drained.clear()
+            await self._drained.wait()
+        return await self.submit(rows)
+
+    async def flush(self) -> None:
+        """Write out everything buffered now."""
+        async with self._flush_lock:
+            buffer, batches = self._buffer, self._batches
+            self._buffer, self._batches = {}, []
+            self._has_rows.clear()
+            self._full.clear()
+            self._drained.set()
+            if not batches:
+                return
+            try:
+                await self._write(buffer)
+            except Exception as e:
+                self.stats.failed_flushes += 1
+                logger.warning("Ingest flush of %d rows failed: %s", len(buffer), e)
+                if len(batches) == 1:
+                    _settle(batches[0], e)
+                    return
+                # One producer's bad row must not fail everyone's batch: retry
+                # each batch on its own
+                for batch in batches:
+                    rows = {key: entry for key, entry in buffer.items() if entry[1] is batch}
+                    try:
+                        await self._write(rows)
+                    except Exception as batch_error:
+                        _settle(batch, batch_error)
+                    else:
+                        _settle(batch)
+                return
+            for batch in batches:
+                _settle(batch)
+
+    async def aclose(self) -> None:
+        """Flush what is buffered and stop the background flusher."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._has_rows.wait()
+            deadline = loop.time() + self.max_delay
+            while not self._full.is_set() and (remaining := deadline - loop.time()) > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), remaining)
+                except TimeoutError:
+                    break
+            # Shielded: stopping the flusher must not abandon a flush midway
+            await asyncio.shield(self.flush())
+
+    async def _write(self, buffer: dict[tuple[str, date], tuple[dict[str, Any], _Batch]]) -> None:
+        if not buffer:
+            return
+        # Key order: concurrent flushes lock index entries in the same order
+        keys = sorted(buffer)
+        written: dict[tuple[str, date], bool] = {}
+        async with self.session_factory() as db:
+            try:
+                for start in range(0, len(keys), CHUNK_ROWS):
+                    rows = [buffer[key][0] for key in keys[start : start + CHUNK_ROWS]]
+                    stmt = bar_upsert(rows).returning(
+                        TickerHistory.ticker,
+                        TickerHistory.date,
+                        # xmax is 0 for a freshly inserted row version
+                        literal_column("xmax = 0").label("inserted"),
+                    )
+                    result = await db.execute(stmt)
+                    written.update(((ticker, day), inserted) for ticker, day, inserted in result)
+                # Delivered with the commit, together with the bars
+                changed: dict[str, tuple[date, date]] = {}
+                for ticker, day in written:
+                    first, last = changed.get(ticker, (day, day))
+                    changed[ticker] = (min(first, day), max(last, day))
+                for ticker, (first, last) in sorted(changed.items()):
+                    await notify_ticker_change(db, ticker, first, last)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+        self.stats.flushes += 1
+        self.stats.rows_written += len(keys)
+        self.stats.largest_flush = max(self.stats.largest_flush, len(keys))
+        for key in keys:
+            result = buffer[key][1].result
+            if key not in written:
+                result.unchanged += 1
+                continue
+            if written[key]:
+                result.created += 1
+            else:
+                result.updated += 1
+            ticker, day = key
+            result.first_changed[ticker] = min(result.first_changed.get(ticker, day), day)
+
+
+def _settle(batch: _Batch, error: BaseException | None = None) -> None:
+    # A producer may have stopped waiting (cancelled) meanwhile
+    if batch.future.done():
+        return
+    if error is None:
+        batch.future.set_result(batch.result)
+    else:
+        batch.future.set_exception(error)
+
+
+@lru_cache(maxsize=1)
+def get_ingest_writer() -> IngestWriter:
+    """Process-wide ingest writer over the application's engine."""
+    from app.core.database import async_session_maker
+
+    return IngestWriter(
+        async_session_maker,
+        max_rows=settings.INGEST_WRITER_MAX_ROWS,
+        max_delay=settings.INGEST_WRITER_MAX_DELAY,
+    )
+
+
+async def close_ingest_writer() -> None:
+    """Flush and stop the shared ingest writer, if it was created."""
+    if get_ingest_writer.cache_info().currsize:
+        await get_ingest_writer().aclose()
+        get_ingest_writer.cache_clear()
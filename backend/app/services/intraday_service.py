@@ -0,0 +1,388 @@
+"""
+Intraday bar tier: bulk ingestion, retention rollups and tiered reads.
+
+Intraday bars live in ``intraday_bars``, apart from daily ``ticker_history``.
+Downloads are bulk-loaded with ``COPY`` into a session-local staging table
+and merged with a single ``INSERT ... SELECT ... ON CONFLICT``. A retention
+policy (``intraday_config`` in the watchlist YAML) rolls bars older than a
+cutoff into the next coarser interval and deletes the finer rows, so every
+period is stored in exactly one tier. Reads aggregate across the tiers at or
+below the requested interval. Bucketing uses ``date_bin`` (PostgreSQL 14+)
+aligned to the exchange's session open.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, cast
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    Interval,
+    MetaData,
+    String,
+    Table,
+    delete,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config_loader, settings
+from app.models.intraday_bar import IntradayBar
+from app.services.market_calendar import exchange_for
+from app.services.market_data import history_fetcher
+from app.services.provider_governor import NoDataError, get_governor
+
+# Interval tiers, finest first
+INTRADAY_INTERVALS: dict[str, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "5m": timedelta(minutes=5),
+    "1h": timedelta(hours=1),
+}
+
+# Column order of intraday rows returned by ``get_intraday_rows``
+INTRADAY_COLUMNS = ("ticker", "interval", "timestamp", "open", "high", "low", "close", "volume")
+
+_BAR_VALUES = ("open", "high", "low", "close", "volume")
+
+# Session-local staging table for COPY (not part of the models' metadata)
+_staging = Table(
+    "intraday_bars_staging",
+    MetaData(),
+    Column("ticker", String(20)),
+    Column("interval", String(4)),
+    Column("timestamp", DateTime(timezone=True)),
+    Column("open", Float),
+    Column("high", Float),
+    Column("low", Float),
+    Column("close", Float),
+    Column("volume", BigInteger),
+    prefixes=["TEMPORARY"],
+)
+
+
+@dataclass(frozen=True)
+class RetentionRule:
+    source: str
+    target: str
+    after: timedelta
+
+
+@dataclass(frozen=True)
+class IntradayPolicy:
+    interval: str = "1m"
+    period: str = "5d"
+    rollups: tuple[RetentionRule, ...] = (
+        RetentionRule("1m", "5m", timedelta(days=7)),
+        RetentionRule("5m", "1h", timedelta(days=60)),
+    )
+    drop_after: timedelta | None = timedelta(days=730)
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "IntradayPolicy":
+        """Build the policy from the ``intraday_config`` YAML section."""
+        policy = cls()
+        rollups = policy.rollups
+        if "retention" in config:
+            rollups = tuple(
+                RetentionRule(rule["from"], rule["to"], timedelta(days=rule["after_days"]))
+                for rule in config["retention"]
+            )
+        default_drop_days = policy.drop_after.days if policy.drop_after is not None else None
+        drop_after_days = config.get("drop_after_days", default_drop_days)
+        policy = cls(
+            interval=config.get("interval", policy.interval),
+            period=config.get("period", policy.period),
+            rollups=rollups,
+            drop_after=timedelta(days=drop_after_days) if drop_after_days else None,
+        )
+
+        tiers = list(INTRADAY_INTERVALS)
+        if policy.interval not in tiers:
+            raise ValueError(f"Unsupported intraday interval: {policy.interval}")
+        for rule in policy.rollups:
+            if rule.source not in tiers or rule.target not in tiers:
+                raise ValueError(f"Unsupported retention rule: {rule.source} -> {rule.target}")
+            if tiers.index(rule.target) <= tiers.index(rule.source):
+                raise ValueError(f"Retention must roll up to a coarser interval: {rule}")
+        return policy
+
+    def rollup_cutoff(self, rule: RetentionRule, origin: datetime, now: datetime) -> datetime:
+        """Start of the ``rule.target`` bucket containing ``now - rule.after``."""
+        return floor_to_bucket(now - rule.after, INTRADAY_INTERVALS[rule.target], origin)
+
+
+def intraday_policy() -> IntradayPolicy:
+    return IntradayPolicy.from_config(config_loader.stock_watchlist.get("intraday_config", {}))
+
+
+def floor_to_bucket(moment: datetime, stride: timedelta, origin: datetime) -> datetime:
+    """Start of the ``stride`` bucket containing ``moment`` (buckets aligned to ``origin``)."""
+    return moment - (moment - origin) % stride
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Treat naive datetimes (e.g. from query strings) as UTC."""
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def frame_to_records(ticker: str, interval: str, frame: Any) -> list[tuple[Any, ...]]:
+    """Rows of a yfinance intraday DataFrame as ``INTRADAY_COLUMNS`` tuples (UTC timestamps)."""
+    frame = frame.dropna(subset=["Open", "High", "Low", "Close"])
+    timestamps = frame.index.tz_convert("UTC").to_pydatetime()
+    return [
+        (ticker, interval, ts, float(o), float(h), float(lo), float(c), int(v))
+        for ts, o, h, lo, c, v in zip(
+            timestamps,
+            frame["Open"].to_numpy(),
+            frame["High"].to_numpy(),
+            frame["Low"].to_numpy(),
+            frame["Close"].to_numpy(),
+            frame["Volume"].fillna(0).to_numpy(),
+            strict=True,
+        )
+    ]
+
+
+async def store_intraday_bars(db: AsyncSession, records: list[tuple[Any, ...]]) -> int:
+    """
+    Bulk-upsert ``INTRADAY_COLUMNS`` tuples (caller commits).
+
+    Rows are streamed with ``COPY`` into a temporary staging table and merged
+    in one statement; unchanged bars are left untouched.
+
+    Returns:
+        Number of inserted or changed rows
+    """
+    if not records:
+        return 0
+
+    connection = await db.connection()
+    await connection.run_sync(lambda sync_conn: _staging.create(sync_conn, checkfirst=True))
+    await db.execute(_staging.delete())
+    raw = await connection.get_raw_connection()
+    driver_connection = raw.driver_connection
+    if driver_connection is None:
+        raise RuntimeError("Intraday COPY needs an open asyncpg connection")
+    await driver_connection.copy_records_to_table(
+        _staging.name, records=records, columns=list(INTRADAY_COLUMNS)
+    )
+
+    stmt = insert(IntradayBar).from_select(list(INTRADAY_COLUMNS), select(_staging))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ticker", "interval", "timestamp"],
+        set_={name: getattr(stmt.excluded, name) for name in _BAR_VALUES},
+        where=tuple_(*(getattr(IntradayBar, name) for name in _BAR_VALUES)).is_distinct_from(
+            tuple_(*(getattr(stmt.excluded, name) for name in _BAR_VALUES))
+        ),
+    )
+    result = cast(CursorResult[Any], await db.execute(stmt))
+    return result.rowcount
+
+
+def _aggregate(ticker: str, tiers: list[str], interval: str, origin: datetime) -> Any:
+    """Bars of ``interval`` aggregated from the rows of ``tiers`` for one ticker."""
+    bucket = func.date_bin(
+        literal(INTRADAY_INTERVALS[interval], Interval),
+        IntradayBar.timestamp,
+        literal(origin, DateTime(timezone=True)),
+    ).label("timestamp")
+    return (
+        select(
+            literal(ticker, String).label("ticker"),
+            literal(interval, String).label("interval"),
+            bucket,
+            func.array_agg(aggregate_order_by(IntradayBar.open, IntradayBar.timestamp.asc()))[1],
+            func.max(IntradayBar.high),
+            func.min(IntradayBar.low),
+            func.array_agg(aggregate_order_by(IntradayBar.close, IntradayBar.timestamp.desc()))[1],
+            func.sum(IntradayBar.volume).cast(BigInteger),
+        )
+        .where(IntradayBar.ticker == ticker, IntradayBar.interval.in_(tiers))
+        .group_by(bucket)
+    )
+
+
+async def apply_retention(
+    db: AsyncSession,
+    policy: IntradayPolicy | None = None,
+    tickers: list[str] | None = None,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    """
+    Roll old intraday bars into coarser intervals and drop expired rows.
+
+    Args:
+        db: Database session
+        policy: Retention policy (defaults to ``intraday_config``)
+        tickers: Tickers to process (defaults to every ticker in the table)
+        now: Reference time (defaults to now)
+
+    Returns:
+        Number of rows removed per source interval (plus ``"dropped"``)
+    """
+    policy = policy or intraday_policy()
+    now = now or datetime.now(timezone.utc)
+    if tickers is None:
+        result = await db.execute(select(IntradayBar.ticker).distinct())
+        tickers = list(result.scalars().all())
+
+    removed: dict[str, int] = {}
+    for ticker in tickers:
+        origin = exchange_for(ticker).session_origin()
+        for rule in policy.rollups:
+            cutoff = policy.rollup_cutoff(rule, origin, now)
+            rollup = _aggregate(ticker, [rule.source], rule.target, origin).where(
+                IntradayBar.timestamp < cutoff
+            )
+            stmt = insert(IntradayBar).from_select(list(INTRADAY_COLUMNS), rollup)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["ticker", "interval", "timestamp"],
+                set_={name: getattr(stmt.excluded, name) for name in _BAR_VALUES},
+            )
+            await db.execute(stmt)
+            result = cast(
+                CursorResult[Any],
+                await db.execute(
+                    delete(IntradayBar).where(
+                        IntradayBar.ticker == ticker,
+                        IntradayBar.interval == rule.source,
+                        IntradayBar.timestamp < cutoff,
+                    )
+                ),
+            )
+            removed[rule.source] = removed.get(rule.source, 0) + result.rowcount
+
+        if policy.drop_after is not None:
+            result = cast(
+                CursorResult[Any],
+                await db.execute(
+                    delete(IntradayBar).where(
+                        IntradayBar.ticker == ticker,
+                        IntradayBar.timestamp < now - policy.drop_after,
+                    )
+                ),
+            )
+            removed["dropped"] = removed.get("dropped", 0) + result.rowcount
+        await db.commit()
+
+    return removed
+
+
+async def fetch_and_store_intraday(
+    db: AsyncSession,
+    tickers: list[str] | None = None,
+    policy: IntradayPolicy | None = None,
+) -> dict[str, Any]:
+    """
+    Download intraday bars for tickers and bulk-store them.
+
+    Bars older than the first rollup cutoff of the base interval are skipped:
+    that period has already been rolled into a coarser tier.
+
+    Args:
+        db: Database session
+        tickers: Ticker symbols (defaults to the watchlist)
+        policy: Intraday policy (defaults to ``intraday_config``)
+
+    Returns:
+        Dictionary with operation results
+    """
+    policy = policy or intraday_policy()
+    if tickers is None:
+        tickers = config_loader.get_watchlist_symbols() or settings.ticker_list
+    now = datetime.now(timezone.utc)
+    base_rule = next((rule for rule in policy.rollups if rule.source == policy.interval), None)
+
+    records_stored = 0
+    errors = []
+    governor = get_governor()
+    fetch_history = history_fetcher()
+    for ticker in tickers:
+        try:
+            try:
+                frame = await governor.call(
+                    partial(
+                        fetch_history,
+                        ticker,
+                        period=policy.period,
+                        interval=policy.interval,
+                        actions=False,
+                    ),
+                    symbol=ticker,
+                    empty=lambda frame: frame.empty,
+                )
+            except NoDataError:
+                errors.append(f"{ticker}: No data available")
+                continue
+
+            records = frame_to_records(ticker, policy.interval, frame)
+            if base_rule is not None:
+                origin = exchange_for(ticker).session_origin()
+                cutoff = policy.rollup_cutoff(base_rule, origin, now)
+                records = [record for record in records if record[2] >= cutoff]
+
+            records_stored += await store_intraday_bars(db, records)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            errors.append(f"{ticker}: {str(e)}")
+
+    message = "Intraday data fetched successfully"
+    if errors:
+        message = f"Completed with {len(errors)} error(s): {'; '.join(errors)}"
+
+    return {
+        "success": not errors,
+        "message": message,
+        "records_stored": records_stored,
+        "tickers_processed": len(tickers) - len(errors),
+        "errors": errors,
+    }
+
+
+async def get_intraday_rows(
+    db: AsyncSession,
+    ticker: str,
+    interval: str,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    limit: int = 100,
+) -> list[tuple[Any, ...]]:
+    """
+    Retrieve intraday bars as ``INTRADAY_COLUMNS`` tuples, newest first.
+
+    Recent periods may only exist in finer tiers (not rolled up yet), so bars
+    are aggregated from every tier at or below ``interval``.
+
+    Args:
+        db: Database session
+        ticker: Ticker symbol
+        interval: ``1m``, ``5m`` or ``1h``
+        start_date: Optional start time filter
+        end_date: Optional end time filter
+        limit: Maximum number of bars to return
+    """
+    tiers = list(INTRADAY_INTERVALS)
+    if interval not in tiers:
+        raise ValueError(f"Unsupported intraday interval: {interval}")
+
+    query = _aggregate(
+        ticker, tiers[: tiers.index(interval) + 1], interval, exchange_for(ticker).session_origin()
+    )
+    if start_date:
+        query = query.where(IntradayBar.timestamp >= _as_utc(start_date))
+    if end_date:
+        query = query.where(IntradayBar.timestamp <= _as_utc(end_date))
+    query = query.order_by(query.selected_columns.timestamp.desc()).limit(limit)
+
+    result = await db.execute(query)
+    return list(result.tuples().all())
@@ -0,0 +1,315 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.config import config_loader, settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMBudgetExceededError(RuntimeError):
+    """Raised when a request would push spend past ``max_cost_per_report``."""
+
+
+@dataclass
+class LLMResponse:
+    content: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float
+    cached: bool = False
+
+
+class LLMResponseCache:
+    """
+    Persistent on-disk cache of LLM responses.
+
+    One JSON file per key under ``cache_dir``; entries older than ``ttl_seconds``
+    are treated as misses and overwritten on the next store.
+    """
+
+    def __init__(self, cache_dir: Path | str, ttl_seconds: float):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def make_key(model: str, messages: list[dict[str, str]], params: dict[str, Any]) -> str:
+        """Stable key over model, prompt and sampling parameters."""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> LLMResponse | None:
+        """Return the cached response for ``key`` if present and not expired."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if time.time() - entry["created_at"] > self.ttl_seconds:
+            return None
+        return LLMResponse(**{**entry["response"], "cost": 0.0, "cached": True})
+
+    def set(self, key: str, response: LLMResponse) -> None:
+        """Store a response atomically (write to a temp file, then rename)."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps({"created_at": time.time(), "response": asdict(response)}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+
+class CostTracker:
+    """
+    Token cost accounting against a per-report budget.
+
+    Requests reserve their worst-case cost (prompt estimate + ``max_tokens``)
+    before being sent and settle to the actual usage afterwards, so concurrent
+    requests cannot overshoot the budget.
+    """
+
+    def __init__(
+        self,
+        pricing: dict[str, dict[str, float]],
+        max_cost: float | None = None,
+        alert_threshold: float | None = None,
+    ):
+        self.pricing = pricing
+        self.max_cost = max_cost
+        self.alert_threshold = alert_threshold
+        self.spent = 0.0
+        self.reserved = 0.0
+        self._alerted = False
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """USD cost of a request; unknown models are priced at zero."""
+        prices = self.pricing.get(model, {})
+        return (
+            prompt_tokens * prices.get("input", 0.0) + completion_tokens * prices.get("output", 0.0)
+        ) / 1_000_000
+
+    def reserve(self, amount: float) -> None:
+        if self.max_cost is not None and self.spent + self.reserved + amount > self.max_cost:
+            raise LLMBudgetExceededError(
+                f"LLM budget exceeded: spent ${self.spent:.4f} + reserved ${self.reserved:.4f} "
+                f"+ ${amount:.4f} > ${self.max_cost:.2f}"
+            )
+        self.reserved += amount
+
+    def settle(self, reserved: float, actual: float) -> None:
+        self.reserved -= reserved
+        self.spent += actual
+        if (
+            self.alert_threshold is not None
+            and not self._alerted
+            and self.spent >= self.alert_threshold
+        ):
+            self._alerted = True
+            logger.warning(
+                "LLM spend $%.4f reached alert threshold $%.2f", self.spent, self.alert_threshold
+            )
+
+
+class LLMClient:
+    """
+    Async client for OpenAI-compatible chat completion APIs.
+
+    Adds a persistent response cache, a per-model concurrency limit, token cost
+    accounting and coalescing of identical in-flight prompts. Point
+    ``base_url`` (or pass an ``httpx`` ``transport``) at the fake server in
+    ``tests.fakes.llm_server`` to run offline.
+
+    Usage:
+        async with LLMClient.from_config() as llm:
+            response = await llm.complete([{"role": "user", "content": "..."}])
+    """
+
+    def __init__(
+        self,
+        model: str,
+        base_url: str,
+        api_key: str = "",
+        temperature: float = 0.7,
+        max_tokens: int = 4000,
+        timeout: float = 60,
+        max_concurrent_requests: int = 4,
+        cache: LLMResponseCache | None = None,
+        cost_tracker: CostTracker | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.max_concurrent_requests = max_concurrent_requests
+        self.cache = cache
+        self.cost_tracker = cost_tracker or CostTracker(pricing={})
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, asyncio.Future[LLMResponse]] = {}
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            transport=transport,
+        )
+
+    @classmethod
+    def from_config(cls, **overrides: Any) -> "LLMClient":
+        """Build a client from settings and the ``llm``/``cost_management`` YAML sections."""
+        llm = config_loader.get_llm_settings()
+        costs = config_loader.agent_config.get("cost_management", {})
+
+        cache = None
+        if costs.get("enable_caching", False):
+            cache = LLMResponseCache(
+                settings.LLM_CACHE_DIR,
+                ttl_seconds=costs.get("cache_ttl_hours", 24) * 3600,
+            )
+
+        options: dict[str, Any] = {
+            "model": llm.get("model", settings.OPENAI_MODEL),
+            "base_url": settings.OPENAI_BASE_URL,
+            "api_key": settings.OPENAI_API_KEY,
+            "temperature": llm.get("temperature", settings.OPENAI_TEMPERATURE),
+            "max_tokens": llm.get("max_tokens", settings.OPENAI_MAX_TOKENS),
+            "timeout": llm.get("timeout", 60),
+            "max_concurrent_requests": llm.get("max_concurrent_requests", 4),
+            "cache": cache,
+            "cost_tracker": CostTracker(
+                pricing=costs.get("pricing", {}),
+                max_cost=costs.get("max_cost_per_report"),
+                alert_threshold=costs.get("alert_threshold"),
+            ),
+        }
+        options.update(overrides)
+        return cls(**options)
+
+    async def __aenter__(self) -> "LLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            self._semaphores[model] = asyncio.Semaphore(self.max_concurrent_requests)
+        return self._semaphores[model]
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        model: str | None = None,
+        temperature: float | None = None,
+        max_tokens: int | None = None,
+        **params: Any,
+    ) -> LLMResponse:
+        """
+        Run a chat completion, serving identical requests from cache.
+
+        Args:
+            messages: Chat messages (``role``/``content`` dicts)
+            model: Model name (defaults to the configured model)
+            temperature: Sampling temperature override
+            max_tokens: Completion token limit override
+            **params: Extra request parameters; part of the cache key
+
+        Returns:
+            LLMResponse (``cached=True`` and ``cost=0`` for cache hits)
+
+        Raises:
+            LLMBudgetExceededError: If the request could exceed the report budget
+            httpx.HTTPError: On transport errors or non-2xx responses
+        """
+        model = model or self.model
+        params = {
+            "temperature": self.temperature if temperature is None else temperature,
+            "max_tokens": self.max_tokens if max_tokens is None else max_tokens,
+            **params,
+        }
+        key = LLMResponseCache.make_key(model, messages, params)
+
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                return cached
+
+        # Coalesce identical prompts that are already being requested
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            response = await asyncio.shield(in_flight)
+            return LLMResponse(**{**asdict(response), "cost": 0.0, "cached": True})
+
+        future: asyncio.Future[LLMResponse] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response = await self._request(model, messages, params)
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.set, key, response)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited failure is not logged by asyncio
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _request(
+        self, model: str, messages: list[dict[str, str]], params: dict[str, Any]
+    ) -> LLMResponse:
+        # Rough prompt estimate (~4 characters per token) for the reservation
+        prompt_estimate = sum(len(message.get("content", "")) for message in messages) // 4
+        reservation = self.cost_tracker.cost(model, prompt_estimate, params["max_tokens"])
+        self.cost_tracker.reserve(reservation)
+
+        actual = 0.0
+        try:
+            async with self._semaphore(model):
+                http_response = await self._http.post(
+                    "/chat/completions",
+                    json={"model": model, "messages": messages, **params},
+                )
+            http_response.raise_for_status()
+            body = http_response.json()
+
+            usage = body.get("usage", {})
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+            actual = self.cost_tracker.cost(model, prompt_tokens, completion_tokens)
+
+            return LLMResponse(
+                content=body["choices"][0]["message"]["content"],
+                model=body.get("model", model),
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cost=actual,
+            )
+        finally:
+            self.cost_tracker.settle(reservation, actual)
@@ -0,0 +1,337 @@
+"""
+Exchange metadata derived from Yahoo Finance ticker suffixes.
+
+``NVDA`` trades in New York, ``2330.TW`` in Taipei, ``2222.SR`` in Riyadh.
+The exchange determines the local timezone (what "today" means for a
+market), the session open (where hourly bars start) and the first trading
+day of its week: most markets trade Monday-Friday, some Middle Eastern
+markets Sunday-Thursday.
+
+Each exchange also has a trading calendar (``calendar_for``): a precomputed
+table of its sessions, i.e. trading days without weekends and holidays.
+NYSE holidays follow from the exchange's rules; other exchanges' holidays
+are listed under ``trading_calendars`` in ``stock_watchlist.yaml``. Refreshes
+use it to skip closed markets and fetch only the sessions a ticker is
+missing.
+"""
+
+import bisect
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from app.config import config_loader
+
+MONDAY, THURSDAY, FRIDAY, SATURDAY, SUNDAY = 0, 3, 4, 5, 6
+
+# Range of the precomputed session tables (through the end of next year)
+CALENDAR_START = date(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class Exchange:
+    code: str  # ISO 10383 MIC
+    timezone: str
+    session_open: time = time(9, 30)  # Local time of the regular session open
+    week_start: int = MONDAY  # date.weekday() of the first trading day of the week
+    session_close: time = time(16, 0)  # Local time of the regular session close
+
+    @property
+    def weekdays(self) -> frozenset[int]:
+        """``date.weekday()`` numbers of the exchange's five trading days."""
+        return frozenset((self.week_start + i) % 7 for i in range(5))
+
+    def today(self, now: datetime | None = None) -> date:
+        """Current date in the exchange's timezone."""
+        zone = ZoneInfo(self.timezone)
+        return (now.astimezone(zone) if now else datetime.now(zone)).date()
+
+    def session_origin(self) -> datetime:
+        """
+        A past session open as an aware datetime, used to align intraday buckets.
+
+        Bucketing from this origin makes hourly bars start at the session open
+        (09:30, 10:30, ... in New York) rather than on the UTC hour.
+        """
+        return datetime.combine(date(2000, 1, 3), self.session_open, ZoneInfo(self.timezone))
+
+
+US = Exchange("XNYS", "America/New_York")
+
+EXCHANGES_BY_SUFFIX: dict[str, Exchange] = {
+    "": US,
+    "TW": Exchange("XTAI", "Asia/Taipei", time(9, 0), session_close=time(13, 30)),
+    "TWO": Exchange("ROCO", "Asia/Taipei", time(9, 0), session_close=time(13, 30)),
+    "HK": Exchange("XHKG", "Asia/Hong_Kong", time(9, 30), session_close=time(16, 0)),
+    "T": Exchange("XTKS", "Asia/Tokyo", time(9, 0), session_close=time(15, 30)),
+    "KS": Exchange("XKRX", "Asia/Seoul", time(9, 0), session_close=time(15, 30)),
+    "SS": Exchange("XSHG", "Asia/Shanghai", time(9, 30), session_close=time(15, 0)),
+    "SZ": Exchange("XSHE", "Asia/Shanghai", time(9, 30), session_close=time(15, 0)),
+    "NS": Exchange("XNSE", "Asia/Kolkata", time(9, 15), session_close=time(15, 30)),
+    "BO": Exchange("XBOM", "Asia/Kolkata", time(9, 15), session_close=time(15, 30)),
+    "L": Exchange("XLON", "Europe/London", time(8, 0), session_close=time(16, 30)),
+    "DE": Exchange("XETR", "Europe/Berlin", time(9, 0), session_close=time(17, 30)),
+    "PA": Exchange("XPAR", "Europe/Paris", time(9, 0), session_close=time(17, 30)),
+    "AS": Exchange("XAMS", "Europe/Amsterdam", time(9, 0), session_close=time(17, 30)),
+    "TO": Exchange("XTSE", "America/Toronto", time(9, 30), session_close=time(16, 0)),
+    "AX": Exchange("XASX", "Australia/Sydney", time(10, 0), session_close=time(16, 0)),
+    "SR": Exchange("XSAU", "Asia/Riyadh", time(10, 0), SUNDAY, time(15, 0)),
+    "QA": Exchange("DSMD", "Asia/Qatar", time(9, 30), SUNDAY, time(13, 15)),
+    "KW": Exchange("XKUW", "Asia/Kuwait", time(9, 0), SUNDAY, time(12, 40)),
+    "CA": Exchange("XCAI", "Africa/Cairo", time(10, 0), SUNDAY, time(14, 30)),
+}
+
+EXCHANGES_BY_CODE: dict[str, Exchange] = {
+    exchange.code: exchange for exchange in EXCHANGES_BY_SUFFIX.values()
+}
+
+
+def ticker_suffix(ticker: str) -> str:
+    """Exchange suffix of a Yahoo Finance ticker (``""`` for US listings)."""
+    symbol, dot, suffix = ticker.upper().rpartition(".")
+    return suffix if dot and symbol else ""
+
+
+def exchange_for(ticker: str) -> Exchange:
+    """Exchange a ticker trades on; unknown suffixes fall back to US conventions."""
+    return EXCHANGES_BY_SUFFIX.get(ticker_suffix(ticker), US)
+
+
+def _easter(year: int) -> date:
+    """Western (Gregorian) Easter Sunday, by the anonymous Gregorian algorithm."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The ``n``-th ``weekday`` of a month (``n=-1``: the last one)."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    """NYSE observance: Saturday holidays move to Friday, Sunday ones to Monday."""
+    if day.weekday() == SATURDAY:
+        return day - timedelta(days=1)
+    if day.weekday() == SUNDAY:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year: int) -> list[date]:
+    """
+    Regular NYSE full-day holidays of ``year``.
+
+    Unscheduled closures (national days of mourning, storms) are not
+    rule-based; list them under ``trading_calendars`` instead.
+    """
+    holidays = [
+        _nth_weekday(year, 2, MONDAY, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, MONDAY, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),  # Independence Day
+        _nth_weekday(year, 9, MONDAY, 1),  # Labor Day
+        _nth_weekday(year, 11, THURSDAY, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),  # Christmas
+    ]
+    # A Saturday New Year's Day is not observed on the previous Friday
+    if date(year, 1, 1).weekday() != SATURDAY:
+        holidays.append(_observed(date(year, 1, 1)))
+    if year >= 1998:
+        holidays.append(_nth_weekday(year, 1, MONDAY, 3))  # Martin Luther King Jr. Day
+    if year >= 2022:
+        holidays.append(_observed(date(year, 6, 19)))  # Juneteenth
+    return holidays
+
+
+# Exchanges whose holidays are derived from rules (plus any configured ones)
+HOLIDAY_RULES = {"XNYS": nyse_holidays}
+
+
+class TradingCalendar:
+    """
+    Precomputed session table of one exchange.
+
+    Sessions are kept as a sorted tuple, so membership is a dict lookup and
+    range queries are two bisections.
+    """
+
+    def __init__(self, exchange: Exchange, holidays: Iterable[date], end: date):
+        self.exchange = exchange
+        self.start = CALENDAR_START
+        self.end = end
+        self.holidays = tuple(sorted({day for day in holidays if self.start <= day <= end}))
+
+        closed = set(self.holidays)
+        weekdays = exchange.weekdays
+        sessions = []
+        day = self.start
+        while day <= end:
+            if day.weekday() in weekdays and day not in closed:
+                sessions.append(day)
+            day += timedelta(days=1)
+        self._sessions = tuple(sessions)
+        self._positions = {day: i for i, day in enumerate(sessions)}
+
+    def is_session(self, day: date) -> bool:
+        return day in self._positions
+
+    def sessions(self, start: date, end: date) -> list[date]:
+        """Sessions from ``start`` through ``end`` (inclusive)."""
+        lo = bisect.bisect_left(self._sessions, start)
+        hi = bisect.bisect_right(self._sessions, end)
+        return list(self._sessions[lo:hi])
+
+    def previous_session(self, day: date) -> date | None:
+        """Latest session strictly before ``day``."""
+        i = bisect.bisect_left(self._sessions, day)
+        return self._sessions[i - 1] if i else None
+
+    def sessions_before(self, day: date, count: int) -> date | None:
+        """The ``count``-th session counting back from ``day`` (inclusive, 1-based)."""
+        i = bisect.bisect_right(self._sessions, day) - count
+        return self._sessions[i] if i >= 0 and count > 0 else None
+
+    def last_completed_session(self, now: datetime | None = None) -> date | None:
+        """
+        Latest session whose regular close has passed at ``now``.
+
+        While a session is under way (or before it opens) this is the
+        previous one: today's bar is not final yet.
+        """
+        zone = ZoneInfo(self.exchange.timezone)
+        local = now.astimezone(zone) if now else datetime.now(zone)
+        today = local.date()
+        if self.is_session(today) and local.time() >= self.exchange.session_close:
+            return today
+        return self.previous_session(today)
+
+    def is_open(self, now: datetime | None = None) -> bool:
+        """Whether the regular session is under way at ``now``."""
+        zone = ZoneInfo(self.exchange.timezone)
+        local = now.astimezone(zone) if now else datetime.now(zone)
+        return (
+            self.is_session(local.date())
+            and self.exchange.session_open <= local.time() < self.exchange.session_close
+        )
+
+    def missing_sessions(self, stored: Iterable[date], start: date, end: date) -> list[date]:
+        """Sessions from ``start`` through ``end`` that are not in ``stored``."""
+        present = set(stored)
+        return [day for day in self.sessions(start, end) if day not in present]
+
+    def session_runs(self, days: list[date]) -> list[tuple[date, date]]:
+        """
+        Group sorted sessions into runs of consecutive sessions.
+
+        Returns:
+            List of (first, last) sessions of each run, oldest first
+        """
+        runs: list[tuple[date, date]] = []
+        previous = -2
+        for day in days:
+            position = self._positions[day]
+            if position == previous + 1:
+                runs[-1] = (runs[-1][0], day)
+            else:
+                runs.append((day, day))
+            previous = position
+        return runs
+
+    def period_start(self, period: str, end: date) -> date | None:
+        """
+        First day of a yfinance ``period`` ending on ``end`` (None for ``max``).
+
+        ``Nd`` periods count sessions; ``Nmo``/``Ny`` periods calendar months
+        and years; ``ytd`` starts on January 1st.
+        """
+        if period == "max":
+            return None
+        if period == "ytd":
+            return date(end.year, 1, 1)
+        if period.endswith("mo"):
+            months = int(period[:-2])
+        elif period.endswith("y"):
+            months = 12 * int(period[:-1])
+        elif period.endswith("d"):
+            return self.sessions_before(end, int(period[:-1])) or self.start
+        else:
+            raise ValueError(f"Unsupported period: {period}")
+        year, month = divmod(end.year * 12 + end.month - 1 - months, 12)
+        month += 1
+        last_day = (date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)).day
+        return date(year, month, min(end.day, last_day)) + timedelta(days=1)
+
+
+def _calendar_config(code: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """(holidays, annual) of exchange ``code`` under ``trading_calendars``, as strings."""
+    config = (config_loader.stock_watchlist.get("trading_calendars") or {}).get(code) or {}
+    return (
+        tuple(str(day) for day in config.get("holidays") or []),
+        tuple(str(month_day) for month_day in config.get("annual") or []),
+    )
+
+
+def _expand_holidays(holidays: Iterable[str], annual: Iterable[str], last_year: int) -> list[date]:
+    days = [date.fromisoformat(day) for day in holidays]
+    for month_day in annual:
+        month, day = (int(part) for part in month_day.split("-"))
+        date(2000, month, day)  # Validates the entry (2000 is a leap year)
+        for year in range(CALENDAR_START.year, last_year + 1):
+            try:
+                days.append(date(year, month, day))
+            except ValueError:  # 02-29 outside leap years
+                continue
+    return days
+
+
+def configured_holidays(code: str) -> list[date]:
+    """
+    Holidays of exchange ``code`` listed under ``trading_calendars``.
+
+    ``holidays`` lists dates; ``annual`` lists ``MM-DD`` dates closed every
+    year (without weekend observance; ``02-29`` in leap years only).
+    """
+    holidays, annual = _calendar_config(code)
+    return _expand_holidays(holidays, annual, date.today().year + 1)
+
+
+@lru_cache(maxsize=64)
+def _build_calendar(
+    code: str, holidays: tuple[str, ...], annual: tuple[str, ...], year: int
+) -> TradingCalendar:
+    end = date(year + 1, 12, 31)
+    days = _expand_holidays(holidays, annual, end.year)
+    if rule := HOLIDAY_RULES.get(code):
+        for rule_year in range(CALENDAR_START.year, end.year + 1):
+            days.extend(rule(rule_year))
+    return TradingCalendar(EXCHANGES_BY_CODE[code], days, end)
+
+
+def trading_calendar(code: str) -> TradingCalendar:
+    """
+    Session table of exchange ``code``.
+
+    Built once per configuration: edits to ``trading_calendars`` in the
+    watchlist YAML (which is reloaded when it changes) and a new year
+    rebuild it.
+    """
+    holidays, annual = _calendar_config(code)
+    return _build_calendar(code, holidays, annual, date.today().year)
+
+
+def calendar_for(ticker: str) -> TradingCalendar:
+    """Trading calendar of the exchange a ticker trades on."""
+    return trading_calendar(exchange_for(ticker).code)
@@ -0,0 +1,345 @@
+"""
+Price history providers.
+
+Both providers return bars as a yfinance-style DataFrame: Open, High, Low,
+Close, Volume (and Dividends, Stock Splits with ``actions``), prices
+split-adjusted as of the download, indexed by exchange-local timestamps
+(midnight for daily bars).
+
+- ``yfinance`` (default): the yfinance library. Its calls block, so the
+  provider governor runs them in worker threads, one session per ``Ticker``.
+- ``yahoo_http``: Yahoo Finance's chart API through one shared
+  ``httpx.AsyncClient``. Requests are coroutines multiplexed over a small
+  pool of keep-alive (HTTP/2 if ``h2`` is installed) connections, so many
+  symbols can be in flight without threads.
+
+``MARKET_DATA_PROVIDER`` selects the provider; ``history_fetcher`` returns
+its fetch function, to be called through ``ProviderGovernor.call``, and
+``batch_history_fetcher`` the batched fetch of a provider that multiplexes
+requests (``yahoo_http``), used by multi-ticker refreshes.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date, datetime, time
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo
+
+import httpx
+
+from app.config import settings
+from app.services.market_calendar import exchange_for
+
+if TYPE_CHECKING:
+    from app.services.provider_governor import ProviderGovernor
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# Intervals whose bars are labelled by date rather than by time
+_DAILY_INTERVALS = {"1d", "5d", "1wk", "1mo", "3mo"}
+
+
+def yfinance_history(symbol: str, **params: Any) -> Any:
+    """Bars of ``symbol`` from yfinance (blocking); ``params`` as for ``Ticker.history``."""
+    # Imported lazily: yfinance pulls in pandas (see ticker_service)
+    import yfinance as yf
+
+    return yf.Ticker(symbol).history(auto_adjust=False, **params)
+
+
+def http2_available() -> bool:
+    """Whether the ``h2`` package needed for HTTP/2 is installed (``http2`` extra)."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def chart_to_frame(result: dict[str, Any], interval: str = "1d", actions: bool = True) -> Any:
+    """
+    Convert one chart API ``result`` into a yfinance-style DataFrame.
+
+    Rows without any price (Yahoo sends nulls for e.g. halted sessions) are
+    dropped; dividends and splits are placed on the bar of their date.
+    """
+    import numpy as np
+    import pandas as pd
+
+    zone = result["meta"].get("exchangeTimezoneName", "UTC")
+    timestamps = result.get("timestamp") or []
+    quote = (result.get("indicators", {}).get("quote") or [{}])[0]
+    index = pd.to_datetime(timestamps, unit="s", utc=True).tz_convert(zone)
+    if interval in _DAILY_INTERVALS:
+        index = index.normalize()
+
+    frame = pd.DataFrame(
+        {
+            column: np.array(quote.get(column.lower()) or [None] * len(timestamps), dtype=float)
+            for column in PRICE_COLUMNS
+        },
+        index=pd.DatetimeIndex(index, name="Date"),
+    )
+    frame = frame.dropna(how="all", subset=["Open", "High", "Low", "Close"])
+
+    if actions:
+        frame["Dividends"] = 0.0
+        frame["Stock Splits"] = 0.0
+        events = result.get("events") or {}
+        for event in (events.get("dividends") or {}).values():
+            _set_event(frame, event["date"], zone, interval, "Dividends", event["amount"])
+        for event in (events.get("splits") or {}).values():
+            ratio = event["numerator"] / event["denominator"]
+            _set_event(frame, event["date"], zone, interval, "Stock Splits", ratio)
+    return frame
+
+
+def _set_event(
+    frame: Any, timestamp: int, zone: str, interval: str, column: str, value: float
+) -> None:
+    import pandas as pd
+
+    moment = pd.Timestamp(timestamp, unit="s", tz="UTC").tz_convert(zone)
+    if interval in _DAILY_INTERVALS:
+        moment = moment.normalize()
+    if moment in frame.index:
+        frame.loc[moment, column] = value
+
+
+def _empty_frame(actions: bool) -> Any:
+    import pandas as pd
+
+    columns = [*PRICE_COLUMNS, "Dividends", "Stock Splits"] if actions else list(PRICE_COLUMNS)
+    return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], tz="UTC", name="Date"))
+
+
+class YahooChartClient:
+    """
+    Async Yahoo Finance chart API client over a shared connection pool.
+
+    One ``httpx.AsyncClient`` (keep-alive, HTTP/2 when available) serves every
+    request; at most ``max_connections`` requests are in flight, further ones
+    wait for a free slot instead of failing with a pool timeout.
+
+    Usage:
+        client = get_chart_client()
+        frame = await client.history("NVDA", period="1y")
+        frames = await client.history_many(["NVDA", "2330.TW"], period="1mo")
+        quotes = await client.quotes(["NVDA", "2330.TW"])
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://query2.finance.yahoo.com",
+        http2: bool = True,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        if http2 and not http2_available():
+            logger.warning("HTTP/2 requested but h2 is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.max_connections = max_connections
+        self._slots = asyncio.Semaphore(max_connections)
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            headers={"User-Agent": "Mozilla/5.0 (compatible; quant-crew)"},
+            transport=transport,
+        )
+
+    @classmethod
+    def from_settings(cls, **overrides: Any) -> "YahooChartClient":
+        options: dict[str, Any] = {
+            "base_url": settings.MARKET_DATA_BASE_URL,
+            "http2": settings.MARKET_DATA_HTTP2,
+            "max_connections": settings.MARKET_DATA_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.MARKET_DATA_MAX_KEEPALIVE_CONNECTIONS,
+            "timeout": settings.MARKET_DATA_TIMEOUT,
+        }
+        options.update(overrides)
+        return cls(**options)
+
+    async def __aenter__(self) -> "YahooChartClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def history(
+        self,
+        symbol: str,
+        period: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        interval: str = "1d",
+        actions: bool = True,
+    ) -> Any:
+        """
+        Bars of ``symbol`` for a ``period`` or from ``start`` up to ``end`` (exclusive).
+
+        Like ``yfinance.Ticker.history``: dates are midnights in the exchange's
+        timezone and an unknown symbol gives an empty DataFrame.
+
+        Raises:
+            httpx.HTTPError: On transport errors or error responses other than 404
+        """
+        params: dict[str, Any] = {"interval": interval, "includePrePost": "false"}
+        if actions:
+            params["events"] = "div,splits"
+        if start is not None or end is not None:
+            zone = ZoneInfo(exchange_for(symbol).timezone)
+            params["period1"] = _epoch(start or date(1970, 1, 2), zone)
+            params["period2"] = _epoch(end, zone) if end else int(datetime.now().timestamp())
+        else:
+            params["range"] = period or "1mo"
+
+        async with self._slots:
+            response = await self._http.get(f"/v8/finance/chart/{symbol}", params=params)
+        if response.status_code == 404:
+            return _empty_frame(actions)
+        response.raise_for_status()
+
+        results = response.json()["chart"]["result"] or []
+        if not results:
+            return _empty_frame(actions)
+        return chart_to_frame(results[0], interval, actions)
+
+    async def quote(self, symbol: str) -> dict[str, Any] | None:
+        """
+        Current quote of ``symbol`` from its chart ``meta`` (see ``quote_from_meta``).
+
+        A one-day chart: the regular-market values come with the metadata,
+        so no history is downloaded. None for an unknown symbol.
+
+        Raises:
+            httpx.HTTPError: On transport errors or error responses other than 404
+        """
+        async with self._slots:
+            response = await self._http.get(
+                f"/v8/finance/chart/{symbol}", params={"range": "1d", "interval": "1d"}
+            )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+
+        results = response.json()["chart"]["result"] or []
+        if not results:
+            return None
+        return quote_from_meta(results[0]["meta"])
+
+    async def history_many(
+        self,
+        symbols: Iterable[str],
+        governor: "ProviderGovernor | None" = None,
+        **params: Any,
+    ) -> dict[str, Any | BaseException]:
+        """
+        Bars of several symbols at once, multiplexed over the connection pool.
+
+        With a ``governor``, each symbol's request goes through it (rate
+        limit, retries, circuit breaker), and an empty result is a
+        ``NoDataError``.
+
+        Returns:
+            DataFrame (or the exception raised) per symbol
+        """
+        return await self._many(
+            partial(self.history, **params), symbols, governor, lambda frame: bool(frame.empty)
+        )
+
+    async def quotes(
+        self, symbols: Iterable[str], governor: "ProviderGovernor | None" = None
+    ) -> dict[str, dict[str, Any] | BaseException]:
+        """
+        Quotes of several symbols at once, multiplexed like ``history_many``.
+
+        Returns:
+            Quote (or the exception raised; None for an unknown symbol
+            without a ``governor``) per symbol
+        """
+        return await self._many(self.quote, symbols, governor, lambda quote: quote is None)
+
+    async def _many(
+        self,
+        fetch: Callable[[str], Awaitable[Any]],
+        symbols: Iterable[str],
+        governor: "ProviderGovernor | None",
+        empty: Callable[[Any], bool],
+    ) -> dict[str, Any]:
+        symbols = list(dict.fromkeys(symbols))
+        requests: list[Awaitable[Any]] = [
+            (
+                governor.call(partial(fetch, symbol), symbol=symbol, empty=empty)
+                if governor is not None
+                else fetch(symbol)
+            )
+            for symbol in symbols
+        ]
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        return dict(zip(symbols, results, strict=True))
+
+
+def quote_from_meta(meta: dict[str, Any]) -> dict[str, Any]:
+    """Quote values (price, previous_close, volume) of a chart API ``meta``."""
+    return {
+        "price": meta.get("regularMarketPrice"),
+        "previous_close": meta.get("previousClose", meta.get("chartPreviousClose")),
+        "volume": meta.get("regularMarketVolume"),
+    }
+
+
+def _epoch(day: date, zone: ZoneInfo) -> int:
+    return int(datetime.combine(day, time(0), zone).timestamp())
+
+
+@lru_cache(maxsize=1)
+def get_chart_client() -> YahooChartClient:
+    """Process-wide chart API client (one connection pool)."""
+    return YahooChartClient.from_settings()
+
+
+async def close_chart_client() -> None:
+    """Close the shared chart API client's connections, if it was created."""
+    if get_chart_client.cache_info().currsize:
+        await get_chart_client().aclose()
+        get_chart_client.cache_clear()
+
+
+def history_fetcher() -> Callable[..., Any]:
+    """
+    Fetch function of the configured provider: ``fetch(symbol, **params)``.
+
+    ``params`` are ``period`` or ``start``/``end``, ``interval`` and
+    ``actions``, as for ``yfinance.Ticker.history``.
+    """
+    if settings.MARKET_DATA_PROVIDER == "yahoo_http":
+        return get_chart_client().history
+    return yfinance_history
+
+
+def batch_history_fetcher() -> Callable[..., Awaitable[dict[str, Any]]] | None:
+    """
+    Batched fetch of the configured provider: ``fetch(symbols, governor, **params)``.
+
+    None for yfinance, whose blocking calls gain nothing from batching.
+    """
+    if settings.MARKET_DATA_PROVIDER == "yahoo_http":
+        return get_chart_client().history_many
+    return None
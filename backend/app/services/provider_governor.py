@@ -0,0 +1,362 @@
+"""
+Governor for calls to upstream market data providers.
+
+Every provider call from the API, the scripts and scheduled jobs goes
+through the governor of its upstream (``get_governor("yahoo")``), which
+combines:
+
+- a token bucket, so refreshes of a large universe run at the sustainable
+  request rate instead of bursting into the provider's throttling;
+- jittered exponential backoff ("full jitter") for retryable errors (rate
+  limiting, 5xx responses, timeouts and connection errors);
+- a circuit breaker: after ``failure_threshold`` consecutive failed calls
+  (retryable errors, and refusals such as a 403 ban) the upstream is not
+  called at all for ``reset_timeout`` seconds, then a single probe call
+  decides whether it is back;
+- a negative cache of symbols the provider has no data for, so unknown or
+  delisted symbols are not re-requested on every run.
+
+Limits are per process; with several workers, divide ``rate_per_second``
+accordingly. They are configured per upstream in ``settings.PROVIDER_LIMITS``
+(the ``PROVIDER_LIMITS`` environment variable, as JSON).
+"""
+
+import asyncio
+import inspect
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# Not worth retrying, but the upstream refuses this client: keep off it
+_REFUSED_STATUS = {401, 403}
+
+# Provider exception classes (or their bases) recognised by name, so their
+# libraries need not be imported: yfinance, curl_cffi/requests and httpx
+_RETRYABLE_NAMES = {
+    "YFRateLimitError",
+    "ConnectionError",
+    "Timeout",
+    "ConnectError",
+    "TimeoutException",
+}
+
+
+class ProviderError(RuntimeError):
+    """Base class for calls refused by the governor."""
+
+
+class CircuitOpenError(ProviderError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class NoDataError(ProviderError):
+    """Raised when the provider has (recently had) no data for a symbol."""
+
+
+def _status(error: BaseException) -> Any:
+    response = getattr(error, "response", None)
+    return getattr(error, "status_code", None) or getattr(response, "status_code", None)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether ``error`` is transient: throttling, a 5xx response, a timeout or a dropped connection."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if _RETRYABLE_NAMES.intersection(cls.__name__ for cls in type(error).__mro__):
+        return True
+    return _status(error) in _RETRYABLE_STATUS
+
+
+def is_refused(error: BaseException) -> bool:
+    """Whether the upstream refused this client (401/403, e.g. a ban)."""
+    return _status(error) in _REFUSED_STATUS
+
+
+class TokenBucket:
+    """
+    Token bucket of ``rate`` tokens per second holding at most ``burst``.
+
+    ``acquire`` reserves a token immediately (the balance may go negative) and
+    sleeps until it is covered, so concurrent callers queue up fairly without
+    a lock.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = burst
+        self._updated = clock()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self) -> float:
+        wait = self.reserve()
+        if wait:
+            await self._sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (closed -> open -> half-open -> closed).
+
+    While open, calls are refused until ``reset_timeout`` has passed; then one
+    probe call is let through and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now (claims the probe when half-open)."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Give up a claimed probe without an outcome (e.g. the call was cancelled)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = self._clock()
+        self._probing = False
+
+
+@dataclass(frozen=True)
+class GovernorPolicy:
+    rate_per_second: float = 2.0
+    burst: int = 5
+    max_retries: int = 4
+    backoff_base_seconds: float = 1.0
+    backoff_max_seconds: float = 30.0
+    failure_threshold: int = 5
+    reset_timeout_seconds: float = 60.0
+    no_data_ttl_seconds: float = 24 * 3600
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "GovernorPolicy":
+        """Build the policy from one upstream's ``PROVIDER_LIMITS`` entry."""
+        policy = cls(**{name: config[name] for name in cls.__dataclass_fields__ if name in config})
+        if policy.rate_per_second <= 0 or policy.burst < 1 or policy.failure_threshold < 1:
+            raise ValueError(f"Invalid provider limits: {policy}")
+        return policy
+
+
+@dataclass
+class GovernorStats:
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    rejected: int = 0  # Refused by the open circuit
+    no_data: int = 0  # Served from the negative cache
+    throttled_seconds: float = 0.0
+    errors: dict[str, int] = field(default_factory=dict)
+
+
+class ProviderGovernor:
+    """
+    Rate limit, retry, circuit breaker and negative cache for one upstream.
+
+    Usage:
+        governor = get_governor("yahoo")
+        frame = await governor.call(download, "NVDA", symbol="NVDA", empty=lambda f: f.empty)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: GovernorPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.name = name
+        self.policy = policy or GovernorPolicy()
+        self.bucket = TokenBucket(self.policy.rate_per_second, self.policy.burst, clock, sleep)
+        self.breaker = CircuitBreaker(
+            self.policy.failure_threshold, self.policy.reset_timeout_seconds, clock
+        )
+        self.stats = GovernorStats()
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._no_data: dict[str, float] = {}
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry ``attempt`` (0-based)."""
+        cap = min(self.policy.backoff_max_seconds, self.policy.backoff_base_seconds * 2.0**attempt)
+        return self._jitter() * cap
+
+    def _check_no_data(self, symbol: str | None) -> None:
+        if symbol is None or symbol not in self._no_data:
+            return
+        if self._clock() < self._no_data[symbol]:
+            self.stats.no_data += 1
+            raise NoDataError(f"{self.name}: no data for {symbol} (cached)")
+        del self._no_data[symbol]
+
+    async def call(
+        self,
+        fn: Callable[..., T] | Callable[..., Awaitable[T]],
+        *args: Any,
+        symbol: str | None = None,
+        empty: Callable[[T], bool] | None = None,
+    ) -> T:
+        """
+        Call the provider through the governor.
+
+        Blocking functions run in a worker thread; coroutine functions are
+        awaited.
+
+        Args:
+            fn: Provider call
+            *args: Arguments for ``fn``
+            symbol: Symbol requested, for the negative cache
+            empty: Predicate telling an empty ("no data") result apart
+
+        Returns:
+            The result of ``fn``
+
+        Raises:
+            NoDataError: If the result is empty, or was recently for ``symbol``
+            CircuitOpenError: If the upstream's circuit is open
+            Exception: The provider's error, once retries are exhausted or if
+                it is not retryable (a refusal counts as a failed call for the
+                circuit breaker; other non-retryable errors count as neither)
+        """
+        self._check_no_data(symbol)
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.stats.rejected += 1
+                raise CircuitOpenError(f"{self.name}: circuit open, upstream not called")
+
+            try:
+                self.stats.throttled_seconds += await self.bucket.acquire()
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            self.stats.calls += 1
+            result: T
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    result = await cast(Callable[..., Awaitable[T]], fn)(*args)
+                else:
+                    result = await asyncio.to_thread(cast(Callable[..., T], fn), *args)
+            except Exception as e:
+                kind = type(e).__name__
+                self.stats.errors[kind] = self.stats.errors.get(kind, 0) + 1
+                if is_refused(e):
+                    # Retrying will not help, but neither does calling on: let
+                    # refusals open the circuit like any other failure
+                    self.breaker.record_failure()
+                    self.stats.failures += 1
+                    raise
+                if not is_retryable(e):
+                    # The call itself was bad (e.g. an invalid symbol): says nothing
+                    # about the upstream either way, so only a probe is given back
+                    self.breaker.release_probe()
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.policy.max_retries or self.breaker.state != "closed":
+                    self.stats.failures += 1
+                    raise
+                delay = self.backoff(attempt)
+                logger.warning(
+                    "%s call failed (%s: %s), retry %d in %.1fs",
+                    self.name,
+                    kind,
+                    e,
+                    attempt + 1,
+                    delay,
+                )
+                self.stats.retries += 1
+                await self._sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # Cancelled (client disconnect, timeout): says nothing about the upstream,
+                # but a half-open probe must be released or the circuit never closes
+                self.breaker.release_probe()
+                raise
+
+            self.breaker.record_success()
+            if empty is not None and empty(result):
+                if symbol is not None:
+                    self._no_data[symbol] = self._clock() + self.policy.no_data_ttl_seconds
+                raise NoDataError(f"{self.name}: no data for {symbol}")
+            return result
+
+
+_governors: dict[str, ProviderGovernor] = {}
+
+
+def governor_policy(upstream: str = "yahoo") -> GovernorPolicy:
+    return GovernorPolicy.from_config(settings.PROVIDER_LIMITS.get(upstream, {}))
+
+
+def get_governor(upstream: str = "yahoo") -> ProviderGovernor:
+    """Process-wide governor of ``upstream`` (configured in ``PROVIDER_LIMITS``)."""
+    if upstream not in _governors:
+        _governors[upstream] = ProviderGovernor(upstream, governor_policy(upstream))
+    return _governors[upstream]
+
+
+def configure_governor(upstream: str, policy: GovernorPolicy) -> ProviderGovernor:
+    """Replace this process's governor of ``upstream`` (e.g. a worker's share of the rate)."""
+    _governors[upstream] = ProviderGovernor(upstream, policy)
+    return _governors[upstream]
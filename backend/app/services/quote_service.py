@@ -0,0 +1,237 @@
+"""
+Live quote fan-out for WebSocket clients.
+
+One background poller per process polls every subscribed symbol once per
+tick, however many clients watch it, with a single batched provider call,
+and every new quote is fanned out to all of the symbol's subscribers.
+Subscribers never slow the poller down: each keeps only the latest
+undelivered quote per symbol, so a slow client skips intermediate values
+instead of queueing them.
+
+Quotes come from ``MARKET_DATA_PROVIDER`` through the ``yahoo_quotes``
+governor, whose budget (``PROVIDER_LIMITS``) is separate from ingestion's
+``yahoo`` one, so live quotes cannot starve fetches of history.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from typing import Any
+
+from app.config import settings
+from app.services.market_data import get_chart_client
+from app.services.provider_governor import NoDataError, get_governor
+
+logger = logging.getLogger(__name__)
+
+# Governor (and PROVIDER_LIMITS entry) of quote polls
+QUOTE_UPSTREAM = "yahoo_quotes"
+
+# Fetches the current quote values (price, previous_close, volume) of symbols:
+# per symbol, its values or the exception raised
+QuoteProvider = Callable[[list[str]], Awaitable[dict[str, Any]]]
+
+
+def yfinance_quotes(symbols: list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Current quotes of ``symbols`` from one yfinance download (blocking).
+
+    The last two daily bars give the price, previous close and volume; a
+    symbol without bars is left out.
+    """
+    # Imported lazily: yfinance pulls in pandas (see ticker_service)
+    import yfinance as yf
+
+    frame = yf.download(
+        symbols,
+        period="5d",
+        interval="1d",
+        group_by="ticker",
+        auto_adjust=False,
+        progress=False,
+        multi_level_index=True,
+    )
+    quotes: dict[str, dict[str, Any]] = {}
+    if frame is None or frame.empty:
+        return quotes
+    for symbol in symbols:
+        if symbol not in frame.columns.get_level_values(0):
+            continue
+        bars = frame[symbol].dropna(subset=["Close"])
+        if bars.empty:
+            continue
+        closes = bars["Close"].tolist()
+        quotes[symbol] = {
+            "price": closes[-1],
+            "previous_close": closes[-2] if len(closes) > 1 else None,
+            "volume": int(bars["Volume"].iloc[-1]),
+        }
+    return quotes
+
+
+async def provider_quotes(symbols: list[str]) -> dict[str, Any]:
+    """
+    Current quotes of ``symbols`` from ``MARKET_DATA_PROVIDER``, in one batch.
+
+    ``yahoo_http`` multiplexes one-day chart requests (quotes from their
+    metadata), each through the ``yahoo_quotes`` governor; yfinance makes a
+    single governed download of all the symbols.
+
+    Returns:
+        Quote values (or the exception raised) per symbol
+    """
+    governor = get_governor(QUOTE_UPSTREAM)
+    if settings.MARKET_DATA_PROVIDER == "yahoo_http":
+        return await get_chart_client().quotes(symbols, governor)
+
+    quotes: dict[str, Any] = await governor.call(partial(yfinance_quotes, symbols))
+    return {
+        symbol: quotes.get(symbol) or NoDataError(f"{QUOTE_UPSTREAM}: no quote for {symbol}")
+        for symbol in symbols
+    }
+
+
+class QuoteSubscriber:
+    """
+    One client's mailbox: the latest undelivered quote per symbol.
+
+    ``push`` never blocks; a quote replacing an undelivered one of the same
+    symbol counts as dropped.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def push(self, quote: dict[str, Any]) -> None:
+        if quote["ticker"] in self._pending:
+            self.dropped += 1
+        self._pending[quote["ticker"]] = quote
+        self._ready.set()
+
+    def discard(self, ticker: str) -> None:
+        self._pending.pop(ticker, None)
+
+    async def get(self) -> list[dict[str, Any]]:
+        """Wait for and take every pending quote (at most one per symbol)."""
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        quotes = list(self._pending.values())
+        self._pending.clear()
+        return quotes
+
+
+class QuoteHub:
+    """
+    Polls the subscribed symbols and fans quotes out to their subscribers.
+
+    Every ``poll_interval`` seconds, all subscribed symbols are polled in one
+    provider call; a newly subscribed symbol is polled right away (with the
+    others subscribed meanwhile) and then joins the next tick. The poller
+    runs while any symbol is subscribed. New subscribers immediately receive
+    the symbol's latest quote, if any. Unchanged quotes are not re-published.
+    """
+
+    def __init__(self, provider: QuoteProvider | None = None, poll_interval: float | None = None):
+        self.provider = provider or provider_quotes
+        self.poll_interval = (
+            settings.QUOTE_POLL_INTERVAL if poll_interval is None else poll_interval
+        )
+        self._subscribers: dict[str, set[QuoteSubscriber]] = {}
+        self._poller: asyncio.Task[None] | None = None
+        self._new: set[str] = set()
+        self._wake = asyncio.Event()
+        self._values: dict[str, dict[str, Any]] = {}
+        self._latest: dict[str, dict[str, Any]] = {}
+
+    @property
+    def polled_tickers(self) -> set[str]:
+        return set(self._subscribers) if self._poller is not None else set()
+
+    def subscribe(self, subscriber: QuoteSubscriber, tickers: Iterable[str]) -> None:
+        for ticker in tickers:
+            subscribers = self._subscribers.get(ticker)
+            if subscribers is None:
+                subscribers = self._subscribers[ticker] = set()
+                self._new.add(ticker)
+                self._wake.set()
+            if subscriber in subscribers:
+                continue
+            subscribers.add(subscriber)
+            if ticker in self._latest:
+                subscriber.push(self._latest[ticker])
+        if self._subscribers and self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+
+    def unsubscribe(
+        self, subscriber: QuoteSubscriber, tickers: Iterable[str] | None = None
+    ) -> None:
+        """Remove ``subscriber`` from ``tickers`` (default: every symbol)."""
+        for ticker in list(self._subscribers) if tickers is None else tickers:
+            subscribers = self._subscribers.get(ticker)
+            if not subscribers or subscriber not in subscribers:
+                continue
+            subscribers.discard(subscriber)
+            subscriber.discard(ticker)
+            if not subscribers:
+                del self._subscribers[ticker]
+                self._new.discard(ticker)
+                self._values.pop(ticker, None)
+                self._latest.pop(ticker, None)
+        if not self._subscribers and self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    def publish(self, ticker: str, values: dict[str, Any]) -> None:
+        """Fan a freshly polled quote out to the symbol's subscribers, unless unchanged."""
+        if values == self._values.get(ticker):
+            return
+        self._values[ticker] = values
+        quote = {
+            "ticker": ticker,
+            **values,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        self._latest[ticker] = quote
+        for subscriber in self._subscribers.get(ticker, ()):
+            subscriber.push(quote)
+
+    async def _poll(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            self._wake.clear()
+            if loop.time() >= next_tick:
+                next_tick = loop.time() + self.poll_interval
+                due = list(self._subscribers)
+            else:
+                due = [ticker for ticker in self._new if ticker in self._subscribers]
+            self._new.clear()
+            if due:
+                await self._refresh(due)
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(0.0, next_tick - loop.time()))
+            except TimeoutError:
+                pass
+
+    async def _refresh(self, tickers: list[str]) -> None:
+        try:
+            quotes = await self.provider(tickers)
+        except Exception as e:
+            logger.warning("Quote poll failed for %s: %s", ", ".join(tickers), e)
+            return
+        for ticker, values in quotes.items():
+            if isinstance(values, BaseException):
+                logger.warning("Quote poll failed for %s: %s", ticker, values)
+            elif ticker in self._subscribers:
+                self.publish(ticker, values)
+
+
+@lru_cache(maxsize=1)
+def get_quote_hub() -> QuoteHub:
+    """Shared quote hub for the API process."""
+    return QuoteHub()
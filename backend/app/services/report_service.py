@@ -0,0 +1,301 @@
+"""
+Weekly report build pipeline.
+
+Reports are built like a build system builds targets: every (ticker, format)
+report has a fingerprint over its inputs (price data hash, indicator results
+and agent outputs), recorded in a per-week manifest. A rebuild renders only
+reports whose fingerprint changed or whose file is missing; the rest are
+rendered in parallel in a process pool.
+"""
+
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.config import config_loader, settings
+
+# Bump when a renderer's output changes so existing reports are rebuilt
+RENDERER_VERSION = 1
+
+SUPPORTED_FORMATS = ("json", "html", "pdf")
+
+_AGENT_SECTIONS = {
+    "technical": "technical_analysis",
+    "sentiment": "sentiment_analysis",
+    "risk": "risk_assessment",
+    "cio": "cio_synthesis",
+}
+
+# Per-call LLM metadata: differs between a fresh and a cached run of the same
+# analysis, so it is kept out of the document (and its fingerprint)
+_CALL_METADATA = ("cost", "cached")
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def build_report_document(ticker: str, week: str, stages: dict[str, Any]) -> dict[str, Any]:
+    """
+    Build the report document for one ticker from its workflow stage results.
+
+    The raw bars are reduced to a content hash plus their date range, so the
+    document (and its fingerprint) stays small.
+    """
+    bars = stages.get("data_collection", {}).get("bars", [])
+    document: dict[str, Any] = {
+        "ticker": ticker,
+        "week": week,
+        "data": {
+            "hash": hashlib.sha256(_canonical_json(bars).encode("utf-8")).hexdigest(),
+            "bars": len(bars),
+            "first_date": bars[0].get("date") if bars else None,
+            "last_date": bars[-1].get("date") if bars else None,
+            "last_close": bars[-1].get("close") if bars else None,
+        },
+    }
+    for section, stage in _AGENT_SECTIONS.items():
+        value = stages.get(stage)
+        if isinstance(value, dict):
+            value = {key: item for key, item in value.items() if key not in _CALL_METADATA}
+        document[section] = value
+    return document
+
+
+def report_fingerprint(document: dict[str, Any], fmt: str) -> str:
+    """Fingerprint of everything a rendered report depends on."""
+    payload = _canonical_json({"renderer": RENDERER_VERSION, "format": fmt, "document": document})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_json(document: dict[str, Any]) -> bytes:
+    return json.dumps(document, indent=2, sort_keys=True, default=str).encode("utf-8")
+
+
+def _report_lines(document: dict[str, Any]) -> list[tuple[str, list[str]]]:
+    """Report content as (section title, lines) pairs shared by the HTML and PDF renderers."""
+    data = document["data"]
+    sections = [
+        (
+            "Market Data",
+            [
+                f"Bars: {data['bars']} ({data['first_date']} to {data['last_date']})",
+                f"Last close: {data['last_close']}",
+            ],
+        )
+    ]
+    for section, title in (
+        ("technical", "Technical Analysis"),
+        ("sentiment", "Sentiment Analysis"),
+        ("risk", "Risk Assessment"),
+    ):
+        value = document.get(section) or {}
+        sections.append((title, [f"{key}: {_canonical_json(item)}" for key, item in value.items()]))
+
+    cio = document.get("cio") or {}
+    sections.append(("CIO Recommendation", str(cio.get("recommendation", "")).splitlines()))
+    return sections
+
+
+def render_html(document: dict[str, Any]) -> bytes:
+    title = html.escape(f"{document['ticker']} — Weekly Report {document['week']}")
+    parts = [
+        "<!DOCTYPE html>",
+        '<html lang="en"><head><meta charset="utf-8">',
+        f"<title>{title}</title></head><body>",
+        f"<h1>{title}</h1>",
+    ]
+    for section_title, lines in _report_lines(document):
+        parts.append(f"<h2>{html.escape(section_title)}</h2><ul>")
+        parts.extend(f"<li>{html.escape(line)}</li>" for line in lines)
+        parts.append("</ul>")
+    if document.get("charts"):
+        parts.append("<h2>Charts</h2>")
+        parts.extend(
+            f'<img src="{html.escape(src)}" alt="{html.escape(document["ticker"])} chart">'
+            for src in document["charts"]
+        )
+    parts.append("</body></html>")
+    return "\n".join(parts).encode("utf-8")
+
+
+def render_pdf(document: dict[str, Any]) -> bytes:
+    """Render a plain-text PDF (Helvetica, A4) without third-party dependencies."""
+    lines = [f"{document['ticker']} - Weekly Report {document['week']}", ""]
+    for section_title, section_lines in _report_lines(document):
+        lines.extend([section_title, *(f"  {line}" for line in section_lines), ""])
+
+    # Wrap long lines and paginate: 90 characters, 60 lines per A4 page at 11pt
+    wrapped = [line[i : i + 90] for line in lines for i in range(0, max(len(line), 1), 90)]
+    pages = [wrapped[i : i + 60] for i in range(0, len(wrapped), 60)] or [[]]
+
+    def escape(text: str) -> str:
+        text = text.encode("latin-1", "replace").decode("latin-1")
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages, filled in below once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for page in pages:
+        text = "BT /F1 11 Tf 13 TL 50 800 Td " + " ".join(f"({escape(line)}) '" for line in page)
+        stream = (text + " ET").encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs).encode("ascii")
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_refs))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref_offset,
+    )
+    return bytes(output)
+
+
+_RENDERERS = {"json": render_json, "html": render_html, "pdf": render_pdf}
+
+
+def render_report_file(fmt: str, document: dict[str, Any], path: str) -> str:
+    """Render one report to ``path`` atomically (runs in a worker process)."""
+    content = _RENDERERS[fmt](document)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return path
+
+
+@dataclass
+class ReportBuildResult:
+    week: str
+    rendered: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+class ReportBuilder:
+    """
+    Incremental, parallel builder for weekly reports.
+
+    Output layout: ``<output_dir>/<week>/<ticker>.<format>`` plus a
+    ``manifest.json`` mapping each report file to its input fingerprint.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str | None = None,
+        formats: list[str] | None = None,
+        max_workers: int | None = None,
+    ):
+        self.output_dir = Path(output_dir or settings.REPORT_OUTPUT_DIR)
+        if formats is None:
+            formats = config_loader.stock_watchlist.get("report_config", {}).get(
+                "formats", list(SUPPORTED_FORMATS)
+            )
+        unsupported = set(formats) - set(SUPPORTED_FORMATS)
+        if unsupported:
+            raise ValueError(f"Unsupported report format(s): {', '.join(sorted(unsupported))}")
+        self.formats = list(formats)
+        self.max_workers = max_workers
+
+    def _load_manifest(self, path: Path) -> dict[str, str]:
+        try:
+            manifest: dict[str, str] = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return manifest
+
+    def build(self, week: str, documents: dict[str, dict[str, Any]]) -> ReportBuildResult:
+        """
+        Build every (ticker, format) report for ``week``, skipping unchanged ones.
+
+        Args:
+            week: Report week identifier (e.g. the workflow run id)
+            documents: Report document per ticker (see ``build_report_document``)
+
+        Returns:
+            ReportBuildResult listing rendered and skipped files and per-file errors
+        """
+        week_dir = self.output_dir / week
+        week_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = week_dir / "manifest.json"
+        manifest = self._load_manifest(manifest_path)
+        result = ReportBuildResult(week=week)
+
+        jobs: dict[str, tuple[str, dict[str, Any], str]] = {}
+        for ticker, document in documents.items():
+            for fmt in self.formats:
+                name = f"{ticker}.{fmt}"
+                path = week_dir / name
+                fingerprint = report_fingerprint(document, fmt)
+                if manifest.get(name) == fingerprint and path.exists():
+                    result.skipped.append(str(path))
+                else:
+                    jobs[name] = (fingerprint, document, str(path))
+
+        if jobs:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    name: pool.submit(render_report_file, name.rsplit(".", 1)[1], document, path)
+                    for name, (_, document, path) in jobs.items()
+                }
+                for name, future in futures.items():
+                    try:
+                        result.rendered.append(future.result())
+                        manifest[name] = jobs[name][0]
+                    except Exception as e:
+                        manifest.pop(name, None)
+                        result.errors[name] = str(e)
+
+            tmp_manifest = manifest_path.with_suffix(".json.tmp")
+            tmp_manifest.write_text(
+                json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8"
+            )
+            os.replace(tmp_manifest, manifest_path)
+
+        return result
+
+    def build_from_workflow(
+        self,
+        week: str,
+        results: dict[str, dict[str, Any]],
+        charts: dict[str, list[Path]] | None = None,
+    ) -> ReportBuildResult:
+        """
+        Build reports from ``WorkflowResult.results`` (stage results per ticker).
+
+        Args:
+            week: Report week identifier
+            results: Stage results per ticker
+            charts: Optional rendered chart files per ticker to embed (see ChartService)
+        """
+        week_dir = self.output_dir / week
+        documents = {}
+        for ticker, stages in results.items():
+            if "cio_synthesis" not in stages:
+                continue
+            document = build_report_document(ticker, week, stages)
+            if charts and charts.get(ticker):
+                document["charts"] = [os.path.relpath(path, week_dir) for path in charts[ticker]]
+            documents[ticker] = document
+        return self.build(week, documents)
@@ -0,0 +1,335 @@
+"""
+Weekly report read model.
+
+The research workflow writes one compact JSON document per ticker and per
+portfolio and ISO week to ``weekly_report_snapshots``; the reports API only
+reads them back. Serving a report is a single primary key lookup, listing a
+subject's weeks reads the primary key index without the documents, and two
+weeks are diffed here rather than by the client.
+
+Documents carry ``version`` (``SNAPSHOT_VERSION``): bump it when their shape
+changes. Stored documents are served as written, older versions included.
+"""
+
+import hashlib
+import json
+from datetime import date
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.weekly_report_snapshot import WeeklyReportSnapshot
+from app.services.report_service import build_report_document
+
+SNAPSHOT_VERSION = 1
+
+TICKER = "ticker"
+PORTFOLIO = "portfolio"
+KINDS = (TICKER, PORTFOLIO)
+
+# Portfolio snapshot written for runs over the whole watchlist
+WATCHLIST_PORTFOLIO = "watchlist"
+
+# Recommendations are kept whole in ticker documents, as a headline in portfolio ones
+HEADLINE_LENGTH = 200
+
+WEEK_PATTERN = r"^\d{4}-W\d{2}$"
+
+LISTED_COLUMNS = ("week", "version", "run_id", "fingerprint", "created_at", "updated_at")
+
+
+def report_week(day: date | None = None) -> str:
+    """ISO week of ``day`` (default today), e.g. ``2026-W42``."""
+    year, week, _ = (day or date.today()).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def snapshot_fingerprint(document: dict[str, Any]) -> str:
+    payload = json.dumps(document, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_ticker_document(ticker: str, week: str, stages: dict[str, Any]) -> dict[str, Any]:
+    """Snapshot document of one ticker (the report document, bars reduced to a hash)."""
+    return {"version": SNAPSHOT_VERSION, **build_report_document(ticker, week, stages)}
+
+
+def _weekly_return(stages: dict[str, Any]) -> float | None:
+    closes = [bar.get("close") for bar in stages.get("data_collection", {}).get("bars", [])[-6:]]
+    if len(closes) < 6 or not closes[0] or closes[-1] is None:
+        return None
+    return float(closes[-1]) / float(closes[0]) - 1
+
+
+def _mean(values: list[float | None]) -> float | None:
+    present = [value for value in values if value is not None]
+    return sum(present) / len(present) if present else None
+
+
+def build_portfolio_document(
+    portfolio: str, week: str, results: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """
+    Snapshot document of a portfolio: one summary line per holding plus totals.
+
+    Args:
+        portfolio: Portfolio name
+        week: ISO week
+        results: Stage results per ticker (``WorkflowResult.results``); tickers
+            without a CIO synthesis are listed as ``missing``
+
+    Returns:
+        Portfolio document with ``holdings`` keyed by ticker
+    """
+    holdings: dict[str, dict[str, Any]] = {}
+    missing = []
+    for ticker, stages in sorted(results.items()):
+        if "cio_synthesis" not in stages:
+            missing.append(ticker)
+            continue
+        bars = stages.get("data_collection", {}).get("bars", [])
+        risk = stages.get("risk_assessment") or {}
+        recommendation = str((stages.get("cio_synthesis") or {}).get("recommendation", ""))
+        holdings[ticker] = {
+            "last_close": bars[-1].get("close") if bars else None,
+            "return_1w": _weekly_return(stages),
+            "volatility": risk.get("volatility"),
+            "max_drawdown": risk.get("max_drawdown"),
+            "sentiment_score": (stages.get("sentiment_analysis") or {}).get("sentiment_score"),
+            "recommendation": recommendation.strip().split("\n", 1)[0][:HEADLINE_LENGTH],
+        }
+
+    returns = [holding["return_1w"] for holding in holdings.values()]
+    return {
+        "version": SNAPSHOT_VERSION,
+        "portfolio": portfolio,
+        "week": week,
+        "summary": {
+            "holdings": len(holdings),
+            "advancers": sum(1 for value in returns if value is not None and value > 0),
+            "decliners": sum(1 for value in returns if value is not None and value < 0),
+            "mean_return_1w": _mean(returns),
+            "mean_volatility": _mean([holding["volatility"] for holding in holdings.values()]),
+            "mean_sentiment": _mean([holding["sentiment_score"] for holding in holdings.values()]),
+        },
+        "holdings": holdings,
+        "missing": missing,
+    }
+
+
+def build_snapshots(
+    week: str, results: dict[str, dict[str, Any]], portfolio: str | None = None
+) -> list[tuple[str, str, dict[str, Any]]]:
+    """
+    Snapshot documents of a workflow run as (kind, subject, document) triples.
+
+    Args:
+        week: ISO week
+        results: Stage results per ticker; tickers without a CIO synthesis
+            get no ticker snapshot
+        portfolio: Name of the portfolio snapshot to build, None for none
+    """
+    snapshots = [
+        (TICKER, ticker, build_ticker_document(ticker, week, stages))
+        for ticker, stages in sorted(results.items())
+        if "cio_synthesis" in stages
+    ]
+    if portfolio is not None:
+        snapshots.append((PORTFOLIO, portfolio, build_portfolio_document(portfolio, week, results)))
+    return snapshots
+
+
+async def save_snapshots(
+    db: AsyncSession,
+    week: str,
+    run_id: str,
+    snapshots: list[tuple[str, str, dict[str, Any]]],
+) -> int:
+    """
+    Upsert snapshot documents in one statement (caller commits).
+
+    A stored document with the same fingerprint is left untouched, so rerunning
+    an unchanged week rewrites nothing.
+
+    Args:
+        db: Database session
+        week: ISO week
+        run_id: Workflow run that produced the documents
+        snapshots: (kind, subject, document) triples (see ``build_snapshots``)
+
+    Returns:
+        Number of snapshots written (inserted or changed)
+    """
+    if not snapshots:
+        return 0
+
+    stmt = insert(WeeklyReportSnapshot).values(
+        [
+            {
+                "kind": kind,
+                "subject": subject,
+                "week": week,
+                "version": document["version"],
+                "run_id": run_id,
+                "fingerprint": snapshot_fingerprint(document),
+                "document": document,
+            }
+            for kind, subject, document in snapshots
+        ]
+    )
+    upsert = stmt.on_conflict_do_update(
+        index_elements=["kind", "subject", "week"],
+        set_={
+            "version": stmt.excluded.version,
+            "run_id": stmt.excluded.run_id,
+            "fingerprint": stmt.excluded.fingerprint,
+            "document": stmt.excluded.document,
+            "updated_at": func.now(),
+        },
+        where=WeeklyReportSnapshot.fingerprint != stmt.excluded.fingerprint,
+    ).returning(WeeklyReportSnapshot.subject)
+    return len((await db.execute(upsert)).all())
+
+
+def _snapshot_dict(row: Any) -> dict[str, Any]:
+    return {
+        "kind": row.kind,
+        "subject": row.subject,
+        "week": row.week,
+        "version": row.version,
+        "run_id": row.run_id,
+        "fingerprint": row.fingerprint,
+        "created_at": row.created_at,
+        "updated_at": row.updated_at,
+        "document": row.document,
+    }
+
+
+async def get_snapshot(
+    db: AsyncSession, kind: str, subject: str, week: str
+) -> dict[str, Any] | None:
+    """Snapshot of ``subject`` for ``week`` (one primary key lookup), None if not written."""
+    query = select(WeeklyReportSnapshot).where(
+        WeeklyReportSnapshot.kind == kind,
+        WeeklyReportSnapshot.subject == subject,
+        WeeklyReportSnapshot.week == week,
+    )
+    row = (await db.execute(query)).scalar_one_or_none()
+    return _snapshot_dict(row) if row is not None else None
+
+
+async def list_snapshot_weeks(
+    db: AsyncSession,
+    kind: str,
+    subject: str,
+    limit: int = 52,
+    before: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Weeks with a snapshot of ``subject``, newest first, without their documents.
+
+    Args:
+        db: Database session
+        kind: ``ticker`` or ``portfolio``
+        subject: Ticker or portfolio name
+        limit: Maximum number of weeks
+        before: Only weeks before this ISO week (keyset pagination)
+
+    Returns:
+        List of dictionaries with the week, document version, run id,
+        fingerprint and timestamps
+    """
+    query = select(*(getattr(WeeklyReportSnapshot, column) for column in LISTED_COLUMNS)).where(
+        WeeklyReportSnapshot.kind == kind, WeeklyReportSnapshot.subject == subject
+    )
+    if before is not None:
+        query = query.where(WeeklyReportSnapshot.week < before)
+    query = query.order_by(WeeklyReportSnapshot.week.desc()).limit(limit)
+
+    rows = (await db.execute(query)).all()
+    return [dict(zip(LISTED_COLUMNS, row, strict=True)) for row in rows]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def diff_documents(base: Any, other: Any, path: str = "") -> list[dict[str, Any]]:
+    """
+    Changes from ``base`` to ``other``, recursing into objects.
+
+    Lists and scalars are compared as whole values. Each change has the
+    dotted ``path``, the ``base`` and ``other`` values (None when absent),
+    ``change`` (``added``, ``removed`` or ``changed``) and, between two
+    numbers, ``delta``.
+    """
+    if isinstance(base, dict) and isinstance(other, dict):
+        changes = []
+        for key in sorted(base.keys() | other.keys(), key=str):
+            key_path = f"{path}.{key}" if path else str(key)
+            if key not in other:
+                changes.append(
+                    {"path": key_path, "change": "removed", "base": base[key], "other": None}
+                )
+            elif key not in base:
+                changes.append(
+                    {"path": key_path, "change": "added", "base": None, "other": other[key]}
+                )
+            else:
+                changes.extend(diff_documents(base[key], other[key], key_path))
+        return changes
+
+    if base == other:
+        return []
+    change = {"path": path, "change": "changed", "base": base, "other": other}
+    if _is_number(base) and _is_number(other):
+        change["delta"] = other - base
+    return [change]
+
+
+async def diff_snapshots(
+    db: AsyncSession, kind: str, subject: str, base_week: str, week: str
+) -> dict[str, Any] | None:
+    """
+    Diff the snapshots of two weeks of ``subject`` in one query.
+
+    Args:
+        db: Database session
+        kind: ``ticker`` or ``portfolio``
+        subject: Ticker or portfolio name
+        base_week: ISO week diffed from
+        week: ISO week diffed to
+
+    Returns:
+        Dictionary with both weeks, their document versions and the changes
+        (see ``diff_documents``; the ``week`` field itself is left out), or
+        None if either week has no snapshot
+    """
+    query = select(
+        WeeklyReportSnapshot.week, WeeklyReportSnapshot.version, WeeklyReportSnapshot.document
+    ).where(
+        WeeklyReportSnapshot.kind == kind,
+        WeeklyReportSnapshot.subject == subject,
+        WeeklyReportSnapshot.week.in_([base_week, week]),
+    )
+    rows = {row.week: row for row in (await db.execute(query)).all()}
+    if base_week not in rows or week not in rows:
+        return None
+
+    base, other = rows[base_week], rows[week]
+    changes = [
+        change
+        for change in diff_documents(base.document, other.document)
+        if change["path"] != "week"
+    ]
+    return {
+        "kind": kind,
+        "subject": subject,
+        "base_week": base_week,
+        "week": week,
+        "base_version": base.version,
+        "version": other.version,
+        "changes": changes,
+    }
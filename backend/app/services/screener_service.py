@@ -0,0 +1,466 @@
+"""
+Stock screener over the latest-indicator snapshot.
+
+``indicator_snapshots`` holds one row per ticker with its current indicator
+values and watchlist metadata; ingestion refreshes a ticker's row after
+storing its bars (``refresh_snapshot``). Screens only ever query that table,
+so their cost depends on the number of tickers, not on the length of their
+history.
+
+Filters use a small expression language compiled to a single SQL WHERE
+clause::
+
+    rsi14 < 30 and close > ma60
+    sector in ('Technology', 'Semiconductors') and (close - ma20) / ma20 > 0.05
+    region = 'us' and not macd_hist < 0 and volatility is not null
+
+Field names are case-insensitive (``RSI14`` works); strings are quoted. Sorts
+are comma-separated fields, ``-`` for descending: ``-rsi14,ticker``.
+"""
+
+import operator
+import re
+from dataclasses import dataclass
+from datetime import date
+from functools import partial
+from typing import Any
+
+from sqlalchemy import Float, and_, func, literal, not_, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import config_loader
+from app.models.indicator_snapshot import IndicatorSnapshot
+from app.models.ticker_history import TickerHistory
+from app.services.adjustment_service import adjusted_column, adjustment_factors, join_adjustments
+from app.services.indicators import bollinger, macd, risk_metrics, rsi, sma
+
+# Trading days loaded per refresh: a 52-week range plus indicator warm-up
+SNAPSHOT_LOOKBACK = 300
+_WEEKS_52 = 252
+_VOLATILITY_WINDOW = 60
+
+# Screenable fields; the text ones only support =, != and in
+TEXT_FIELDS = ("ticker", "name", "sector", "region")
+NUMERIC_FIELDS = (
+    "market_cap",
+    "close",
+    "volume",
+    "change_1d",
+    "ma5",
+    "ma20",
+    "ma60",
+    "rsi14",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+    "bb_upper",
+    "bb_lower",
+    "volatility",
+    "high_52w",
+    "low_52w",
+)
+SNAPSHOT_FIELDS = ("ticker", "as_of", *TEXT_FIELDS[1:], *NUMERIC_FIELDS)
+
+MAX_LIMIT = 500
+
+
+class ScreenerSyntaxError(ValueError):
+    """Raised for an invalid filter or sort expression."""
+
+
+def compute_snapshot(closes: list[float], volumes: list[int]) -> dict[str, Any]:
+    """
+    Latest indicator values of a series of (adjusted) daily closes, oldest first.
+
+    Indicators without enough history are None.
+    """
+
+    def last(series: list[float | None]) -> float | None:
+        return series[-1] if series else None
+
+    line, signal_line, histogram = macd(closes)
+    upper, _, lower = bollinger(closes)
+    year = closes[-_WEEKS_52:]
+    return {
+        "close": closes[-1],
+        "volume": volumes[-1],
+        "change_1d": closes[-1] / closes[-2] - 1 if len(closes) > 1 and closes[-2] else None,
+        "ma5": last(sma(closes, 5)),
+        "ma20": last(sma(closes, 20)),
+        "ma60": last(sma(closes, 60)),
+        "rsi14": last(rsi(closes, 14)),
+        "macd": last(line),
+        "macd_signal": last(signal_line),
+        "macd_hist": last(histogram),
+        "bb_upper": last(upper),
+        "bb_lower": last(lower),
+        "volatility": risk_metrics(closes[-_VOLATILITY_WINDOW - 1 :])["volatility"],
+        "high_52w": max(year),
+        "low_52w": min(year),
+    }
+
+
+async def refresh_snapshot(db: AsyncSession, ticker: str) -> bool:
+    """
+    Recompute a ticker's snapshot row from its latest adjusted bars (caller commits).
+
+    Returns:
+        Whether the ticker had bars (otherwise no row is written)
+    """
+    factors = adjustment_factors([ticker])
+    query = join_adjustments(
+        select(
+            TickerHistory.date,
+            adjusted_column("close", factors),
+            adjusted_column("volume", factors),
+        ).select_from(TickerHistory),
+        factors,
+    )
+    query = (
+        query.where(TickerHistory.ticker == ticker)
+        .order_by(TickerHistory.date.desc())
+        .limit(SNAPSHOT_LOOKBACK)
+    )
+    rows = list((await db.execute(query)).tuples().all())
+    if not rows:
+        return False
+
+    rows.reverse()
+    stock = config_loader.watchlist_index.stocks.get(ticker)
+    values = {
+        "as_of": rows[-1][0],
+        "name": stock.name if stock else None,
+        "sector": stock.sector if stock else None,
+        "region": stock.region if stock else None,
+        "market_cap": stock.market_cap if stock else None,
+        **compute_snapshot([float(row[1]) for row in rows], [int(row[2]) for row in rows]),
+    }
+    stmt = insert(IndicatorSnapshot).values(ticker=ticker, **values)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["ticker"], set_={**values, "updated_at": func.now()}
+        )
+    )
+    return True
+
+
+# --- Expression language ---------------------------------------------------
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<string>'[^']*'|"[^"]*")
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op><=|>=|!=|<>|==|[-+*/(),<>=])
+    )""",
+    re.VERBOSE,
+)
+
+_KEYWORDS = {"and", "or", "not", "in", "is", "null"}
+# Deepest nesting of parentheses, unary minus and "not" a filter may use
+MAX_NESTING = 32
+_COMPARISONS = {"<", "<=", ">", ">=", "=", "==", "!=", "<>"}
+_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+
+@dataclass(frozen=True)
+class _Token:
+    kind: str  # number, string, name, op or end
+    value: str
+    position: int
+
+
+def _tokenize(text: str) -> list[_Token]:
+    tokens = []
+    position = 0
+    while text[position:].strip():
+        match = _TOKEN.match(text, position)
+        if match is None:
+            start = len(text) - len(text[position:].lstrip())
+            raise ScreenerSyntaxError(f"Unexpected character {text[start]!r} at position {start}")
+        kind = match.lastgroup or ""
+        value, start = match.group(kind), match.start(kind)
+        if kind == "name" and value.lower() in _KEYWORDS:
+            kind, value = "keyword", value.lower()
+        tokens.append(_Token(kind, value, start))
+        position = match.end()
+    tokens.append(_Token("end", "", len(text)))
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser producing SQLAlchemy clauses.
+
+    Each rule returns ``(kind, clause)`` with kind ``bool``, ``number`` or
+    ``text``, so type errors are reported before anything reaches the
+    database::
+
+        or_expr    := and_expr ("or" and_expr)*
+        and_expr   := not_expr ("and" not_expr)*
+        not_expr   := "not" not_expr | comparison
+        comparison := sum [op sum | ["not"] "in" "(" sum ("," sum)* ")" | "is" ["not"] "null"]
+        sum        := product (("+" | "-") product)*
+        product    := unary (("*" | "/") unary)*
+        unary      := "-" unary | number | string | field | "(" or_expr ")"
+
+    Nesting deeper than ``MAX_NESTING`` is a syntax error rather than a
+    ``RecursionError``.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.index = 0
+        self.depth = 0
+
+    @property
+    def token(self) -> _Token:
+        return self.tokens[self.index]
+
+    def error(self, message: str, token: _Token | None = None) -> ScreenerSyntaxError:
+        token = token or self.token
+        found = f"{token.value!r}" if token.kind != "end" else "end of expression"
+        return ScreenerSyntaxError(f"{message} at position {token.position} (found {found})")
+
+    def accept(self, kind: str, *values: str) -> _Token | None:
+        token = self.token
+        if token.kind == kind and (not values or token.value in values):
+            self.index += 1
+            return token
+        return None
+
+    def expect(self, kind: str, value: str) -> None:
+        if self.accept(kind, value) is None:
+            raise self.error(f"Expected {value!r}")
+
+    def nested(self, rule: Any, token: _Token) -> Any:
+        """Parse ``rule`` one nesting level below ``token`` (a "(", "-" or "not")."""
+        if self.depth >= MAX_NESTING:
+            raise self.error(f"Expression nested more than {MAX_NESTING} levels deep", token)
+        self.depth += 1
+        result = rule()
+        self.depth -= 1
+        return result
+
+    def parse_filter(self) -> Any:
+        start = self.token
+        kind, clause = self.or_expr()
+        if self.token.kind != "end":
+            raise self.error("Unexpected token")
+        if kind != "bool":
+            raise self.error("Filter must be a condition, not a value", start)
+        return clause
+
+    def boolean(self, rule: Any) -> Any:
+        token = self.token
+        kind, clause = rule()
+        if kind != "bool":
+            raise self.error("Expected a condition", token)
+        return clause
+
+    def or_expr(self) -> tuple[str, Any]:
+        return self.connective("or", self.and_expr, or_)
+
+    def and_expr(self) -> tuple[str, Any]:
+        return self.connective("and", self.not_expr, and_)
+
+    def connective(self, keyword: str, operand: Any, combine: Any) -> tuple[str, Any]:
+        start = self.token
+        kind, clause = operand()
+        if self.token.kind != "keyword" or self.token.value != keyword:
+            return kind, clause
+        if kind != "bool":
+            raise self.error("Expected a condition", start)
+        clauses = [clause]
+        while self.accept("keyword", keyword):
+            clauses.append(self.boolean(operand))
+        return "bool", combine(*clauses)
+
+    def not_expr(self) -> tuple[str, Any]:
+        if token := self.accept("keyword", "not"):
+            return "bool", not_(self.nested(partial(self.boolean, self.not_expr), token))
+        return self.comparison()
+
+    def comparison(self) -> tuple[str, Any]:
+        start = self.token
+        kind, left = self.sum()
+
+        if op := self.accept("op", *_COMPARISONS):
+            right_token = self.token
+            right_kind, right = self.sum()
+            self.check_operands(kind, right_kind, start, right_token)
+            if kind == "text" and op.value not in {"=", "==", "!=", "<>"}:
+                raise self.error("Text fields only support =, != and in", op)
+            if op.value in {"=", "=="}:
+                return "bool", left == right
+            if op.value in {"!=", "<>"}:
+                return "bool", left != right
+            return "bool", left.operate(_OPERATORS[op.value], right)
+
+        negated = False
+        if self.token.kind == "keyword" and self.token.value == "not":
+            if self.tokens[self.index + 1].value != "in":
+                return kind, left
+            self.index += 1
+            negated = True
+        if self.accept("keyword", "in"):
+            self.expect("op", "(")
+            items = []
+            while True:
+                item_token = self.token
+                item_kind, item = self.sum()
+                self.check_operands(kind, item_kind, start, item_token)
+                items.append(item)
+                if not self.accept("op", ","):
+                    break
+            self.expect("op", ")")
+            clause = left.in_(items)
+            return "bool", not_(clause) if negated else clause
+
+        if self.accept("keyword", "is"):
+            negated = self.accept("keyword", "not") is not None
+            self.expect("keyword", "null")
+            return "bool", left.is_not(None) if negated else left.is_(None)
+
+        return kind, left
+
+    def check_operands(
+        self, left: str, right: str, left_token: _Token, right_token: _Token
+    ) -> None:
+        if left == "bool":
+            raise self.error("Expected a value", left_token)
+        if right == "bool":
+            raise self.error("Expected a value", right_token)
+        if left != right:
+            raise self.error(f"Cannot compare {left} with {right}", right_token)
+
+    def sum(self) -> tuple[str, Any]:
+        return self.arithmetic(self.product, ("+", "-"))
+
+    def product(self) -> tuple[str, Any]:
+        return self.arithmetic(self.unary, ("*", "/"))
+
+    def arithmetic(self, operand: Any, operators: tuple[str, ...]) -> tuple[str, Any]:
+        start = self.token
+        kind, left = operand()
+        while op := self.accept("op", *operators):
+            right_token = self.token
+            right_kind, right = operand()
+            if kind != "number":
+                raise self.error("Arithmetic needs numbers", start)
+            if right_kind != "number":
+                raise self.error("Arithmetic needs numbers", right_token)
+            if op.value == "/":
+                # NULL instead of a division-by-zero error
+                right = func.nullif(right, 0, type_=Float)
+            left = left.operate(_OPERATORS[op.value], right)
+        return kind, left
+
+    def unary(self) -> tuple[str, Any]:
+        if op := self.accept("op", "-"):
+            kind, value = self.nested(self.unary, op)
+            if kind != "number":
+                raise self.error("Arithmetic needs numbers", op)
+            return "number", -value
+        if token := self.accept("number"):
+            return "number", literal(float(token.value))
+        if token := self.accept("string"):
+            return "text", literal(token.value[1:-1])
+        if token := self.accept("name"):
+            name = token.value.lower()
+            if name in TEXT_FIELDS:
+                return "text", getattr(IndicatorSnapshot, name)
+            if name in NUMERIC_FIELDS:
+                return "number", getattr(IndicatorSnapshot, name)
+            raise self.error("Unknown field", token)
+        if token := self.accept("op", "("):
+            result: tuple[str, Any] = self.nested(self.or_expr, token)
+            self.expect("op", ")")
+            return result
+        raise self.error("Expected a field, number or string")
+
+
+def compile_filter(expression: str) -> Any:
+    """
+    Compile a filter expression into a WHERE clause over ``indicator_snapshots``.
+
+    Raises:
+        ScreenerSyntaxError: If the expression is invalid
+    """
+    return _Parser(expression).parse_filter()
+
+
+def compile_sort(expression: str) -> list[Any]:
+    """
+    Compile a sort expression (``-rsi14,ticker``) into ORDER BY clauses.
+
+    NULLs sort last either way; ties are broken by ticker.
+
+    Raises:
+        ScreenerSyntaxError: If a field is unknown
+    """
+    order_by = []
+    names = []
+    for part in expression.split(","):
+        name = part.strip()
+        descending = name.startswith("-")
+        name = name.lstrip("+-").strip().lower()
+        if name not in SNAPSHOT_FIELDS:
+            raise ScreenerSyntaxError(f"Unknown sort field {part.strip()!r}")
+        column = getattr(IndicatorSnapshot, name)
+        order_by.append((column.desc() if descending else column.asc()).nulls_last())
+        names.append(name)
+    if "ticker" not in names:
+        order_by.append(IndicatorSnapshot.ticker.asc())
+    return order_by
+
+
+def build_screen_query(filter: str | None, sort: str | None, limit: int) -> Any:
+    """Single SELECT over ``indicator_snapshots`` for a screen."""
+    query = select(*(getattr(IndicatorSnapshot, name) for name in SNAPSHOT_FIELDS))
+    if filter and filter.strip():
+        query = query.where(compile_filter(filter))
+    return query.order_by(*compile_sort(sort or "ticker")).limit(limit)
+
+
+async def run_screen(
+    db: AsyncSession,
+    filter: str | None = None,
+    sort: str | None = None,
+    limit: int = 100,
+) -> dict[str, Any]:
+    """
+    Run a screen over the latest-indicator snapshot.
+
+    Args:
+        db: Database session
+        filter: Filter expression (all tickers if empty)
+        sort: Sort expression (defaults to ticker)
+        limit: Maximum number of rows
+
+    Returns:
+        Dictionary with the expressions, the matching rows and their as-of range
+
+    Raises:
+        ScreenerSyntaxError: If an expression is invalid
+    """
+    query = build_screen_query(filter, sort, min(limit, MAX_LIMIT))
+    rows = [dict(zip(SNAPSHOT_FIELDS, row, strict=True)) for row in (await db.execute(query)).all()]
+    as_of: list[date] = [row["as_of"] for row in rows]
+    return {
+        "filter": filter or "",
+        "sort": sort or "ticker",
+        "count": len(rows),
+        "oldest_as_of": min(as_of) if as_of else None,
+        "results": rows,
+    }
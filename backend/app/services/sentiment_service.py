@@ -0,0 +1,535 @@
+"""
+News sentiment pipeline: ingestion, near-duplicate suppression, batched scoring.
+
+Wire stories are syndicated many times over, so most articles of a ticker
+are copies of a few stories. Each article gets a MinHash signature of the
+word shingles of its title and summary; an article whose estimated Jaccard
+similarity to an earlier one of the same ticker (published within
+``dedup_window_days``) reaches ``similarity`` is a near-duplicate.
+Candidates are found through LSH banding, so an article is only compared
+with the few stories sharing a band of its signature.
+
+Only the first copy of a story is scored, by a pluggable model scoring
+texts in batches (``score_batch``, run in a worker thread); copies carry
+its score. Articles are stored in ``news_articles`` and the days touched by
+a run are re-aggregated into ``news_sentiment_daily``, so reruns only pay
+for articles they have not seen. Settings come from the ``news_sentiment``
+section of the watchlist YAML.
+"""
+
+import asyncio
+import hashlib
+import random
+import re
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Protocol
+
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import config_loader
+from app.models.news_article import NewsArticle
+from app.models.news_sentiment import NewsSentimentDaily
+
+# Scores within this band around 0 count as neither positive nor negative
+NEUTRAL_BAND = 0.05
+
+_TOKENS = re.compile(r"\w+(?:'\w+)?")
+# Modulus of the MinHash permutations (a Mersenne prime: values fit in BIGINT)
+_PRIME = (1 << 61) - 1
+
+
+@dataclass(frozen=True)
+class NewsSentimentPolicy:
+    model: str = "lexicon"
+    batch_size: int = 32
+    articles_per_ticker: int = 50
+    shingle_size: int = 3
+    num_perm: int = 64
+    bands: int = 16
+    similarity: float = 0.5
+    dedup_window_days: int = 3
+    lookback_days: int = 7
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "NewsSentimentPolicy":
+        """Build the policy from the ``news_sentiment`` YAML section."""
+        unknown = set(config) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown news_sentiment settings: {sorted(unknown)}")
+        policy = cls(**config)
+        counts = (
+            policy.batch_size,
+            policy.bands,
+            policy.articles_per_ticker,
+            policy.shingle_size,
+            policy.lookback_days,
+        )
+        if (
+            min(counts) < 1
+            or policy.num_perm % policy.bands
+            or not 0 < policy.similarity <= 1
+            or policy.dedup_window_days < 0
+        ):
+            raise ValueError(f"Invalid news_sentiment settings: {policy}")
+        return policy
+
+
+def news_sentiment_policy() -> NewsSentimentPolicy:
+    return NewsSentimentPolicy.from_config(config_loader.stock_watchlist.get("news_sentiment", {}))
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKENS.findall(text.lower())
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    """Word ``size``-grams of ``text`` (the whole text if it is shorter)."""
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+@lru_cache(maxsize=4)
+def _permutations(num_perm: int) -> tuple[tuple[int, int], ...]:
+    # Fixed seed: signatures stored by earlier runs must stay comparable
+    rng = random.Random(0x5EED)
+    return tuple((rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm))
+
+
+def minhash(text: str, shingle_size: int = 3, num_perm: int = 64) -> list[int]:
+    """MinHash signature of the word shingles of ``text`` (``num_perm`` values)."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for shingle in shingles(text, shingle_size)
+    ]
+    if not hashes:
+        return [_PRIME] * num_perm
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _permutations(num_perm)]
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Jaccard similarity of two texts estimated from their MinHash signatures."""
+    return sum(x == y for x, y in zip(a, b, strict=True)) / len(a)
+
+
+class MinHashIndex:
+    """
+    MinHash signatures indexed by LSH band, for near-duplicate lookups.
+
+    Signatures are split into ``bands`` bands; only signatures agreeing on a
+    whole band are compared. Pairs at the Jaccard similarity
+    ``(1 / bands) ** (1 / rows)`` (0.5 with 64 values in 16 bands) collide
+    with probability ~0.65, more similar pairs almost surely.
+    """
+
+    def __init__(self, bands: int = 16):
+        self.bands = bands
+        self._buckets: dict[tuple[int, tuple[int, ...]], list[tuple[list[int], Any]]] = defaultdict(
+            list
+        )
+
+    def _keys(self, signature: list[int]) -> list[tuple[int, tuple[int, ...]]]:
+        rows = len(signature) // self.bands
+        return [
+            (band, tuple(signature[band * rows : (band + 1) * rows])) for band in range(self.bands)
+        ]
+
+    def add(self, signature: list[int], value: Any) -> None:
+        """Index ``signature`` with ``value`` (hashable, returned by ``query``)."""
+        for key in self._keys(signature):
+            self._buckets[key].append((signature, value))
+
+    def query(self, signature: list[int], threshold: float) -> list[Any]:
+        """Values of the signatures at least ``threshold`` similar, most similar first."""
+        matches: dict[Any, float] = {}
+        for key in self._keys(signature):
+            for candidate, value in self._buckets.get(key, ()):
+                if value not in matches:
+                    matches[value] = similarity(signature, candidate)
+        return sorted(
+            (value for value, score in matches.items() if score >= threshold),
+            key=matches.__getitem__,
+            reverse=True,
+        )
+
+
+class SentimentModel(Protocol):
+    """Scores texts from -1 (negative) to 1 (positive)."""
+
+    name: str
+
+    def score_batch(self, texts: list[str]) -> list[float]: ...
+
+
+class LexiconSentimentModel:
+    """
+    Offline baseline: counts finance-specific positive and negative words.
+
+    A negation ("not", "no", "n't" ...) flips the polarity of the next
+    ``NEGATION_SCOPE`` words. The score is ``(pos - neg) / (pos + neg + 1)``,
+    so a single hit is a weaker signal than several agreeing ones.
+    """
+
+    name = "lexicon"
+
+    POSITIVE = frozenset("""
+        beat beats boost boosted booming breakthrough bullish buy climb climbs climbed
+        gain gains gained growth improve improved improves jump jumps jumped outperform
+        outperformed optimistic profit profitable rally rallies rallied rebound record
+        recover recovery rise rises rising soar soars soared strong stronger surge surged
+        surges upgrade upgraded upgrades upbeat upside win wins expand expansion exceeds
+        exceeded robust momentum positive raises raised
+        """.split())
+    NEGATIVE = frozenset("""
+        bearish crash crashed decline declined declines cut cuts delay delayed downgrade
+        downgraded downgrades drop dropped drops fall falls fell fraud investigation lawsuit
+        loss losses miss missed misses plunge plunged plunges probe recall recession risk
+        risks selloff shortfall slump slumped slowdown sink sinks sank tumble tumbled
+        tumbles underperform warning warns weak weaker layoffs bankruptcy default concern
+        concerns negative lowered lowers
+        """.split())
+    NEGATIONS = frozenset({"not", "no", "never", "without", "neither", "nor"})
+    NEGATION_SCOPE = 3
+
+    def score(self, text: str) -> float:
+        positive = negative = 0
+        negated = 0
+        for token in tokenize(text):
+            if token in self.NEGATIONS or token.endswith("n't"):
+                negated = self.NEGATION_SCOPE
+                continue
+            polarity = (token in self.POSITIVE) - (token in self.NEGATIVE)
+            if negated:
+                polarity = -polarity
+                negated -= 1
+            positive += polarity > 0
+            negative += polarity < 0
+        return (positive - negative) / (positive + negative + 1)
+
+    def score_batch(self, texts: list[str]) -> list[float]:
+        return [self.score(text) for text in texts]
+
+
+MODELS: dict[str, Callable[[], SentimentModel]] = {"lexicon": LexiconSentimentModel}
+
+
+def load_model(spec: str) -> SentimentModel:
+    """
+    Instantiate a sentiment model.
+
+    Args:
+        spec: A name of ``MODELS`` or ``"package.module:Class"`` (e.g. a local
+            transformer wrapper), built without arguments
+
+    Raises:
+        ValueError: If ``spec`` names no model, or an object without ``score_batch``
+    """
+    if spec in MODELS:
+        return MODELS[spec]()
+    module_path, _, attribute = spec.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown sentiment model: {spec}")
+    factory: Callable[[], SentimentModel] = getattr(import_module(module_path), attribute)
+    model = factory()
+    if not callable(getattr(model, "score_batch", None)):
+        raise ValueError(f"Not a sentiment model: {spec}")
+    return model
+
+
+async def score_texts(model: SentimentModel, texts: list[str], batch_size: int) -> list[float]:
+    """Score ``texts`` with ``model``, ``batch_size`` at a time, in a worker thread."""
+    scores: list[float] = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start : start + batch_size]
+        batch_scores = await asyncio.to_thread(model.score_batch, batch)
+        if len(batch_scores) != len(batch):
+            raise ValueError(
+                f"Sentiment model {model.name} returned {len(batch_scores)} scores "
+                f"for {len(batch)} texts"
+            )
+        scores.extend(max(-1.0, min(1.0, float(score))) for score in batch_scores)
+    return scores
+
+
+def article_text(article: dict[str, Any]) -> str:
+    return f"{article['title']} {article.get('summary') or ''}".strip()
+
+
+def _day(moment: datetime) -> date:
+    return moment.astimezone(timezone.utc).date()
+
+
+async def ingest_articles(
+    db: AsyncSession,
+    ticker: str,
+    articles: Iterable[dict[str, Any]],
+    model: SentimentModel,
+    policy: NewsSentimentPolicy | None = None,
+) -> dict[str, Any]:
+    """
+    Store the new articles of ``ticker`` and refresh the days they fall on.
+
+    Articles already stored are skipped. The rest are deduplicated against
+    each other and against the ticker's stored stories of the dedup window,
+    unique ones are scored in batches, and everything is committed at once.
+
+    Args:
+        db: Database session
+        ticker: Ticker the articles are about
+        articles: Normalized articles (see ``app.tools.news_scraper``)
+        model: Sentiment model scoring unique articles
+        policy: Pipeline settings (default: ``news_sentiment`` in the YAML)
+
+    Returns:
+        Counts of articles received, new, duplicates and scored, and the
+        days refreshed
+    """
+    policy = policy or news_sentiment_policy()
+    received = {article["id"]: article for article in articles}
+    result: dict[str, Any] = {
+        "ticker": ticker,
+        "articles": len(received),
+        "new": 0,
+        "duplicates": 0,
+        "scored": 0,
+        "days": [],
+    }
+    if not received:
+        return result
+
+    stored = await db.execute(
+        select(NewsArticle.article_id).where(
+            NewsArticle.ticker == ticker, NewsArticle.article_id.in_(list(received))
+        )
+    )
+    known = {row.article_id for row in stored.all()}
+    new = sorted(
+        (article for article_id, article in received.items() if article_id not in known),
+        key=lambda article: article["published_at"],
+    )
+    if not new:
+        return result
+
+    # Stories already stored that the new articles may be copies of
+    window = timedelta(days=policy.dedup_window_days)
+    index = MinHashIndex(policy.bands)
+    scores: dict[str, float] = {}
+    canonical = await db.execute(
+        select(
+            NewsArticle.article_id,
+            NewsArticle.signature,
+            NewsArticle.published_at,
+            NewsArticle.score,
+        ).where(
+            NewsArticle.ticker == ticker,
+            NewsArticle.duplicate_of.is_(None),
+            NewsArticle.published_at >= new[0]["published_at"] - window,
+        )
+    )
+    for row in canonical.all():
+        index.add(list(row.signature), (row.article_id, row.published_at))
+        scores[row.article_id] = row.score
+
+    records: list[dict[str, Any]] = []
+    unique: list[tuple[dict[str, Any], str]] = []
+    for article in new:
+        text = article_text(article)
+        signature = minhash(text, policy.shingle_size, policy.num_perm)
+        original = next(
+            (
+                article_id
+                for article_id, published_at in index.query(signature, policy.similarity)
+                if abs(article["published_at"] - published_at) <= window
+            ),
+            None,
+        )
+        record = {
+            "ticker": ticker,
+            "article_id": article["id"],
+            "published_at": article["published_at"],
+            "title": article["title"],
+            "publisher": (article.get("publisher") or "")[:100] or None,
+            "url": article.get("url"),
+            "signature": signature,
+            "duplicate_of": original,
+            "model": model.name,
+        }
+        if original is None:
+            index.add(signature, (article["id"], article["published_at"]))
+            unique.append((record, text))
+        records.append(record)
+
+    unique_scores = await score_texts(model, [text for _, text in unique], policy.batch_size)
+    for (record, _), score in zip(unique, unique_scores, strict=True):
+        scores[record["article_id"]] = score
+    for record in records:
+        record["score"] = scores[record["duplicate_of"] or record["article_id"]]
+
+    await db.execute(
+        insert(NewsArticle)
+        .values(records)
+        .on_conflict_do_nothing(index_elements=["ticker", "article_id"])
+    )
+    days = sorted({_day(record["published_at"]) for record in records})
+    await refresh_daily_sentiment(db, ticker, days)
+    await db.commit()
+
+    result.update(
+        new=len(records),
+        duplicates=len(records) - len(unique),
+        scored=len(unique),
+        days=days,
+    )
+    return result
+
+
+async def refresh_daily_sentiment(db: AsyncSession, ticker: str, days: list[date]) -> None:
+    """Recompute the ``news_sentiment_daily`` rows of ``ticker`` for ``days`` (UTC)."""
+    if not days:
+        return
+    day = cast(func.timezone("UTC", NewsArticle.published_at), Date)
+    unique = NewsArticle.duplicate_of.is_(None)
+    query = (
+        select(
+            NewsArticle.ticker,
+            day,
+            func.count(),
+            func.count().filter(unique),
+            func.coalesce(func.sum(NewsArticle.score).filter(unique), 0.0),
+            func.coalesce(func.avg(NewsArticle.score).filter(unique), 0.0),
+            func.count().filter(unique & (NewsArticle.score > NEUTRAL_BAND)),
+            func.count().filter(unique & (NewsArticle.score < -NEUTRAL_BAND)),
+        )
+        .where(
+            NewsArticle.ticker == ticker,
+            # Range on the indexed column first, then the exact days
+            NewsArticle.published_at >= datetime.combine(min(days), time(), timezone.utc),
+            NewsArticle.published_at
+            < datetime.combine(max(days) + timedelta(days=1), time(), timezone.utc),
+            day.in_(days),
+        )
+        .group_by(NewsArticle.ticker, day)
+    )
+    columns = [
+        "ticker",
+        "date",
+        "articles",
+        "unique_articles",
+        "score_sum",
+        "sentiment",
+        "positive",
+        "negative",
+    ]
+    stmt = insert(NewsSentimentDaily).from_select(columns, query)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ticker", "date"],
+        set_={
+            **{column: stmt.excluded[column] for column in columns[2:]},
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def run_news_sentiment(
+    session_factory: async_sessionmaker[AsyncSession],
+    tickers: list[str] | None = None,
+    scraper: Any = None,
+    model: SentimentModel | None = None,
+    policy: NewsSentimentPolicy | None = None,
+) -> dict[str, Any]:
+    """
+    Fetch, deduplicate, score and aggregate the news of ``tickers``.
+
+    Args:
+        session_factory: Sessions to store each ticker's articles with
+        tickers: Tickers (default: the watchlist stocks)
+        scraper: Article source with an async ``fetch(ticker)`` (default:
+            ``NewsScraperTool``)
+        model: Sentiment model (default: ``policy.model``)
+        policy: Pipeline settings (default: ``news_sentiment`` in the YAML)
+
+    Returns:
+        Dictionary with success, message, per-step counts and errors
+    """
+    policy = policy or news_sentiment_policy()
+    tickers = tickers or config_loader.get_watchlist_symbols()
+    if scraper is None:
+        from app.tools.news_scraper import NewsScraperTool
+
+        scraper = NewsScraperTool(count=policy.articles_per_ticker)
+    model = model or load_model(policy.model)
+
+    totals = {"articles": 0, "new": 0, "duplicates": 0, "scored": 0}
+    errors: list[str] = []
+    processed = 0
+    for ticker in tickers:
+        try:
+            articles = await scraper.fetch(ticker)
+            async with session_factory() as db:
+                result = await ingest_articles(db, ticker, articles, model, policy)
+        except Exception as e:
+            errors.append(f"{ticker}: {e}")
+            continue
+        processed += 1
+        for key in totals:
+            totals[key] += result[key]
+
+    return {
+        "success": not errors,
+        "message": (
+            f"Scored {totals['scored']} unique of {totals['new']} new articles "
+            f"for {processed}/{len(tickers)} tickers"
+        ),
+        "tickers_processed": processed,
+        "model": model.name,
+        **totals,
+        "errors": errors,
+    }
+
+
+async def sentiment_summary(
+    db: AsyncSession, ticker: str, lookback_days: int | None = None, today: date | None = None
+) -> dict[str, Any]:
+    """
+    News sentiment of ``ticker`` over the last ``lookback_days`` days.
+
+    The score is the mean over unique stories; ``available`` is False when
+    no story was scored in the window, so callers never mistake missing news
+    for neutral sentiment.
+    """
+    if lookback_days is None:
+        lookback_days = news_sentiment_policy().lookback_days
+    since = (today or date.today()) - timedelta(days=lookback_days - 1)
+    result = await db.execute(
+        select(NewsSentimentDaily)
+        .where(NewsSentimentDaily.ticker == ticker, NewsSentimentDaily.date >= since)
+        .order_by(NewsSentimentDaily.date.asc())
+    )
+    days = result.scalars().all()
+    unique = sum(day.unique_articles for day in days)
+    return {
+        "sentiment_score": sum(day.score_sum for day in days) / unique if unique else None,
+        "articles": sum(day.articles for day in days),
+        "unique_articles": unique,
+        "positive": sum(day.positive for day in days),
+        "negative": sum(day.negative for day in days),
+        "daily": [
+            {
+                "date": day.date.isoformat(),
+                "sentiment": day.sentiment,
+                "articles": day.articles,
+                "unique_articles": day.unique_articles,
+            }
+            for day in days
+        ],
+        "available": unique > 0,
+    }
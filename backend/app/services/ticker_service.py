@@ -1,97 +1,437 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
 from typing import Any
+from zoneinfo import ZoneInfo
 
-import yfinance as yf
-from sqlalchemy import func, select
+from sqlalchemy import Float, cast, delete, func, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.core.change_listener import notify_ticker_change
+from app.models.closed_session import ClosedSession
+from app.models.pending_raw_backfill import PendingRawBackfill
+from app.models.quarantined_bar import QuarantinedBar
 from app.models.ticker_history import TickerHistory
+from app.services.adjustment_service import (
+    adjusted_column,
+    adjustment_factors,
+    join_adjustments,
+    refresh_adjustments,
+    split_multipliers,
+)
+from app.services.bar_service import invalidate_bars
+from app.services.ingest_writer import IngestWriter, bar_upsert
+from app.services.market_calendar import TradingCalendar, calendar_for
+from app.services.market_data import batch_history_fetcher, history_fetcher
+from app.services.provider_governor import NoDataError, ProviderGovernor, get_governor
+from app.services.screener_service import refresh_snapshot
+
+
+async def _missing_sessions(
+    db: AsyncSession,
+    ticker: str,
+    period: str,
+    calendar: TradingCalendar,
+    now: datetime | None = None,
+) -> list[date] | None:
+    """
+    Sessions of ``period`` a ticker has no final bar for (None: nothing stored yet).
+
+    Only the span from the ticker's first stored bar onwards is considered, so
+    refreshes never re-request history the provider does not have. Bars
+    stored before their session closed (partial bars) count as missing;
+    quarantined days and sessions the provider had no bar for
+    (``closed_sessions``) count as present.
+    """
+    first_stored = await db.scalar(
+        select(func.min(TickerHistory.date)).where(TickerHistory.ticker == ticker)
+    )
+    if first_stored is None:
+        return None
+
+    end = calendar.last_completed_session(now)
+    if end is None:
+        return []
+    start = max(calendar.period_start(period, end) or first_stored, first_stored)
+    if start > end:
+        return []
+
+    stored = await db.execute(
+        select(TickerHistory.date, TickerHistory.updated_at).where(
+            TickerHistory.ticker == ticker,
+            TickerHistory.date >= start,
+            TickerHistory.date <= end,
+        )
+    )
+    zone = ZoneInfo(calendar.exchange.timezone)
+    present = {
+        day
+        for day, updated_at in stored.tuples().all()
+        if updated_at is None
+        or updated_at.replace(tzinfo=updated_at.tzinfo or timezone.utc)
+        >= datetime.combine(day, calendar.exchange.session_close, zone)
+    }
+    accounted = await db.execute(
+        select(QuarantinedBar.date)
+        .where(
+            QuarantinedBar.ticker == ticker,
+            QuarantinedBar.date >= start,
+            QuarantinedBar.date <= end,
+        )
+        .union_all(
+            select(ClosedSession.date).where(
+                ClosedSession.ticker == ticker,
+                ClosedSession.date >= start,
+                ClosedSession.date <= end,
+            )
+        )
+    )
+    present.update(accounted.scalars().all())
+    return calendar.missing_sessions(present, start, end)
+
+
+async def _pending_raw_backfills(db: AsyncSession, tickers: list[str]) -> set[str]:
+    """Tickers of ``tickers`` whose history awaits a raw backfill."""
+    return {
+        ticker
+        for (ticker,) in (
+            await db.execute(
+                select(PendingRawBackfill.ticker).where(PendingRawBackfill.ticker.in_(tickers))
+            )
+        ).tuples()
+    }
+
+
+async def prefetch_full_histories(
+    db: AsyncSession,
+    tickers: list[str],
+    period: str = "1y",
+    full_refresh: bool = False,
+    governor: ProviderGovernor | None = None,
+    pending_raw: set[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Download together the whole periods ``fetch_and_store_ticker_data`` would fetch.
+
+    These are the tickers without stored bars or pending a raw backfill, or
+    all of them with ``full_refresh``. Only providers that multiplex
+    requests (``yahoo_http``) batch them, and only for two tickers or more;
+    otherwise nothing is prefetched and each ticker is downloaded on its own.
+
+    Args:
+        db: Database session
+        tickers: Ticker symbols about to be fetched
+        period: Data period (1d,5d,1mo,3mo,6mo,1y,2y,5y,10y,ytd,max)
+        full_refresh: Download the whole period even if bars are stored
+        governor: Provider governor (defaults to the process-wide one)
+        pending_raw: Tickers pending a raw backfill (default: looked up)
+
+    Returns:
+        DataFrame (or the exception raised) per prefetched ticker
+    """
+    fetch_many = batch_history_fetcher()
+    if fetch_many is None or len(tickers) < 2:
+        return {}
+
+    if pending_raw is None:
+        pending_raw = await _pending_raw_backfills(db, tickers)
+    stored = {
+        ticker
+        for (ticker,) in (
+            await db.execute(
+                select(TickerHistory.ticker)
+                .where(TickerHistory.ticker.in_(tickers))
+                .group_by(TickerHistory.ticker)
+            )
+        ).tuples()
+    }
+    full = [
+        ticker
+        for ticker in tickers
+        if full_refresh or ticker in pending_raw or ticker not in stored
+    ]
+    if len(full) < 2:
+        return {}
+    return await fetch_many(full, governor or get_governor(), period=period)
 
 
 async def fetch_and_store_ticker_data(
     db: AsyncSession,
     tickers: list[str] | None = None,
     period: str = "1y",
+    full_refresh: bool = False,
+    now: datetime | None = None,
+    writer: IngestWriter | None = None,
+    prefetched: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """
-    Fetch ticker historical data from yfinance and store in database.
+    Fetch ticker historical data from the market data provider and store in database.
+
+    A ticker that already has bars is refreshed incrementally: only the
+    sessions of ``period`` it is missing (per its exchange's trading
+    calendar) are requested, as one call per run of consecutive missing
+    sessions, and a ticker whose market has had no session since its last
+    bar is skipped without calling the provider. Tickers without bars, and
+    all tickers with ``full_refresh``, download the whole period; so does a
+    ticker pending a raw backfill (history stored adjusted by the provider,
+    see ``PendingRawBackfill``), once. With a provider that multiplexes
+    requests (``yahoo_http``), the whole-period downloads of several tickers
+    are requested together up front (see ``prefetch_full_histories``).
+
+    With a ``writer``, bars are group-committed together with other
+    producers' (see ``ingest_writer``): quarantined rows are committed
+    first, and the derived data (cached bars, adjustments, screener row)
+    once the bars are. Without one, everything for a ticker is committed in
+    one transaction. The transaction of the derived data also publishes the
+    changed date range to the API workers' caches (see ``change_listener``);
+    with a writer, so does the transaction of the bars.
 
     Args:
         db: Database session
         tickers: List of ticker symbols (defaults to settings.TICKERS)
         period: Data period (1d,5d,1mo,3mo,6mo,1y,2y,5y,10y,ytd,max)
+        full_refresh: Download the whole period even if bars are stored
+        now: Current time (defaults to now), for the exchanges' last sessions
+        writer: Group-commit writer for the bars (default: write them directly)
+        prefetched: Whole-period downloads already made, per ticker (DataFrame
+            or the exception raised), as returned by ``prefetch_full_histories``;
+            by default they are made here
 
     Returns:
-        Dictionary with operation results
+        Dictionary with operation results, including per-ticker data-quality
+        stats (see ``data_quality.QualityReport``)
     """
+    # Imported here rather than at module level: data_quality pulls in pandas,
+    # and every API worker and CLI would otherwise pay for it at startup.
+    from app.services.data_quality import (
+        QualityReport,
+        quality_policy,
+        quarantine_bars,
+        validate_bars,
+    )
+
     if tickers is None:
         tickers = settings.ticker_list
 
     records_created = 0
     records_updated = 0
+    records_quarantined = 0
+    tickers_up_to_date = 0
+    sessions_missing = 0
+    sessions_unfilled = 0
+    quality: dict[str, dict[str, Any]] = {}
     errors = []
+    policy = quality_policy()
+    governor = get_governor()
+    fetch_history = history_fetcher()
+    pending_raw = await _pending_raw_backfills(db, tickers)
+    # Whole-period downloads fetched in one batch, per ticker (or the error raised)
+    if prefetched is None:
+        prefetched = await prefetch_full_histories(
+            db, tickers, period, full_refresh, governor, pending_raw
+        )
+    else:
+        prefetched = dict(prefetched)
 
     for ticker_symbol in tickers:
         try:
-            # Fetch data from yfinance
-            ticker = yf.Ticker(ticker_symbol)
-            hist = ticker.history(period=period)
+            calendar = calendar_for(ticker_symbol)
+            missing = (
+                None
+                if full_refresh or ticker_symbol in pending_raw or ticker_symbol in prefetched
+                else await _missing_sessions(db, ticker_symbol, period, calendar, now)
+            )
+            if missing == []:
+                tickers_up_to_date += 1
+                continue
+
+            # Fetch data from the configured provider (yfinance by default).
+            # Unadjusted prices: adjustments are applied on read from price_adjustments
+            frames = []
+            # Missing sessions the provider returned a bar for
+            refetched: list[date] = []
+            if missing is None:
+                try:
+                    if ticker_symbol in prefetched:
+                        hist = prefetched.pop(ticker_symbol)
+                        if isinstance(hist, BaseException):
+                            raise hist
+                    else:
+                        hist = await governor.call(
+                            partial(fetch_history, ticker_symbol, period=period),
+                            symbol=ticker_symbol,
+                            empty=lambda frame: frame.empty,
+                        )
+                except NoDataError:
+                    errors.append(f"{ticker_symbol}: No data available")
+                    continue
+                frames.append(hist.fillna({"Dividends": 0.0, "Stock Splits": 0.0}))
+            else:
+                sessions_missing += len(missing)
+                latest = calendar.last_completed_session(now)
+                closed = []
+                for first, last in calendar.session_runs(missing):
+                    # No ``empty`` check: a run the provider has no bars for
+                    # (an unlisted holiday) must not mark the symbol as dataless
+                    hist = await governor.call(
+                        partial(
+                            fetch_history, ticker_symbol, start=first, end=last + timedelta(days=1)
+                        ),
+                        symbol=ticker_symbol,
+                    )
+                    fetched = set(hist.index.date)
+                    for day in calendar.sessions(first, last):
+                        if day in fetched:
+                            refetched.append(day)
+                        else:
+                            sessions_unfilled += 1
+                            # The latest session's bar may just not be published yet
+                            if day != latest:
+                                closed.append(day)
+                    if not hist.empty:
+                        frames.append(hist.fillna({"Dividends": 0.0, "Stock Splits": 0.0}))
+
+                if closed:
+                    # Not requested again (see _missing_sessions)
+                    await db.execute(
+                        insert(ClosedSession)
+                        .values([{"ticker": ticker_symbol, "date": day} for day in closed])
+                        .on_conflict_do_nothing()
+                    )
 
-            if hist.empty:
-                errors.append(f"{ticker_symbol}: No data available")
+            if not frames:
+                await db.commit()
                 continue
 
-            # Process each row of historical data
-            for date_idx, row in hist.iterrows():
-                # Convert pandas Timestamp to date
-                trade_date = date_idx.date()
-
-                # Prepare data for upsert
-                data = {
-                    "ticker": ticker_symbol,
-                    "date": trade_date,
-                    "open": float(row["Open"]),
-                    "high": float(row["High"]),
-                    "low": float(row["Low"]),
-                    "close": float(row["Close"]),
-                    "volume": int(row["Volume"]),
-                    "dividends": float(row.get("Dividends", 0)),
-                    "stock_splits": float(row.get("Stock Splits", 0)),
-                    "updated_at": datetime.utcnow(),
-                }
-
-                # Use PostgreSQL upsert (ON CONFLICT DO UPDATE)
-                stmt = insert(TickerHistory).values(**data)
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["ticker", "date"],
-                    set_={
-                        "open": stmt.excluded.open,
-                        "high": stmt.excluded.high,
-                        "low": stmt.excluded.low,
-                        "close": stmt.excluded.close,
-                        "volume": stmt.excluded.volume,
-                        "dividends": stmt.excluded.dividends,
-                        "stock_splits": stmt.excluded.stock_splits,
-                        "updated_at": stmt.excluded.updated_at,
-                    },
+            # Splits after a frame scale its prices too: they are on stored
+            # rows, or in a later frame
+            splits_after = {
+                day: float(ratio)
+                for day, ratio in (
+                    await db.execute(
+                        select(TickerHistory.date, TickerHistory.stock_splits).where(
+                            TickerHistory.ticker == ticker_symbol, TickerHistory.stock_splits > 0
+                        )
+                    )
+                ).tuples()
+                if ratio
+            }
+            for hist in frames:
+                for day, ratio in zip(hist.index.date, hist.get("Stock Splits", []), strict=False):
+                    if ratio:
+                        splits_after[day] = float(ratio)
+
+            report = QualityReport(ticker=ticker_symbol)
+            # First day whose bar was inserted or changed (invalidates cached bars)
+            first_changed = None
+            last_changed = None
+
+            for hist in frames:
+                frame_end = hist.index[-1].date()
+                later = 1.0
+                for day, ratio in splits_after.items():
+                    if day > frame_end:
+                        later *= ratio
+
+                # Yahoo's prices are still split-adjusted; undo it so stored rows stay raw.
+                # Computed over every row so a quarantined split day still counts.
+                splits = hist["Stock Splits"].tolist() if "Stock Splits" in hist else []
+                multipliers = split_multipliers(splits) if splits else [1.0] * len(hist)
+                multipliers = [multiplier * later for multiplier in multipliers]
+
+                # Bad rows are quarantined; the clean ones are still stored
+                clean, rejected, frame_report = validate_bars(
+                    ticker_symbol, hist, policy, calendar.exchange.week_start, calendar.holidays
+                )
+                report.extend(frame_report)
+                await quarantine_bars(db, ticker_symbol, rejected, hist.index[0].date(), frame_end)
+                records_quarantined += len(rejected)
+
+                # Prepare the clean rows for upsert
+                rows = [
+                    {
+                        "ticker": ticker_symbol,
+                        "date": date_idx.date(),
+                        "open": float(row["Open"]) * multiplier,
+                        "high": float(row["High"]) * multiplier,
+                        "low": float(row["Low"]) * multiplier,
+                        "close": float(row["Close"]) * multiplier,
+                        "volume": round(int(row["Volume"]) / multiplier),
+                        "dividends": float(row.get("Dividends", 0)) * multiplier,
+                        "stock_splits": float(row.get("Stock Splits", 0)),
+                        "updated_at": datetime.utcnow(),
+                    }
+                    for is_clean, multiplier, (date_idx, row) in zip(
+                        clean, multipliers, hist.iterrows(), strict=True
+                    )
+                    if is_clean
+                ]
+
+                if writer is not None:
+                    # Committed first so the session gives its connection back
+                    # to the pool while waiting for the writer, which needs one
+                    await db.commit()
+                    written = await writer.write(rows)
+                    records_created += written.created
+                    records_updated += written.updated
+                    if ticker_symbol in written.first_changed:
+                        trade_date = written.first_changed[ticker_symbol]
+                        first_changed = min(first_changed or trade_date, trade_date)
+                        frame_last = max(data["date"] for data in rows)
+                        last_changed = max(last_changed or frame_last, frame_last)
+                    continue
+
+                for data in rows:
+                    # Use PostgreSQL upsert (ON CONFLICT DO UPDATE)
+                    result = await db.execute(bar_upsert(data))
+
+                    # Check if it was an insert or update
+                    if result.rowcount > 0:
+                        trade_date = data["date"]
+                        first_changed = min(first_changed or trade_date, trade_date)
+                        last_changed = max(last_changed or trade_date, trade_date)
+                        # Check if the record existed before
+                        check_stmt = select(TickerHistory).where(
+                            TickerHistory.ticker == ticker_symbol,
+                            TickerHistory.date == trade_date,
+                        )
+                        existing = await db.execute(check_stmt)
+                        if existing.scalar_one_or_none():
+                            records_updated += 1
+                        else:
+                            records_created += 1
+
+            quality[ticker_symbol] = report.as_dict()
+
+            if refetched:
+                # A partial bar whose final values are the same is skipped by the
+                # upsert; mark it final so it is not requested again
+                await db.execute(
+                    update(TickerHistory)
+                    .where(TickerHistory.ticker == ticker_symbol, TickerHistory.date.in_(refetched))
+                    .values(updated_at=func.now())
                 )
 
-                result = await db.execute(stmt)
+            if first_changed is not None:
+                await invalidate_bars(db, ticker_symbol, first_changed)
+                adjusted_since = await refresh_adjustments(db, ticker_symbol, first_changed)
+                if adjusted_since is not None:
+                    await invalidate_bars(db, ticker_symbol, adjusted_since, adjusted_only=True)
+                # Delivered to the API workers' caches when this transaction commits
+                await notify_ticker_change(
+                    db, ticker_symbol, first_changed, last_changed or first_changed, adjusted_since
+                )
 
-                # Check if it was an insert or update
-                if result.rowcount > 0:
-                    # Check if the record existed before
-                    check_stmt = select(TickerHistory).where(
-                        TickerHistory.ticker == ticker_symbol,
-                        TickerHistory.date == trade_date,
-                    )
-                    existing = await db.execute(check_stmt)
-                    if existing.scalar_one_or_none():
-                        records_updated += 1
-                    else:
-                        records_created += 1
+            if ticker_symbol in pending_raw:
+                # The period's provider-adjusted rows are rewritten raw; older
+                # ones keep their flag and are read as they are
+                await db.execute(
+                    delete(PendingRawBackfill).where(PendingRawBackfill.ticker == ticker_symbol)
+                )
+
+            # Screener row, in the same transaction as the bars it is computed from
+            await refresh_snapshot(db, ticker_symbol)
 
             await db.commit()
 
@@ -109,11 +449,36 @@ async def fetch_and_store_ticker_data(
         "message": message,
         "records_created": records_created,
         "records_updated": records_updated,
+        "records_quarantined": records_quarantined,
         "tickers_processed": len(tickers) - len(errors),
+        "tickers_up_to_date": tickers_up_to_date,
+        "sessions_missing": sessions_missing,
+        "sessions_unfilled": sessions_unfilled,
         "errors": errors,
+        "quality": quality,
     }
 
 
+def _history_query(
+    columns: list[Any],
+    ticker: str,
+    start_date: datetime | None,
+    end_date: datetime | None,
+    limit: int,
+    factors: Any = None,
+) -> Any:
+    query = select(*columns).where(TickerHistory.ticker == ticker)
+    if factors is not None:
+        query = join_adjustments(query.select_from(TickerHistory), factors)
+
+    if start_date:
+        query = query.where(TickerHistory.date >= start_date.date())
+    if end_date:
+        query = query.where(TickerHistory.date <= end_date.date())
+
+    return query.order_by(TickerHistory.date.desc()).limit(limit)
+
+
 async def get_ticker_history(
     db: AsyncSession,
     ticker: str,
@@ -134,17 +499,70 @@ async def get_ticker_history(
     Returns:
         List of TickerHistory records
     """
-    query = select(TickerHistory).where(TickerHistory.ticker == ticker)
+    query = _history_query([TickerHistory], ticker, start_date, end_date, limit)
+    result = await db.execute(query)
+    return list(result.scalars().all())
 
-    if start_date:
-        query = query.where(TickerHistory.date >= start_date.date())
-    if end_date:
-        query = query.where(TickerHistory.date <= end_date.date())
 
-    query = query.order_by(TickerHistory.date.desc()).limit(limit)
+# Field order of the TickerHistory response schema
+HISTORY_COLUMNS = (
+    "ticker",
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "dividends",
+    "stock_splits",
+    "id",
+    "created_at",
+    "updated_at",
+)
+
+_FLOAT_COLUMNS = {"open", "high", "low", "close", "dividends", "stock_splits"}
 
+# Dividends and splits are reported as recorded on their ex-date
+_ADJUSTED_COLUMNS = {"open", "high", "low", "close", "volume"}
+
+
+async def get_ticker_history_rows(
+    db: AsyncSession,
+    ticker: str,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+    limit: int = 100,
+    adjusted: bool = False,
+) -> list[tuple[Any, ...]]:
+    """
+    Retrieve ticker historical data as plain row tuples (no ORM objects).
+
+    Columns are ``HISTORY_COLUMNS``; numeric columns are cast to float in SQL
+    so the rows can be JSON-encoded as is (see ``app.core.serialization``).
+
+    Args:
+        db: Database session
+        ticker: Ticker symbol
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        limit: Maximum number of records to return
+        adjusted: Apply split/dividend adjustment factors to prices and volume
+
+    Returns:
+        List of row tuples, newest first
+    """
+    factors = adjustment_factors([ticker]) if adjusted else None
+    columns = []
+    for name in HISTORY_COLUMNS:
+        if factors is not None and name in _ADJUSTED_COLUMNS:
+            columns.append(adjusted_column(name, factors).label(name))
+        elif name in _FLOAT_COLUMNS:
+            columns.append(cast(getattr(TickerHistory, name), Float).label(name))
+        else:
+            columns.append(getattr(TickerHistory, name))
+    query = _history_query(columns, ticker, start_date, end_date, limit, factors)
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return list(result.tuples().all())
 
 
 async def get_available_tickers(db: AsyncSession) -> dict[str, Any]:
@@ -189,3 +607,35 @@ async def get_available_tickers(db: AsyncSession) -> dict[str, Any]:
         "configured_tickers": configured_tickers,
         "tickers_in_database": tickers_in_db,
     }
+
+
+async def get_history_validator(
+    db: AsyncSession,
+    ticker: str,
+    start_date: datetime | None = None,
+    end_date: datetime | None = None,
+) -> tuple[datetime | None, int]:
+    """
+    Get the cache validator for a ticker's history range.
+
+    Returns:
+        Tuple of (latest ``updated_at`` in the range, number of rows in the range);
+        an index-only scan of ``idx_ticker_date``, which includes
+        ``updated_at``
+    """
+    query = select(func.max(TickerHistory.updated_at), func.count()).where(
+        TickerHistory.ticker == ticker
+    )
+    if start_date:
+        query = query.where(TickerHistory.date >= start_date.date())
+    if end_date:
+        query = query.where(TickerHistory.date <= end_date.date())
+
+    last_modified, count = (await db.execute(query)).one()
+    return last_modified, count
+
+
+async def get_tickers_validator(db: AsyncSession) -> datetime | None:
+    """Latest ``updated_at`` across all tickers (served from ``ix_ticker_history_updated_at``)."""
+    result = await db.execute(select(func.max(TickerHistory.updated_at)))
+    return result.scalar_one_or_none()
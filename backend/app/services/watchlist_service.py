@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import WatchlistIndex, config_loader
+from app.models.ticker_history import TickerHistory
+from app.services.adjustment_service import adjusted_column, adjustment_factors, join_adjustments
+
+
+def aggregate_group_returns(
+    index: WatchlistIndex,
+    returns: dict[str, float],
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Aggregate per-symbol returns into sector and region statistics in one pass.
+
+    Args:
+        index: Compiled watchlist index
+        returns: Period return per symbol (e.g. 0.05 for +5%); symbols
+            without data are simply absent
+
+    Returns:
+        Dictionary with ``sectors`` and ``regions`` lists of group aggregates
+        (equal- and cap-weighted returns, advancers/decliners, breadth)
+    """
+    accumulators: dict[tuple[str, str], dict[str, float]] = {}
+
+    def new_accumulator(members: int) -> dict[str, float]:
+        return {
+            "members": members,
+            "count": 0,
+            "return_sum": 0.0,
+            "cap_sum": 0.0,
+            "cap_return_sum": 0.0,
+            "advancers": 0,
+            "decliners": 0,
+        }
+
+    for name, members in index.sectors.items():
+        accumulators[("sectors", name)] = new_accumulator(len(members))
+    for name, members in index.regions.items():
+        accumulators[("regions", name)] = new_accumulator(len(members))
+
+    for symbol, stock in index.stocks.items():
+        period_return = returns.get(symbol)
+        if period_return is None:
+            continue
+
+        for key in (("sectors", stock.sector), ("regions", stock.region)):
+            acc = accumulators[key]
+            acc["count"] += 1
+            acc["return_sum"] += period_return
+            if period_return > 0:
+                acc["advancers"] += 1
+            elif period_return < 0:
+                acc["decliners"] += 1
+            if stock.market_cap:
+                acc["cap_sum"] += stock.market_cap
+                acc["cap_return_sum"] += stock.market_cap * period_return
+
+    result: dict[str, list[dict[str, Any]]] = {"sectors": [], "regions": []}
+    for (kind, name), acc in accumulators.items():
+        count = int(acc["count"])
+        result[kind].append(
+            {
+                "group": name,
+                "members": int(acc["members"]),
+                "members_with_data": count,
+                "equal_weighted_return": acc["return_sum"] / count if count else None,
+                "cap_weighted_return": (
+                    acc["cap_return_sum"] / acc["cap_sum"] if acc["cap_sum"] else None
+                ),
+                "advancers": int(acc["advancers"]),
+                "decliners": int(acc["decliners"]),
+                "breadth": acc["advancers"] / count if count else None,
+            }
+        )
+
+    for groups in result.values():
+        groups.sort(key=lambda group: group["group"])
+    return result
+
+
+async def get_period_returns(
+    db: AsyncSession,
+    symbols: list[str],
+    start_date: date,
+    adjusted: bool = False,
+) -> dict[str, float]:
+    """
+    Get the close-to-close return since ``start_date`` for each symbol.
+
+    Uses a single query: the first and last close in the window are picked
+    per ticker with window functions and folded with a GROUP BY. With
+    ``adjusted``, closes are split/dividend-adjusted (total return).
+    """
+    factors = adjustment_factors(symbols) if adjusted else None
+    close = adjusted_column("close", factors) if factors is not None else TickerHistory.close
+    ranked = select(
+        TickerHistory.ticker,
+        close.label("close"),
+        func.row_number()
+        .over(partition_by=TickerHistory.ticker, order_by=TickerHistory.date.asc())
+        .label("first_rank"),
+        func.row_number()
+        .over(partition_by=TickerHistory.ticker, order_by=TickerHistory.date.desc())
+        .label("last_rank"),
+    )
+    if factors is not None:
+        ranked = join_adjustments(ranked.select_from(TickerHistory), factors)
+    windowed = ranked.where(
+        TickerHistory.ticker.in_(symbols), TickerHistory.date >= start_date
+    ).subquery()
+    query = select(
+        windowed.c.ticker,
+        func.max(case((windowed.c.first_rank == 1, windowed.c.close))).label("first_close"),
+        func.max(case((windowed.c.last_rank == 1, windowed.c.close))).label("last_close"),
+    ).group_by(windowed.c.ticker)
+
+    result = await db.execute(query)
+    returns = {}
+    for row in result:
+        if row.first_close:
+            returns[row.ticker] = float(row.last_close) / float(row.first_close) - 1.0
+    return returns
+
+
+async def get_watchlist_aggregates(
+    db: AsyncSession,
+    lookback_days: int | None = None,
+    adjusted: bool = False,
+) -> dict[str, Any]:
+    """
+    Compute sector- and region-level aggregates for the watchlist.
+
+    Args:
+        db: Database session
+        lookback_days: Return window in calendar days (defaults to
+            ``analysis_config.lookback_days`` from the watchlist YAML)
+        adjusted: Use split/dividend-adjusted closes
+
+    Returns:
+        Dictionary with the window and sector/region aggregates
+    """
+    if lookback_days is None:
+        lookback_days = config_loader.stock_watchlist.get("analysis_config", {}).get(
+            "lookback_days", 30
+        )
+
+    index = config_loader.watchlist_index
+    start_date = date.today() - timedelta(days=lookback_days)
+    returns = await get_period_returns(db, list(index.symbols), start_date, adjusted)
+
+    return {
+        "lookback_days": lookback_days,
+        "start_date": start_date,
+        **aggregate_group_returns(index, returns),
+    }
@@ -1,11 +1,28 @@
 """
 Agent Tools for Data Collection and Analysis
+
+Tool classes are imported on first access so that importing this package
+does not load yfinance/pandas.
 """
 
-from app.tools.yahoo_finance_tool import YahooFinanceTool
-from app.tools.news_scraper import NewsScraperTool
-from app.tools.ta_analyzer import TechnicalAnalyzerTool
-from app.tools.risk_assessment import RiskAssessmentTool
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from app.tools.news_scraper import NewsScraperTool
+    from app.tools.risk_assessment import RiskAssessmentTool
+    from app.tools.ta_analyzer import TechnicalAnalyzerTool
+    from app.tools.yahoo_finance_tool import YahooFinanceTool
+
+_EXPORTS = {
+    "YahooFinanceTool": "app.tools.yahoo_finance_tool",
+    "NewsScraperTool": "app.tools.news_scraper",
+    "TechnicalAnalyzerTool": "app.tools.ta_analyzer",
+    "RiskAssessmentTool": "app.tools.risk_assessment",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     "YahooFinanceTool",
@@ -0,0 +1,114 @@
+"""
+News articles per ticker from Yahoo Finance.
+
+Articles are normalized to plain dicts (``ARTICLE_FIELDS``) whatever the
+payload version yfinance returns, so the sentiment pipeline never sees
+provider formats. Calls go through the provider governor like every other
+Yahoo request.
+"""
+
+import hashlib
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from app.services.provider_governor import ProviderGovernor, get_governor
+
+# Keys of a normalized article
+ARTICLE_FIELDS = ("id", "ticker", "title", "summary", "publisher", "url", "published_at")
+
+# Fetches the raw news items of a symbol (blocking)
+NewsFetcher = Callable[[str, int], list[dict[str, Any]]]
+
+
+def yfinance_news(symbol: str, count: int) -> list[dict[str, Any]]:
+    """Raw news items of ``symbol`` from yfinance (blocking)."""
+    # Imported lazily: yfinance pulls in pandas (see ticker_service)
+    import yfinance as yf
+
+    news: list[dict[str, Any]] = yf.Ticker(symbol).get_news(count=count)
+    return news
+
+
+def _published_at(value: Any) -> datetime | None:
+    if isinstance(value, int | float):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    if isinstance(value, str) and value:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return None
+
+
+def normalize_article(ticker: str, item: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    One raw news item as an ``ARTICLE_FIELDS`` dict.
+
+    Handles both yfinance payloads: the current one (fields under
+    ``content``) and the legacy flat one (``uuid``, ``link``,
+    ``providerPublishTime``).
+
+    Returns:
+        The article, or None if it has no title or publication time
+    """
+    content = item.get("content") or item
+    url = (
+        (content.get("canonicalUrl") or {}).get("url")
+        or (content.get("clickThroughUrl") or {}).get("url")
+        or content.get("link")
+    )
+    published_at = _published_at(content.get("pubDate") or content.get("providerPublishTime"))
+    title = (content.get("title") or "").strip()
+    if not title or published_at is None:
+        return None
+
+    article_id = item.get("id") or content.get("id") or content.get("uuid")
+    if not article_id:
+        article_id = hashlib.sha1((url or title).encode("utf-8")).hexdigest()
+    return {
+        "id": str(article_id)[:64],
+        "ticker": ticker,
+        "title": title,
+        "summary": (content.get("summary") or content.get("description") or "").strip(),
+        "publisher": (content.get("provider") or {}).get("displayName") or content.get("publisher"),
+        "url": url,
+        "published_at": published_at,
+    }
+
+
+class NewsScraperTool:
+    """
+    Recent news articles of a ticker.
+
+    Usage:
+        scraper = NewsScraperTool()
+        articles = await scraper.fetch("NVDA")
+    """
+
+    name = "news_scraper"
+    description = "Recent news articles (title, summary, publisher, time) about a stock ticker"
+
+    def __init__(
+        self,
+        fetcher: NewsFetcher = yfinance_news,
+        governor: ProviderGovernor | None = None,
+        count: int = 50,
+    ):
+        self.fetcher = fetcher
+        self.governor = governor
+        self.count = count
+
+    async def fetch(self, ticker: str) -> list[dict[str, Any]]:
+        """
+        Fetch and normalize the latest articles of ``ticker``.
+
+        Returns:
+            Articles, newest first, without items lacking a title or time
+        """
+        governor = self.governor or get_governor()
+        items = await governor.call(self.fetcher, ticker, self.count)
+        articles = [normalize_article(ticker, item) for item in items or []]
+        return sorted(
+            (article for article in articles if article is not None),
+            key=lambda article: article["published_at"],
+            reverse=True,
+        )
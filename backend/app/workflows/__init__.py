@@ -1,7 +1,21 @@
 """
 LangGraph Workflow Definitions
+
+Workflow classes are imported on first access so that importing this package
+does not load the agent stack.
 """
 
-from app.workflows.research_workflow import ResearchWorkflow
+from typing import TYPE_CHECKING
+
+from app.core.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from app.workflows.research_workflow import ResearchWorkflow
+
+_EXPORTS = {
+    "ResearchWorkflow": "app.workflows.research_workflow",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = ["ResearchWorkflow"]
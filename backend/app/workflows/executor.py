@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+import shutil
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# A node handler receives the ticker and the results of its dependencies for
+# that ticker (keyed by node name) and returns a JSON-serializable result.
+NodeHandler = Callable[[str, dict[str, Any]], Awaitable[Any]]
+
+
+class WorkflowDefinitionError(ValueError):
+    """Raised for DAGs with unknown dependencies, duplicates or cycles."""
+
+
+class DependencyFailedError(RuntimeError):
+    """Recorded for nodes skipped because a dependency failed for the same ticker."""
+
+
+@dataclass(frozen=True)
+class WorkflowNode:
+    name: str
+    handler: NodeHandler
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class WorkflowResult:
+    run_id: str
+    status: str  # "completed", "failed" or "timed_out"
+    results: dict[str, dict[str, Any]] = field(default_factory=dict)
+    errors: dict[str, dict[str, str]] = field(default_factory=dict)
+    resumed: int = 0
+    executed: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class CheckpointStore:
+    """
+    Checkpoints finished (node, ticker) results on disk.
+
+    One JSON file per result under ``<base_dir>/<run_id>/<node>/<ticker>.json``,
+    written atomically so a crash never leaves a partial checkpoint behind.
+    """
+
+    def __init__(self, base_dir: Path | str):
+        self.base_dir = Path(base_dir)
+
+    def _path(self, run_id: str, node: str, ticker: str) -> Path:
+        return self.base_dir / run_id / node / f"{ticker}.json"
+
+    def load(self, run_id: str, node: str, ticker: str) -> tuple[bool, Any]:
+        """Return ``(found, result)`` for a checkpointed node."""
+        path = self._path(run_id, node, ticker)
+        try:
+            return True, json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False, None
+
+    def save(self, run_id: str, node: str, ticker: str, result: Any) -> None:
+        path = self._path(run_id, node, ticker)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(result, default=str), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def clear(self, run_id: str) -> None:
+        """Drop every checkpoint of ``run_id``."""
+        shutil.rmtree(self.base_dir / run_id, ignore_errors=True)
+
+
+class DAGExecutor:
+    """
+    Runs a DAG of workflow nodes, fanned out per ticker.
+
+    Each (node, ticker) pair starts as soon as that ticker's dependencies are
+    done, so a slow ticker never holds back the others. All pairs share one
+    concurrency budget, the whole run is bounded by ``timeout_seconds``, and
+    finished pairs are checkpointed so a rerun with the same ``run_id`` only
+    executes what did not complete. Checkpoints of a run that completes are
+    dropped, so the next run with that id starts from fresh inputs.
+    """
+
+    def __init__(
+        self,
+        nodes: list[WorkflowNode],
+        max_concurrency: int = 8,
+        timeout_seconds: float | None = None,
+        checkpoints: CheckpointStore | None = None,
+    ):
+        self.nodes = {node.name: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise WorkflowDefinitionError("Duplicate node names in workflow")
+        self.order = self._topological_order()
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.checkpoints = checkpoints
+
+    def _topological_order(self) -> list[str]:
+        for node in self.nodes.values():
+            unknown = set(node.depends_on) - set(self.nodes)
+            if unknown:
+                raise WorkflowDefinitionError(
+                    f"Node {node.name!r} depends on unknown node(s): {', '.join(sorted(unknown))}"
+                )
+
+        order: list[str] = []
+        visiting: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise WorkflowDefinitionError(f"Cycle detected at node {name!r}")
+            visiting.add(name)
+            for dependency in self.nodes[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    async def run(self, tickers: list[str], run_id: str) -> WorkflowResult:
+        """
+        Execute the DAG for every ticker.
+
+        Args:
+            tickers: Ticker symbols to fan out over
+            run_id: Identifier of the run; reusing it after a failed or timed
+                out run resumes from checkpoints
+
+        Returns:
+            WorkflowResult with per-ticker node results and errors
+        """
+        started = time.perf_counter()
+        result = WorkflowResult(run_id=run_id, status="completed")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: dict[tuple[str, str], asyncio.Task[Any]] = {}
+
+        async def run_node(name: str, ticker: str) -> Any:
+            node = self.nodes[name]
+            if self.checkpoints is not None:
+                found, value = await asyncio.to_thread(self.checkpoints.load, run_id, name, ticker)
+                if found:
+                    result.resumed += 1
+                    return value
+
+            inputs = {}
+            for dependency in node.depends_on:
+                try:
+                    inputs[dependency] = await tasks[(dependency, ticker)]
+                except Exception as e:
+                    raise DependencyFailedError(f"dependency {dependency!r} failed") from e
+
+            async with semaphore:
+                value = await node.handler(ticker, inputs)
+            result.executed += 1
+
+            if self.checkpoints is not None:
+                await asyncio.to_thread(self.checkpoints.save, run_id, name, ticker, value)
+            return value
+
+        for ticker in tickers:
+            for name in self.order:
+                tasks[(name, ticker)] = asyncio.create_task(run_node(name, ticker))
+
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                await asyncio.gather(*tasks.values(), return_exceptions=True)
+        except TimeoutError:
+            result.status = "timed_out"
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        for (name, ticker), task in tasks.items():
+            if task.cancelled():
+                error = "timed out"
+            elif task.exception() is not None:
+                exception = task.exception()
+                error = f"{type(exception).__name__}: {exception}"
+            else:
+                result.results.setdefault(ticker, {})[name] = task.result()
+                continue
+
+            if result.status == "completed":
+                result.status = "failed"
+            result.errors.setdefault(ticker, {})[name] = error
+
+        if self.checkpoints is not None and result.status == "completed":
+            await asyncio.to_thread(self.checkpoints.clear, run_id)
+
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
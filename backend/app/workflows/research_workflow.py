@@ -0,0 +1,224 @@
+import json
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import config_loader, settings
+from app.core.database import async_session_maker
+from app.models.ticker_history import TickerHistory
+from app.services.indicators import latest_indicators, risk_metrics
+from app.services.llm_client import LLMClient
+from app.services.report_snapshot_service import (
+    WATCHLIST_PORTFOLIO,
+    build_snapshots,
+    report_week,
+    save_snapshots,
+)
+from app.services.sentiment_service import sentiment_summary
+from app.workflows.executor import (
+    CheckpointStore,
+    DAGExecutor,
+    NodeHandler,
+    WorkflowNode,
+    WorkflowResult,
+)
+
+DATA_COLLECTION = "data_collection"
+TECHNICAL_ANALYSIS = "technical_analysis"
+SENTIMENT_ANALYSIS = "sentiment_analysis"
+RISK_ASSESSMENT = "risk_assessment"
+CIO_SYNTHESIS = "cio_synthesis"
+
+
+def weekly_run_id(day: date | None = None) -> str:
+    """Run id shared by every run in the same ISO week, so reruns of a failed run resume."""
+    return f"weekly-{report_week(day)}"
+
+
+class ResearchWorkflow:
+    """
+    Weekly research workflow executed as a per-ticker DAG.
+
+    data_collection -> (technical_analysis | sentiment_analysis | risk_assessment)
+    -> cio_synthesis, with the three analysis stages running in parallel. Limits
+    come from the ``workflow`` section of ``agent_config.yaml``; any stage can
+    be replaced through ``handlers`` (e.g. in tests).
+
+    Usage:
+        workflow = ResearchWorkflow()
+        result = await workflow.run_weekly_analysis()
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+        llm: LLMClient | None = None,
+        handlers: dict[str, NodeHandler] | None = None,
+        checkpoints: CheckpointStore | None = None,
+    ):
+        workflow_config = config_loader.agent_config.get("workflow", {})
+        self.session_maker = session_maker or async_session_maker
+        self.llm = llm
+        self.history_days = workflow_config.get("history_days", 365)
+        self.indicators = config_loader.get_agent_settings("quant_strategist").get("indicators", [])
+
+        stage_handlers: dict[str, NodeHandler] = {
+            DATA_COLLECTION: self.collect_market_data,
+            TECHNICAL_ANALYSIS: self.analyze_technicals,
+            SENTIMENT_ANALYSIS: self.analyze_sentiment,
+            RISK_ASSESSMENT: self.assess_risk,
+            CIO_SYNTHESIS: self.synthesize,
+        }
+        stage_handlers.update(handlers or {})
+
+        analyses = (TECHNICAL_ANALYSIS, SENTIMENT_ANALYSIS, RISK_ASSESSMENT)
+        self.executor = DAGExecutor(
+            nodes=[
+                WorkflowNode(DATA_COLLECTION, stage_handlers[DATA_COLLECTION]),
+                *(
+                    WorkflowNode(name, stage_handlers[name], depends_on=(DATA_COLLECTION,))
+                    for name in analyses
+                ),
+                WorkflowNode(CIO_SYNTHESIS, stage_handlers[CIO_SYNTHESIS], depends_on=analyses),
+            ],
+            max_concurrency=workflow_config.get("max_concurrency", 8),
+            timeout_seconds=workflow_config.get("timeout_seconds", 600),
+            checkpoints=checkpoints or CheckpointStore(settings.WORKFLOW_CHECKPOINT_DIR),
+        )
+
+    async def run(self, tickers: list[str], run_id: str) -> WorkflowResult:
+        """Run the workflow for ``tickers``, resuming any checkpointed stages of ``run_id``."""
+        owns_llm = self.llm is None
+        if owns_llm:
+            self.llm = LLMClient.from_config()
+        try:
+            return await self.executor.run(tickers, run_id=run_id)
+        finally:
+            if owns_llm and self.llm is not None:
+                await self.llm.aclose()
+                self.llm = None
+
+    async def run_weekly_analysis(
+        self,
+        stocks: list[str] | None = None,
+        run_id: str | None = None,
+        portfolio: str | None = None,
+    ) -> WorkflowResult:
+        """
+        Run the weekly analysis and store this ISO week's report snapshots.
+
+        Args:
+            stocks: Tickers to analyze (default: every watchlist symbol)
+            run_id: Workflow run id (default: this ISO week's)
+            portfolio: Name of the portfolio snapshot to write (default:
+                ``watchlist`` for a run over the watchlist, none otherwise)
+        """
+        if portfolio is None and not stocks:
+            portfolio = WATCHLIST_PORTFOLIO
+        result = await self.run(
+            stocks or config_loader.get_watchlist_symbols(),
+            run_id=run_id or weekly_run_id(),
+        )
+        await self.store_snapshots(result, report_week(), portfolio)
+        return result
+
+    async def store_snapshots(
+        self, result: WorkflowResult, week: str, portfolio: str | None = None
+    ) -> int:
+        """
+        Write the report snapshots of ``result`` for ``week`` (read by the reports API).
+
+        Tickers whose CIO synthesis did not finish get no snapshot (a resumed
+        run writes them); the portfolio snapshot lists them as missing.
+
+        Returns:
+            Number of snapshots written (unchanged ones are not rewritten)
+        """
+        snapshots = build_snapshots(week, result.results, portfolio)
+        async with self.session_maker() as db:
+            written = await save_snapshots(db, week, result.run_id, snapshots)
+            await db.commit()
+        return written
+
+    async def analyze_stock(self, symbol: str, run_id: str | None = None) -> WorkflowResult:
+        """Run the workflow for a single ticker."""
+        return await self.run([symbol], run_id=run_id or f"{weekly_run_id()}-{symbol}")
+
+    async def collect_market_data(self, ticker: str, inputs: dict[str, Any]) -> dict[str, Any]:
+        start_date = date.today() - timedelta(days=self.history_days)
+        query = (
+            select(
+                TickerHistory.date,
+                TickerHistory.open,
+                TickerHistory.high,
+                TickerHistory.low,
+                TickerHistory.close,
+                TickerHistory.volume,
+            )
+            .where(TickerHistory.ticker == ticker, TickerHistory.date >= start_date)
+            .order_by(TickerHistory.date.asc())
+        )
+        async with self.session_maker() as db:
+            rows = (await db.execute(query)).all()
+
+        if not rows:
+            raise ValueError(f"No price history for {ticker} since {start_date}")
+
+        return {
+            "ticker": ticker,
+            "bars": [
+                {
+                    "date": row.date.isoformat(),
+                    "open": float(row.open),
+                    "high": float(row.high),
+                    "low": float(row.low),
+                    "close": float(row.close),
+                    "volume": int(row.volume),
+                }
+                for row in rows
+            ],
+        }
+
+    async def analyze_technicals(self, ticker: str, inputs: dict[str, Any]) -> dict[str, Any]:
+        closes = [bar["close"] for bar in inputs[DATA_COLLECTION]["bars"]]
+        return {
+            "close": closes[-1],
+            "indicators": latest_indicators(closes, self.indicators),
+        }
+
+    async def analyze_sentiment(self, ticker: str, inputs: dict[str, Any]) -> dict[str, Any]:
+        # Daily aggregates of the news pipeline (scripts/fetch_news.py); a ticker
+        # without scored news reports available=False rather than neutral sentiment
+        async with self.session_maker() as db:
+            return await sentiment_summary(db, ticker)
+
+    async def assess_risk(self, ticker: str, inputs: dict[str, Any]) -> dict[str, Any]:
+        closes = [bar["close"] for bar in inputs[DATA_COLLECTION]["bars"]]
+        return risk_metrics(closes)
+
+    async def synthesize(self, ticker: str, inputs: dict[str, Any]) -> dict[str, Any]:
+        if self.llm is None:
+            raise RuntimeError("ResearchWorkflow.synthesize requires an LLM client")
+
+        role = config_loader.get_agent_settings("cio")
+        analyses = {name: value for name, value in inputs.items() if name != DATA_COLLECTION}
+        response = await self.llm.complete(
+            [
+                {"role": "system", "content": role.get("backstory", "").strip()},
+                {
+                    "role": "user",
+                    "content": (
+                        f"Produce a concise weekly investment recommendation for {ticker} "
+                        f"from these analyses:\n{json.dumps(analyses, sort_keys=True)}"
+                    ),
+                },
+            ]
+        )
+        return {
+            "recommendation": response.content,
+            "model": response.model,
+            "cost": response.cost,
+            "cached": response.cached,
+        }
@@ -1,13 +1,35 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
 from app.config import settings
+from app.core.change_listener import close_change_listener, get_change_listener
+from app.core.compression import CompressionMiddleware
+from app.services.ingest_writer import close_ingest_writer
+from app.services.market_data import close_chart_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if settings.PROCESS_CACHE:
+        # Enables this worker's cache once it listens for ingestion changes
+        get_change_listener().start()
+    yield
+    await close_change_listener()
+    # Bars still buffered for group commit
+    await close_ingest_writer()
+    # Pooled market data connections (MARKET_DATA_PROVIDER=yahoo_http)
+    await close_chart_client()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    lifespan=lifespan,
 )
 
 if settings.BACKEND_CORS_ORIGINS:
@@ -19,6 +41,8 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
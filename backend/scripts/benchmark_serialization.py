@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark serialization of ticker history responses.
+
+Compares, for the same rows:
+- model path: ORM objects validated through ``response_model`` (Pydantic,
+  ``from_attributes``) and rendered like FastAPI's ``JSONResponse``
+- fast path: plain row tuples encoded with orjson (``app.core.serialization``)
+
+and reports p50/p99 latency per response size.
+
+Usage:
+    python scripts/benchmark_serialization.py                    # 100, 1,000 and 10,000 rows
+    python scripts/benchmark_serialization.py --rows 1000 --iterations 500
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import encode_rows
+from app.models.ticker_history import TickerHistory as TickerHistoryModel
+from app.schemas.ticker_history import TickerHistory
+from app.services.ticker_service import HISTORY_COLUMNS
+
+_ADAPTER = TypeAdapter(list[TickerHistory])
+
+
+def make_rows(count: int) -> list[tuple]:
+    """Synthetic history rows in ``HISTORY_COLUMNS`` order, as the fast path selects them."""
+    stamp = datetime(2026, 1, 2, 21, 0, tzinfo=timezone.utc)
+    rows = []
+    for i in range(count):
+        close = 100 + (i % 50) * 0.37
+        rows.append(
+            (
+                "NVDA",
+                date(2000, 1, 1) + timedelta(days=i),
+                round(close - 0.5, 6),
+                round(close + 1.25, 6),
+                round(close - 1.75, 6),
+                round(close, 6),
+                40_000_000 + i,
+                0.0,
+                0.0,
+                i + 1,
+                stamp,
+                stamp,
+            )
+        )
+    return rows
+
+
+def make_orm_objects(rows: list[tuple]) -> list[TickerHistoryModel]:
+    """ORM instances for ``rows`` with ``Decimal`` numerics, as a ``select(TickerHistory)`` returns."""
+    objects = []
+    for row in rows:
+        values = dict(zip(HISTORY_COLUMNS, row, strict=True))
+        for name in ("open", "high", "low", "close", "dividends", "stock_splits"):
+            values[name] = Decimal(str(values[name]))
+        objects.append(TickerHistoryModel(**values))
+    return objects
+
+
+def model_path(objects: list[TickerHistoryModel]) -> bytes:
+    content = _ADAPTER.dump_python(
+        _ADAPTER.validate_python(objects, from_attributes=True), mode="json"
+    )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def fast_path(rows: list[tuple]) -> bytes:
+    return encode_rows(HISTORY_COLUMNS, rows)
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def time_call(func, arg, iterations: int) -> dict[str, float]:
+    """p50/p99 wall time (ms) of ``func(arg)`` over ``iterations`` calls after a warm-up."""
+    for _ in range(min(10, iterations)):
+        func(arg)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50": percentile(samples, 0.50), "p99": percentile(samples, 0.99)}
+
+
+def benchmark(row_counts: list[int], iterations: int) -> list[dict]:
+    """
+    Benchmark both paths for each response size.
+
+    Returns:
+        One dictionary per size with p50/p99 (ms) of each path and the speedups
+    """
+    results = []
+    for count in row_counts:
+        rows = make_rows(count)
+        objects = make_orm_objects(rows)
+        if json.loads(model_path(objects)) != json.loads(fast_path(rows)):
+            raise AssertionError("fast path output differs from the response_model output")
+
+        # Fewer iterations for large responses to keep the run short
+        n = max(20, iterations * 100 // max(count, 100))
+        model = time_call(model_path, objects, n)
+        fast = time_call(fast_path, rows, n)
+        results.append(
+            {
+                "rows": count,
+                "iterations": n,
+                "model": model,
+                "fast": fast,
+                "speedup_p50": model["p50"] / fast["p50"],
+                "speedup_p99": model["p99"] / fast["p99"],
+            }
+        )
+    return results
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100, 1_000, 10_000], help="Response sizes"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=200,
+        help="Iterations at 100 rows (scaled down for larger)",
+    )
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("SERIALIZATION BENCHMARK (ms)")
+    print("=" * 72)
+    print(
+        f"{'rows':>8} {'model p50':>10} {'model p99':>10} {'fast p50':>10} {'fast p99':>10} {'x p50':>7} {'x p99':>7}"
+    )
+    for r in benchmark(args.rows, args.iterations):
+        print(
+            f"{r['rows']:>8,} {r['model']['p50']:>10.3f} {r['model']['p99']:>10.3f} "
+            f"{r['fast']['p50']:>10.3f} {r['fast']['p99']:>10.3f} "
+            f"{r['speedup_p50']:>6.1f}x {r['speedup_p99']:>6.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark application startup.
+
+Measures, in fresh interpreters:
+- import time of ``main`` (what every uvicorn worker pays before serving)
+- time to first request (import + app startup + GET /api/v1/health)
+
+and checks that heavy optional subsystems are not imported at startup.
+
+Usage:
+    python scripts/benchmark_startup.py                      # 5 runs, report only
+    python scripts/benchmark_startup.py --runs 10
+    python scripts/benchmark_startup.py --max-import-ms 1500 --max-first-request-ms 2500
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that must only be loaded on demand (data fetches, agents, workflows)
+HEAVY_MODULES = ["yfinance", "pandas", "numpy", "app.agents.cio", "app.workflows.research_workflow"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    response = client.get("/api/v1/health")
+    response.raise_for_status()
+first_request = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (first_request - start) * 1000,
+    "heavy_modules": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def run_probe() -> dict:
+    """Run one startup probe in a fresh interpreter and return its measurements."""
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure_startup(runs: int = 5) -> dict:
+    """
+    Measure startup over several fresh interpreters.
+
+    Returns:
+        Dictionary with median/max import and first-request times (ms) and
+        the heavy modules found loaded in any run
+    """
+    samples = [run_probe() for _ in range(runs)]
+    import_ms = [s["import_ms"] for s in samples]
+    first_request_ms = [s["first_request_ms"] for s in samples]
+
+    return {
+        "runs": runs,
+        "import_ms_median": statistics.median(import_ms),
+        "import_ms_max": max(import_ms),
+        "first_request_ms_median": statistics.median(first_request_ms),
+        "first_request_ms_max": max(first_request_ms),
+        "heavy_modules": sorted({m for s in samples for m in s["heavy_modules"]}),
+    }
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters")
+    parser.add_argument(
+        "--max-import-ms", type=float, help="Fail if median import time exceeds this"
+    )
+    parser.add_argument(
+        "--max-first-request-ms",
+        type=float,
+        help="Fail if median time to first request exceeds this",
+    )
+    args = parser.parse_args()
+
+    result = measure_startup(args.runs)
+
+    print("=" * 60)
+    print("STARTUP BENCHMARK")
+    print("=" * 60)
+    print(f"Runs: {result['runs']}")
+    print(
+        f"Import main:       median {result['import_ms_median']:8.1f} ms  (max {result['import_ms_max']:.1f})"
+    )
+    print(
+        f"First request:     median {result['first_request_ms_median']:8.1f} ms  "
+        f"(max {result['first_request_ms_max']:.1f})"
+    )
+
+    failures = []
+    if result["heavy_modules"]:
+        failures.append(f"heavy modules loaded at startup: {', '.join(result['heavy_modules'])}")
+    if args.max_import_ms is not None and result["import_ms_median"] > args.max_import_ms:
+        failures.append(
+            f"import time {result['import_ms_median']:.1f} ms > {args.max_import_ms} ms"
+        )
+    if (
+        args.max_first_request_ms is not None
+        and result["first_request_ms_median"] > args.max_first_request_ms
+    ):
+        failures.append(
+            f"first request {result['first_request_ms_median']:.1f} ms > {args.max_first_request_ms} ms"
+        )
+
+    if failures:
+        print("\nRegressions:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        return 1
+
+    print("\n✓ Startup within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
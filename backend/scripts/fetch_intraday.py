@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Fetch intraday bars and apply the intraday retention policy.
+
+Downloads the base interval from `intraday_config` (watchlist YAML) for every
+watchlist stock, bulk-loads it into `intraday_bars`, then rolls bars past
+their retention window into coarser intervals.
+
+Usage:
+    python scripts/fetch_intraday.py                 # Watchlist stocks
+    python scripts/fetch_intraday.py NVDA 2330.TW    # Specific tickers
+    python scripts/fetch_intraday.py --retention-only
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.core.database import async_session_maker
+from app.services.intraday_service import (
+    apply_retention,
+    fetch_and_store_intraday,
+    intraday_policy,
+)
+
+
+async def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("tickers", nargs="*", help="Ticker symbols (defaults to the watchlist)")
+    parser.add_argument(
+        "--retention-only", action="store_true", help="Only roll up and drop old bars"
+    )
+    args = parser.parse_args()
+
+    policy = intraday_policy()
+    tickers = args.tickers or None
+
+    print("=" * 60)
+    print("FETCH INTRADAY DATA")
+    print("=" * 60)
+    print(f"Interval: {policy.interval} (period {policy.period})")
+    for rule in policy.rollups:
+        print(f"Retention: {rule.source} -> {rule.target} after {rule.after.days} days")
+    print("=" * 60)
+
+    exit_code = 0
+    async with async_session_maker() as db:
+        if not args.retention_only:
+            result = await fetch_and_store_intraday(db, tickers=tickers, policy=policy)
+            print(f"\n{result['message']}")
+            print(f"  Bars stored: {result['records_stored']}")
+            print(f"  Tickers processed: {result['tickers_processed']}")
+            for error in result["errors"]:
+                print(f"  ✗ {error}")
+            if not result["success"]:
+                exit_code = 1
+
+        removed = await apply_retention(db, policy=policy, tickers=tickers)
+        print("\nRetention:")
+        for interval, count in removed.items():
+            print(f"  {interval}: {count} rows removed")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
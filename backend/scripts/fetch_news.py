@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Fetch news and update the daily news sentiment per ticker.
+
+Downloads the latest articles of each watchlist stock, drops near-duplicate
+copies of syndicated stories, scores the unique ones in batches with the
+model of `news_sentiment` (watchlist YAML) and re-aggregates the days they
+fall on in `news_sentiment_daily`. Articles already stored are skipped, so
+the script is cheap to rerun.
+
+Usage:
+    python scripts/fetch_news.py                  # Watchlist stocks
+    python scripts/fetch_news.py NVDA 2330.TW     # Specific tickers
+    python scripts/fetch_news.py --model mypkg.finbert:FinBertModel
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.core.database import async_session_maker
+from app.services.sentiment_service import load_model, news_sentiment_policy, run_news_sentiment
+
+
+async def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("tickers", nargs="*", help="Ticker symbols (defaults to the watchlist)")
+    parser.add_argument("--model", help="Sentiment model (default: news_sentiment.model)")
+    args = parser.parse_args()
+
+    policy = news_sentiment_policy()
+    model = load_model(args.model or policy.model)
+
+    print("=" * 60)
+    print("FETCH NEWS SENTIMENT")
+    print("=" * 60)
+    print(f"Model: {model.name} (batches of {policy.batch_size})")
+    print(
+        f"Near-duplicates: >= {policy.similarity:.0%} similar within "
+        f"{policy.dedup_window_days} days"
+    )
+    print("=" * 60)
+
+    result = await run_news_sentiment(
+        async_session_maker, tickers=args.tickers or None, model=model, policy=policy
+    )
+
+    print(f"\n{result['message']}")
+    print(f"  Articles fetched: {result['articles']}")
+    print(f"  New articles: {result['new']}")
+    print(f"  Near-duplicates: {result['duplicates']}")
+    print(f"  Scored: {result['scored']}")
+    for error in result["errors"]:
+        print(f"  ✗ {error}")
+
+    return 0 if result["success"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -6,12 +6,17 @@ Usage:
     python fetch_ticker_data.py              # Fetch 1 year for all configured tickers
     python fetch_ticker_data.py 5y           # Fetch 5 years for all configured tickers
     python fetch_ticker_data.py 1mo NVDA TSM # Fetch 1 month for specific tickers
+    python fetch_ticker_data.py --full 1y    # Re-download the period even if stored
+
+Tickers with stored bars only fetch the sessions they are missing; tickers
+whose market has had no session since their last bar are skipped. A ticker
+being fetched by the API at the same time is waited for, not fetched twice.
 """
 import asyncio
 import sys
 
-from app.core.database import async_session_maker
-from app.services.ticker_service import fetch_and_store_ticker_data
+from app.services.fetch_coordinator import get_fetch_coordinator
+from app.services.provider_governor import get_governor
 from app.config import settings
 
 
@@ -19,6 +24,8 @@ async def main() -> int:
     """Main entry point."""
     # Parse arguments
     args = sys.argv[1:]
+    full_refresh = "--full" in args
+    args = [arg for arg in args if arg != "--full"]
 
     period = "1y"
     tickers = None
@@ -37,34 +44,53 @@ async def main() -> int:
     print("=" * 60)
     print("FETCH TICKER DATA")
     print("=" * 60)
-    print(f"Period: {period}")
+    print(f"Period: {period}{' (full refresh)' if full_refresh else ''}")
     print(f"Tickers: {', '.join(tickers) if tickers else ', '.join(settings.ticker_list)}")
     print("=" * 60)
 
     try:
-        async with async_session_maker() as db:
-            result = await fetch_and_store_ticker_data(
-                db=db,
-                tickers=tickers,
-                period=period,
-            )
-
-            print(f"\n{result['message']}")
-            print(f"  Records created: {result['records_created']}")
-            print(f"  Records updated: {result['records_updated']}")
-            print(f"  Tickers processed: {result['tickers_processed']}")
-
-            if result['errors']:
-                print("\nErrors:")
-                for error in result['errors']:
-                    print(f"  ✗ {error}")
-
-            if result['success']:
-                print("\n✓ Data fetch completed successfully!")
-                return 0
-            else:
-                print("\n⚠ Data fetch completed with errors")
-                return 1
+        # Waits for (rather than repeats) fetches of the same tickers in progress
+        # in the API workers
+        result = await get_fetch_coordinator().fetch(
+            tickers=tickers,
+            period=period,
+            full_refresh=full_refresh,
+        )
+
+        print(f"\n{result['message']}")
+        print(f"  Records created: {result['records_created']}")
+        print(f"  Records updated: {result['records_updated']}")
+        print(f"  Records quarantined: {result['records_quarantined']}")
+        print(f"  Tickers processed: {result['tickers_processed']}")
+        print(f"  Tickers up to date: {result['tickers_up_to_date']}")
+        print(f"  Missing sessions fetched: {result['sessions_missing']}"
+              f" ({result['sessions_unfilled']} without data)")
+
+        for ticker, report in result['quality'].items():
+            issues = [f"{reason}={count}" for reason, count in report['quarantined'].items()]
+            if report['extreme_moves']:
+                issues.append(f"extreme_moves={len(report['extreme_moves'])}")
+            if report['gaps']:
+                issues.append(f"gaps={len(report['gaps'])}")
+            print(f"  {ticker}: {report['clean']}/{report['rows']} clean"
+                  + (f" ({', '.join(issues)})" if issues else ""))
+
+        stats = get_governor().stats
+        print(f"  Provider calls: {stats.calls} ({stats.retries} retried, "
+              f"{stats.rejected} refused by open circuit, "
+              f"{stats.throttled_seconds:.1f}s throttled)")
+
+        if result['errors']:
+            print("\nErrors:")
+            for error in result['errors']:
+                print(f"  ✗ {error}")
+
+        if result['success']:
+            print("\n✓ Data fetch completed successfully!")
+            return 0
+        else:
+            print("\n⚠ Data fetch completed with errors")
+            return 1
 
     except Exception as e:
         print(f"\n✗ Error: {str(e)}")
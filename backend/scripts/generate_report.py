@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Generate the weekly investment research reports.
+
+Runs the research workflow for the watchlist (resuming this week's checkpoints)
+and renders one report per ticker and format. Reports whose inputs did not
+change since the last build are skipped. The workflow also stores this week's
+report snapshots, served by the reports API.
+
+Usage:
+    python generate_report.py              # All watchlist stocks
+    python generate_report.py NVDA TSM     # Specific tickers
+"""
+
+import asyncio
+import sys
+
+from app.config import config_loader
+from app.services.chart_service import ChartService, ChartSpec, chart_key
+from app.services.report_service import ReportBuilder
+from app.workflows.research_workflow import ResearchWorkflow
+
+
+async def main() -> int:
+    """Main entry point."""
+    tickers = sys.argv[1:] or None
+
+    print("=" * 60)
+    print("GENERATE WEEKLY REPORT")
+    print("=" * 60)
+
+    try:
+        workflow = ResearchWorkflow()
+        result = await workflow.run_weekly_analysis(stocks=tickers)
+
+        print(f"Run: {result.run_id} ({result.status}, {result.elapsed_seconds:.1f}s)")
+        print(f"  Stages executed: {result.executed}")
+        print(f"  Stages resumed from checkpoint: {result.resumed}")
+        for ticker, errors in result.errors.items():
+            for stage, error in errors.items():
+                print(f"  ✗ {ticker} / {stage}: {error}")
+
+        # Charts are content-addressed, so ones already rendered (by an earlier
+        # run or the API) are reused rather than re-rendered
+        lookbacks = config_loader.stock_watchlist.get("analysis_config", {}).get(
+            "chart_lookbacks", [90]
+        )
+        chart_jobs = {
+            (ticker, lookback): (
+                ChartSpec(ticker, lookback=lookback),
+                stages["data_collection"]["bars"],
+            )
+            for ticker, stages in result.results.items()
+            if "data_collection" in stages
+            for lookback in lookbacks
+        }
+        chart_paths = await asyncio.to_thread(
+            ChartService().render_batch, list(chart_jobs.values())
+        )
+        charts: dict[str, list] = {}
+        for (ticker, _), (spec, bars) in chart_jobs.items():
+            charts.setdefault(ticker, []).append(chart_paths[chart_key(bars, spec)])
+        print(f"\nCharts: {len(chart_paths)} ({len(lookbacks)} lookback(s) per ticker)")
+
+        builder = ReportBuilder()
+        build = await asyncio.to_thread(
+            builder.build_from_workflow, result.run_id, result.results, charts
+        )
+
+        print(f"\nReports rendered: {len(build.rendered)}")
+        print(f"Reports unchanged (skipped): {len(build.skipped)}")
+        for name, error in build.errors.items():
+            print(f"  ✗ {name}: {error}")
+
+        if result.status == "completed" and not build.errors:
+            print("\n✓ Weekly report generated successfully!")
+            return 0
+
+        print("\n⚠ Weekly report generated with errors (rerun to resume)")
+        return 1
+
+    except Exception as e:
+        print(f"\n✗ Error: {str(e)}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
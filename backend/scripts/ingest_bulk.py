@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Bulk-ingest daily history for a large symbol universe across worker processes.
+
+Shards the symbols over N worker processes (each with its own event loop,
+connection pool and share of the provider rate limit), checkpoints every
+finished symbol and reports aggregate throughput. Rerunning the same command
+resumes a killed run with only the unfinished symbols.
+
+Usage:
+    python scripts/ingest_bulk.py --file universe.txt --period max --workers 8
+    python scripts/ingest_bulk.py NVDA TSM GOOG --period 10y
+    python scripts/ingest_bulk.py --file universe.txt --restart   # Ignore the checkpoint
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from app.config import config_loader, settings
+from app.services.bulk_ingest import IngestSummary, run_bulk_ingest
+
+VALID_PERIODS = ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"]
+
+
+def format_summary(summary: IngestSummary) -> str:
+    eta = summary.eta_seconds
+    return (
+        f"{summary.total - summary.remaining}/{summary.total} symbols "
+        f"({summary.resumed} resumed, {summary.failed} failed) | "
+        f"{summary.symbols_per_second:.2f} symbols/s, {summary.rows_per_second:,.0f} rows/s"
+        + (f" | ETA {eta / 60:.1f} min" if eta is not None else "")
+    )
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("tickers", nargs="*", help="Ticker symbols (defaults to the watchlist)")
+    parser.add_argument("--file", type=Path, help="File with one symbol per line")
+    parser.add_argument("--period", default="max", choices=VALID_PERIODS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concurrency", type=int, default=2, help="Symbols in flight per worker")
+    parser.add_argument("--run-id", help="Checkpoint run id (default: derived from symbols/period)")
+    parser.add_argument("--restart", action="store_true", help="Discard the run's checkpoint")
+    parser.add_argument("--progress-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    symbols = list(args.tickers)
+    if args.file:
+        symbols += [
+            line.strip()
+            for line in args.file.read_text(encoding="utf-8").splitlines()
+            if line.strip() and not line.startswith("#")
+        ]
+    if not symbols:
+        symbols = config_loader.get_watchlist_symbols() or settings.ticker_list
+
+    print("=" * 60)
+    print("BULK INGEST")
+    print("=" * 60)
+    print(f"Symbols: {len(symbols)} | Period: {args.period}")
+    print(f"Workers: {args.workers} x {args.concurrency} symbols in flight")
+    print("=" * 60)
+
+    run_id, summary = run_bulk_ingest(
+        symbols,
+        args.period,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        run_id=args.run_id,
+        restart=args.restart,
+        progress_interval=args.progress_interval,
+        on_progress=lambda progress: print(format_summary(progress), flush=True),
+    )
+
+    print("\n" + "=" * 60)
+    print(f"Run: {run_id}")
+    print(f"  Ingested: {summary.done} symbols, {summary.records:,} rows")
+    print(f"  Quarantined rows: {summary.quarantined:,}")
+    print(f"  No data: {summary.no_data}")
+    print(f"  Resumed (already finished): {summary.resumed}")
+    print(f"  Failed: {summary.failed}")
+    print(f"  Elapsed: {summary.elapsed_seconds:.1f}s")
+    print(
+        f"  Throughput: {summary.symbols_per_second:.2f} symbols/s, "
+        f"{summary.rows_per_second:,.0f} rows/s"
+    )
+    if summary.failed:
+        print("\n⚠ Some symbols failed; rerun the same command to retry them")
+        return 1
+    print("\n✓ Bulk ingest completed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,7 +10,6 @@ This script will:
 import asyncio
 import sys
 
-import yfinance as yf
 from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert
 
@@ -30,6 +29,8 @@ async def init_db() -> None:
 
 async def fetch_and_store_data(period: str = "1y") -> None:
     """Fetch and store ticker historical data."""
+    import yfinance as yf
+
     tickers = settings.ticker_list
     print(f"\nFetching {period} of data for tickers: {', '.join(tickers)}")
 
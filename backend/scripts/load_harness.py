@@ -0,0 +1,317 @@
+"""
+End-to-end load testing of the API.
+
+Virtual users run scripted scenarios - request sequences modelled on the
+frontend and on data jobs - against a running app, so the whole stack is
+measured: uvicorn workers, per-request sessions from ``deps.get_db``, the
+connection pool and Postgres. Latencies are recorded per route template
+(``GET /tickers/{ticker}/history``), reported as throughput and
+p50/p95/p99, and checked against the SLOs of ``load_test_slos.yaml`` next
+to this module.
+
+Run it with ``scripts/load_test.py``, which starts the app and a fake Yahoo
+Finance server, or against any ``httpx.AsyncClient``.
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import yaml
+
+from app.config import settings
+
+# Per-route SLOs checked by default (see load_slos)
+DEFAULT_SLO_FILE = Path(__file__).with_name("load_test_slos.yaml")
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    One request of a scenario.
+
+    ``route`` is the method and route template, relative to the API prefix;
+    ``{ticker}`` (a random ticker of the universe) and ``{tickers}`` (all of
+    them, comma-separated) are filled in per request, also in ``params`` and
+    ``json``.
+    """
+
+    route: str
+    params: dict[str, Any] | None = None
+    json: Any = None
+
+    def render(self, ticker: str, tickers: list[str]) -> tuple[str, str, dict[str, Any], Any]:
+        """Method, URL, query parameters and JSON body of one request."""
+        method, template = self.route.split(" ", 1)
+        names = {"ticker": ticker, "tickers": ",".join(tickers)}
+        return (
+            method,
+            settings.API_V1_PREFIX + template.format(**names),
+            _fill(self.params or {}, names),
+            _fill(self.json, names),
+        )
+
+
+def _fill(value: Any, names: dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return value.format(**names)
+    if isinstance(value, list):
+        return [_fill(item, names) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, names) for key, item in value.items()}
+    return value
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    steps: tuple[Step, ...]
+    think_seconds: float = 0.0  # Pause after each step, like a user reading the page
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        # Opening the dashboard: ticker list, watchlist, a screen and a chart
+        Scenario(
+            "dashboard",
+            (
+                Step("GET /tickers/"),
+                Step("GET /watchlist/"),
+                Step("GET /watchlist/aggregates"),
+                Step("GET /screener/", params={"sort": "-change_1d", "limit": 20}),
+                Step("GET /tickers/{ticker}/bars", params={"interval": "1w", "limit": 52}),
+            ),
+            think_seconds=0.1,
+        ),
+        # Research pages pulling long histories for many tickers at once
+        Scenario(
+            "batch_history",
+            (
+                Step("GET /tickers/bars", params={"tickers": "{tickers}", "interval": "1w"}),
+                Step("GET /tickers/{ticker}/history", params={"limit": 1000}),
+                Step("GET /tickers/{ticker}/history", params={"limit": 250, "adjusted": "true"}),
+            ),
+        ),
+        # Fetches (provider calls, upserts) while other users keep reading
+        Scenario(
+            "fetch_and_read",
+            (
+                Step("POST /tickers/fetch", json={"tickers": ["{ticker}"], "period": "1mo"}),
+                Step("GET /tickers/{ticker}/history", params={"limit": 100}),
+                Step("GET /tickers/"),
+            ),
+        ),
+    )
+}
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank ``q``-th percentile of sorted values (0.0 if there are none)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class RouteStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    def summary(self, elapsed_seconds: float) -> dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "rps": self.count / elapsed_seconds if elapsed_seconds else 0.0,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "max_ms": ordered[-1] if ordered else 0.0,
+            "statuses": dict(self.statuses),
+        }
+
+
+@dataclass
+class LoadReport:
+    users: int
+    scenarios: list[str]
+    elapsed_seconds: float = 0.0
+    routes: dict[str, RouteStats] = field(default_factory=dict)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(stats.count for stats in self.routes.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.total_requests / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "users": self.users,
+            "scenarios": self.scenarios,
+            "elapsed_seconds": self.elapsed_seconds,
+            "total_requests": self.total_requests,
+            "throughput": self.throughput,
+            "routes": {
+                route: stats.summary(self.elapsed_seconds)
+                for route, stats in sorted(self.routes.items())
+            },
+        }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    scenarios: list[Scenario],
+    tickers: list[str],
+    users: int = 10,
+    duration_seconds: float | None = 30.0,
+    iterations: int | None = None,
+    seed: int | None = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> LoadReport:
+    """
+    Run virtual users against ``client`` and record per-route latencies.
+
+    User ``i`` loops over scenario ``i % len(scenarios)``, so the mix follows
+    the order of ``scenarios``. A request fails if it raises or answers with
+    a status of 400 or above.
+
+    Args:
+        client: Client of the app under test (its base URL or ASGI transport)
+        scenarios: Scenarios to run
+        tickers: Ticker universe the steps draw from
+        users: Concurrent virtual users
+        duration_seconds: Stop starting requests after this long
+        iterations: Or: scenario runs per user
+        seed: Seed of the users' ticker choices, for repeatable runs
+
+    Returns:
+        The run's LoadReport
+    """
+    if not scenarios or not tickers or users < 1:
+        raise ValueError("A load test needs scenarios, tickers and at least one user")
+    if duration_seconds is None and iterations is None:
+        raise ValueError("Either duration_seconds or iterations is required")
+
+    report = LoadReport(users=users, scenarios=[s.name for s in scenarios])
+    started = clock()
+    deadline = started + duration_seconds if duration_seconds is not None else math.inf
+
+    async def request(step: Step, ticker: str) -> None:
+        method, url, params, body = step.render(ticker, tickers)
+        stats = report.routes.setdefault(step.route, RouteStats())
+        begin = clock()
+        try:
+            response = await client.request(method, url, params=params, json=body)
+        except httpx.HTTPError as e:
+            stats.statuses[type(e).__name__] += 1
+            stats.errors += 1
+        else:
+            stats.statuses[str(response.status_code)] += 1
+            stats.errors += response.status_code >= 400
+        stats.latencies_ms.append((clock() - begin) * 1000)
+
+    async def user(index: int) -> None:
+        rng = random.Random(None if seed is None else seed + index)
+        scenario = scenarios[index % len(scenarios)]
+        runs = 0
+        while (iterations is None or runs < iterations) and clock() < deadline:
+            for step in scenario.steps:
+                if clock() >= deadline:
+                    return
+                await request(step, rng.choice(tickers))
+                if scenario.think_seconds:
+                    await asyncio.sleep(scenario.think_seconds)
+            runs += 1
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+    report.elapsed_seconds = clock() - started
+    return report
+
+
+@dataclass(frozen=True)
+class RouteSlo:
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    p99_ms: float | None = None
+    max_error_rate: float = 0.01
+    min_rps: float | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "RouteSlo":
+        """Build the SLO from one route's entry of the SLO file."""
+        unknown = set(config) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown load test SLO fields: {sorted(unknown)}")
+        slo = cls(**config)
+        limits = (slo.p50_ms, slo.p95_ms, slo.p99_ms, slo.min_rps)
+        if any(limit is not None and limit <= 0 for limit in limits) or not (
+            0 <= slo.max_error_rate <= 1
+        ):
+            raise ValueError(f"Invalid load test SLO: {slo}")
+        return slo
+
+
+def load_slos(
+    config: dict[str, Any] | None = None, path: Path = DEFAULT_SLO_FILE
+) -> dict[str, RouteSlo]:
+    """
+    SLOs per route from ``config``, or else read from the YAML file ``path``.
+
+    The ``"*"`` entry applies to every route; a route's own entry overrides
+    its fields.
+    """
+    if config is None:
+        config = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    default = config.get("*", {})
+    slos = {"*": RouteSlo.from_config(default)}
+    for route, entry in config.items():
+        if route != "*":
+            slos[route] = RouteSlo.from_config({**default, **(entry or {})})
+    return slos
+
+
+def check_slos(report: LoadReport, slos: dict[str, RouteSlo]) -> list[str]:
+    """
+    Compare a run against the SLOs.
+
+    Returns:
+        One message per violated threshold (empty if the run is within SLO)
+    """
+    violations = []
+    for route, stats in sorted(report.routes.items()):
+        slo = slos.get(route, slos.get("*"))
+        if slo is None:
+            continue
+        summary = stats.summary(report.elapsed_seconds)
+        for name in ("p50_ms", "p95_ms", "p99_ms"):
+            limit = getattr(slo, name)
+            if limit is not None and summary[name] > limit:
+                violations.append(f"{route}: {name} {summary[name]:.1f} > {limit}")
+        if summary["error_rate"] > slo.max_error_rate:
+            violations.append(
+                f"{route}: error rate {summary['error_rate']:.2%} > {slo.max_error_rate:.2%}"
+            )
+        if slo.min_rps is not None and summary["rps"] < slo.min_rps:
+            violations.append(f"{route}: {summary['rps']:.1f} req/s < {slo.min_rps}")
+    return violations
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Load-test the API end to end and check it against the SLOs.
+
+Starts the app under uvicorn (with ``--workers``) against the database of
+``DATABASE_URL``, plus a fake Yahoo Finance server replaying
+``tests/fixtures/yahoo_chart`` so fetches never hit Yahoo, runs the
+scenarios of ``scripts/load_harness.py`` and reports throughput and
+p50/p95/p99 per route. Exits non-zero when a route breaks its SLO
+(``load_test_slos.yaml``, or the file given with ``--slos``).
+
+Usage:
+    python scripts/load_test.py                                  # All scenarios, 20 users, 30 s
+    python scripts/load_test.py --scenario dashboard --users 50 --duration 60
+    python scripts/load_test.py --workers 4 --json outputs/load_test.json
+    python scripts/load_test.py --base-url http://localhost:8000  # Against a running app
+    python scripts/load_test.py --slos staging_slos.yaml         # Other thresholds
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+import httpx
+from load_harness import (
+    DEFAULT_SLO_FILE,
+    SCENARIOS,
+    LoadReport,
+    check_slos,
+    load_slos,
+    run_load,
+)
+
+from app.config import settings
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RECORDINGS_DIR = BACKEND_DIR / "tests" / "fixtures" / "yahoo_chart"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(
+    stack: ExitStack, app: str, port: int, workers: int = 1, env: dict | None = None
+) -> str:
+    """Start ``app`` under uvicorn, stopped when ``stack`` closes; returns its base URL."""
+    command = [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port)]
+    command += ["--workers", str(workers), "--log-level", "warning"]
+    process = subprocess.Popen(
+        command,
+        cwd=BACKEND_DIR,
+        env={**os.environ, **(env or {})},
+    )
+    stack.callback(process.wait, 30)
+    stack.callback(process.terminate)
+    return f"http://127.0.0.1:{port}"
+
+
+def wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if httpx.get(url, timeout=2).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{url} not ready after {timeout:.0f}s")
+        time.sleep(0.2)
+
+
+def print_report(result: dict) -> None:
+    print(f"\n{'Route':<38} {'count':>7} {'err%':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for route, stats in result["routes"].items():
+        print(
+            f"{route:<38} {stats['count']:>7} {stats['error_rate'] * 100:>5.1f}% "
+            f"{stats['rps']:>8.1f} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+            f"{stats['p99_ms']:>8.1f}"
+        )
+    print(
+        f"\nTotal: {result['total_requests']} requests in {result['elapsed_seconds']:.1f}s "
+        f"({result['throughput']:.1f} req/s)"
+    )
+
+
+async def run(args: argparse.Namespace, base_url: str) -> LoadReport:
+    scenarios = [SCENARIOS[name] for name in args.scenario or SCENARIOS]
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        report = await run_load(
+            client,
+            scenarios,
+            tickers=args.tickers or settings.ticker_list,
+            users=args.users,
+            duration_seconds=args.duration,
+            seed=args.seed,
+        )
+    return report
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario (repeatable; default all)",
+    )
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn workers of the started app")
+    parser.add_argument("--tickers", nargs="+", help="Ticker universe (default: settings.TICKERS)")
+    parser.add_argument("--base-url", help="Test an already running app instead of starting one")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout (seconds)")
+    parser.add_argument("--seed", type=int, help="Seed of the users' ticker choices")
+    parser.add_argument("--json", type=Path, help="Also write the report to this file")
+    parser.add_argument(
+        "--slos", type=Path, default=DEFAULT_SLO_FILE, help="YAML file of per-route SLOs"
+    )
+    parser.add_argument("--no-slo", action="store_true", help="Report only, never fail")
+    args = parser.parse_args()
+
+    with ExitStack() as stack:
+        base_url = args.base_url
+        if base_url is None:
+            yahoo_url = start_server(
+                stack,
+                "tests.fakes.yahoo_server:app",
+                free_port(),
+                env={"RECORDINGS_DIR": str(RECORDINGS_DIR)},
+            )
+            base_url = start_server(
+                stack,
+                "main:app",
+                free_port(),
+                workers=args.workers,
+                env={
+                    "DEBUG": "false",  # No SQL echo
+                    "MARKET_DATA_PROVIDER": "yahoo_http",
+                    "MARKET_DATA_BASE_URL": yahoo_url,
+                },
+            )
+            wait_ready(f"{yahoo_url}/docs")
+        wait_ready(f"{base_url}{settings.API_V1_PREFIX}/health")
+
+        print("=" * 60)
+        print("API LOAD TEST")
+        print("=" * 60)
+        print(f"Target: {base_url}{'' if args.base_url else f' ({args.workers} workers)'}")
+        print(f"Scenarios: {', '.join(args.scenario or SCENARIOS)}")
+        print(f"Users: {args.users}, duration: {args.duration:.0f}s")
+        print("=" * 60)
+
+        report = asyncio.run(run(args, base_url))
+
+    result = report.as_dict()
+    print_report(result)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"Report written to {args.json}")
+
+    if args.no_slo:
+        return 0
+    violations = check_slos(report, load_slos(path=args.slos))
+    if violations:
+        print("\nSLO violations:")
+        for violation in violations:
+            print(f"  ✗ {violation}")
+        return 1
+
+    print("\n✓ All routes within SLO")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""In-process fakes of the external services, for tests and load tests."""
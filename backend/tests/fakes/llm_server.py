@@ -0,0 +1,80 @@
+"""
+Fake OpenAI-compatible chat completion server for offline tests and benchmarks.
+
+Responses are deterministic (derived from the prompt) and report token usage,
+so caching and cost accounting behave as they would against the real API.
+
+Run standalone and point ``OPENAI_BASE_URL`` at it:
+    uv run uvicorn tests.fakes.llm_server:app --port 8001
+    OPENAI_BASE_URL=http://localhost:8001/v1
+
+or use it in-process with ``httpx.ASGITransport(app=create_fake_llm_app())``.
+"""
+
+import asyncio
+import hashlib
+from typing import Any
+
+from fastapi import FastAPI
+
+
+class FakeLLMStats:
+    """Request counters exposed for assertions in tests and benchmarks."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+def create_fake_llm_app(latency_seconds: float = 0.0) -> FastAPI:
+    """
+    Create a fake LLM app.
+
+    Args:
+        latency_seconds: Artificial delay per request, to exercise concurrency limits
+
+    Returns:
+        FastAPI app with ``app.state.stats`` holding a FakeLLMStats
+    """
+    fake_app = FastAPI(title="Fake LLM")
+    stats = FakeLLMStats()
+    fake_app.state.stats = stats
+
+    @fake_app.post("/v1/chat/completions")
+    async def chat_completions(request: dict[str, Any]) -> dict[str, Any]:
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            if latency_seconds:
+                await asyncio.sleep(latency_seconds)
+
+            prompt = "\n".join(message.get("content", "") for message in request["messages"])
+            digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+            content = f"[fake:{request['model']}:{digest}] {prompt[:200]}"
+
+            return {
+                "id": f"chatcmpl-{digest}",
+                "object": "chat.completion",
+                "model": request["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": max(1, len(prompt) // 4),
+                    "completion_tokens": max(1, len(content) // 4),
+                    "total_tokens": max(1, len(prompt) // 4) + max(1, len(content) // 4),
+                },
+            }
+        finally:
+            stats.in_flight -= 1
+
+    return fake_app
+
+
+app = create_fake_llm_app()
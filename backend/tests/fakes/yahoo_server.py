@@ -0,0 +1,115 @@
+"""
+Fake Yahoo Finance chart API serving recorded responses, for offline tests.
+
+Responses are JSON files named ``<SYMBOL>.json`` in ``recordings_dir``, as
+saved from ``/v8/finance/chart/<SYMBOL>``; ``period1``/``period2`` requests
+get the recorded bars in that range and unknown symbols Yahoo's 404.
+
+Run standalone and point ``MARKET_DATA_BASE_URL`` at it:
+    RECORDINGS_DIR=tests/fixtures/yahoo_chart \\
+        uv run uvicorn tests.fakes.yahoo_server:app --port 8002
+    MARKET_DATA_PROVIDER=yahoo_http MARKET_DATA_BASE_URL=http://localhost:8002
+
+or use it in-process with ``httpx.ASGITransport(app=create_fake_yahoo_app(...))``.
+"""
+
+import asyncio
+import copy
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class FakeYahooStats:
+    """Request counters exposed for assertions in tests and benchmarks."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections: set[tuple[str, int]] = set()  # Client (host, port) pairs
+        self.http_versions: set[str] = set()
+
+
+def slice_chart(result: dict[str, Any], period1: int | None, period2: int | None) -> dict[str, Any]:
+    """Copy of a chart result restricted to timestamps in ``[period1, period2)``."""
+    result = copy.deepcopy(result)
+    timestamps = result.get("timestamp") or []
+    keep = [
+        i
+        for i, ts in enumerate(timestamps)
+        if (period1 is None or ts >= period1) and (period2 is None or ts < period2)
+    ]
+    result["timestamp"] = [timestamps[i] for i in keep]
+    for series in result["indicators"]["quote"] + result["indicators"].get("adjclose", []):
+        for name, values in series.items():
+            series[name] = [values[i] for i in keep]
+    for kind, events in (result.get("events") or {}).items():
+        result["events"][kind] = {
+            key: event
+            for key, event in events.items()
+            if (period1 is None or event["date"] >= period1)
+            and (period2 is None or event["date"] < period2)
+        }
+    return result
+
+
+def create_fake_yahoo_app(
+    recordings_dir: Path | str, latency_seconds: float = 0.0, fail_status: int | None = None
+) -> FastAPI:
+    """
+    Create a fake chart API app.
+
+    Args:
+        recordings_dir: Directory of recorded ``<SYMBOL>.json`` chart responses
+        latency_seconds: Artificial delay per request, to exercise concurrency limits
+        fail_status: Answer every request with this HTTP status instead
+
+    Returns:
+        FastAPI app with ``app.state.stats`` holding a FakeYahooStats
+    """
+    fake_app = FastAPI(title="Fake Yahoo Finance")
+    stats = FakeYahooStats()
+    fake_app.state.stats = stats
+    recordings = {
+        path.stem: json.loads(path.read_text(encoding="utf-8"))
+        for path in Path(recordings_dir).glob("*.json")
+    }
+
+    @fake_app.get("/v8/finance/chart/{symbol}")
+    async def chart(
+        request: Request, symbol: str, period1: int | None = None, period2: int | None = None
+    ) -> JSONResponse:
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        if request.client is not None:
+            stats.connections.add((request.client.host, request.client.port))
+        stats.http_versions.add(request.scope.get("http_version", ""))
+        try:
+            if latency_seconds:
+                await asyncio.sleep(latency_seconds)
+            if fail_status is not None:
+                return JSONResponse({"finance": {"error": "fake failure"}}, fail_status)
+
+            recorded = recordings.get(symbol)
+            if recorded is None:
+                error = {
+                    "code": "Not Found",
+                    "description": "No data found, symbol may be delisted",
+                }
+                return JSONResponse({"chart": {"result": None, "error": error}}, 404)
+
+            result = slice_chart(recorded["chart"]["result"][0], period1, period2)
+            return JSONResponse({"chart": {"result": [result], "error": None}})
+        finally:
+            stats.in_flight -= 1
+
+    return fake_app
+
+
+app = create_fake_yahoo_app(os.environ.get("RECORDINGS_DIR", "tests/fixtures/yahoo_chart"))
@@ -0,0 +1,88 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.ticker_history import TickerHistory
+from app.services.adjustment_service import (
+    adjusted_column,
+    adjustment_factors,
+    compute_adjustments,
+    join_adjustments,
+    split_multipliers,
+)
+from app.services.ingest_writer import bar_upsert
+from app.services.ticker_service import HISTORY_COLUMNS, _history_query
+
+
+def test_split_multipliers_restore_raw_prices() -> None:
+    # 10:1 split on the third day; provider prices are already divided by 10 before it
+    assert split_multipliers([0.0, 0.0, 10.0, 0.0]) == [10.0, 10.0, 1.0, 1.0]
+    assert split_multipliers([0.0, 2.0, 0.0, 3.0]) == [6.0, 3.0, 3.0, 1.0]
+    assert split_multipliers([]) == []
+
+
+def test_compute_adjustments_cumulates_backwards() -> None:
+    rows = compute_adjustments(
+        [
+            (date(2024, 6, 10), 0.0, 10.0, 1200.0),  # 10:1 split
+            (date(2024, 3, 5), 0.04, 0.0, 800.0),  # dividend, 0.005% of the previous close
+            (date(2024, 9, 12), 0.01, 0.0, 100.0),
+        ]
+    )
+    assert [row["ex_date"] for row in rows] == [
+        date(2024, 3, 5),
+        date(2024, 6, 10),
+        date(2024, 9, 12),
+    ]
+    latest, split, oldest = rows
+    assert oldest["price_factor"] == pytest.approx(1 - 0.01 / 100)
+    assert split["price_factor"] == pytest.approx((1 - 0.01 / 100) / 10)
+    assert split["volume_factor"] == 10.0
+    assert latest["price_factor"] == pytest.approx((1 - 0.01 / 100) / 10 * (1 - 0.04 / 800))
+    assert latest["volume_factor"] == 10.0
+    assert compute_adjustments([]) == []
+
+
+def test_adjusted_history_multiplies_in_sql() -> None:
+    factors = adjustment_factors(["NVDA"])
+    columns = [
+        (
+            adjusted_column(name, factors).label(name)
+            if name in ("close", "volume")
+            else getattr(TickerHistory, name)
+        )
+        for name in HISTORY_COLUMNS
+    ]
+    sql = str(
+        _history_query(columns, "NVDA", None, None, 10, factors).compile(
+            dialect=postgresql.dialect()
+        )
+    )
+    assert "LEFT OUTER JOIN" in sql
+    assert "ticker_history.close * CASE WHEN ticker_history.provider_adjusted" in sql
+    assert "ELSE coalesce(anon_1.price_factor" in sql
+    assert "ELSE coalesce(anon_1.volume_factor" in sql
+    assert "anon_1.end_date > ticker_history.date" in sql
+
+
+def test_join_adjustments_matches_per_ticker() -> None:
+    factors = adjustment_factors(["NVDA", "2330.TW"])
+    query = join_adjustments(
+        TickerHistory.__table__.select().with_only_columns(TickerHistory.date), factors
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "PARTITION BY price_adjustments.ticker" in sql
+    assert "anon_1.ticker = ticker_history.ticker" in sql
+
+
+def test_upsert_rewrites_provider_adjusted_rows() -> None:
+    row = {
+        "ticker": "NVDA",
+        "date": date(2024, 6, 7),
+        **dict.fromkeys(("open", "high", "low", "close", "dividends", "stock_splits"), 1.0),
+        "volume": 100,
+    }
+    sql = str(bar_upsert(row).compile(dialect=postgresql.dialect()))
+    assert "provider_adjusted = false" in sql
+    assert "WHERE ticker_history.provider_adjusted OR" in sql
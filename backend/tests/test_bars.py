@@ -0,0 +1,124 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.v1.endpoints import tickers
+from app.services.bar_service import period_bounds, resample_bars
+from app.services.market_calendar import MONDAY, SUNDAY, exchange_for
+from main import app
+
+
+def test_exchange_for_ticker_suffix() -> None:
+    assert exchange_for("NVDA").code == "XNYS"
+    assert exchange_for("2330.TW").timezone == "Asia/Taipei"
+    assert exchange_for("2222.SR").week_start == SUNDAY
+    assert exchange_for("BRK.B").code == "XNYS"  # share class, not an exchange suffix
+    assert exchange_for("^GSPC").code == "XNYS"
+
+
+def test_exchange_today_uses_local_timezone() -> None:
+    late_utc = datetime(2026, 10, 16, 23, 30, tzinfo=timezone.utc)
+    assert exchange_for("NVDA").today(late_utc) == date(2026, 10, 16)
+    assert exchange_for("2330.TW").today(late_utc) == date(2026, 10, 17)
+
+
+def test_period_bounds() -> None:
+    thursday = date(2026, 10, 15)
+    assert period_bounds(thursday, "1w", MONDAY) == (date(2026, 10, 12), date(2026, 10, 18))
+    assert period_bounds(thursday, "1w", SUNDAY) == (date(2026, 10, 11), date(2026, 10, 17))
+    assert period_bounds(date(2028, 2, 10), "1mo") == (date(2028, 2, 1), date(2028, 2, 29))
+    with pytest.raises(ValueError):
+        period_bounds(thursday, "1d")
+
+
+def test_resample_weekly_and_monthly() -> None:
+    rows = [
+        (date(2026, 9, 29), 10.0, 12.0, 9.0, 11.0, 100),  # Tue
+        (date(2026, 9, 30), 11.0, 15.0, 10.5, 14.0, 200),  # Wed, month end
+        (date(2026, 10, 2), 14.0, 14.5, 8.0, 9.0, 300),  # Fri
+        (date(2026, 10, 5), 9.0, 10.0, 8.5, 9.5, 400),  # Mon, next week
+    ]
+
+    weekly = resample_bars(rows, "1w")
+    assert [(b["period_start"], b["trading_days"]) for b in weekly] == [
+        (date(2026, 9, 28), 3),
+        (date(2026, 10, 5), 1),
+    ]
+    assert {k: weekly[0][k] for k in ("open", "high", "low", "close", "volume")} == {
+        "open": 10.0,
+        "high": 15.0,
+        "low": 8.0,
+        "close": 9.0,
+        "volume": 600,
+    }
+
+    monthly = resample_bars(rows, "1mo")
+    assert [(b["period_start"], b["close"], b["volume"]) for b in monthly] == [
+        (date(2026, 9, 1), 14.0, 300),
+        (date(2026, 10, 1), 9.5, 700),
+    ]
+    assert resample_bars([], "1w") == []
+
+
+def test_resample_sunday_week() -> None:
+    rows = [
+        (date(2026, 10, 11), 1.0, 1.0, 1.0, 1.0, 1),  # Sun
+        (date(2026, 10, 15), 2.0, 2.0, 2.0, 2.0, 1),  # Thu
+        (date(2026, 10, 18), 3.0, 3.0, 3.0, 3.0, 1),  # Sun, next trading week
+    ]
+    assert [b["trading_days"] for b in resample_bars(rows, "1w", SUNDAY)] == [2, 1]
+    assert [b["trading_days"] for b in resample_bars(rows, "1w", MONDAY)] == [1, 2]
+
+
+@pytest.fixture
+def bars_client(monkeypatch):
+    bar = {
+        "period_start": date(2026, 10, 12),
+        "period_end": date(2026, 10, 18),
+        "open": 1.0,
+        "high": 2.0,
+        "low": 0.5,
+        "close": 1.5,
+        "volume": 5_000_000_000,
+        "trading_days": 4,
+        "complete": False,
+    }
+
+    async def fake_get_bars(
+        db, ticker, interval, start_date=None, end_date=None, limit=100, adjusted=False
+    ):
+        return [bar] if ticker == "NVDA" else []
+
+    async def fake_get_bars_batch(
+        db, symbols, interval, start_date=None, end_date=None, limit=100, adjusted=False
+    ):
+        return {symbol: await fake_get_bars(db, symbol, interval) for symbol in symbols}
+
+    async def fake_db():
+        yield None
+
+    monkeypatch.setattr(tickers, "get_bars", fake_get_bars)
+    monkeypatch.setattr(tickers, "get_bars_batch", fake_get_bars_batch)
+    app.dependency_overrides[deps.get_db] = fake_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_bars_endpoints(bars_client) -> None:
+    response = bars_client.get("/api/v1/tickers/NVDA/bars?interval=1w")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["interval"] == "1w"
+    assert body["bars"][0]["volume"] == 5_000_000_000
+    assert body["bars"][0]["complete"] is False
+
+    assert bars_client.get("/api/v1/tickers/NONE/bars").status_code == 404
+    assert bars_client.get("/api/v1/tickers/NVDA/bars?interval=1d").status_code == 422
+
+    batch = bars_client.get("/api/v1/tickers/bars?tickers=NVDA,NONE&interval=1mo").json()
+    assert [(item["ticker"], len(item["bars"])) for item in batch] == [("NVDA", 1), ("NONE", 0)]
+
+    too_many = ",".join(f"T{i}" for i in range(51))
+    assert bars_client.get(f"/api/v1/tickers/bars?tickers={too_many}").status_code == 422
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from app.config import settings
+from app.services.bulk_ingest import (
+    IngestCheckpoint,
+    default_run_id,
+    ingest_shard,
+    run_bulk_ingest,
+    shard,
+)
+
+
+def test_shard_round_robin() -> None:
+    symbols = [f"S{i}" for i in range(10)]
+    shards = shard(symbols, 3)
+    assert [len(part) for part in shards] == [4, 3, 3]
+    assert sorted(sum(shards, [])) == sorted(symbols)
+    assert shard(["A"], 4) == [["A"]]
+
+
+def test_run_id_depends_on_universe_and_period() -> None:
+    assert default_run_id(["B", "A"], "max") == default_run_id(["A", "B", "A"], "max")
+    assert default_run_id(["A"], "max") != default_run_id(["A"], "10y")
+    assert default_run_id(["A"], "max") != default_run_id(["B"], "max")
+
+
+def test_checkpoint_resume_skips_finished_symbols(tmp_path) -> None:
+    checkpoint = IngestCheckpoint(tmp_path)
+    checkpoint.record(0, {"ticker": "NVDA", "status": "done", "finished_at": 1.0})
+    checkpoint.record(1, {"ticker": "TSM", "status": "failed", "finished_at": 1.0})
+    checkpoint.record(1, {"ticker": "GONE", "status": "no_data", "finished_at": 1.0})
+    checkpoint.record(0, {"ticker": "GOOG", "status": "failed", "finished_at": 1.0})
+    checkpoint.record(0, {"ticker": "GOOG", "status": "done", "finished_at": 2.0})
+    # A worker killed mid-write leaves a partial line behind
+    with open(tmp_path / "worker-1.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"ticker": "AAPL", "sta')
+
+    assert checkpoint.remaining(["NVDA", "TSM", "GONE", "GOOG", "AAPL"]) == ["TSM", "AAPL"]
+
+
+def test_ingest_shard_checkpoints_each_symbol(tmp_path) -> None:
+    checkpoint = IngestCheckpoint(tmp_path)
+    in_flight = []
+    max_in_flight = []
+
+    @asynccontextmanager
+    async def session_factory():
+        yield None
+
+    async def fake_ingest(db, tickers, period, full_refresh):
+        in_flight.append(tickers[0])
+        max_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(tickers[0])
+        if tickers[0] == "BOOM":
+            raise RuntimeError("database went away")
+        if tickers[0] == "GONE":
+            return {
+                "success": False,
+                "errors": ["GONE: No data available"],
+                "records_created": 0,
+                "records_updated": 0,
+            }
+        return {
+            "success": True,
+            "errors": [],
+            "records_created": 250,
+            "records_updated": 2,
+            "records_quarantined": 1,
+        }
+
+    started_at = time.time()
+    symbols = ["NVDA", "TSM", "GONE", "BOOM", "GOOG"]
+    asyncio.run(ingest_shard(checkpoint, 0, symbols, "max", 2, session_factory, fake_ingest))
+
+    assert max(max_in_flight) == 2
+    entries = checkpoint.entries()
+    assert entries["BOOM"]["status"] == "failed"
+    assert "database went away" in entries["BOOM"]["error"]
+    assert entries["GONE"]["status"] == "no_data"
+    assert checkpoint.remaining(symbols) == ["BOOM"]
+
+    summary = checkpoint.summary(symbols, started_at)
+    assert (summary.done, summary.no_data, summary.failed) == (3, 1, 1)
+    assert summary.records == 3 * 252
+    assert summary.quarantined == 3
+    assert summary.remaining == 1
+    assert summary.symbols_per_second > 0
+
+
+def test_finished_run_is_not_started_again(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "WORKFLOW_CHECKPOINT_DIR", str(tmp_path))
+    symbols = ["NVDA", "TSM"]
+    run_id = default_run_id(symbols, "max")
+    checkpoint = IngestCheckpoint(tmp_path / "ingest" / run_id)
+    for symbol in symbols:
+        checkpoint.record(0, {"ticker": symbol, "status": "done", "finished_at": time.time() - 60})
+
+    resumed_id, summary = run_bulk_ingest(symbols, "max", workers=4)
+    assert resumed_id == run_id
+    assert summary.resumed == 2
+    assert summary.done == 0
+    assert summary.remaining == 0
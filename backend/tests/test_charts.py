@@ -0,0 +1,65 @@
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.services import chart_service
+from app.services.chart_service import ChartService, ChartSpec, chart_key, render_chart_svg
+from main import app
+
+BARS = [
+    {"date": f"2026-{1 + i // 28:02d}-{1 + i % 28:02d}", "close": 100 + i % 9} for i in range(200)
+]
+
+
+def test_svg_is_well_formed_with_all_panels() -> None:
+    svg = render_chart_svg(ChartSpec("2330.TW", lookback=90), BARS)
+    root = ET.fromstring(svg)
+    assert root.tag.endswith("svg")
+    assert svg.count(b"<polyline") >= 7  # close, MA20, MA60, BB x2, RSI, MACD lines
+
+
+def test_key_depends_only_on_visible_input_and_spec() -> None:
+    spec = ChartSpec("NVDA", lookback=30)
+    older_history = [{"date": "2025-01-01", "close": 1.0}] + BARS
+    assert chart_key(BARS, spec) == chart_key(older_history, spec)
+    assert chart_key(BARS, spec) != chart_key(BARS, ChartSpec("NVDA", lookback=90))
+    assert chart_key(BARS, spec) != chart_key(BARS[:-1], spec)
+
+
+def test_batch_renders_each_chart_once(tmp_path: Path, monkeypatch) -> None:
+    rendered: list[str] = []
+    original = chart_service.render_chart_file
+
+    def counting_render(spec, bars, path):
+        rendered.append(path)
+        return original(spec, bars, path)
+
+    monkeypatch.setattr(chart_service, "render_chart_file", counting_render)
+    service = ChartService(output_dir=tmp_path, executor=ThreadPoolExecutor(2))
+    jobs = [(ChartSpec(t, lookback=lb), BARS) for t in ("NVDA", "TSM") for lb in (30, 90)]
+
+    first = service.render_batch(jobs)
+    second = service.render_batch(jobs)
+
+    assert first == second
+    assert len(rendered) == 4
+    assert all(path.exists() for path in first.values())
+
+
+def test_chart_files_are_served_with_immutable_cache_headers(tmp_path: Path, monkeypatch) -> None:
+    service = ChartService(output_dir=tmp_path)
+    monkeypatch.setattr(chart_service, "get_chart_service", lambda: service)
+    monkeypatch.setattr("app.api.v1.endpoints.charts.get_chart_service", lambda: service)
+    key = chart_key(BARS, ChartSpec("NVDA"))
+    service.path_for(key).write_bytes(render_chart_svg(ChartSpec("NVDA"), BARS))
+
+    client = TestClient(app)
+    response = client.get(f"/api/v1/charts/files/{key}.svg")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/svg+xml"
+    assert "immutable" in response.headers["cache-control"]
+
+    assert client.get(f"/api/v1/charts/files/{'0' * 32}.svg").status_code == 404
+    assert client.get("/api/v1/charts/files/..%2Fsecret.svg").status_code in (404, 422)
@@ -0,0 +1,164 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import ticker_service
+from app.services.data_quality import (
+    QualityPolicy,
+    quarantine_bars,
+    validate_bars,
+)
+from app.services.market_calendar import SUNDAY
+
+
+def _frame(rows: list[tuple], dates: list[str]) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        rows, columns=["Open", "High", "Low", "Close", "Volume"], index=pd.DatetimeIndex(dates)
+    )
+    frame["Dividends"] = 0.0
+    frame["Stock Splits"] = 0.0
+    return frame
+
+
+def _good(close: float) -> tuple:
+    return (close, close + 1, close - 1, close, 1_000)
+
+
+def test_row_checks_quarantine_bad_rows_only() -> None:
+    frame = _frame(
+        [
+            _good(100),
+            (101, 102, 100, 101, np.nan),  # NaN volume
+            (101, 99, 102, 101, 1_000),  # high < low
+            (101, 102, 100, 105, 1_000),  # close above high
+            (101, 102, 100, 101, -5),  # negative volume
+            (0, 102, 100, 101, 1_000),  # non-positive open (also outside range)
+            _good(100),  # duplicate of the next row: the later one is kept
+            _good(102),
+        ],
+        [
+            "2026-10-05",
+            "2026-10-06",
+            "2026-10-07",
+            "2026-10-08",
+            "2026-10-09",
+            "2026-10-12",
+            "2026-10-13",
+            "2026-10-13",
+        ],
+    )
+    clean, rejected, report = validate_bars("NVDA", frame, QualityPolicy())
+
+    assert clean.tolist() == [True, False, False, False, False, False, False, True]
+    assert [row["reasons"] for row in rejected] == [
+        ["non_finite"],
+        ["high_below_low"],
+        ["open_close_outside_range"],
+        ["negative_volume"],
+        ["non_positive_price", "open_close_outside_range"],
+        ["duplicate_date"],
+    ]
+    assert rejected[0]["date"] == date(2026, 10, 6)
+    assert rejected[0]["payload"]["volume"] is None
+    assert report.rows == 8
+    assert report.clean == 2
+    assert report.quarantined["open_close_outside_range"] == 2
+
+
+def test_spikes_quarantined_lasting_moves_and_gaps_reported() -> None:
+    frame = _frame(
+        [_good(100), _good(300), _good(101), _good(102), _good(40), _good(41)],
+        ["2026-10-05", "2026-10-06", "2026-10-07", "2026-10-08", "2026-10-09", "2026-10-20"],
+    )
+    clean, rejected, report = validate_bars("NVDA", frame, QualityPolicy(max_daily_move=0.5))
+
+    assert [row["reasons"] for row in rejected] == [["price_spike"]]
+    assert rejected[0]["date"] == date(2026, 10, 6)
+    assert report.extreme_moves == ["2026-10-09"]
+    # 12th-19th October: six missing weekdays
+    assert report.gaps == [{"after": "2026-10-09", "before": "2026-10-20", "missing_days": 6}]
+
+    # Sunday-Thursday markets trade on the Sundays in between
+    _, _, report = validate_bars("2222.SR", frame, QualityPolicy(), SUNDAY)
+    assert [gap["missing_days"] for gap in report.gaps] == [7]
+
+
+def test_policy_from_config() -> None:
+    assert QualityPolicy.from_config({}) == QualityPolicy()
+    assert QualityPolicy.from_config({"max_daily_move": 0.3}).max_daily_move == 0.3
+    with pytest.raises(ValueError):
+        QualityPolicy.from_config({"max_daily_move": 0})
+
+
+class _Result(list):
+    rowcount = 1
+
+    def scalar_one_or_none(self):
+        return None
+
+    def tuples(self):
+        return self
+
+    def all(self):
+        return list(self)
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result()
+
+    async def scalar(self, statement):
+        return None
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+async def test_quarantine_replaces_rows_in_range() -> None:
+    db = _RecordingSession()
+    rejected = [{"date": date(2026, 10, 6), "reasons": ["non_finite"], "payload": {"volume": None}}]
+    await quarantine_bars(db, "NVDA", rejected, date(2026, 10, 1), date(2026, 10, 9))
+
+    delete_sql, insert_sql = (str(s.compile(dialect=postgresql.dialect())) for s in db.statements)
+    assert delete_sql.startswith("DELETE FROM quarantined_bars")
+    assert "quarantined_bars.date >=" in delete_sql
+    assert insert_sql.startswith("INSERT INTO quarantined_bars")
+
+
+async def test_bad_bar_no_longer_fails_the_ticker(monkeypatch) -> None:
+    import yfinance
+
+    frame = _frame(
+        [_good(100), (101, 102, 100, 101, np.nan), _good(102)],
+        ["2026-10-05", "2026-10-06", "2026-10-07"],
+    )
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            pass
+
+        def history(self, period, auto_adjust):
+            return frame
+
+    monkeypatch.setattr(yfinance, "Ticker", FakeTicker)
+    db = _RecordingSession()
+    result = await ticker_service.fetch_and_store_ticker_data(db, tickers=["NVDA"])
+
+    assert result["success"] is True
+    assert result["records_created"] == 2
+    assert result["records_quarantined"] == 1
+    assert result["quality"]["NVDA"]["quarantined"] == {"non_finite": 1}
+    assert db.commits == 1
+    assert db.rollbacks == 0
@@ -0,0 +1,293 @@
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError, TimeoutError
+
+from app.services.fetch_coordinator import (
+    FetchCoordinator,
+    SingleFlight,
+    advisory_lock_key,
+    advisory_xact_lock,
+    merge_fetch_results,
+)
+
+
+def _result(ticker: str, created: int = 1, errors: list[str] | None = None) -> dict:
+    return {
+        "success": not errors,
+        "message": "",
+        "records_created": created,
+        "records_updated": 0,
+        "records_quarantined": 0,
+        "tickers_processed": 0 if errors else 1,
+        "tickers_up_to_date": 0,
+        "sessions_missing": 0,
+        "sessions_unfilled": 0,
+        "errors": errors or [],
+        "quality": {} if errors else {ticker: {"ticker": ticker}},
+    }
+
+
+async def test_single_flight_shares_one_call() -> None:
+    flights = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "bars"
+
+    first = asyncio.create_task(flights.do("NVDA", fetch))
+    second = asyncio.create_task(flights.do("NVDA", fetch))
+    await asyncio.sleep(0)
+    assert flights.in_flight == {"NVDA"}
+    release.set()
+
+    assert await first == ("bars", False)
+    assert await second == ("bars", True)
+    assert calls == 1
+    assert flights.in_flight == set()
+
+
+async def test_single_flight_shares_errors_and_survives_cancelled_callers() -> None:
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        raise RuntimeError("upstream down")
+
+    leader = asyncio.create_task(flights.do("NVDA", fetch))
+    follower = asyncio.create_task(flights.do("NVDA", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        await follower
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+def test_advisory_lock_key_is_stable_and_fits_bigint() -> None:
+    key = advisory_lock_key("ticker_fetch:NVDA")
+
+    assert key == advisory_lock_key("ticker_fetch:NVDA")
+    assert key != advisory_lock_key("ticker_fetch:TSM")
+    assert -(2**63) <= key < 2**63
+
+
+class _LockNotAvailable(Exception):
+    sqlstate = "55P03"
+
+
+class _LockSession:
+    """
+    Session whose advisory lock is held by someone else while ``busy``.
+
+    With ``held``, waiting for it runs into ``lock_timeout``.
+    """
+
+    def __init__(self, busy: bool = False, held: bool = False, no_connection: bool = False):
+        self.busy = busy or held
+        self.held = held
+        self.no_connection = no_connection
+        self.statements = []
+        self.rollbacks = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def scalar(self, statement):
+        if self.no_connection:
+            raise TimeoutError("QueuePool limit of size 5 overflow 0 reached")
+        self.statements.append(statement)
+        return not self.busy
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        if self.held and "pg_advisory_xact_lock" in str(statement):
+            raise DBAPIError(str(statement), None, _LockNotAvailable("lock timeout"))
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+async def test_advisory_lock_waits_when_held_elsewhere() -> None:
+    db = _LockSession(busy=True)
+
+    async with advisory_xact_lock(db, 42) as waited:
+        assert waited is True
+        assert db.rollbacks == 0
+
+    try_sql, wait_sql = (str(s.compile(dialect=postgresql.dialect())) for s in db.statements)
+    assert "pg_try_advisory_xact_lock" in try_sql
+    assert "pg_advisory_xact_lock" in wait_sql
+    # Ending the transaction releases the lock
+    assert db.rollbacks == 1
+
+
+async def test_advisory_lock_taken_immediately_when_free() -> None:
+    db = _LockSession()
+
+    async with advisory_xact_lock(db, 42) as waited:
+        assert waited is False
+
+    assert len(db.statements) == 1
+
+
+async def test_advisory_lock_wait_is_bounded() -> None:
+    db = _LockSession(held=True)
+
+    async with advisory_xact_lock(db, 42, timeout=1.5) as waited:
+        assert waited is False
+
+    set_sql, wait_sql = (str(s.compile(dialect=postgresql.dialect())) for s in db.statements[1:])
+    assert "set_config" in set_sql
+    assert "1500ms" in db.statements[1].compile().params.values()
+    assert "pg_advisory_xact_lock" in wait_sql
+    assert db.rollbacks == 2
+
+
+async def test_advisory_lock_skipped_when_pool_exhausted() -> None:
+    db = _LockSession(no_connection=True)
+
+    async with advisory_xact_lock(db, 42, timeout=1.5) as waited:
+        assert waited is False
+
+    assert db.statements == []
+    assert db.rollbacks == 0
+
+
+async def test_overlapping_fetches_share_tickers() -> None:
+    release = asyncio.Event()
+    calls = []
+
+    async def ingest(db, tickers, period, full_refresh, writer, prefetched):
+        calls.append((tickers[0], period, full_refresh))
+        await release.wait()
+        return _result(tickers[0])
+
+    coordinator = FetchCoordinator(_LockSession, ingest=ingest, advisory_locks=False)
+    first = asyncio.create_task(coordinator.fetch(["NVDA"], period="1y"))
+    second = asyncio.create_task(coordinator.fetch(["NVDA", "TSM"], period="1y"))
+    await asyncio.sleep(0.01)
+    release.set()
+    first, second = await asyncio.gather(first, second)
+
+    assert sorted(calls) == [("NVDA", "1y", False), ("TSM", "1y", False)]
+    assert first["tickers_shared"] == 0
+    assert second["tickers_shared"] == 1
+    assert second["records_created"] == 2
+    assert sorted(second["quality"]) == ["NVDA", "TSM"]
+    assert coordinator.stats.fetches == 2 and coordinator.stats.shared == 1
+
+
+async def test_fetch_after_another_process_only_fills_gaps() -> None:
+    calls = []
+
+    async def ingest(db, tickers, period, full_refresh, writer, prefetched):
+        calls.append(full_refresh)
+        return _result(tickers[0], created=0)
+
+    coordinator = FetchCoordinator(lambda: _LockSession(busy=True), ingest=ingest)
+    result = await coordinator.fetch(["NVDA"], full_refresh=True)
+
+    assert calls == [False]
+    assert result["success"] is True
+    assert coordinator.stats.waited == 1
+
+
+async def test_locks_are_held_on_their_own_sessions() -> None:
+    lock_sessions = []
+    calls = []
+
+    def lock_session():
+        lock_sessions.append(_LockSession(held=True))
+        return lock_sessions[-1]
+
+    async def ingest(db, tickers, period, full_refresh, writer, prefetched):
+        calls.append((type(db), full_refresh))
+        return _result(tickers[0])
+
+    coordinator = FetchCoordinator(
+        _LockSession, ingest=ingest, lock_session_factory=lock_session, lock_timeout=1
+    )
+    await coordinator.fetch(["NVDA"], full_refresh=True)
+
+    # Timed out waiting for the other process: fetched as asked, without the lock
+    assert calls == [(_LockSession, True)]
+    assert len(lock_sessions) == 1 and lock_sessions[0].statements
+    assert coordinator.stats.waited == 0
+
+
+async def test_fetch_prefetches_whole_periods_together() -> None:
+    release = asyncio.Event()
+    prefetches = []
+    calls = []
+
+    async def prefetch(db, tickers, period, full_refresh):
+        prefetches.append(list(tickers))
+        return {ticker: f"{ticker} bars" for ticker in tickers if ticker != "AAPL"}
+
+    async def ingest(db, tickers, period, full_refresh, writer, prefetched):
+        calls.append((tickers[0], prefetched))
+        if tickers[0] == "NVDA":
+            await release.wait()
+        return _result(tickers[0])
+
+    coordinator = FetchCoordinator(
+        _LockSession, ingest=ingest, advisory_locks=False, prefetch=prefetch
+    )
+    first = asyncio.create_task(coordinator.fetch(["NVDA"], period="1y"))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(coordinator.fetch(["NVDA", "TSM", "AAPL", "TSM"], period="1y"))
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(first, second)
+
+    # One batch for the tickers the second call started flights for; NVDA was in flight
+    assert prefetches == [["TSM", "AAPL"]]
+    assert calls == [
+        ("NVDA", None),
+        ("TSM", {"TSM": "TSM bars"}),
+        ("AAPL", None),
+    ]
+
+
+async def test_prefetched_download_dropped_after_waiting_for_another_process() -> None:
+    calls = []
+
+    async def prefetch(db, tickers, period, full_refresh):
+        return {ticker: f"{ticker} bars" for ticker in tickers}
+
+    async def ingest(db, tickers, period, full_refresh, writer, prefetched):
+        calls.append((tickers[0], full_refresh, prefetched))
+        return _result(tickers[0])
+
+    coordinator = FetchCoordinator(
+        lambda: _LockSession(busy=True), ingest=ingest, prefetch=prefetch
+    )
+    await coordinator.fetch(["NVDA", "TSM"], full_refresh=True)
+
+    assert calls == [("NVDA", False, None), ("TSM", False, None)]
+
+
+def test_merge_fetch_results() -> None:
+    merged = merge_fetch_results(
+        [_result("NVDA", created=3), _result("BAD", created=0, errors=["BAD: No data available"])],
+        tickers_shared=1,
+    )
+
+    assert merged["success"] is False
+    assert merged["message"] == "Completed with 1 error(s): BAD: No data available"
+    assert merged["records_created"] == 3
+    assert merged["tickers_processed"] == 1
+    assert merged["tickers_shared"] == 1
+    assert list(merged["quality"]) == ["NVDA"]
@@ -0,0 +1,133 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.v1.endpoints import tickers
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+from main import app
+
+UPDATED_AT = datetime(2026, 10, 16, 8, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def history_client(monkeypatch):
+    calls = {"history": 0}
+
+    async def fake_validator(db, ticker, start_date=None, end_date=None):
+        return UPDATED_AT, 2
+
+    async def fake_rows(db, ticker, start_date=None, end_date=None, limit=100, adjusted=False):
+        calls["history"] += 1
+        return [
+            (
+                ticker,
+                date(2026, 10, 15 + i),
+                1.0,
+                2.0,
+                0.5,
+                1.5,
+                100,
+                0.0,
+                0.0,
+                i,
+                UPDATED_AT,
+                UPDATED_AT,
+            )
+            for i in range(2)
+        ]
+
+    async def fake_db():
+        yield None
+
+    monkeypatch.setattr(tickers, "get_history_validator", fake_validator)
+    monkeypatch.setattr(tickers, "get_ticker_history_rows", fake_rows)
+    app.dependency_overrides[deps.get_db] = fake_db
+    yield TestClient(app), calls
+    app.dependency_overrides.clear()
+
+
+def test_history_revalidates_with_304(history_client) -> None:
+    client, calls = history_client
+    first = client.get("/api/v1/tickers/NVDA/history")
+    assert first.status_code == 200
+    assert first.headers["last-modified"] == "Fri, 16 Oct 2026 08:30:15 GMT"
+
+    etag = first.headers["etag"]
+    second = client.get("/api/v1/tickers/NVDA/history", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+    third = client.get(
+        "/api/v1/tickers/NVDA/history",
+        headers={"If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert third.status_code == 304
+    assert calls["history"] == 1
+
+    other_range = client.get(
+        "/api/v1/tickers/NVDA/history?limit=5", headers={"If-None-Match": etag}
+    )
+    assert other_range.status_code == 200
+
+
+def test_choose_encoding(monkeypatch) -> None:
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip;q=0") is None
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("br;q=0.5, gzip") == "gzip"
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br") is None
+
+
+def test_large_responses_are_compressed() -> None:
+    small_app = FastAPI()
+    small_app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @small_app.get("/big")
+    async def big() -> dict[str, str]:
+        return {"data": "x" * 5000}
+
+    @small_app.get("/small")
+    async def small_response() -> PlainTextResponse:
+        return PlainTextResponse("tiny")
+
+    client = TestClient(small_app)
+    raw = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert raw.headers["content-encoding"] == "gzip"
+    assert int(raw.headers["content-length"]) < 5000
+    assert raw.json() == {"data": "x" * 5000}
+    assert "Accept-Encoding" in raw.headers["vary"]
+
+    tiny = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in tiny.headers
+    assert tiny.text == "tiny"
+
+    identity = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+
+def test_partial_responses_are_not_compressed(tmp_path) -> None:
+    path = tmp_path / "chart.svg"
+    path.write_text("<svg>" + "x" * 5000 + "</svg>")
+    range_app = FastAPI()
+    range_app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @range_app.get("/chart")
+    async def chart() -> FileResponse:
+        return FileResponse(path, media_type="image/svg+xml")
+
+    client = TestClient(range_app)
+    partial = client.get("/chart", headers={"Accept-Encoding": "gzip", "Range": "bytes=0-99"})
+
+    assert partial.status_code == 206
+    assert "content-encoding" not in partial.headers
+    assert partial.headers["content-range"] == f"bytes 0-99/{path.stat().st_size}"
+    assert partial.content == path.read_bytes()[:100]
@@ -0,0 +1,248 @@
+import asyncio
+from datetime import date
+
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.process_cache import TickerChange
+from app.services import ticker_service
+from app.services.ingest_writer import BAR_COLUMNS, IngestWriter, bar_upsert
+
+
+def _bar(ticker: str, day: int, close: float = 100.0) -> dict:
+    return {
+        "ticker": ticker,
+        "date": date(2026, 10, day),
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": 1_000,
+        "dividends": 0.0,
+        "stock_splits": 0.0,
+        "updated_at": None,
+    }
+
+
+class _Store:
+    """ticker_history as the fake sessions see it: committed rows by (ticker, date)."""
+
+    def __init__(self, rows: list[dict] | None = None, reject: str | None = None):
+        self.rows = {(row["ticker"], row["date"]): row for row in rows or []}
+        self.reject = reject  # Ticker whose rows fail the insert
+        self.statements = []
+        self.notified = []  # pg_notify payloads
+        self.commits = 0
+        self.rollbacks = 0
+
+    def session(self) -> "_WriterSession":
+        return _WriterSession(self)
+
+
+class _WriterSession:
+    def __init__(self, store: _Store):
+        self.store = store
+        self.pending: dict = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        self.store.statements.append(statement)
+        if "pg_notify" in str(statement):
+            self.store.notified.append(list(statement.compile().params.values())[1])
+            return []
+        params = statement.compile(dialect=postgresql.dialect()).params
+        count = sum(name.startswith("ticker_m") for name in params) or 1
+        returned = []
+        for i in range(count):
+            suffix = f"_m{i}" if f"ticker_m{i}" in params else ""
+            row = {name: params[f"{name}{suffix}"] for name in ("ticker", "date", *BAR_COLUMNS)}
+            if row["ticker"] == self.store.reject:
+                raise ValueError(f"bad row for {row['ticker']}")
+            key = (row["ticker"], row["date"])
+            stored = self.pending.get(key, self.store.rows.get(key))
+            if stored is not None and all(stored[c] == row[c] for c in BAR_COLUMNS):
+                continue
+            returned.append((*key, stored is None))
+            self.pending[key] = row
+        return returned
+
+    async def commit(self):
+        self.store.rows.update(self.pending)
+        self.pending = {}
+        self.store.commits += 1
+
+    async def rollback(self):
+        self.pending = {}
+        self.store.rollbacks += 1
+
+
+def test_bar_upsert_skips_unchanged_bars() -> None:
+    sql = str(bar_upsert([_bar("NVDA", 5), _bar("NVDA", 6)]).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("INSERT INTO ticker_history")
+    assert "ON CONFLICT (ticker, date) DO UPDATE SET" in sql
+    assert "IS DISTINCT FROM" in sql
+    assert "%(ticker_m1)s" in sql
+
+
+async def test_concurrent_batches_share_one_commit() -> None:
+    store = _Store([_bar("NVDA", 5), _bar("TSM", 5)])
+    writer = IngestWriter(store.session, max_rows=100, max_delay=0.01)
+
+    nvda, tsm = await asyncio.gather(
+        writer.write([_bar("NVDA", 5), _bar("NVDA", 6)]),
+        writer.write([_bar("TSM", 5, close=90.0), _bar("TSM", 6)]),
+    )
+
+    assert store.commits == 1
+    assert writer.stats.flushes == 1 and writer.stats.largest_flush == 4
+    assert (nvda.created, nvda.updated, nvda.unchanged) == (1, 0, 1)
+    assert nvda.first_changed == {"NVDA": date(2026, 10, 6)}
+    assert (tsm.created, tsm.updated, tsm.unchanged) == (1, 1, 0)
+    assert tsm.first_changed == {"TSM": date(2026, 10, 5)}
+    assert store.rows[("TSM", date(2026, 10, 5))]["close"] == 90.0
+    # Changed ranges are published in the flush transaction
+    assert [TickerChange.from_payload(payload) for payload in store.notified] == [
+        TickerChange("NVDA", date(2026, 10, 6), date(2026, 10, 6)),
+        TickerChange("TSM", date(2026, 10, 5), date(2026, 10, 6)),
+    ]
+
+
+async def test_later_write_of_a_bar_wins() -> None:
+    store = _Store()
+    writer = IngestWriter(store.session, max_rows=100, max_delay=0.01)
+
+    first = writer.submit([_bar("NVDA", 5, close=100.0), _bar("NVDA", 6)])
+    second = writer.submit([_bar("NVDA", 5, close=101.0)])
+    first, second = await asyncio.gather(first, second)
+
+    assert store.rows[("NVDA", date(2026, 10, 5))]["close"] == 101.0
+    assert (first.rows, first.created, first.superseded) == (2, 1, 1)
+    assert (second.rows, second.created, second.superseded) == (1, 1, 0)
+    assert writer.stats.rows_written == 2
+
+
+async def test_full_buffer_flushes_without_waiting() -> None:
+    store = _Store()
+    writer = IngestWriter(store.session, max_rows=3, max_delay=60)
+
+    result = await asyncio.wait_for(
+        writer.write([_bar("NVDA", day) for day in (5, 6, 7)]), timeout=5
+    )
+
+    assert result.created == 3
+    assert store.commits == 1
+
+
+async def test_chunks_large_flushes(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.ingest_writer.CHUNK_ROWS", 2)
+    store = _Store()
+    writer = IngestWriter(store.session, max_rows=100, max_delay=0)
+
+    result = await writer.write([_bar("NVDA", day) for day in (7, 5, 6)])
+
+    assert result.created == 3
+    # Two chunks, then the change notification
+    assert len(store.statements) == 3 and store.commits == 1
+    assert len(store.notified) == 1
+    # Written in key order
+    first_chunk = store.statements[0].compile(dialect=postgresql.dialect()).params
+    assert (first_chunk["date_m0"], first_chunk["date_m1"]) == (
+        date(2026, 10, 5),
+        date(2026, 10, 6),
+    )
+
+
+async def test_bad_batch_does_not_fail_the_others() -> None:
+    store = _Store(reject="BAD")
+    writer = IngestWriter(store.session, max_rows=100, max_delay=0.01)
+
+    good, bad = await asyncio.gather(
+        writer.write([_bar("NVDA", 5)]),
+        writer.write([_bar("BAD", 5)]),
+        return_exceptions=True,
+    )
+
+    assert good.created == 1
+    assert isinstance(bad, ValueError)
+    assert ("NVDA", date(2026, 10, 5)) in store.rows
+    assert writer.stats.failed_flushes == 1
+
+
+async def test_aclose_flushes_buffered_batches() -> None:
+    store = _Store()
+    writer = IngestWriter(store.session, max_rows=100, max_delay=60)
+
+    future = writer.submit([_bar("NVDA", 5)])
+    await writer.aclose()
+
+    assert future.result().created == 1
+    assert writer.pending_rows == 0
+
+
+def test_invalid_limits_rejected() -> None:
+    with pytest.raises(ValueError):
+        IngestWriter(_Store().session, max_rows=0)
+
+
+class _Result(list):
+    def tuples(self):
+        return self
+
+    def all(self):
+        return list(self)
+
+
+class _ProducerSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def execute(self, statement):
+        return _Result()
+
+    async def scalar(self, statement):
+        return None
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        raise AssertionError("unexpected rollback")
+
+
+async def test_fetch_writes_bars_through_the_writer(monkeypatch) -> None:
+    import yfinance
+
+    frame = pd.DataFrame(
+        [(100.0, 101.0, 99.0, 100.0, 1_000), (101.0, 102.0, 100.0, 101.0, 1_000)],
+        columns=["Open", "High", "Low", "Close", "Volume"],
+        index=pd.DatetimeIndex(["2026-10-05", "2026-10-06"]),
+    )
+    frame["Dividends"] = 0.0
+    frame["Stock Splits"] = 0.0
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            pass
+
+        def history(self, period, auto_adjust):
+            return frame
+
+    monkeypatch.setattr(yfinance, "Ticker", FakeTicker)
+    store = _Store()
+    writer = IngestWriter(store.session, max_rows=100, max_delay=0.01)
+    db = _ProducerSession()
+
+    result = await ticker_service.fetch_and_store_ticker_data(db, tickers=["NVDA"], writer=writer)
+
+    assert result["success"] is True
+    assert result["records_created"] == 2
+    assert sorted(store.rows) == [("NVDA", date(2026, 10, 5)), ("NVDA", date(2026, 10, 6))]
+    # Quarantine before the write, derived data after it
+    assert db.commits == 2
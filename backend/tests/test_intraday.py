@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.v1.endpoints import tickers
+from app.services import intraday_service
+from app.services.intraday_service import (
+    IntradayPolicy,
+    apply_retention,
+    floor_to_bucket,
+    frame_to_records,
+)
+from app.services.market_calendar import exchange_for
+from main import app
+
+UTC = timezone.utc
+
+
+def test_policy_from_config() -> None:
+    policy = IntradayPolicy.from_config(
+        {
+            "interval": "5m",
+            "retention": [{"from": "5m", "to": "1h", "after_days": 30}],
+            "drop_after_days": 0,
+        }
+    )
+    assert policy.interval == "5m"
+    assert [(r.source, r.target, r.after.days) for r in policy.rollups] == [("5m", "1h", 30)]
+    assert policy.drop_after is None
+    assert IntradayPolicy.from_config({}) == IntradayPolicy()
+
+    with pytest.raises(ValueError):
+        IntradayPolicy.from_config({"retention": [{"from": "1h", "to": "5m", "after_days": 1}]})
+    with pytest.raises(ValueError):
+        IntradayPolicy.from_config({"interval": "2m"})
+
+
+def test_hourly_buckets_align_to_session_open() -> None:
+    origin = exchange_for("NVDA").session_origin()
+    hour = timedelta(hours=1)
+    # 10:45 New York (EDT) falls in the 10:30 bar, not the 10:00 UTC-aligned one
+    moment = datetime(2026, 10, 16, 14, 45, tzinfo=UTC)
+    assert floor_to_bucket(moment, hour, origin) == datetime(2026, 10, 16, 14, 30, tzinfo=UTC)
+    five = timedelta(minutes=5)
+    assert floor_to_bucket(moment, five, origin) == moment
+
+    india = exchange_for("RELIANCE.NS").session_origin()
+    assert floor_to_bucket(datetime(2026, 10, 16, 5, 0, tzinfo=UTC), hour, india) == datetime(
+        2026, 10, 16, 4, 45, tzinfo=UTC
+    )
+
+
+def test_frame_to_records() -> None:
+    index = pd.DatetimeIndex(
+        ["2026-10-16 09:30", "2026-10-16 09:31", "2026-10-16 09:32"], tz="America/New_York"
+    )
+    frame = pd.DataFrame(
+        {
+            "Open": [1.0, float("nan"), 3.0],
+            "High": [1.5, 2.5, 3.5],
+            "Low": [0.5, 1.5, 2.5],
+            "Close": [1.2, 2.2, 3.2],
+            "Volume": [3_000_000_000, 10, float("nan")],
+        },
+        index=index,
+    )
+    records = frame_to_records("NVDA", "1m", frame)
+    assert records == [
+        (
+            "NVDA",
+            "1m",
+            datetime(2026, 10, 16, 13, 30, tzinfo=UTC),
+            1.0,
+            1.5,
+            0.5,
+            1.2,
+            3_000_000_000,
+        ),
+        ("NVDA", "1m", datetime(2026, 10, 16, 13, 32, tzinfo=UTC), 3.0, 3.5, 2.5, 3.2, 0),
+    ]
+
+
+class _Result(list):
+    rowcount = 3
+
+    def scalars(self):
+        return self
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result()
+
+    async def commit(self):
+        pass
+
+
+async def test_retention_rolls_up_then_deletes() -> None:
+    db = _RecordingSession()
+    now = datetime(2026, 10, 19, 12, 7, tzinfo=UTC)
+    removed = await apply_retention(db, IntradayPolicy(), tickers=["NVDA"], now=now)
+
+    kinds = [type(statement).__name__ for statement in db.statements]
+    assert kinds == ["Insert", "Delete", "Insert", "Delete", "Delete"]
+    assert removed == {"1m": 3, "5m": 3, "dropped": 3}
+
+    # The 1m -> 5m cutoff is aligned to a 5-minute bucket
+    cutoff = db.statements[1].compile().params["timestamp_1"]
+    assert cutoff == datetime(2026, 10, 12, 12, 5, tzinfo=UTC)
+
+
+@pytest.fixture
+def intraday_client(monkeypatch):
+    calls = []
+
+    async def fake_rows(db, ticker, interval, start_date=None, end_date=None, limit=100):
+        calls.append(interval)
+        stamp = datetime(2026, 10, 16, 13, 30, tzinfo=UTC)
+        return (
+            [(ticker, interval, stamp, 1.0, 2.0, 0.5, 1.5, 3_000_000_000)]
+            if ticker == "NVDA"
+            else []
+        )
+
+    async def fake_db():
+        yield None
+
+    monkeypatch.setattr(tickers, "get_intraday_rows", fake_rows)
+    app.dependency_overrides[deps.get_db] = fake_db
+    yield TestClient(app), calls
+    app.dependency_overrides.clear()
+
+
+def test_history_interval_reads_intraday_tier(intraday_client) -> None:
+    client, calls = intraday_client
+    response = client.get("/api/v1/tickers/NVDA/history?interval=5m")
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "ticker": "NVDA",
+            "interval": "5m",
+            "timestamp": "2026-10-16T13:30:00Z",
+            "open": 1.0,
+            "high": 2.0,
+            "low": 0.5,
+            "close": 1.5,
+            "volume": 3_000_000_000,
+        }
+    ]
+    assert calls == ["5m"]
+
+    assert client.get("/api/v1/tickers/NONE/history?interval=1m").status_code == 404
+    assert client.get("/api/v1/tickers/NVDA/history?interval=1h&adjusted=true").status_code == 422
+    assert client.get("/api/v1/tickers/NVDA/history?interval=2m").status_code == 422
+
+
+def test_intraday_policy_reads_yaml() -> None:
+    policy = intraday_service.intraday_policy()
+    assert policy.interval == "1m"
+    assert [rule.target for rule in policy.rollups] == ["5m", "1h"]
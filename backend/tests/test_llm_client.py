@@ -0,0 +1,115 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services.llm_client import (
+    CostTracker,
+    LLMBudgetExceededError,
+    LLMClient,
+    LLMResponse,
+    LLMResponseCache,
+)
+from tests.fakes.llm_server import create_fake_llm_app
+
+PRICING = {"fake-model": {"input": 1000.0, "output": 1000.0}}
+
+
+def make_client(fake_app, cache: LLMResponseCache | None = None, **kwargs) -> LLMClient:
+    return LLMClient(
+        model="fake-model",
+        base_url="http://fake-llm/v1",
+        max_tokens=100,
+        cache=cache,
+        transport=httpx.ASGITransport(app=fake_app),
+        **kwargs,
+    )
+
+
+async def test_identical_prompts_are_served_from_disk_cache(tmp_path: Path) -> None:
+    fake_app = create_fake_llm_app()
+    messages = [{"role": "user", "content": "Summarize NVDA"}]
+
+    async with make_client(fake_app, LLMResponseCache(tmp_path, ttl_seconds=3600)) as llm:
+        first = await llm.complete(messages)
+        second = await llm.complete(messages)
+        other = await llm.complete(messages, temperature=0.0)
+
+    # A new client (e.g. next report run) still hits the persistent cache
+    async with make_client(fake_app, LLMResponseCache(tmp_path, ttl_seconds=3600)) as llm:
+        third = await llm.complete(messages)
+
+    assert not first.cached
+    assert second.cached and third.cached
+    assert second.content == first.content == third.content
+    assert not other.cached
+    assert fake_app.state.stats.requests == 2
+
+
+async def test_expired_entries_are_refetched(tmp_path: Path) -> None:
+    fake_app = create_fake_llm_app()
+    cache = LLMResponseCache(tmp_path, ttl_seconds=3600)
+    messages = [{"role": "user", "content": "Summarize TSM"}]
+
+    async with make_client(fake_app, cache) as llm:
+        await llm.complete(messages)
+        cache.ttl_seconds = -1
+        response = await llm.complete(messages)
+
+    assert not response.cached
+    assert fake_app.state.stats.requests == 2
+
+
+async def test_concurrency_is_capped_per_model() -> None:
+    fake_app = create_fake_llm_app(latency_seconds=0.02)
+
+    async with make_client(fake_app, max_concurrent_requests=2) as llm:
+        await asyncio.gather(
+            *(llm.complete([{"role": "user", "content": f"prompt {i}"}]) for i in range(8))
+        )
+
+    assert fake_app.state.stats.requests == 8
+    assert fake_app.state.stats.max_in_flight == 2
+
+
+async def test_identical_in_flight_prompts_are_coalesced() -> None:
+    fake_app = create_fake_llm_app(latency_seconds=0.02)
+    messages = [{"role": "user", "content": "same"}]
+
+    async with make_client(fake_app) as llm:
+        responses = await asyncio.gather(*(llm.complete(messages) for _ in range(5)))
+
+    assert fake_app.state.stats.requests == 1
+    assert sum(not response.cached for response in responses) == 1
+
+
+async def test_cost_is_accounted_and_budget_enforced() -> None:
+    fake_app = create_fake_llm_app()
+    tracker = CostTracker(pricing=PRICING, max_cost=1.0)
+
+    async with make_client(fake_app, cost_tracker=tracker) as llm:
+        response = await llm.complete([{"role": "user", "content": "x" * 40}], max_tokens=10)
+        assert response.cost == pytest.approx(
+            (response.prompt_tokens + response.completion_tokens) * 1000 / 1_000_000
+        )
+        assert tracker.spent == pytest.approx(response.cost)
+        assert tracker.reserved == 0
+
+        with pytest.raises(LLMBudgetExceededError):
+            await llm.complete([{"role": "user", "content": "y"}], max_tokens=10_000)
+
+    assert fake_app.state.stats.requests == 1
+
+
+def test_cache_entry_ttl(tmp_path: Path) -> None:
+    cache = LLMResponseCache(tmp_path, ttl_seconds=60)
+    key = LLMResponseCache.make_key("m", [{"role": "user", "content": "a"}], {"temperature": 0})
+    assert cache.get(key) is None
+
+    cache.set(key, LLMResponse("a", "m", 1, 1, cost=0.5))
+    hit = cache.get(key)
+    assert hit is not None and hit.cached and hit.cost == 0.0
+
+    cache.ttl_seconds = -1
+    assert cache.get(key) is None
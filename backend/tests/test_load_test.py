@@ -0,0 +1,152 @@
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app.config import settings
+from scripts.load_harness import (
+    SCENARIOS,
+    LoadReport,
+    RouteStats,
+    Scenario,
+    Step,
+    check_slos,
+    load_slos,
+    percentile,
+    run_load,
+)
+
+
+def test_percentile_nearest_rank() -> None:
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([7.0], 99) == 7.0
+    assert percentile([], 50) == 0.0
+
+
+def test_step_fills_in_tickers() -> None:
+    step = Step(
+        "POST /tickers/fetch", params={"tickers": "{tickers}"}, json={"tickers": ["{ticker}"]}
+    )
+
+    method, url, params, body = step.render("NVDA", ["NVDA", "TSM"])
+
+    assert method == "POST"
+    assert url == f"{settings.API_V1_PREFIX}/tickers/fetch"
+    assert params == {"tickers": "NVDA,TSM"}
+    assert body == {"tickers": ["NVDA"]}
+
+
+def test_scenarios_only_use_existing_routes() -> None:
+    from main import app
+
+    routes = {
+        f"{method.upper()} {path.removeprefix(settings.API_V1_PREFIX)}"
+        for path, operations in app.openapi()["paths"].items()
+        for method in operations
+    }
+    for scenario in SCENARIOS.values():
+        for step in scenario.steps:
+            assert step.route in routes, f"{scenario.name}: {step.route}"
+
+
+async def test_run_load_records_latency_per_route() -> None:
+    app = FastAPI()
+
+    @app.get(settings.API_V1_PREFIX + "/tickers/{ticker}/history")
+    async def history(ticker: str) -> list:
+        if ticker == "BAD":
+            raise HTTPException(status_code=500)
+        return []
+
+    @app.get(settings.API_V1_PREFIX + "/tickers/")
+    async def tickers() -> dict:
+        return {}
+
+    scenario = Scenario("reads", (Step("GET /tickers/"), Step("GET /tickers/{ticker}/history")))
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        report = await run_load(
+            client,
+            [scenario],
+            ["NVDA", "BAD"],
+            users=3,
+            duration_seconds=None,
+            iterations=4,
+            seed=1,
+        )
+
+    result = report.as_dict()
+    assert result["total_requests"] == 24
+    assert result["routes"]["GET /tickers/"]["count"] == 12
+    assert result["routes"]["GET /tickers/"]["errors"] == 0
+    history_stats = result["routes"]["GET /tickers/{ticker}/history"]
+    assert history_stats["count"] == 12
+    assert 0 < history_stats["errors"] < 12
+    assert history_stats["errors"] == history_stats["statuses"]["500"]
+    assert history_stats["p50_ms"] <= history_stats["p95_ms"] <= history_stats["p99_ms"]
+
+
+async def test_run_load_needs_a_stop_condition() -> None:
+    with pytest.raises(ValueError):
+        await run_load(None, [SCENARIOS["dashboard"]], ["NVDA"], duration_seconds=None)
+
+
+def _report(route: str, latencies: list[float], errors: int = 0) -> LoadReport:
+    report = LoadReport(users=1, scenarios=["reads"], elapsed_seconds=10.0)
+    report.routes[route] = RouteStats(latencies_ms=latencies, errors=errors)
+    return report
+
+
+def test_route_slo_overrides_the_default() -> None:
+    slos = load_slos(
+        {
+            "*": {"p95_ms": 100, "max_error_rate": 0.0},
+            "POST /tickers/fetch": {"p95_ms": 1000},
+        }
+    )
+
+    assert slos["POST /tickers/fetch"].p95_ms == 1000
+    assert slos["POST /tickers/fetch"].max_error_rate == 0.0
+    assert check_slos(_report("POST /tickers/fetch", [500.0] * 10), slos) == []
+    assert check_slos(_report("GET /tickers/", [500.0] * 10), slos) == [
+        "GET /tickers/: p95_ms 500.0 > 100"
+    ]
+
+
+def test_slo_violations_for_errors_and_throughput() -> None:
+    slos = load_slos({"*": {"max_error_rate": 0.1, "min_rps": 5}})
+
+    violations = check_slos(_report("GET /tickers/", [10.0] * 10, errors=2), slos)
+
+    assert violations == [
+        "GET /tickers/: error rate 20.00% > 10.00%",
+        "GET /tickers/: 1.0 req/s < 5",
+    ]
+
+
+def test_configured_slos_are_valid() -> None:
+    slos = load_slos()
+
+    assert "*" in slos
+    assert slos["POST /tickers/fetch"].p95_ms > slos["*"].p95_ms
+
+
+def test_slos_read_from_file(tmp_path) -> None:
+    path = tmp_path / "slos.yaml"
+    path.write_text('"*":\n  p95_ms: 100\n"GET /tickers/":\n  p99_ms: 300\n', encoding="utf-8")
+
+    slos = load_slos(path=path)
+
+    assert slos["GET /tickers/"].p95_ms == 100
+    assert slos["GET /tickers/"].p99_ms == 300
+
+
+def test_invalid_slo_rejected() -> None:
+    with pytest.raises(ValueError):
+        load_slos({"*": {"p95": 100}})
+    with pytest.raises(ValueError):
+        load_slos({"*": {"max_error_rate": 2}})
@@ -0,0 +1,232 @@
+import asyncio
+import json
+import threading
+from datetime import date
+from pathlib import Path
+
+import httpx
+import pytest
+import uvicorn
+
+from app.config import settings
+from app.core.process_cache import TickerChange
+from app.services import market_data, provider_governor, ticker_service
+from app.services.fetch_coordinator import FetchCoordinator
+from app.services.market_data import YahooChartClient, chart_to_frame, history_fetcher
+from app.services.provider_governor import is_retryable
+from tests.fakes.yahoo_server import create_fake_yahoo_app
+
+RECORDINGS = Path(__file__).parent / "fixtures" / "yahoo_chart"
+
+
+def make_client(fake_app, **kwargs) -> YahooChartClient:
+    return YahooChartClient(
+        base_url="http://fake-yahoo",
+        http2=False,
+        transport=httpx.ASGITransport(app=fake_app),
+        **kwargs,
+    )
+
+
+def test_chart_to_frame_matches_yfinance_layout() -> None:
+    recorded = json.loads((RECORDINGS / "NVDA.json").read_text())
+    frame = chart_to_frame(recorded["chart"]["result"][0])
+
+    assert list(frame.columns) == [
+        "Open",
+        "High",
+        "Low",
+        "Close",
+        "Volume",
+        "Dividends",
+        "Stock Splits",
+    ]
+    assert str(frame.index.tz) == "America/New_York"
+    assert frame.index[0].date() == date(2024, 6, 3)
+    assert frame.loc["2024-06-10", "Stock Splits"].item() == 10.0
+    assert frame.loc["2024-06-11", "Dividends"].item() == 0.01
+    assert frame["Stock Splits"].sum() == 10.0
+
+    # Rows without prices (a halted session) are dropped
+    recorded = json.loads((RECORDINGS / "2330.TW.json").read_text())
+    frame = chart_to_frame(recorded["chart"]["result"][0], actions=False)
+    assert [day.isoformat() for day in frame.index.date] == [
+        "2026-10-12",
+        "2026-10-13",
+        "2026-10-15",
+        "2026-10-16",
+    ]
+    assert "Dividends" not in frame
+
+
+async def test_history_against_recorded_responses() -> None:
+    fake_app = create_fake_yahoo_app(RECORDINGS)
+    async with make_client(fake_app) as client:
+        full = await client.history("NVDA", period="1mo")
+        window = await client.history("NVDA", start=date(2024, 6, 10), end=date(2024, 6, 12))
+        unknown = await client.history("NOPE", period="1y")
+
+    assert len(full) == 10
+    assert [day.isoformat() for day in window.index.date] == ["2024-06-10", "2024-06-11"]
+    assert window["Stock Splits"].tolist() == [10.0, 0.0]
+    assert unknown.empty
+    assert fake_app.state.stats.requests == 3
+
+
+async def test_server_errors_are_retryable() -> None:
+    fake_app = create_fake_yahoo_app(RECORDINGS, fail_status=503)
+    async with make_client(fake_app) as client:
+        with pytest.raises(httpx.HTTPStatusError) as excinfo:
+            await client.history("NVDA", period="1mo")
+    assert is_retryable(excinfo.value)
+
+
+async def test_history_many_is_bounded_by_the_pool() -> None:
+    fake_app = create_fake_yahoo_app(RECORDINGS, latency_seconds=0.01)
+    symbols = ["NVDA", "2330.TW", "NOPE"] * 4
+    async with make_client(fake_app, max_connections=2) as client:
+        frames = await client.history_many(symbols, period="1mo")
+
+    assert list(frames) == ["NVDA", "2330.TW", "NOPE"]
+    assert len(frames["NVDA"]) == 10 and frames["NOPE"].empty
+    assert fake_app.state.stats.max_in_flight <= 2
+
+
+@pytest.fixture
+def chart_server():
+    """The fake chart API on a real local socket, to observe connection reuse."""
+    fake_app = create_fake_yahoo_app(RECORDINGS)
+    server = uvicorn.Server(
+        uvicorn.Config(fake_app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        threading.Event().wait(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", fake_app.state.stats
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+async def test_connections_are_kept_alive(chart_server) -> None:
+    base_url, stats = chart_server
+    async with YahooChartClient(base_url=base_url, http2=False, max_connections=3) as client:
+        for _ in range(2):
+            await client.history_many(["NVDA", "2330.TW"] * 5, period="1mo")
+            await asyncio.sleep(0)
+
+    assert stats.requests == 4
+    assert stats.http_versions == {"1.1"}
+    # Four requests over at most three pooled connections
+    assert len(stats.connections) <= 3
+
+
+def test_provider_is_selected_in_settings(monkeypatch) -> None:
+    assert history_fetcher() is market_data.yfinance_history
+
+    client = make_client(create_fake_yahoo_app(RECORDINGS))
+    monkeypatch.setattr(settings, "MARKET_DATA_PROVIDER", "yahoo_http")
+    monkeypatch.setattr(market_data, "get_chart_client", lambda: client)
+    assert history_fetcher() == client.history
+
+
+class _Result(list):
+    rowcount = 1
+
+    def scalar_one_or_none(self):
+        return None
+
+    def tuples(self):
+        return self
+
+    def all(self):
+        return list(self)
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def scalar(self, statement):
+        return None
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result()
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+async def test_ingestion_through_the_http_provider(monkeypatch) -> None:
+    fake_app = create_fake_yahoo_app(RECORDINGS)
+    client = make_client(fake_app)
+    monkeypatch.setattr(settings, "MARKET_DATA_PROVIDER", "yahoo_http")
+    monkeypatch.setattr(market_data, "get_chart_client", lambda: client)
+
+    db = _RecordingSession()
+    result = await ticker_service.fetch_and_store_ticker_data(db, tickers=["NVDA"], period="1mo")
+    await client.aclose()
+
+    assert result["success"] is True
+    assert result["records_created"] == 10
+    assert fake_app.state.stats.requests == 1
+    # Pre-split bars are stored raw (x10), as with the yfinance provider
+    first_bar = next(s for s in db.statements if type(s).__name__ == "Insert")
+    assert first_bar.compile().params["close"] == pytest.approx(1150.0)
+    # The changed range is published to the API workers' caches
+    notify = next(s for s in db.statements if "pg_notify" in str(s))
+    channel, payload = notify.compile().params.values()
+    change = TickerChange.from_payload(payload)
+    assert channel == "ticker_changes"
+    assert change.ticker == "NVDA" and change.start < change.end
+
+
+async def test_multi_ticker_ingestion_batches_full_downloads(monkeypatch) -> None:
+    fake_app = create_fake_yahoo_app(RECORDINGS, latency_seconds=0.05)
+    client = make_client(fake_app)
+    monkeypatch.setattr(settings, "MARKET_DATA_PROVIDER", "yahoo_http")
+    monkeypatch.setattr(market_data, "get_chart_client", lambda: client)
+    monkeypatch.setattr(provider_governor, "_governors", {})  # Fresh no-data cache
+
+    db = _RecordingSession()
+    result = await ticker_service.fetch_and_store_ticker_data(
+        db, tickers=["NVDA", "2330.TW", "NOPE"], period="1mo"
+    )
+    await client.aclose()
+
+    # Requested together, and still through the governor (NOPE has no data)
+    assert fake_app.state.stats.requests == 3
+    assert fake_app.state.stats.max_in_flight == 3
+    assert result["errors"] == ["NOPE: No data available"]
+    assert result["records_created"] == 14
+
+
+async def test_coordinated_fetch_batches_full_downloads(monkeypatch) -> None:
+    fake_app = create_fake_yahoo_app(RECORDINGS, latency_seconds=0.05)
+    client = make_client(fake_app)
+    monkeypatch.setattr(settings, "MARKET_DATA_PROVIDER", "yahoo_http")
+    monkeypatch.setattr(market_data, "get_chart_client", lambda: client)
+    monkeypatch.setattr(provider_governor, "_governors", {})
+
+    # As POST /tickers/fetch and the CLI do: one flight (and ingest) per ticker
+    coordinator = FetchCoordinator(_RecordingSession, advisory_locks=False)
+    result = await coordinator.fetch(["NVDA", "2330.TW", "NOPE"], period="1mo")
+    await client.aclose()
+
+    assert coordinator.stats.fetches == 3
+    assert fake_app.state.stats.requests == 3
+    assert fake_app.state.stats.max_in_flight == 3
+    assert result["errors"] == ["NOPE: No data available"]
+    assert result["records_created"] == 14
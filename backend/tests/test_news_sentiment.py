@@ -0,0 +1,277 @@
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.provider_governor import ProviderGovernor
+from app.services.sentiment_service import (
+    LexiconSentimentModel,
+    MinHashIndex,
+    NewsSentimentPolicy,
+    ingest_articles,
+    load_model,
+    minhash,
+    score_texts,
+    sentiment_summary,
+    similarity,
+)
+from app.tools.news_scraper import NewsScraperTool, normalize_article
+
+STORY = (
+    "Nvidia shares surge after record data center revenue beats estimates. The chipmaker "
+    "reported quarterly revenue well above analyst expectations as demand for AI "
+    "accelerators stayed strong, and guided higher for the next quarter."
+)
+SYNDICATED = STORY.replace("stayed strong", "remained strong") + " (Reuters)"
+OTHER = (
+    "Nvidia shares fall as export restrictions on AI chips to China widen. The chipmaker "
+    "said new rules could hit data center revenue next quarter."
+)
+NOON = datetime(2026, 10, 14, 12, tzinfo=timezone.utc)
+
+
+def _article(article_id: str, title: str, published_at: datetime) -> dict:
+    return {
+        "id": article_id,
+        "ticker": "NVDA",
+        "title": title,
+        "summary": "",
+        "publisher": "Wire",
+        "url": None,
+        "published_at": published_at,
+    }
+
+
+def test_normalize_article_handles_both_payloads() -> None:
+    current = normalize_article(
+        "NVDA",
+        {
+            "id": "abc",
+            "content": {
+                "title": " Nvidia beats ",
+                "summary": "Record quarter",
+                "pubDate": "2026-10-14T12:00:00Z",
+                "provider": {"displayName": "Reuters"},
+                "canonicalUrl": {"url": "https://example.com/a"},
+            },
+        },
+    )
+    legacy = normalize_article(
+        "NVDA",
+        {"uuid": "xyz", "title": "Nvidia beats", "publisher": "AP", "providerPublishTime": 0},
+    )
+
+    assert current == {
+        "id": "abc",
+        "ticker": "NVDA",
+        "title": "Nvidia beats",
+        "summary": "Record quarter",
+        "publisher": "Reuters",
+        "url": "https://example.com/a",
+        "published_at": NOON,
+    }
+    assert legacy["id"] == "xyz" and legacy["publisher"] == "AP"
+    assert legacy["published_at"] == datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert normalize_article("NVDA", {"content": {"title": "No date"}}) is None
+
+
+async def test_scraper_fetches_through_the_governor() -> None:
+    calls = []
+
+    def fetcher(symbol: str, count: int) -> list[dict]:
+        calls.append((symbol, count))
+        return [
+            {"uuid": "old", "title": "Older", "providerPublishTime": 1_000},
+            {"uuid": "ad"},
+            {"uuid": "new", "title": "Newer", "providerPublishTime": 2_000},
+        ]
+
+    governor = ProviderGovernor("test")
+    scraper = NewsScraperTool(fetcher=fetcher, governor=governor, count=10)
+
+    articles = await scraper.fetch("NVDA")
+
+    assert [article["id"] for article in articles] == ["new", "old"]
+    assert calls == [("NVDA", 10)]
+    assert governor.stats.calls == 1
+
+
+def test_minhash_separates_copies_from_other_stories() -> None:
+    story = minhash(STORY)
+
+    assert similarity(story, minhash(SYNDICATED)) > 0.7
+    assert similarity(story, minhash(OTHER)) < 0.2
+    assert minhash(STORY) == story  # Stable across calls (stored signatures stay comparable)
+
+    index = MinHashIndex(bands=16)
+    index.add(story, "story")
+    index.add(minhash(OTHER), "other")
+    assert index.query(minhash(SYNDICATED), 0.5) == ["story"]
+    assert index.query(minhash("Apple unveils a new phone"), 0.5) == []
+
+
+def test_lexicon_model_scores_polarity_and_negation() -> None:
+    model = LexiconSentimentModel()
+
+    positive, negative, negated, neutral = model.score_batch(
+        [
+            "Shares surge as profit beats estimates",
+            "Stock plunges after guidance cut and lawsuit",
+            "Revenue did not improve",
+            "The company held its annual meeting",
+        ]
+    )
+
+    assert positive == pytest.approx(0.75)
+    assert negative == pytest.approx(-0.75)
+    assert negated == pytest.approx(-0.5)
+    assert neutral == 0.0
+    assert load_model("lexicon").name == "lexicon"
+    with pytest.raises(ValueError):
+        load_model("finbert")
+    assert load_model("app.services.sentiment_service:LexiconSentimentModel").name == "lexicon"
+    with pytest.raises(ValueError):
+        load_model("collections:OrderedDict")
+
+
+async def test_texts_scored_in_batches() -> None:
+    batches = []
+
+    class Model:
+        name = "counting"
+
+        def score_batch(self, texts: list[str]) -> list[float]:
+            batches.append(len(texts))
+            return [2.0] * len(texts)
+
+    scores = await score_texts(Model(), ["a"] * 5, batch_size=2)
+
+    assert batches == [2, 2, 1]
+    assert scores == [1.0] * 5  # Clamped to [-1, 1]
+
+
+class _Result(list):
+    def all(self):
+        return list(self)
+
+    def scalars(self):
+        return self
+
+
+class _Session:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result(self.results.pop(0) if self.results else [])
+
+    async def commit(self):
+        self.commits += 1
+
+
+class _CountingModel(LexiconSentimentModel):
+    name = "counting"
+
+    def __init__(self):
+        self.texts = []
+
+    def score_batch(self, texts: list[str]) -> list[float]:
+        self.texts.extend(texts)
+        return super().score_batch(texts)
+
+
+async def test_ingest_scores_each_story_once() -> None:
+    stored_story = minhash(OTHER)
+    db = _Session(
+        # Already stored article ids, then the ticker's stories of the window
+        [SimpleNamespace(article_id="seen")],
+        [SimpleNamespace(article_id="s1", signature=stored_story, published_at=NOON, score=-0.4)],
+    )
+    model = _CountingModel()
+    articles = [
+        _article("seen", "Already stored", NOON),
+        _article("a1", STORY, NOON + timedelta(hours=1)),
+        _article("a2", SYNDICATED, NOON + timedelta(hours=2)),
+        _article("a3", OTHER, NOON + timedelta(days=1)),
+        _article("a4", STORY, NOON + timedelta(days=10)),  # Outside the dedup window
+    ]
+
+    result = await ingest_articles(db, "NVDA", articles, model, NewsSentimentPolicy())
+
+    assert result == {
+        "ticker": "NVDA",
+        "articles": 5,
+        "new": 4,
+        "duplicates": 2,
+        "scored": 2,
+        "days": [date(2026, 10, 14), date(2026, 10, 15), date(2026, 10, 24)],
+    }
+    assert model.texts == [STORY, STORY]  # a1 and a4; never the copies
+    assert db.commits == 1
+
+    insert_params = db.statements[2].compile(dialect=postgresql.dialect()).params
+    rows = {
+        insert_params[f"article_id_m{i}"]: (
+            insert_params[f"duplicate_of_m{i}"],
+            insert_params[f"score_m{i}"],
+        )
+        for i in range(4)
+    }
+    assert rows["a2"] == ("a1", rows["a1"][1])
+    assert rows["a3"] == ("s1", -0.4)
+    assert rows["a4"][0] is None
+
+    refresh = str(db.statements[3].compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO news_sentiment_daily" in refresh
+    assert "ON CONFLICT (ticker, date) DO UPDATE" in refresh
+    assert "FILTER (WHERE news_articles.duplicate_of IS NULL)" in refresh
+
+
+async def test_ingest_skips_known_articles() -> None:
+    db = _Session([SimpleNamespace(article_id="a1")])
+
+    result = await ingest_articles(
+        db, "NVDA", [_article("a1", STORY, NOON)], _CountingModel(), NewsSentimentPolicy()
+    )
+
+    assert result["new"] == 0
+    assert len(db.statements) == 1
+    assert db.commits == 0
+
+
+async def test_sentiment_summary_weights_unique_stories() -> None:
+    def day(day_of_month: int, articles: int, unique: int, score_sum: float):
+        return SimpleNamespace(
+            date=date(2026, 10, day_of_month),
+            articles=articles,
+            unique_articles=unique,
+            score_sum=score_sum,
+            sentiment=score_sum / unique if unique else 0.0,
+            positive=1,
+            negative=0,
+        )
+
+    db = _Session([day(13, 10, 2, 1.0), day(14, 3, 2, -0.2)])
+    summary = await sentiment_summary(db, "NVDA", lookback_days=7, today=date(2026, 10, 14))
+
+    assert summary["sentiment_score"] == pytest.approx(0.2)
+    assert summary["articles"] == 13
+    assert summary["unique_articles"] == 4
+    assert summary["available"] is True
+    assert [entry["date"] for entry in summary["daily"]] == ["2026-10-13", "2026-10-14"]
+
+    empty = await sentiment_summary(_Session([]), "NVDA", lookback_days=7)
+    assert empty["sentiment_score"] is None and empty["available"] is False
+
+
+def test_invalid_policy_rejected() -> None:
+    with pytest.raises(ValueError):
+        NewsSentimentPolicy.from_config({"max_distance": 3})
+    with pytest.raises(ValueError):
+        NewsSentimentPolicy.from_config({"num_perm": 64, "bands": 10})
+    with pytest.raises(ValueError):
+        NewsSentimentPolicy.from_config({"similarity": 0})
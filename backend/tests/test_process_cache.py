@@ -0,0 +1,190 @@
+import asyncio
+from datetime import date
+
+from app.core.change_listener import ChangeListener, listener_dsn
+from app.core.process_cache import ProcessCache, TickerChange
+
+OCT_1 = date(2026, 10, 1)
+OCT_10 = date(2026, 10, 10)
+OCT_20 = date(2026, 10, 20)
+
+
+def _loader(value, calls: list):
+    async def load():
+        calls.append(value)
+        return value
+
+    return load
+
+
+def test_change_scope_and_payload() -> None:
+    change = TickerChange("NVDA", OCT_10, OCT_10)
+
+    assert change.affects(None, None)
+    assert change.affects(OCT_1, OCT_20)
+    assert not change.affects(OCT_1, date(2026, 10, 9))
+    assert not change.affects(date(2026, 10, 11), None)
+    # A changed ex-date rewrites earlier adjusted prices only
+    split = TickerChange("NVDA", OCT_20, OCT_20, adjusted_before=OCT_10)
+    assert split.affects(OCT_1, OCT_10, adjusted=True)
+    assert not split.affects(OCT_1, OCT_10)
+    assert not split.affects(OCT_10, date(2026, 10, 15), adjusted=True)
+
+    assert TickerChange.from_payload(split.payload()) == split
+
+
+async def test_disabled_cache_always_loads() -> None:
+    cache = ProcessCache()
+    calls: list = []
+
+    await cache.get_or_load("k", _loader(1, calls))
+    await cache.get_or_load("k", _loader(1, calls))
+
+    assert calls == [1, 1]
+    assert len(cache) == 0
+
+
+async def test_entries_expire_after_the_ttl() -> None:
+    now = [0.0]
+    cache = ProcessCache(ttl_seconds=10, clock=lambda: now[0])
+    cache.enabled = True
+    calls: list = []
+
+    assert await cache.get_or_load("k", _loader("a", calls)) == "a"
+    assert await cache.get_or_load("k", _loader("b", calls)) == "a"
+    now[0] = 11
+    assert await cache.get_or_load("k", _loader("b", calls)) == "b"
+    assert calls == ["a", "b"]
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+async def test_change_drops_only_affected_entries() -> None:
+    cache = ProcessCache()
+    cache.enabled = True
+    calls: list = []
+    await cache.get_or_load("nvda-all", _loader(1, calls), ticker="NVDA")
+    await cache.get_or_load("nvda-early", _loader(2, calls), ticker="NVDA", end=OCT_1)
+    await cache.get_or_load(
+        "nvda-early-adjusted", _loader(3, calls), ticker="NVDA", end=OCT_1, adjusted=True
+    )
+    await cache.get_or_load("tsm-all", _loader(4, calls), ticker="TSM")
+    await cache.get_or_load("screen", _loader(5, calls))  # Spans every ticker
+
+    dropped = cache.invalidate(TickerChange("NVDA", OCT_10, OCT_20, adjusted_before=OCT_10))
+
+    assert dropped == 3
+    calls.clear()
+    for key in ("nvda-all", "nvda-early", "nvda-early-adjusted", "tsm-all", "screen"):
+        await cache.get_or_load(key, _loader(key, calls), ticker="NVDA")
+    assert calls == ["nvda-all", "nvda-early-adjusted", "screen"]
+
+
+async def test_load_racing_with_a_change_is_not_cached() -> None:
+    cache = ProcessCache()
+    cache.enabled = True
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_read():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    read = asyncio.create_task(cache.get_or_load("k", slow_read, ticker="NVDA"))
+    await started.wait()
+    cache.invalidate(TickerChange("NVDA", OCT_10, OCT_10))
+    release.set()
+
+    assert await read == "stale"
+    assert len(cache) == 0
+
+
+async def test_least_recently_used_entry_evicted() -> None:
+    cache = ProcessCache(max_entries=2)
+    cache.enabled = True
+    calls: list = []
+    await cache.get_or_load("a", _loader("a", calls), ticker="NVDA")
+    await cache.get_or_load("b", _loader("b", calls), ticker="NVDA")
+    await cache.get_or_load("a", _loader("a", calls), ticker="NVDA")
+    await cache.get_or_load("c", _loader("c", calls), ticker="TSM")
+
+    assert cache.stats.evicted == 1
+    calls.clear()
+    await cache.get_or_load("a", _loader("a", calls), ticker="NVDA")
+    await cache.get_or_load("b", _loader("b", calls), ticker="NVDA")
+    assert calls == ["b"]
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.on_terminate = None
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def execute(self, query):
+        return "SELECT 1"
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+    def notify(self, payload: str) -> None:
+        self.listeners["ticker_changes"](self, 1, "ticker_changes", payload)
+
+    def drop(self) -> None:
+        self.closed = True
+        self.on_terminate(self)
+
+
+async def test_listener_invalidates_and_reconnects() -> None:
+    connections: list[_FakeConnection] = []
+
+    async def connect(dsn: str) -> _FakeConnection:
+        connections.append(_FakeConnection())
+        return connections[-1]
+
+    cache = ProcessCache()
+    listener = ChangeListener("postgresql://db", cache, connect=connect, retry_seconds=0.01)
+    listener.start()
+    await asyncio.wait_for(listener.connected.wait(), 1)
+    assert cache.enabled
+
+    calls: list = []
+    await cache.get_or_load("nvda", _loader(1, calls), ticker="NVDA")
+    await cache.get_or_load("tsm", _loader(2, calls), ticker="TSM")
+    connections[0].notify(TickerChange("NVDA", OCT_10, OCT_10).payload())
+    assert len(cache) == 1
+
+    # Changes may be missed while reconnecting: the cache is off, then cleared
+    connections[0].drop()
+    await asyncio.wait_for(_wait_for(lambda: not cache.enabled), 1)
+    await asyncio.wait_for(_wait_for(lambda: len(connections) == 2 and cache.enabled), 1)
+    assert len(cache) == 0
+    assert (listener.stats.connects, listener.stats.disconnects) == (2, 1)
+
+    await cache.get_or_load("tsm", _loader(2, calls), ticker="TSM")
+    connections[1].notify("not json")
+    assert len(cache) == 0
+    assert listener.stats.malformed == 1
+
+    await listener.aclose()
+    assert connections[1].closed
+    assert not cache.enabled
+
+
+async def _wait_for(condition) -> None:
+    while not condition():
+        await asyncio.sleep(0.005)
+
+
+def test_listener_dsn_drops_the_driver() -> None:
+    assert listener_dsn("postgresql+asyncpg://user:secret@db:5432/quant") == (
+        "postgresql://user:secret@db:5432/quant"
+    )
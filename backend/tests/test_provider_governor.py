@@ -0,0 +1,244 @@
+import asyncio
+
+import pytest
+
+from app.config import Settings
+from app.services import provider_governor
+from app.services.provider_governor import (
+    CircuitOpenError,
+    GovernorPolicy,
+    NoDataError,
+    ProviderGovernor,
+    TokenBucket,
+    governor_policy,
+    is_refused,
+    is_retryable,
+)
+
+
+class FakeClock:
+    """Virtual time: sleeping advances the clock instead of waiting."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class Banned(Exception):
+    status_code = 403
+
+
+def _governor(clock: FakeClock, **policy) -> ProviderGovernor:
+    return ProviderGovernor(
+        "fake", GovernorPolicy(**policy), clock=clock, sleep=clock.sleep, jitter=lambda: 1.0
+    )
+
+
+def test_is_retryable() -> None:
+    assert is_retryable(RateLimited())
+    assert is_retryable(TimeoutError())
+    assert is_retryable(type("YFRateLimitError", (Exception,), {})())
+    # e.g. curl_cffi's DNSError, whose ConnectionError is not the builtin one
+    library_connection_error = type("ConnectionError", (OSError,), {})
+    assert is_retryable(type("DNSError", (library_connection_error,), {})())
+    assert not is_retryable(ValueError("bad symbol"))
+    assert not is_retryable(Banned())
+    assert is_refused(Banned())
+    assert not is_refused(ValueError("bad symbol"))
+
+
+def test_token_bucket_paces_after_burst() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+
+    async def run() -> None:
+        for _ in range(7):
+            await bucket.acquire()
+
+    asyncio.run(run())
+    # Three burst tokens, then one every half second
+    assert clock.sleeps == [0.5, 0.5, 0.5, 0.5]
+    assert clock.now == 2.0
+
+
+def test_retries_with_backoff_then_succeeds() -> None:
+    clock = FakeClock()
+    governor = _governor(clock, rate_per_second=1000, max_retries=4, backoff_base_seconds=1)
+    outcomes = [RateLimited(), RateLimited(), "ok"]
+
+    def flaky() -> str:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert asyncio.run(governor.call(flaky)) == "ok"
+    assert clock.sleeps == [1.0, 2.0]
+    assert governor.stats.retries == 2
+    assert governor.breaker.state == "closed"
+
+
+def test_non_retryable_error_is_raised_immediately() -> None:
+    clock = FakeClock()
+    governor = _governor(clock)
+
+    async def broken() -> None:
+        raise ValueError("bad symbol")
+
+    with pytest.raises(ValueError):
+        asyncio.run(governor.call(broken))
+    assert governor.stats.calls == 1
+    assert governor.breaker.failures == 0
+
+
+def test_refusals_open_the_circuit() -> None:
+    clock = FakeClock()
+    governor = _governor(clock, rate_per_second=1000, failure_threshold=2)
+    calls = []
+
+    async def banned() -> None:
+        calls.append(clock.now)
+        raise Banned()
+
+    async def run() -> None:
+        for _ in range(2):
+            with pytest.raises(Banned):
+                await governor.call(banned)
+        with pytest.raises(CircuitOpenError):
+            await governor.call(banned)
+
+    asyncio.run(run())
+    # Not retried, and no longer called once the circuit is open
+    assert len(calls) == 2
+    assert governor.stats.retries == 0
+    assert governor.breaker.state == "open"
+
+
+def test_circuit_opens_and_recovers_through_a_probe() -> None:
+    clock = FakeClock()
+    governor = _governor(
+        clock, rate_per_second=1000, max_retries=0, failure_threshold=2, reset_timeout_seconds=60
+    )
+    calls = []
+
+    async def outage() -> None:
+        calls.append(clock.now)
+        raise RateLimited()
+
+    async def healthy() -> str:
+        calls.append(clock.now)
+        return "ok"
+
+    async def run() -> None:
+        for _ in range(2):
+            with pytest.raises(RateLimited):
+                await governor.call(outage)
+        assert governor.breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await governor.call(healthy)
+        assert len(calls) == 2
+
+        clock.now += 60
+        assert governor.breaker.state == "half_open"
+        with pytest.raises(RateLimited):
+            await governor.call(outage)  # Failed probe re-opens the circuit
+        assert governor.breaker.state == "open"
+
+        clock.now += 60
+        assert await governor.call(healthy) == "ok"
+        assert governor.breaker.state == "closed"
+
+    asyncio.run(run())
+    assert governor.stats.rejected == 1
+
+
+def test_cancelled_probe_releases_the_half_open_circuit() -> None:
+    clock = FakeClock()
+    governor = _governor(
+        clock, rate_per_second=1000, max_retries=0, failure_threshold=1, reset_timeout_seconds=60
+    )
+
+    async def outage() -> None:
+        raise RateLimited()
+
+    async def run() -> None:
+        with pytest.raises(RateLimited):
+            await governor.call(outage)
+        clock.now += 60
+
+        started = asyncio.Event()
+
+        async def hanging() -> None:
+            started.set()
+            await asyncio.Event().wait()
+
+        probe = asyncio.create_task(governor.call(hanging))
+        await started.wait()
+        probe.cancel()  # e.g. the client disconnected
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        # The probe slot is free again: the next call probes and closes the circuit
+        assert governor.breaker.state == "half_open"
+
+        async def healthy() -> str:
+            return "ok"
+
+        assert await governor.call(healthy) == "ok"
+        assert governor.breaker.state == "closed"
+
+    asyncio.run(run())
+
+
+def test_no_data_symbols_are_cached() -> None:
+    clock = FakeClock()
+    governor = _governor(clock, no_data_ttl_seconds=3600)
+    calls = []
+
+    def download(symbol: str) -> list:
+        calls.append(symbol)
+        return []
+
+    async def run() -> None:
+        for _ in range(2):
+            with pytest.raises(NoDataError):
+                await governor.call(download, "GONE", symbol="GONE", empty=lambda rows: not rows)
+        assert calls == ["GONE"]
+        clock.now += 3600
+        with pytest.raises(NoDataError):
+            await governor.call(download, "GONE", symbol="GONE", empty=lambda rows: not rows)
+        assert calls == ["GONE", "GONE"]
+
+    asyncio.run(run())
+    assert governor.stats.no_data == 1
+
+
+def test_policy_from_config() -> None:
+    policy = GovernorPolicy.from_config({"rate_per_second": 5, "unknown": 1})
+    assert policy.rate_per_second == 5
+    assert policy.burst == GovernorPolicy.burst
+    with pytest.raises(ValueError):
+        GovernorPolicy.from_config({"rate_per_second": 0})
+
+
+def test_policy_from_settings(monkeypatch) -> None:
+    monkeypatch.setenv("PROVIDER_LIMITS", '{"yahoo": {"rate_per_second": 0.5, "max_retries": 2}}')
+    monkeypatch.setattr(provider_governor, "settings", Settings())
+
+    policy = governor_policy("yahoo")
+    assert policy.rate_per_second == 0.5
+    assert policy.max_retries == 2 and isinstance(policy.max_retries, int)
+    assert policy.failure_threshold == 5  # Not overridden
+    assert governor_policy("yahoo_quotes").rate_per_second == 10  # Other upstreams kept
+    assert governor_policy("other") == GovernorPolicy()
@@ -0,0 +1,180 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.core.query_monitor import SlowQueryMonitor, analyzable, fingerprint, get_query_monitor
+from main import app
+
+
+def test_fingerprint_normalizes_literals_and_parameters() -> None:
+    assert fingerprint(
+        "SELECT close::float FROM ticker_history\n  WHERE ticker = $1 AND date >= '2026-01-01'"
+        " AND volume > 100 AND ticker IN ($2, $3, $4)"
+    ) == (
+        "SELECT close::float FROM ticker_history WHERE ticker = ? AND date >= ?"
+        " AND volume > ? AND ticker IN (...)"
+    )
+    assert fingerprint("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4), ($5, $6)") == (
+        "INSERT INTO t (a, b) VALUES (...)"
+    )
+    assert fingerprint("SELECT count(*) AS count_1 FROM t WHERE x = :x") == (
+        "SELECT count(*) AS count_1 FROM t WHERE x = ?"
+    )
+
+
+def test_slow_statements_recorded_per_fingerprint() -> None:
+    engine = create_engine("sqlite://")
+    monitor = SlowQueryMonitor(threshold_ms=0, explain_sample_rate=0)
+    monitor.install(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT :x + 1"), {"x": 1})
+        conn.execute(text("SELECT :x + 1"), {"x": 2})
+        conn.execute(text("SELECT 42"))
+        conn.execution_options(query_monitor=False).execute(text("SELECT 'skipped'"))
+
+    stats = monitor.stats["SELECT ? + ?"]
+    assert stats.count == 2
+    assert stats.parameters == "(2,)"
+    assert stats.total_ms >= stats.max_ms >= 0
+    assert sorted(monitor.stats) == ["SELECT ?", "SELECT ? + ?"]
+    assert len(stats.query_id) == 12
+
+
+def test_fast_statements_ignored() -> None:
+    ticks = iter([0.0, 0.05, 1.0, 1.5])
+    monitor = SlowQueryMonitor(threshold_ms=100, clock=lambda: next(ticks))
+    engine = create_engine("sqlite://")
+    monitor.install(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # 50 ms
+        conn.execute(text("SELECT 2 + 2"))  # 500 ms
+
+    assert list(monitor.stats) == ["SELECT ? + ?"]
+    assert monitor.stats["SELECT ? + ?"].max_ms == pytest.approx(500)
+
+
+def test_top_and_eviction() -> None:
+    monitor = SlowQueryMonitor(max_fingerprints=2)
+    monitor.record("SELECT a FROM t", (), 300)
+    monitor.record("SELECT b FROM t", (), 200)
+    monitor.record("SELECT b FROM t", (), 200)
+    monitor.record("SELECT c FROM t", (), 1000)  # Evicts the cheapest, a
+
+    assert [s.fingerprint for s in monitor.top()] == ["SELECT c FROM t", "SELECT b FROM t"]
+    assert [s.fingerprint for s in monitor.top(1, "count")] == ["SELECT b FROM t"]
+    with pytest.raises(ValueError):
+        monitor.top(order_by="rows")
+
+
+class _FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execution_options(self, **options):
+        self.engine.options = options
+        return self
+
+    async def exec_driver_sql(self, statement, parameters):
+        self.engine.executed.append((statement, parameters))
+        return self
+
+    def scalar(self):
+        return '[{"Plan": {"Node Type": "Seq Scan"}, "Execution Time": 12.5}]'
+
+    async def rollback(self):
+        self.engine.rollbacks += 1
+
+
+class _FakeAsyncEngine:
+    sync_engine = None
+
+    def __init__(self):
+        self.executed = []
+        self.options = None
+        self.rollbacks = 0
+
+    def connect(self):
+        return _FakeConnection(self)
+
+
+async def test_explain_captures_plan_on_side_connection() -> None:
+    engine = _FakeAsyncEngine()
+    monitor = SlowQueryMonitor(threshold_ms=0, explain_sample_rate=1, sample=lambda: 0.0)
+    monitor._engine = engine
+    stats = monitor.record("SELECT * FROM ticker_history WHERE ticker = $1", ("NVDA",), 900)
+
+    assert monitor._should_explain(stats.statement)
+    assert not monitor._should_explain("INSERT INTO ticker_history VALUES ($1)")
+    await monitor.explain(stats, stats.statement, ("NVDA",))
+
+    assert engine.executed == [
+        (
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT * FROM ticker_history WHERE ticker = $1",
+            ("NVDA",),
+        )
+    ]
+    assert engine.options == {"query_monitor": False}
+    assert engine.rollbacks == 1
+    assert stats.plan["Plan"]["Node Type"] == "Seq Scan"
+    assert stats.plan_analyzed is True
+    assert stats.plan_captured_at is not None
+    assert monitor.explains == 1
+
+
+def test_admin_endpoint_lists_top_fingerprints(monkeypatch) -> None:
+    monitor = get_query_monitor()
+    monitor.reset()
+    monitor.record("SELECT ticker, count(*) FROM ticker_history GROUP BY ticker", (), 750)
+    client = TestClient(app)
+
+    response = client.get("/api/v1/admin/slow-queries", params={"limit": 5})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["fingerprints"] == 1
+    assert body["queries"][0]["fingerprint"].endswith("GROUP BY ticker")
+    assert body["queries"][0]["max_ms"] == 750
+
+    assert client.delete("/api/v1/admin/slow-queries").status_code == 204
+    assert monitor.stats == {}
+
+
+def test_admin_endpoints_require_the_token(monkeypatch) -> None:
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+
+    assert client.get("/api/v1/admin/slow-queries").status_code == 401
+    response = client.get("/api/v1/admin/slow-queries", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    monkeypatch.setattr(settings, "DEBUG", False)
+    assert client.get("/api/v1/admin/slow-queries").status_code == 403
+
+
+async def test_side_effecting_reads_are_only_planned() -> None:
+    engine = _FakeAsyncEngine()
+    monitor = SlowQueryMonitor(threshold_ms=0, explain_sample_rate=1, sample=lambda: 0.0)
+    monitor._engine = engine
+    statement = "SELECT pg_advisory_xact_lock($1)"
+    stats = monitor.record(statement, (42,), 900)
+
+    assert not analyzable(statement)
+    assert not analyzable("SELECT pg_notify('ticker_changes', $1)")
+    assert not analyzable("SELECT nextval('jobs_id_seq')")
+    assert not analyzable("SELECT * FROM jobs WHERE id = $1 FOR UPDATE SKIP LOCKED")
+    assert analyzable("SELECT * FROM ticker_history WHERE ticker = $1")
+    await monitor.explain(stats, statement, (42,))
+
+    assert engine.executed == [("EXPLAIN (FORMAT JSON) SELECT pg_advisory_xact_lock($1)", (42,))]
+    assert stats.plan_analyzed is False
+    assert stats.plan is not None
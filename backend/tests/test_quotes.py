@@ -0,0 +1,262 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.services import provider_governor, quote_service
+from app.services.market_data import YahooChartClient
+from app.services.quote_service import (
+    QUOTE_UPSTREAM,
+    QuoteHub,
+    QuoteSubscriber,
+    get_quote_hub,
+    provider_quotes,
+)
+from main import app
+from tests.fakes.yahoo_server import create_fake_yahoo_app
+
+RECORDINGS = Path(__file__).parent / "fixtures" / "yahoo_chart"
+
+
+class FakeQuoteProvider:
+    """Local quote source: returns the configured price per symbol and counts polls."""
+
+    def __init__(self, prices: dict[str, float]):
+        self.prices = prices
+        self.calls: dict[str, int] = {}
+        self.batches: list[list[str]] = []
+
+    async def __call__(self, tickers: list[str]) -> dict[str, Any]:
+        self.batches.append(sorted(tickers))
+        quotes: dict[str, Any] = {}
+        for ticker in tickers:
+            self.calls[ticker] = self.calls.get(ticker, 0) + 1
+            quotes[ticker] = (
+                {"price": self.prices[ticker], "previous_close": 100.0, "volume": 1_000}
+                if ticker in self.prices
+                else LookupError(f"unknown symbol {ticker}")
+            )
+        return quotes
+
+
+def test_slow_subscriber_keeps_latest_quote_per_symbol() -> None:
+    async def scenario() -> None:
+        hub = QuoteHub(FakeQuoteProvider({}), poll_interval=60)
+        subscriber = QuoteSubscriber()
+        hub._subscribers["NVDA"] = {subscriber}
+        hub._subscribers["TSM"] = {subscriber}
+
+        for price in (1.0, 2.0, 3.0):
+            hub.publish("NVDA", {"price": price})
+        hub.publish("TSM", {"price": 9.0})
+        hub.publish("TSM", {"price": 9.0})  # unchanged: not re-published
+
+        quotes = await subscriber.get()
+        assert [(q["ticker"], q["price"]) for q in quotes] == [("NVDA", 3.0), ("TSM", 9.0)]
+        assert subscriber.dropped == 2
+
+    asyncio.run(scenario())
+
+
+def test_one_poller_per_symbol_shared_by_subscribers() -> None:
+    async def scenario() -> None:
+        provider = FakeQuoteProvider({"NVDA": 120.0, "TSM": 180.0})
+        hub = QuoteHub(provider, poll_interval=0.01)
+        first, second = QuoteSubscriber(), QuoteSubscriber()
+
+        hub.subscribe(first, ["NVDA", "TSM"])
+        hub.subscribe(second, ["NVDA"])
+        assert hub.polled_tickers == {"NVDA", "TSM"}
+
+        assert {q["ticker"] for q in await first.get()} <= {"NVDA", "TSM"}
+        assert [q["ticker"] for q in await second.get()] == ["NVDA"]
+        await asyncio.sleep(0.05)
+
+        # Late subscriber gets the cached latest quote without an extra poll
+        polls = provider.calls["NVDA"]
+        late = QuoteSubscriber()
+        hub.subscribe(late, ["NVDA"])
+        assert (await late.get())[0]["price"] == 120.0
+        assert provider.calls["NVDA"] - polls <= 1
+
+        hub.unsubscribe(first)
+        assert hub.polled_tickers == {"NVDA"}
+        hub.unsubscribe(second)
+        hub.unsubscribe(late, ["NVDA"])
+        assert hub.polled_tickers == set()
+
+    asyncio.run(scenario())
+
+
+def test_poller_survives_provider_errors() -> None:
+    async def scenario() -> None:
+        provider = FakeQuoteProvider({})
+        hub = QuoteHub(provider, poll_interval=0.01)
+        hub.subscribe(QuoteSubscriber(), ["BAD"])
+        await asyncio.sleep(0.05)
+        assert provider.calls["BAD"] > 1
+        assert hub.polled_tickers == {"BAD"}
+        hub.unsubscribe(next(iter(hub._subscribers["BAD"])))
+
+    asyncio.run(scenario())
+
+
+def test_subscribed_symbols_polled_in_one_batch_per_tick() -> None:
+    async def scenario() -> None:
+        provider = FakeQuoteProvider({"NVDA": 120.0, "TSM": 180.0, "AAPL": 200.0})
+        hub = QuoteHub(provider, poll_interval=0.05)
+        first, second = QuoteSubscriber(), QuoteSubscriber()
+
+        hub.subscribe(first, ["NVDA", "TSM"])
+        await first.get()
+        # A new symbol is polled right away, on its own, then joins the tick
+        hub.subscribe(second, ["AAPL", "NVDA"])
+        await asyncio.sleep(0.15)
+
+        assert provider.batches[:3] == [["NVDA", "TSM"], ["AAPL"], ["AAPL", "NVDA", "TSM"]]
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+        assert hub.polled_tickers == set()
+
+    asyncio.run(scenario())
+
+
+def make_client(fake_app) -> YahooChartClient:
+    return YahooChartClient(
+        base_url="http://fake-yahoo", http2=False, transport=httpx.ASGITransport(app=fake_app)
+    )
+
+
+async def test_quotes_from_the_http_provider(monkeypatch) -> None:
+    fake_app = create_fake_yahoo_app(RECORDINGS)
+    client = make_client(fake_app)
+    monkeypatch.setattr(settings, "MARKET_DATA_PROVIDER", "yahoo_http")
+    monkeypatch.setattr(quote_service, "get_chart_client", lambda: client)
+    monkeypatch.setattr(provider_governor, "_governors", {})
+
+    quotes = await provider_quotes(["NVDA", "2330.TW", "NOPE"])
+    await client.aclose()
+
+    # One one-day chart request per symbol, through the quotes' own governor
+    assert quotes["NVDA"] == {"price": 131.88, "previous_close": 113.62, "volume": None}
+    assert quotes["2330.TW"]["price"] > 0
+    assert isinstance(quotes["NOPE"], provider_governor.NoDataError)
+    assert fake_app.state.stats.requests == 3
+    assert provider_governor._governors.keys() == {QUOTE_UPSTREAM}
+
+
+def test_yfinance_quotes_from_one_download(monkeypatch) -> None:
+    import pandas as pd
+    import yfinance
+
+    index = pd.DatetimeIndex(["2026-10-15", "2026-10-16"], name="Date")
+    bars = {
+        "NVDA": pd.DataFrame({"Close": [100.0, 110.0], "Volume": [5, 7]}, index=index),
+        "GONE": pd.DataFrame({"Close": [None, None], "Volume": [0, 0]}, index=index),
+    }
+    calls = []
+
+    def download(symbols, **kwargs):
+        calls.append((symbols, kwargs["group_by"]))
+        return pd.concat(bars, axis=1)
+
+    monkeypatch.setattr(yfinance, "download", download)
+    quotes = quote_service.yfinance_quotes(["NVDA", "GONE", "NOPE"])
+
+    assert calls == [(["NVDA", "GONE", "NOPE"], "ticker")]
+    assert quotes == {"NVDA": {"price": 110.0, "previous_close": 100.0, "volume": 7}}
+
+
+async def test_quotes_from_yfinance_are_one_governed_call(monkeypatch) -> None:
+    batches = []
+
+    def download(symbols):
+        batches.append(symbols)
+        return {"NVDA": {"price": 1.0, "previous_close": 0.5, "volume": 10}}
+
+    monkeypatch.setattr(settings, "MARKET_DATA_PROVIDER", "yfinance")
+    monkeypatch.setattr(quote_service, "yfinance_quotes", download)
+    monkeypatch.setattr(provider_governor, "_governors", {})
+
+    quotes = await provider_quotes(["NVDA", "NOPE"])
+
+    assert batches == [["NVDA", "NOPE"]]
+    assert quotes["NVDA"]["price"] == 1.0
+    assert isinstance(quotes["NOPE"], provider_governor.NoDataError)
+    assert provider_governor._governors[QUOTE_UPSTREAM].stats.calls == 1
+
+
+@pytest.fixture
+def quote_client():
+    provider = FakeQuoteProvider({"NVDA": 120.0, "TSM": 180.0})
+    hub = QuoteHub(provider, poll_interval=0.01)
+    app.dependency_overrides[get_quote_hub] = lambda: hub
+    with TestClient(app) as client:
+        yield client, hub
+    app.dependency_overrides.clear()
+
+
+def _next_quotes(websocket) -> list[dict]:
+    while (message := websocket.receive_json())["type"] != "quotes":
+        pass
+    return message["quotes"]
+
+
+def test_websocket_fan_out(quote_client) -> None:
+    client, hub = quote_client
+    with (
+        client.websocket_connect("/api/v1/quotes/ws") as first,
+        client.websocket_connect("/api/v1/quotes/ws") as second,
+    ):
+        first.send_json({"action": "subscribe", "tickers": ["NVDA"]})
+        assert first.receive_json() == {"type": "subscribed", "tickers": ["NVDA"]}
+        second.send_json({"action": "subscribe", "tickers": ["NVDA", "TSM"]})
+
+        quote = _next_quotes(first)[0]
+        assert quote["ticker"] == "NVDA"
+        assert quote["price"] == 120.0
+        assert {q["ticker"] for q in _next_quotes(second)} <= {"NVDA", "TSM"}
+        assert hub.polled_tickers == {"NVDA", "TSM"}
+
+        second.send_json({"action": "unsubscribe", "tickers": ["TSM"]})
+        second.send_json({"action": "bogus"})
+        replies = []
+        while len(replies) < 2:
+            if (message := second.receive_json())["type"] != "quotes":
+                replies.append(message)
+        assert replies[0] == {"type": "subscribed", "tickers": ["NVDA"]}
+        assert replies[1]["type"] == "error"
+        assert hub.polled_tickers == {"NVDA"}
+
+    # Disconnecting the last subscribers stops the pollers
+    for _ in range(100):
+        if not hub.polled_tickers:
+            break
+        client.portal.call(asyncio.sleep, 0.01)
+    assert hub.polled_tickers == set()
+
+
+def test_websocket_subscription_limit(quote_client) -> None:
+    client, _ = quote_client
+    with client.websocket_connect("/api/v1/quotes/ws") as websocket:
+        websocket.send_json({"action": "subscribe", "tickers": [f"T{i}" for i in range(51)]})
+        assert websocket.receive_json()["type"] == "error"
+
+
+def test_websocket_normalizes_and_validates_symbols(quote_client) -> None:
+    client, hub = quote_client
+    with client.websocket_connect("/api/v1/quotes/ws") as websocket:
+        websocket.send_json({"action": "subscribe", "tickers": ["nvda", " NVDA ", "2330.tw"]})
+        assert websocket.receive_json() == {"type": "subscribed", "tickers": ["2330.TW", "NVDA"]}
+
+        websocket.send_json({"action": "subscribe", "tickers": ["TSM", "DROP TABLE", "X" * 21]})
+        reply = websocket.receive_json()
+        while reply["type"] == "quotes":
+            reply = websocket.receive_json()
+        assert reply["type"] == "error"
+        assert "DROP TABLE" in reply["detail"]
+        assert hub.polled_tickers == {"2330.TW", "NVDA"}
@@ -0,0 +1,235 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api import deps
+from app.services.report_service import (
+    ReportBuilder,
+    build_report_document,
+    render_pdf,
+    report_fingerprint,
+)
+from app.services.report_snapshot_service import (
+    LISTED_COLUMNS,
+    SNAPSHOT_VERSION,
+    build_snapshots,
+    diff_documents,
+    report_week,
+    save_snapshots,
+    snapshot_fingerprint,
+)
+from main import app
+
+
+def workflow_results(cio_text: str = "Hold") -> dict:
+    def stages(ticker: str, recommendation: str) -> dict:
+        return {
+            "data_collection": {
+                "ticker": ticker,
+                "bars": [
+                    {"date": "2026-10-12", "close": 100.0},
+                    {"date": "2026-10-16", "close": 104.0},
+                ],
+            },
+            "technical_analysis": {"close": 104.0, "indicators": {"MA5": 102.0}},
+            "sentiment_analysis": {"sentiment_score": None},
+            "risk_assessment": {"volatility": 0.3},
+            "cio_synthesis": {"recommendation": recommendation},
+        }
+
+    return {"NVDA": stages("NVDA", cio_text), "2330.TW": stages("2330.TW", "Buy (TSMC)")}
+
+
+def test_rebuild_only_renders_changed_reports(tmp_path: Path) -> None:
+    builder = ReportBuilder(output_dir=tmp_path, formats=["json", "html", "pdf"], max_workers=2)
+
+    first = builder.build_from_workflow("2026-W42", workflow_results())
+    assert len(first.rendered) == 6 and not first.skipped and not first.errors
+
+    second = builder.build_from_workflow("2026-W42", workflow_results())
+    assert not second.rendered and len(second.skipped) == 6
+
+    third = builder.build_from_workflow("2026-W42", workflow_results(cio_text="Sell"))
+    assert sorted(Path(p).name for p in third.rendered) == ["NVDA.html", "NVDA.json", "NVDA.pdf"]
+
+    (tmp_path / "2026-W42" / "2330.TW.pdf").unlink()
+    fourth = builder.build_from_workflow("2026-W42", workflow_results(cio_text="Sell"))
+    assert [Path(p).name for p in fourth.rendered] == ["2330.TW.pdf"]
+
+    report = json.loads((tmp_path / "2026-W42" / "NVDA.json").read_text())
+    assert report["cio"]["recommendation"] == "Sell"
+    assert report["data"]["last_date"] == "2026-10-16"
+
+
+def test_llm_call_metadata_does_not_change_the_fingerprint() -> None:
+    fresh = workflow_results()["NVDA"]
+    fresh["cio_synthesis"].update(model="m", cost=0.02, cached=False)
+    cached = workflow_results()["NVDA"]
+    cached["cio_synthesis"].update(model="m", cost=0.0, cached=True)
+
+    document = build_report_document("NVDA", "2026-W42", fresh)
+
+    assert document["cio"] == {"recommendation": "Hold", "model": "m"}
+    assert report_fingerprint(document, "json") == report_fingerprint(
+        build_report_document("NVDA", "2026-W42", cached), "json"
+    )
+
+
+def test_pdf_renderer_produces_valid_structure() -> None:
+    document = build_report_document("NVDA", "2026-W42", workflow_results()["NVDA"])
+    document["cio"] = {"recommendation": "\n".join(f"line (x) {i}" for i in range(150))}
+
+    pdf = render_pdf(document)
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    assert pdf.count(b"/Type /Page ") == 3
+    assert b"line \\(x\\) 149" in pdf
+
+
+class _Result(list):
+    def all(self):
+        return list(self)
+
+    def scalar_one_or_none(self):
+        return self[0] if self else None
+
+
+class _Session:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result(self.results.pop(0) if self.results else [])
+
+
+async def test_snapshots_written_in_one_upsert() -> None:
+    results = workflow_results()
+    results["AAPL"] = {"data_collection": {"ticker": "AAPL", "bars": []}}  # CIO stage failed
+    snapshots = build_snapshots("2026-W42", results, portfolio="watchlist")
+
+    assert [(kind, subject) for kind, subject, _ in snapshots] == [
+        ("ticker", "2330.TW"),
+        ("ticker", "NVDA"),
+        ("portfolio", "watchlist"),
+    ]
+    nvda = snapshots[1][2]
+    assert nvda["version"] == SNAPSHOT_VERSION
+    assert nvda["cio"] == {"recommendation": "Hold"}
+    assert nvda["data"]["bars"] == 2 and "hash" in nvda["data"]  # Bars reduced to a hash
+    portfolio = snapshots[2][2]
+    assert portfolio["holdings"]["2330.TW"]["recommendation"] == "Buy (TSMC)"
+    assert portfolio["summary"]["holdings"] == 2
+    assert portfolio["summary"]["mean_volatility"] == pytest.approx(0.3)
+    assert portfolio["missing"] == ["AAPL"]
+
+    db = _Session([("2330.TW",), ("NVDA",)])
+    assert await save_snapshots(db, "2026-W42", "weekly-2026-W42", snapshots) == 2
+    assert len(db.statements) == 1
+    statement = db.statements[0].compile(dialect=postgresql.dialect())
+    assert "ON CONFLICT (kind, subject, week) DO UPDATE" in str(statement)
+    assert "WHERE weekly_report_snapshots.fingerprint != excluded.fingerprint" in str(statement)
+    assert statement.params["fingerprint_m1"] == snapshot_fingerprint(nvda)
+    assert await save_snapshots(_Session(), "2026-W42", "run", []) == 0
+
+
+def test_diff_documents() -> None:
+    base = {"week": "2026-W41", "risk": {"volatility": 0.3, "var_95": -0.02}, "cio": "Hold"}
+    other = {"week": "2026-W42", "risk": {"volatility": 0.25}, "cio": "Buy", "charts": ["a"]}
+
+    changes = {change["path"]: change for change in diff_documents(base, other)}
+
+    assert set(changes) == {"week", "risk.volatility", "risk.var_95", "cio", "charts"}
+    assert changes["risk.volatility"]["delta"] == pytest.approx(-0.05)
+    assert changes["risk.var_95"]["change"] == "removed"
+    assert changes["charts"] == {"path": "charts", "change": "added", "base": None, "other": ["a"]}
+    assert "delta" not in changes["cio"]
+    assert diff_documents(base, base) == []
+    assert report_week(datetime(2026, 10, 18).date()) == "2026-W42"
+
+
+@pytest.fixture
+def report_client():
+    sessions: list[_Session] = []
+
+    def use(*results) -> _Session:
+        sessions.append(_Session(*results))
+        return sessions[-1]
+
+    async def fake_db():
+        yield sessions.pop(0) if sessions else _Session()
+
+    app.dependency_overrides[deps.get_db] = fake_db
+    yield TestClient(app), use
+    app.dependency_overrides.clear()
+
+
+def _snapshot(week: str, recommendation: str) -> SimpleNamespace:
+    document = {
+        "version": 1,
+        "ticker": "NVDA",
+        "week": week,
+        "cio": {"recommendation": recommendation},
+    }
+    return SimpleNamespace(
+        kind="ticker",
+        subject="NVDA",
+        week=week,
+        version=1,
+        run_id=f"weekly-{week}",
+        fingerprint=snapshot_fingerprint(document),
+        created_at=datetime(2026, 10, 18, tzinfo=timezone.utc),
+        updated_at=datetime(2026, 10, 18, tzinfo=timezone.utc),
+        document=document,
+    )
+
+
+def test_report_endpoints(report_client) -> None:
+    client, use = report_client
+    w41, w42 = _snapshot("2026-W41", "Hold"), _snapshot("2026-W42", "Buy")
+
+    use([w42])
+    response = client.get("/api/v1/reports/ticker/NVDA/2026-W42")
+    assert response.status_code == 200
+    assert response.json()["document"]["cio"]["recommendation"] == "Buy"
+    etag = response.headers["etag"]
+    db = use([w42])
+    response = client.get("/api/v1/reports/ticker/NVDA/2026-W42", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert len(db.statements) == 1
+
+    use([])
+    assert client.get("/api/v1/reports/portfolio/watchlist/2026-W40").status_code == 404
+    assert client.get("/api/v1/reports/sector/NVDA/2026-W42").status_code == 422
+    assert client.get("/api/v1/reports/ticker/NVDA/week-42").status_code == 422
+
+    db = use([tuple(getattr(w42, column) for column in LISTED_COLUMNS)])
+    response = client.get("/api/v1/reports/ticker/NVDA/weeks", params={"before": "2026-W43"})
+    assert [week["week"] for week in response.json()["weeks"]] == ["2026-W42"]
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "document" not in sql and "ORDER BY weekly_report_snapshots.week DESC" in sql
+
+    use([w41, w42])
+    response = client.get(
+        "/api/v1/reports/ticker/NVDA/diff", params={"base": "2026-W41", "week": "2026-W42"}
+    )
+    assert response.status_code == 200
+    assert response.json()["changes"] == [
+        {
+            "path": "cio.recommendation",
+            "change": "changed",
+            "base": "Hold",
+            "other": "Buy",
+            "delta": None,
+        }
+    ]
+    use([w41])
+    response = client.get(
+        "/api/v1/reports/ticker/NVDA/diff", params={"base": "2026-W41", "week": "2026-W42"}
+    )
+    assert response.status_code == 404
@@ -0,0 +1,190 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.api import deps
+from app.services import indicators
+from app.services.screener_service import (
+    MAX_NESTING,
+    SNAPSHOT_FIELDS,
+    ScreenerSyntaxError,
+    build_screen_query,
+    compile_filter,
+    compute_snapshot,
+    refresh_snapshot,
+)
+from main import app
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_filter_compiles_to_where_clause() -> None:
+    sql = _sql(compile_filter("RSI14 < 30 and (sector = 'Semiconductors' or region in ('us'))"))
+    assert sql == (
+        "indicator_snapshots.rsi14 < 30.0 AND (indicator_snapshots.sector = 'Semiconductors' "
+        "OR indicator_snapshots.region IN ('us'))"
+    )
+
+    sql = _sql(compile_filter("not (close - ma20) / ma20 > 0.05 and macd is not null"))
+    assert "/ CAST(nullif(indicator_snapshots.ma20, 0) AS FLOAT) <= 0.05" in sql
+    assert "indicator_snapshots.macd IS NOT NULL" in sql
+
+    assert _sql(compile_filter("ticker not in ('NVDA', 'AAPL')")).startswith(
+        "(indicator_snapshots.ticker NOT IN"
+    )
+    assert _sql(compile_filter("change_1d >= -0.1")) == "indicator_snapshots.change_1d >= -0.1"
+
+
+@pytest.mark.parametrize(
+    "expression, message",
+    [
+        ("rsi < 30", "Unknown field at position 0"),
+        ("rsi14 <", "Expected a field, number or string at position 7 (found end of expression)"),
+        ("rsi14", "Filter must be a condition"),
+        ("rsi14 < 30 and close", "Expected a condition at position 15"),
+        ("sector > 'A'", "Text fields only support"),
+        ("sector = 30", "Cannot compare text with number"),
+        ("sector + 1 > 2", "Arithmetic needs numbers"),
+        ("(rsi14 < 30", "Expected ')'"),
+        ("rsi14 < 30 close", "Unexpected token at position 11"),
+        ("rsi14 ; 30", "Unexpected character ';' at position 6"),
+    ],
+)
+def test_filter_errors(expression: str, message: str) -> None:
+    with pytest.raises(ScreenerSyntaxError, match=message.replace("(", r"\(").replace(")", r"\)")):
+        compile_filter(expression)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "(" * 200 + "rsi14 < 1" + ")" * 200,
+        "rsi14 < " + "-" * 990 + "1",
+        "not " * 240 + "rsi14 < 1",
+    ],
+)
+def test_deep_nesting_is_a_syntax_error(expression: str) -> None:
+    with pytest.raises(ScreenerSyntaxError, match=f"nested more than {MAX_NESTING} levels"):
+        compile_filter(expression)
+
+    # Up to the limit, and long flat chains, still compile
+    nested = "(" * MAX_NESTING + "rsi14 < 1" + ")" * MAX_NESTING
+    assert _sql(compile_filter(nested)) == "indicator_snapshots.rsi14 < 1.0"
+    assert _sql(compile_filter(" + ".join(["rsi14"] * 150) + " > 1"))
+
+
+def test_screen_query_reads_only_the_snapshot() -> None:
+    sql = _sql(build_screen_query("rsi14 < 30", "-rsi14", 10))
+    assert "FROM indicator_snapshots \nWHERE indicator_snapshots.rsi14 < 30.0" in sql
+    assert "ticker_history" not in sql
+    assert sql.endswith(
+        "ORDER BY indicator_snapshots.rsi14 DESC NULLS LAST, "
+        "indicator_snapshots.ticker ASC \n LIMIT 10"
+    )
+
+    with pytest.raises(ScreenerSyntaxError, match="Unknown sort field 'updated_at'"):
+        build_screen_query(None, "updated_at", 10)
+
+
+def test_compute_snapshot_matches_indicators() -> None:
+    closes = [100 + (i % 7) - i * 0.1 for i in range(300)]
+    snapshot = compute_snapshot(closes, [1000] * 300)
+
+    assert snapshot["close"] == closes[-1]
+    assert snapshot["ma20"] == pytest.approx(sum(closes[-20:]) / 20)
+    assert snapshot["rsi14"] == indicators.rsi(closes)[-1]
+    assert snapshot["high_52w"] == max(closes[-252:])
+    assert snapshot["change_1d"] == pytest.approx(closes[-1] / closes[-2] - 1)
+
+    # Too short for most indicators
+    short = compute_snapshot([10.0, 11.0], [5, 6])
+    assert short["ma5"] is None and short["macd"] is None
+    assert short["change_1d"] == pytest.approx(0.1)
+
+
+class _Result(list):
+    def tuples(self):
+        return self
+
+    def all(self):
+        return list(self)
+
+
+class _RecordingSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result(self.rows if len(self.statements) == 1 else [])
+
+
+async def test_refresh_snapshot_upserts_watchlist_metadata() -> None:
+    rows = [(date(2026, 10, 16), 110.0, 900), (date(2026, 10, 15), 100.0, 1000)]  # Newest first
+    db = _RecordingSession(rows)
+    assert await refresh_snapshot(db, "NVDA") is True
+
+    select_sql, upsert_sql = (str(s.compile(dialect=postgresql.dialect())) for s in db.statements)
+    assert "LIMIT" in select_sql
+    assert upsert_sql.startswith("INSERT INTO indicator_snapshots")
+    assert "ON CONFLICT (ticker) DO UPDATE" in upsert_sql
+
+    params = db.statements[1].compile().params
+    assert params["as_of"] == date(2026, 10, 16)
+    assert params["sector"] == "Semiconductors"
+    assert params["change_1d"] == pytest.approx(0.1)
+
+    assert await refresh_snapshot(_RecordingSession([]), "NONE") is False
+
+
+@pytest.fixture
+def screener_client():
+    row = (
+        "NVDA",
+        date(2026, 10, 16),
+        "NVIDIA",
+        "Semiconductors",
+        "us",
+        None,
+        110.0,
+        900,
+        0.1,
+        *([None] * 12),
+    )
+    db = _RecordingSession([row])
+
+    async def fake_db():
+        yield db
+
+    app.dependency_overrides[deps.get_db] = fake_db
+    yield TestClient(app), db
+    app.dependency_overrides.clear()
+
+
+def test_screener_endpoint(screener_client) -> None:
+    client, db = screener_client
+    response = client.get(
+        "/api/v1/screener/", params={"filter": "change_1d > 0.05", "sort": "-change_1d"}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert body["oldest_as_of"] == "2026-10-16"
+    assert set(body["results"][0]) == set(SNAPSHOT_FIELDS)
+    assert body["results"][0]["sector"] == "Semiconductors"
+    assert len(db.statements) == 1
+
+    response = client.get("/api/v1/screener/", params={"filter": "price > 1"})
+    assert response.status_code == 422
+    assert "Unknown field" in response.json()["detail"]
+
+    response = client.get(
+        "/api/v1/screener/", params={"filter": "(" * 200 + "rsi14 < 1" + ")" * 200}
+    )
+    assert response.status_code == 422
+    assert "nested more than" in response.json()["detail"]
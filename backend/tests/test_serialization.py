@@ -0,0 +1,67 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import encode_rows, rows_response
+from app.schemas.ticker_history import TickerHistory
+from app.services.ticker_service import HISTORY_COLUMNS
+from main import app
+
+STAMP = datetime(2026, 10, 16, 8, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def _row(i: int) -> tuple:
+    return (
+        "NVDA",
+        date(2026, 1, 1 + i),
+        100.25,
+        101.5,
+        99.0,
+        100.75,
+        123456789,
+        0.0,
+        None,
+        i,
+        STAMP,
+        STAMP,
+    )
+
+
+def test_encoded_rows_match_pydantic_output() -> None:
+    rows = [_row(i) for i in range(3)]
+    # What the response_model path produced from ORM objects with Decimal columns
+    orm_objects = [
+        SimpleNamespace(
+            **{
+                name: Decimal(str(value)) if isinstance(value, float) else value
+                for name, value in zip(HISTORY_COLUMNS, row, strict=True)
+            }
+        )
+        for row in rows
+    ]
+    adapter = TypeAdapter(list[TickerHistory])
+    expected = adapter.dump_json(adapter.validate_python(orm_objects, from_attributes=True))
+
+    assert encode_rows(HISTORY_COLUMNS, rows) == expected
+
+
+def test_rows_response_sets_headers() -> None:
+    response = rows_response(HISTORY_COLUMNS, [_row(0)], headers={"ETag": 'W/"x"'})
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == 'W/"x"'
+    assert response.body.startswith(b'[{"ticker":"NVDA","date":"2026-01-01"')
+
+
+def test_history_openapi_schema_is_unchanged() -> None:
+    schema = app.openapi()
+    ok = schema["paths"]["/api/v1/tickers/{ticker}/history"]["get"]["responses"]["200"]
+    # Daily rows keep their schema; intraday rows (interval=1h|5m|1m) are the alternative
+    assert ok["content"]["application/json"]["schema"]["anyOf"] == [
+        {"type": "array", "items": {"$ref": "#/components/schemas/TickerHistory"}},
+        {"type": "array", "items": {"$ref": "#/components/schemas/IntradayBar"}},
+    ]
+    assert set(schema["components"]["schemas"]["TickerHistory"]["properties"]) == set(
+        HISTORY_COLUMNS
+    )
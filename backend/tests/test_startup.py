@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["yfinance", "pandas", "numpy"]
+
+# Generous ceiling: catches an accidental eager import of the data/LLM stack,
+# not machine-to-machine noise. Use scripts/benchmark_startup.py for numbers.
+MAX_IMPORT_SECONDS = 5.0
+
+
+def _run(code: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_app_import_does_not_load_heavy_modules() -> None:
+    result = _run(
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import main, app.agents, app.tools, app.workflows\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+    )
+    assert result["loaded"] == []
+    assert result["elapsed"] < MAX_IMPORT_SECONDS
+
+
+def test_first_request_does_not_load_heavy_modules() -> None:
+    result = _run(
+        "import json, sys\n"
+        "from fastapi.testclient import TestClient\n"
+        "import main\n"
+        "status = TestClient(main.app).get('/api/v1/health').status_code\n"
+        f"print(json.dumps({{'status': status, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+    )
+    assert result == {"status": 200, "loaded": []}
+
+
+@pytest.mark.parametrize("package", ["app.agents", "app.tools", "app.workflows"])
+def test_lazy_packages_reject_unknown_names(package: str) -> None:
+    module = __import__(package, fromlist=["__all__"])
+    assert set(module.__all__) <= set(dir(module))
+    with pytest.raises(AttributeError):
+        module.DoesNotExist  # noqa: B018
@@ -0,0 +1,294 @@
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import market_calendar, ticker_service
+from app.services.data_quality import QualityPolicy, validate_bars
+from app.services.market_calendar import (
+    FRIDAY,
+    SATURDAY,
+    calendar_for,
+    nyse_holidays,
+    trading_calendar,
+)
+
+
+def test_nyse_holidays() -> None:
+    assert sorted(nyse_holidays(2026)) == [
+        date(2026, 1, 1),
+        date(2026, 1, 19),
+        date(2026, 2, 16),
+        date(2026, 4, 3),  # Good Friday
+        date(2026, 5, 25),
+        date(2026, 6, 19),
+        date(2026, 7, 3),  # Independence Day falls on a Saturday
+        date(2026, 9, 7),
+        date(2026, 11, 26),
+        date(2026, 12, 25),
+    ]
+    # New Year's Day 2022 was a Saturday: not observed on Friday Dec 31st
+    assert date(2021, 12, 31) not in nyse_holidays(2021) + nyse_holidays(2022)
+    assert calendar_for("NVDA").is_session(date(2021, 12, 31))
+
+
+def test_sessions_per_exchange() -> None:
+    us = calendar_for("NVDA")
+    assert us.sessions(date(2026, 11, 23), date(2026, 11, 29)) == [
+        date(2026, 11, 23),
+        date(2026, 11, 24),
+        date(2026, 11, 25),
+        date(2026, 11, 27),
+    ]
+    # Configured Taiwan holiday; Sunday-Thursday week in Riyadh
+    assert not calendar_for("2330.TW").is_session(date(2026, 10, 9))
+    riyadh = calendar_for("2222.SR")
+    assert riyadh.is_session(date(2026, 10, 18))  # Sunday
+    assert not riyadh.is_session(date(2026, 10, 16))  # Friday
+    assert {day.weekday() for day in riyadh.sessions(date(2026, 1, 1), date(2026, 12, 31))} == (
+        set(range(7)) - {FRIDAY, SATURDAY}
+    )
+
+
+def test_last_completed_session() -> None:
+    us = calendar_for("NVDA")
+    # Monday 10:00 in New York: Friday is the last final bar
+    assert us.last_completed_session(datetime(2026, 10, 19, 14, 0, tzinfo=UTC)) == date(
+        2026, 10, 16
+    )
+    assert us.is_open(datetime(2026, 10, 19, 14, 0, tzinfo=UTC))
+    # After the close
+    assert us.last_completed_session(datetime(2026, 10, 19, 20, 30, tzinfo=UTC)) == date(
+        2026, 10, 19
+    )
+    # Taipei closes at 13:30 local (05:30 UTC)
+    taipei = calendar_for("2330.TW")
+    assert taipei.last_completed_session(datetime(2026, 10, 19, 6, 0, tzinfo=UTC)) == date(
+        2026, 10, 19
+    )
+    assert not taipei.is_open(datetime(2026, 10, 19, 6, 0, tzinfo=UTC))
+
+
+def test_runs_and_periods() -> None:
+    us = calendar_for("NVDA")
+    missing = [date(2026, 11, 24), date(2026, 11, 25), date(2026, 11, 27), date(2026, 12, 1)]
+    # Thanksgiving does not break a run
+    assert us.session_runs(missing) == [
+        (date(2026, 11, 24), date(2026, 11, 27)),
+        (date(2026, 12, 1), date(2026, 12, 1)),
+    ]
+    end = date(2026, 10, 16)
+    assert us.period_start("5d", end) == date(2026, 10, 12)
+    assert us.period_start("1mo", end) == date(2026, 9, 17)
+    assert us.period_start("ytd", end) == date(2026, 1, 1)
+    assert us.period_start("max", end) is None
+    with pytest.raises(ValueError):
+        us.period_start("1w", end)
+
+
+def test_holidays_are_not_gaps() -> None:
+    dates = ["2026-11-20", "2026-11-23", "2026-11-24", "2026-11-25", "2026-11-27"]
+    frame = pd.DataFrame(
+        [(100, 101, 99, 100, 1_000)] * len(dates),
+        columns=["Open", "High", "Low", "Close", "Volume"],
+        index=pd.DatetimeIndex(dates),
+    )
+    policy = QualityPolicy(max_gap_days=0)
+    _, _, report = validate_bars("NVDA", frame, policy)
+    assert [gap["after"] for gap in report.gaps] == ["2026-11-25"]
+
+    _, _, report = validate_bars("NVDA", frame, policy, holidays=calendar_for("NVDA").holidays)
+    assert report.gaps == []
+
+
+class _Result(list):
+    rowcount = 1
+
+    def scalar_one_or_none(self):
+        return None
+
+    def scalars(self):
+        return self
+
+    def tuples(self):
+        return self
+
+    def all(self):
+        return list(self)
+
+
+class _Session:
+    """Ticker with bars stored from ``first`` through ``last`` except ``gaps``."""
+
+    def __init__(self, first: date, last: date, gaps: set[date] = frozenset()):
+        self.first = first
+        self.stored = [
+            (day, datetime.combine(day + timedelta(days=1), datetime.min.time(), UTC))
+            for day in calendar_for("NVDA").sessions(first, last)
+            if day not in gaps
+        ]
+        self.commits = 0
+        self.statements = []
+
+    async def scalar(self, statement):
+        sql = str(statement)
+        return self.first if "min(ticker_history.date)" in sql else None
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        sql = str(statement)
+        if sql.startswith("SELECT ticker_history.date, ticker_history.updated_at"):
+            return _Result(self.stored)
+        return _Result()
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.fixture
+def fake_yahoo(monkeypatch):
+    import yfinance
+
+    class Calls(list):
+        no_bars: set[date] = set()  # Sessions the provider has no bar for
+
+    calls = Calls()
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, auto_adjust, **kwargs):
+            calls.append(kwargs)
+            days = pd.bdate_range(kwargs["start"], kwargs["end"] - timedelta(days=1))
+            days = days[[day.date() not in calls.no_bars for day in days]]
+            return pd.DataFrame(
+                [(100.0, 101.0, 99.0, 100.0, 1_000, 0.0, 0.0)] * len(days),
+                columns=["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"],
+                index=days,
+            )
+
+    monkeypatch.setattr(yfinance, "Ticker", FakeTicker)
+    return calls
+
+
+async def test_closed_market_is_not_fetched(fake_yahoo) -> None:
+    db = _Session(date(2025, 10, 1), date(2026, 10, 16))
+    # Saturday: Friday's bar is stored and final
+    now = datetime(2026, 10, 17, 15, 0, tzinfo=UTC)
+    result = await ticker_service.fetch_and_store_ticker_data(db, tickers=["NVDA"], now=now)
+
+    assert result["success"] is True
+    assert result["tickers_up_to_date"] == 1
+    assert fake_yahoo == []
+    assert db.commits == 0
+
+
+async def test_only_missing_sessions_are_fetched(fake_yahoo) -> None:
+    gaps = {date(2026, 9, 1), date(2026, 9, 2)}
+    db = _Session(date(2025, 10, 1), date(2026, 10, 15), gaps)
+    now = datetime(2026, 10, 16, 21, 0, tzinfo=UTC)  # After Friday's close
+    result = await ticker_service.fetch_and_store_ticker_data(db, tickers=["NVDA"], now=now)
+
+    assert fake_yahoo == [
+        {"start": date(2026, 9, 1), "end": date(2026, 9, 3)},
+        {"start": date(2026, 10, 16), "end": date(2026, 10, 17)},
+    ]
+    assert result["sessions_missing"] == 3
+    assert result["sessions_unfilled"] == 0
+    assert result["records_created"] == 3
+    assert result["quality"]["NVDA"]["rows"] == 3
+    assert db.commits == 1
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+async def test_sessions_without_bars_are_not_requested_again(fake_yahoo) -> None:
+    # Sep 1st: an exchange closure missing from the calendar; Oct 16th: not published yet
+    fake_yahoo.no_bars = {date(2026, 9, 1), date(2026, 10, 16)}
+    db = _Session(date(2025, 10, 1), date(2026, 10, 15), {date(2026, 9, 1), date(2026, 9, 2)})
+    now = datetime(2026, 10, 16, 21, 0, tzinfo=UTC)
+
+    result = await ticker_service.fetch_and_store_ticker_data(db, tickers=["NVDA"], now=now)
+
+    assert result["sessions_unfilled"] == 2
+    statements = [_sql(statement) for statement in db.statements]
+    [closed] = [
+        statement
+        for statement in db.statements
+        if _sql(statement).startswith("INSERT INTO closed_sessions")
+    ]
+    assert list(closed.compile(dialect=postgresql.dialect()).params.values()) == [
+        "NVDA",
+        date(2026, 9, 1),
+    ]
+    assert any("UNION ALL SELECT closed_sessions.date" in sql for sql in statements)
+    # The refetched bar is marked final even if the upsert left it unchanged
+    [touch] = [statement for statement in db.statements if _sql(statement).startswith("UPDATE")]
+    assert "SET updated_at=now()" in _sql(touch)
+    assert touch.compile(dialect=postgresql.dialect()).params["date_1"] == [date(2026, 9, 2)]
+
+
+async def test_pending_raw_backfill_downloads_the_whole_period(monkeypatch) -> None:
+    import yfinance
+
+    calls = []
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            pass
+
+        def history(self, auto_adjust, **kwargs):
+            calls.append(kwargs)
+            days = pd.bdate_range("2026-10-12", "2026-10-16")
+            return pd.DataFrame(
+                [(100.0, 101.0, 99.0, 100.0, 1_000, 0.0, 0.0)] * len(days),
+                columns=["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"],
+                index=days,
+            )
+
+    monkeypatch.setattr(yfinance, "Ticker", FakeTicker)
+
+    class PendingSession(_Session):
+        async def execute(self, statement):
+            if str(statement).startswith("SELECT pending_raw_backfills.ticker"):
+                return _Result([("NVDA",)])
+            return await super().execute(statement)
+
+    # Every session is stored, but as adjusted by the provider
+    db = PendingSession(date(2025, 10, 1), date(2026, 10, 16))
+    now = datetime(2026, 10, 17, 15, 0, tzinfo=UTC)
+    result = await ticker_service.fetch_and_store_ticker_data(db, tickers=["NVDA"], now=now)
+
+    assert calls == [{"period": "1y"}]
+    assert result["tickers_up_to_date"] == 0
+    assert result["records_created"] == 5
+    statements = [_sql(statement) for statement in db.statements]
+    assert any(sql.startswith("DELETE FROM pending_raw_backfills") for sql in statements)
+
+
+def test_configured_calendar_follows_the_watchlist(monkeypatch) -> None:
+    def configure(section: dict) -> None:
+        monkeypatch.setattr(
+            market_calendar,
+            "config_loader",
+            SimpleNamespace(stock_watchlist={"trading_calendars": {"XTAI": section}}),
+        )
+
+    configure({"annual": ["02-29"]})
+    taipei = trading_calendar("XTAI")
+    assert not taipei.is_session(date(2024, 2, 29))
+    assert taipei.is_session(date(2023, 3, 1))  # Leap years only
+    assert trading_calendar("XTAI") is taipei
+
+    # An edited (reloaded) watchlist rebuilds the calendar
+    configure({"holidays": [date(2023, 3, 1)]})
+    assert not trading_calendar("XTAI").is_session(date(2023, 3, 1))
+    assert trading_calendar("XTAI").is_session(date(2024, 2, 29))
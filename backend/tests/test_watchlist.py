@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import ConfigLoader, WatchlistIndex
+from app.services.watchlist_service import aggregate_group_returns
+from main import app
+
+WATCHLIST = {
+    "stocks": {
+        "taiwan": [
+            {"symbol": "2330.TW", "name": "TSMC", "sector": "Semiconductors", "market_cap": 300},
+            {"symbol": "2317.TW", "name": "Hon Hai", "sector": "Electronics"},
+        ],
+        "us": [
+            {"symbol": "NVDA", "name": "NVIDIA", "sector": "Semiconductors", "market_cap": 100},
+        ],
+        "japan": [
+            {"symbol": "8035.T", "name": "Tokyo Electron", "sector": "Semiconductors"},
+        ],
+    }
+}
+
+
+def test_index_covers_every_region_and_keeps_metadata() -> None:
+    index = WatchlistIndex.from_config(WATCHLIST)
+
+    assert index.symbols == ("2330.TW", "2317.TW", "NVDA", "8035.T")
+    assert index.stocks["NVDA"].name == "NVIDIA"
+    assert index.stocks["2330.TW"].market_cap == 300
+    assert index.sectors["Semiconductors"] == ("2330.TW", "NVDA", "8035.T")
+    assert index.regions["japan"] == ("8035.T",)
+
+
+def test_index_reloads_only_when_mtime_changes(tmp_path: Path) -> None:
+    path = tmp_path / "stock_watchlist.yaml"
+    path.write_text('stocks:\n  us:\n    - symbol: "NVDA"\n      sector: "Semiconductors"\n')
+    loader = ConfigLoader(config_dir=tmp_path)
+
+    first = loader.watchlist_index
+    assert loader.watchlist_index is first
+    assert loader.get_watchlist_symbols() == ["NVDA"]
+
+    path.write_text('stocks:\n  us:\n    - symbol: "AAPL"\n      sector: "Hardware"\n')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert loader.watchlist_index is not first
+    assert loader.get_watchlist_symbols() == ["AAPL"]
+
+
+def test_aggregate_group_returns() -> None:
+    index = WatchlistIndex.from_config(WATCHLIST)
+    result = aggregate_group_returns(index, {"2330.TW": 0.10, "NVDA": -0.02, "2317.TW": 0.04})
+
+    semis = next(g for g in result["sectors"] if g["group"] == "Semiconductors")
+    assert semis["members"] == 3
+    assert semis["members_with_data"] == 2
+    assert semis["equal_weighted_return"] == pytest.approx(0.04)
+    assert semis["cap_weighted_return"] == pytest.approx((300 * 0.10 + 100 * -0.02) / 400)
+    assert (semis["advancers"], semis["decliners"], semis["breadth"]) == (1, 1, 0.5)
+
+    taiwan = next(g for g in result["regions"] if g["group"] == "taiwan")
+    assert taiwan["equal_weighted_return"] == pytest.approx(0.07)
+    assert taiwan["cap_weighted_return"] == pytest.approx(0.10)
+
+    japan = next(g for g in result["regions"] if g["group"] == "japan")
+    assert japan["members_with_data"] == 0
+    assert japan["equal_weighted_return"] is None
+    assert japan["breadth"] is None
+
+
+def test_watchlist_endpoint() -> None:
+    response = TestClient(app).get("/api/v1/watchlist/")
+    assert response.status_code == 200
+    body = response.json()
+    assert "2330.TW" in body["regions"]["taiwan"]
+    assert {stock["symbol"] for stock in body["stocks"]} >= {"NVDA", "2330.TW"}
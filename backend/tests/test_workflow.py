@@ -0,0 +1,158 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from app.services.indicators import bollinger, latest_indicators, rsi, sma
+from app.services.llm_client import LLMClient
+from app.workflows.executor import (
+    CheckpointStore,
+    DAGExecutor,
+    WorkflowDefinitionError,
+    WorkflowNode,
+)
+from app.workflows.research_workflow import (
+    CIO_SYNTHESIS,
+    DATA_COLLECTION,
+    SENTIMENT_ANALYSIS,
+    ResearchWorkflow,
+)
+from tests.fakes.llm_server import create_fake_llm_app
+
+
+def build_dag(calls: list[tuple[str, str]], failing: set[tuple[str, str]] = frozenset()):
+    def stage(name: str):
+        async def handler(ticker: str, inputs: dict[str, Any]) -> Any:
+            calls.append((name, ticker))
+            if (name, ticker) in failing:
+                raise RuntimeError("boom")
+            return {"stage": name, "inputs": sorted(inputs)}
+
+        return handler
+
+    return [
+        WorkflowNode("collect", stage("collect")),
+        WorkflowNode("technical", stage("technical"), depends_on=("collect",)),
+        WorkflowNode("risk", stage("risk"), depends_on=("collect",)),
+        WorkflowNode("cio", stage("cio"), depends_on=("technical", "risk")),
+    ]
+
+
+async def test_dag_runs_every_stage_per_ticker() -> None:
+    calls: list[tuple[str, str]] = []
+    result = await DAGExecutor(build_dag(calls)).run(["A", "B"], run_id="r1")
+
+    assert result.status == "completed"
+    assert result.executed == 8
+    assert result.results["A"]["cio"] == {"stage": "cio", "inputs": ["risk", "technical"]}
+    for ticker in ("A", "B"):
+        ticker_calls = [name for name, t in calls if t == ticker]
+        assert ticker_calls[0] == "collect" and ticker_calls[-1] == "cio"
+
+
+async def test_failure_skips_downstream_and_rerun_resumes(tmp_path: Path) -> None:
+    checkpoints = CheckpointStore(tmp_path)
+    calls: list[tuple[str, str]] = []
+    executor = DAGExecutor(build_dag(calls, failing={("risk", "A")}), checkpoints=checkpoints)
+
+    first = await executor.run(["A", "B"], run_id="week")
+    assert first.status == "failed"
+    assert set(first.errors["A"]) == {"risk", "cio"}
+    assert "DependencyFailedError" in first.errors["A"]["cio"]
+    assert "B" not in first.errors
+
+    calls.clear()
+    second = await DAGExecutor(build_dag(calls), checkpoints=checkpoints).run(
+        ["A", "B"], run_id="week"
+    )
+    assert second.status == "completed"
+    assert sorted(calls) == [("cio", "A"), ("risk", "A")]
+    assert second.resumed == 6
+
+    # A completed run drops its checkpoints, so a rerun sees fresh inputs
+    calls.clear()
+    third = await DAGExecutor(build_dag(calls), checkpoints=checkpoints).run(
+        ["A", "B"], run_id="week"
+    )
+    assert third.resumed == 0
+    assert len(calls) == 8
+
+
+async def test_concurrency_budget_and_timeout() -> None:
+    running = peak = 0
+
+    async def slow(ticker: str, inputs: dict[str, Any]) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    executor = DAGExecutor([WorkflowNode("slow", slow)], max_concurrency=3)
+    await executor.run([str(i) for i in range(9)], run_id="r")
+    assert peak == 3
+
+    executor = DAGExecutor([WorkflowNode("slow", slow)], max_concurrency=1, timeout_seconds=0.08)
+    result = await executor.run([str(i) for i in range(9)], run_id="r")
+    assert result.status == "timed_out"
+    assert 0 < len(result.results) < 9
+    assert set(result.errors["8"].values()) == {"timed out"}
+
+
+def test_invalid_dags_are_rejected() -> None:
+    async def noop(ticker: str, inputs: dict[str, Any]) -> None:
+        return None
+
+    with pytest.raises(WorkflowDefinitionError):
+        DAGExecutor([WorkflowNode("a", noop, depends_on=("missing",))])
+    with pytest.raises(WorkflowDefinitionError):
+        DAGExecutor(
+            [WorkflowNode("a", noop, depends_on=("b",)), WorkflowNode("b", noop, depends_on=("a",))]
+        )
+
+
+async def test_research_workflow_end_to_end_with_fake_llm(tmp_path: Path) -> None:
+    closes = [100 + (i % 7) - (i % 3) + i * 0.5 for i in range(80)]
+
+    async def collect(ticker: str, inputs: dict[str, Any]) -> dict[str, Any]:
+        return {"ticker": ticker, "bars": [{"close": close} for close in closes]}
+
+    async def sentiment(ticker: str, inputs: dict[str, Any]) -> dict[str, Any]:
+        return {"sentiment_score": None, "articles": 0, "available": False}
+
+    fake_app = create_fake_llm_app()
+    llm = LLMClient(
+        model="fake-model",
+        base_url="http://fake-llm/v1",
+        transport=httpx.ASGITransport(app=fake_app),
+    )
+    workflow = ResearchWorkflow(
+        llm=llm,
+        handlers={DATA_COLLECTION: collect, SENTIMENT_ANALYSIS: sentiment},
+        checkpoints=CheckpointStore(tmp_path),
+    )
+    result = await workflow.run(["NVDA", "2330.TW"], run_id="test-week")
+    await llm.aclose()
+
+    assert result.status == "completed", result.errors
+    nvda = result.results["NVDA"]
+    assert nvda["technical_analysis"]["indicators"]["MA60"] == pytest.approx(sum(closes[-60:]) / 60)
+    assert nvda["risk_assessment"]["volatility"] > 0
+    assert nvda[CIO_SYNTHESIS]["recommendation"].startswith("[fake:fake-model")
+    assert fake_app.state.stats.requests == 2
+
+
+def test_indicator_basics() -> None:
+    values = [float(v) for v in range(1, 31)]
+    assert sma(values, 5)[-1] == pytest.approx(28.0)
+    assert sma(values, 5)[3] is None
+    assert rsi(values, 14)[-1] == 100.0
+    upper, middle, lower = bollinger(values, 20)
+    assert lower[-1] < middle[-1] < upper[-1]
+    assert set(latest_indicators(values, ["MA5", "RSI14", "MACD", "UNKNOWN"])) == {
+        "MA5",
+        "RSI14",
+        "MACD",
+    }